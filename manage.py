@@ -13,13 +13,17 @@ Uso:
     python manage.py list
     python manage.py status <form>
     python manage.py backup <form>
+    python manage.py restore <form> [--backup ID] [--list]
     python manage.py validate <form>
+    python manage.py rebuild-tag-stats [<form>]
+    python manage.py purge-orphan-tags [<form>]
 """
 
 import sys
 import os
 import argparse
 from datetime import datetime
+import hashlib
 import json
 
 # Add src to path
@@ -29,6 +33,7 @@ from persistence.factory import RepositoryFactory
 from persistence.migration_manager import MigrationManager
 from persistence.config import get_config
 from persistence.schema_history import get_history
+from persistence.backup_store import BackupStore
 from VibeCForms import load_spec, SPECS_DIR
 
 
@@ -264,6 +269,16 @@ def migrate_form(args):
         return 1
 
 
+def _get_manual_backup_store():
+    """Store dos backups manuais (data/backups/manual)."""
+    return BackupStore(os.path.join('data', 'backups', 'manual'))
+
+
+def _dump_line(value):
+    """Serializa uma linha do dump (JSON compacto)."""
+    return (json.dumps(value, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
 def backup_form(args):
     """Cria backup de um formulário."""
     form_path = args.form
@@ -279,33 +294,130 @@ def backup_form(args):
             print("\n⚠ Formulário não tem dados para backup!")
             return 1
 
-        # Ler dados
-        data = repo.read_all(form_path, spec)
-        print(f"\n📊 Registros: {len(data)}")
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        safe_name = form_path.replace('/', '_')
+        record_count = 0
+
+        metadata = {'form_path': form_path}
+
+        # Dump em JSON Lines: cabeçalho + um registro por linha (streaming),
+        # para que registros inalterados sejam deduplicados entre backups
+        def dump_lines():
+            nonlocal record_count
+            yield _dump_line({'form_path': form_path, 'spec': spec, 'timestamp': timestamp})
+            for batch in repo.iter_records(form_path, spec):
+                for record in batch:
+                    record_count += 1
+                    yield _dump_line(record)
+            # O manifesto é gravado depois do dump: o restore confere a contagem
+            metadata['record_count'] = record_count
+
+        store = _get_manual_backup_store()
+        manifest = store.put_lines(
+            safe_name, dump_lines(), kind='records', metadata=metadata
+        )
+        store.prune(safe_name)
+
+        print(f"\n📊 Registros: {record_count}")
+        print(f"\n✅ Backup criado: {manifest['id']}")
+        print(f"📦 {record_count} registros salvos "
+              f"({manifest['size']} bytes, {manifest['stored_bytes']} novos bytes gravados)")
 
-        # Criar diretório de backup
-        backup_dir = os.path.join('data', 'backups', 'manual')
-        os.makedirs(backup_dir, exist_ok=True)
+    except Exception as e:
+        print(f"\n❌ Erro: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
 
-        # Nome do arquivo de backup
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+def restore_form(args):
+    """Restaura um formulário a partir de um backup manual."""
+    form_path = args.form
+    print("=" * 70)
+    print(f"RESTORE: {form_path}")
+    print("=" * 70)
+
+    try:
+        store = _get_manual_backup_store()
         safe_name = form_path.replace('/', '_')
-        backup_file = os.path.join(backup_dir, f"{safe_name}_{timestamp}.json")
+        backups = store.list_backups(safe_name)
+
+        if args.list:
+            print(f"\n{len(backups)} backups disponíveis:")
+            for manifest in backups:
+                print(f"  {manifest['id']}  {manifest['created_at']}  {manifest['size']} bytes")
+            return 0
+
+        if not backups:
+            print("\n⚠ Nenhum backup encontrado para este formulário!")
+            return 1
 
-        # Salvar backup
-        backup_data = {
-            'form_path': form_path,
-            'spec': spec,
-            'records': data,
-            'timestamp': timestamp,
-            'record_count': len(data)
-        }
+        backup_id = args.backup or backups[-1]['id']
+        if store.get_manifest(backup_id)['metadata'].get('form_path') != form_path:
+            print(f"\n❌ Backup {backup_id} não pertence a {form_path}")
+            return 1
 
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            json.dump(backup_data, f, indent=2, ensure_ascii=False)
+        if not args.yes:
+            response = input(f"\nSubstituir os dados de {form_path} pelo backup {backup_id}? (s/N): ")
+            if response.lower() != 's':
+                print("\nRestore cancelado.")
+                return 1
 
-        print(f"\n✅ Backup criado: {backup_file}")
-        print(f"📦 {len(data)} registros salvos")
+        # Os registros são gravados com o spec atual do formulário
+        spec = load_spec(form_path)
+        repo = RepositoryFactory.get_repository(form_path)
+        manifest = store.get_manifest(backup_id)
+        expected = manifest['metadata'].get('record_count')
+
+        # 1. Restaura em um armazenamento temporário e confere o backup;
+        #    os dados atuais só são tocados depois da verificação
+        temp_path = f"{form_path}__restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        digest = hashlib.sha256()
+
+        def backup_records():
+            lines = store.iter_lines(backup_id)
+            header = next(lines)
+            digest.update(header)
+            if json.loads(header)['spec'] != spec:
+                print("\n⚠ O spec do backup difere do atual; os campos seguem o spec atual")
+            for line in lines:
+                digest.update(line)
+                yield json.loads(line)
+
+        repo.create_storage(temp_path, spec)
+        try:
+            restored = _load_records(repo, temp_path, spec, backup_records())
+            if digest.hexdigest() != manifest['sha256']:
+                raise ValueError(f"Backup {backup_id} corrompido (sha256 não confere)")
+            if expected is not None and restored != expected:
+                raise ValueError(
+                    f"Backup {backup_id} tem {restored} registros, esperados {expected}"
+                )
+            if _count_records(repo, temp_path, spec) != restored:
+                raise ValueError("Contagem do armazenamento temporário não confere")
+        except Exception:
+            repo.drop_storage(temp_path, force=True)
+            raise
+
+        # 2. Troca: substitui os dados atuais pelos verificados. Se a cópia
+        #    falhar, o armazenamento temporário é mantido para nova tentativa
+        try:
+            if repo.exists(form_path):
+                repo.drop_storage(form_path, force=True)
+            repo.create_storage(form_path, spec)
+            copied = _load_records(
+                repo, form_path, spec,
+                (record for batch in repo.iter_records(temp_path, spec) for record in batch)
+            )
+            if copied != restored or _count_records(repo, form_path, spec) != restored:
+                raise ValueError(f"Cópia incompleta ({copied}/{restored} registros)")
+        except Exception:
+            print(f"\n❌ Falha na troca; os dados verificados estão em {temp_path}")
+            raise
+        repo.drop_storage(temp_path, force=True)
+
+        print(f"\n✅ Restaurado de: {backup_id} (sha256 verificado)")
+        print(f"📦 {restored} registros restaurados")
 
     except Exception as e:
         print(f"\n❌ Erro: {e}")
@@ -314,6 +426,37 @@ def backup_form(args):
         return 1
 
 
+def _load_records(repo, form_path, spec, records):
+    """Grava registros em lotes numa sessão de carga; falha se algum não for gravado."""
+    loaded = 0
+    batch = []
+    with repo.fast_load(form_path, spec) as session:
+        for record in records:
+            batch.append(record)
+            if len(batch) >= 1000:
+                loaded += _create_batch(repo, form_path, spec, batch)
+                batch = []
+                if session.commit_due():
+                    session.commit()
+        if batch:
+            loaded += _create_batch(repo, form_path, spec, batch)
+    return loaded
+
+
+def _create_batch(repo, form_path, spec, batch):
+    """Grava um lote, levantando erro se algum registro ficou sem ID."""
+    ids = repo.bulk_create(form_path, spec, batch)
+    failed = sum(1 for record_id in ids if record_id is None)
+    if failed or len(ids) != len(batch):
+        raise ValueError(f"Falha ao gravar {failed or len(batch) - len(ids)}/{len(batch)} registros")
+    return len(ids)
+
+
+def _count_records(repo, form_path, spec):
+    """Conta os registros armazenados de um formulário."""
+    return sum(len(batch) for batch in repo.iter_records(form_path, spec))
+
+
 def validate_form(args):
     """Valida integridade dos dados de um formulário."""
     form_path = args.form
@@ -373,6 +516,66 @@ def validate_form(args):
         return 1
 
 
+def _selected_forms(args):
+    """Formulário passado na linha de comando, ou todos os formulários."""
+    if args.form:
+        return [args.form]
+
+    forms = []
+    for root, dirs, files in os.walk(SPECS_DIR):
+        for file in files:
+            if file.endswith('.json') and not file.startswith('_'):
+                rel_path = os.path.relpath(os.path.join(root, file), SPECS_DIR)
+                forms.append(rel_path[:-5])  # Remove .json
+    return sorted(forms)
+
+
+def rebuild_tag_stats(args):
+    """Recalcula os contadores de estatísticas de tags."""
+    print("=" * 70)
+    print("RECALCULAR ESTATÍSTICAS DE TAGS")
+    print("=" * 70)
+
+    failed = 0
+    for form_path in _selected_forms(args):
+        try:
+            repo = RepositoryFactory.get_repository(form_path)
+            stats = repo.rebuild_tag_statistics(form_path)
+            total = sum(stats.values())
+            print(f"\n📄 {form_path}: {len(stats)} tags, {total} aplicações ativas")
+            for tag, count in stats.items():
+                print(f"   {tag}: {count}")
+        except Exception as e:
+            failed += 1
+            print(f"\n📄 {form_path}")
+            print(f"   ❌ Erro: {e}")
+
+    return 1 if failed else 0
+
+
+def purge_orphan_tags(args):
+    """Remove tags de registros que não existem mais."""
+    print("=" * 70)
+    print("REMOVER TAGS ÓRFÃS")
+    print("=" * 70)
+
+    failed = 0
+    total = 0
+    for form_path in _selected_forms(args):
+        try:
+            repo = RepositoryFactory.get_repository(form_path)
+            purged = repo.purge_orphan_tags(form_path)
+            total += purged
+            print(f"\n📄 {form_path}: {purged} tags órfãs removidas")
+        except Exception as e:
+            failed += 1
+            print(f"\n📄 {form_path}")
+            print(f"   ❌ Erro: {e}")
+
+    print(f"\n✅ Total: {total} tags órfãs removidas")
+    return 1 if failed else 0
+
+
 def main():
     """CLI principal."""
     parser = argparse.ArgumentParser(
@@ -411,11 +614,35 @@ def main():
     parser_backup.add_argument('form', help='Caminho do formulário')
     parser_backup.set_defaults(func=backup_form)
 
+    # Comando: restore
+    parser_restore = subparsers.add_parser('restore', help='Restaura um formulário de um backup')
+    parser_restore.add_argument('form', help='Caminho do formulário')
+    parser_restore.add_argument('--backup', help='ID do backup (padrão: o mais recente)')
+    parser_restore.add_argument('--list', action='store_true',
+                               help='Lista os backups disponíveis')
+    parser_restore.add_argument('--yes', '-y', action='store_true',
+                               help='Confirmar automaticamente')
+    parser_restore.set_defaults(func=restore_form)
+
     # Comando: validate
     parser_validate = subparsers.add_parser('validate', help='Valida integridade dos dados')
     parser_validate.add_argument('form', help='Caminho do formulário')
     parser_validate.set_defaults(func=validate_form)
 
+    # Comando: rebuild-tag-stats
+    parser_tag_stats = subparsers.add_parser('rebuild-tag-stats',
+                                             help='Recalcula as estatísticas de tags')
+    parser_tag_stats.add_argument('form', nargs='?',
+                                  help='Caminho do formulário (padrão: todos)')
+    parser_tag_stats.set_defaults(func=rebuild_tag_stats)
+
+    # Comando: purge-orphan-tags
+    parser_orphans = subparsers.add_parser('purge-orphan-tags',
+                                           help='Remove tags de registros excluídos')
+    parser_orphans.add_argument('form', nargs='?',
+                                help='Caminho do formulário (padrão: todos)')
+    parser_orphans.set_defaults(func=purge_orphan_tags)
+
     # Parse e executar
     args = parser.parse_args()
 
@@ -22,7 +22,9 @@ from utils.crockford import generate_id
 def get_tables(conn):
     """Lista todas as tabelas no banco."""
     cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'tags' AND name NOT LIKE 'sqlite_%'")
+    # Ignora tabelas de tags e tabelas internas do adapter (prefixo '_',
+    # p.ex. _fast_load_state); em LIKE o '_' é curinga, por isso substr
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT IN ('tags', 'tags_active', 'tags_history', 'tag_counts', 'tag_changes') AND name NOT LIKE 'sqlite_%' AND substr(name, 1, 1) != '_'")
     tables = [row[0] for row in cursor.fetchall()]
     return tables
 
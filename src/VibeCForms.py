@@ -129,6 +129,15 @@ def initialize_app(business_case_path):
     get_config(config_path)  # Initialize with business case config
     get_history(history_path)  # Initialize with business case history
 
+    # Start the migration job runner, resuming jobs interrupted by a crash
+    from services.migration_job_service import (
+        get_migration_job_service,
+        reset_migration_job_service,
+    )
+
+    reset_migration_job_service()
+    get_migration_job_service()
+
     logger.info(f"Initialized VibeCForms with business case: {BUSINESS_CASE_ROOT}")
     logger.info(f"  - Specs: {SPECS_DIR}")
     logger.info(f"  - Templates: {TEMPLATE_DIR}")
@@ -8,13 +8,16 @@ import logging
 from typing import Dict, Any, List
 from flask import (
     Blueprint,
+    Response,
     render_template,
+    stream_template,
     request,
     redirect,
     jsonify,
 )
 
 from persistence.factory import RepositoryFactory
+from persistence.schema_history import get_history
 from persistence.change_manager import (
     check_form_changes,
     update_form_tracking,
@@ -22,7 +25,11 @@ from persistence.change_manager import (
 )
 from utils.spec_loader import load_spec
 from utils.menu_builder import get_forms_for_landing_page, get_menu_html
-from utils.spec_renderer import render_form_fields, render_table, validate_form
+from utils.spec_renderer import (
+    render_form_fields,
+    get_table_renderer,
+    validate_form,
+)
 from services.tag_service import TagService
 
 logger = logging.getLogger(__name__)
@@ -60,8 +67,9 @@ def read_forms(spec: Dict[str, Any], form_path: str) -> List[Dict[str, Any]]:
     current_backend_config = config.get_backend_config(form_path)
     current_backend = current_backend_config.get("type")
 
-    last_backend = history.get_last_backend(form_path)
-    backend_changed = last_backend and last_backend != current_backend
+    backend_changed = history.has_backend_changed(
+        form_path, current_backend, current_backend_config
+    )
 
     # Get repository for current (new) backend
     repo = RepositoryFactory.get_repository(form_path)
@@ -94,6 +102,14 @@ def read_forms(spec: Dict[str, Any], form_path: str) -> List[Dict[str, Any]]:
         form_path=form_path, spec=spec, has_data=has_data, record_count=record_count
     )
 
+    # In online mode, backend changes migrate in the background while the
+    # form keeps working through a dual-write repository
+    if backend_change and ChangeManager.start_online_migration(
+        form_path, spec, backend_change, record_count
+    ):
+        backend_change = None
+        repo = RepositoryFactory.get_repository(form_path)
+
     # Check if changes require user confirmation
     if schema_change or backend_change:
         if schema_change and schema_change.has_changes():
@@ -308,7 +324,7 @@ def index(form_name):
                 raise
 
             form_fields = render_form_fields(spec, form_data)
-            table = render_table(spec, forms, form_name)
+            table = get_table_renderer(spec, form_name)
 
             return render_template(
                 "form.html",
@@ -317,8 +333,8 @@ def index(form_name):
                 menu_html=menu_html,
                 error=error,
                 form_fields=form_fields,
-                table_headers=table["headers"],
-                table_rows=table["rows"],
+                table_headers=table.headers,
+                table_rows=table.iter_rows(forms),
             )
 
         # Save the form
@@ -330,37 +346,37 @@ def index(form_name):
             if not repo.exists(form_name):
                 repo.create_storage(form_name, spec)
 
-            # Create the new record
-            record_id = repo.create(form_name, spec, form_data)
+            # Create the new record together with its default tags
+            default_tags = spec.get("default_tags", [])
+            if default_tags:
+                record_id = repo.create_with_tags(
+                    form_name,
+                    spec,
+                    form_data,
+                    default_tags,
+                    "system",
+                    {"auto_applied": True, "source": "default_tags"},
+                )
+            else:
+                record_id = repo.create(form_name, spec, form_data)
 
             if record_id:
                 logger.info(f"Created new record {record_id} in {form_name}")
-
-                # Apply default tags if configured in spec
-                default_tags = spec.get("default_tags", [])
                 if default_tags:
-                    for tag in default_tags:
-                        success = tag_service.add_tag(
-                            form_name,
-                            record_id,
-                            tag,
-                            applied_by="system",
-                            metadata={"auto_applied": True, "source": "default_tags"},
-                        )
-                        if success:
-                            logger.info(
-                                f"Auto-applied default tag '{tag}' to {record_id}"
-                            )
-                        else:
-                            logger.warning(
-                                f"Failed to auto-apply tag '{tag}' to {record_id}"
-                            )
+                    logger.info(
+                        f"Auto-applied default tags {default_tags} to {record_id}"
+                    )
+
+                # Update tracking without re-reading the whole form; the
+                # redirected GET recounts the records anyway
+                update_form_tracking(
+                    form_name,
+                    spec,
+                    get_history().get_last_record_count(form_name) + 1,
+                )
             else:
                 logger.error(f"Failed to create record in {form_name}")
 
-            # Update tracking
-            update_form_tracking(form_name, spec, len(repo.read_all(form_name, spec)))
-
         except Exception as e:
             # Check if migration is required
             if str(e).startswith("MIGRATION_REQUIRED:"):
@@ -390,19 +406,21 @@ def index(form_name):
         spec, form_data={"_record_id": new_record_id}, include_uuid=True
     )
 
-    # Render table
-    table = render_table(spec, forms, form_name)
-
-    return render_template(
-        "form.html",
-        title=spec["title"],
-        form_name=form_name,
-        menu_html=menu_html,
-        error="",
-        form_fields=form_fields,
-        table_headers=table["headers"],
-        table_rows=table["rows"],
-        default_tags=spec.get("default_tags", []),
+    # Render table lazily: rows are generated while the page is being sent
+    table = get_table_renderer(spec, form_name)
+
+    return Response(
+        stream_template(
+            "form.html",
+            title=spec["title"],
+            form_name=form_name,
+            menu_html=menu_html,
+            error="",
+            form_fields=form_fields,
+            table_headers=table.headers,
+            table_rows=table.iter_rows(forms),
+            default_tags=spec.get("default_tags", []),
+        )
     )
 
 
@@ -515,17 +533,12 @@ def delete(form_name, record_id):
     # Get repository
     repo = RepositoryFactory.get_repository(form_name)
 
-    # Verify record exists by trying to read it
-    record = repo.read_by_id(form_name, spec, record_id)
-    if not record:
-        return "Registro não encontrado", 404
-
-    # Delete the record by ID
-    success = repo.delete_by_id(form_name, spec, record_id)
-
-    if success:
-        logger.info(f"Deleted record {record_id} from {form_name}")
-    else:
+    # Delete the record and its tags by ID
+    if not repo.delete_by_id(form_name, spec, record_id):
+        if not repo.read_by_id(form_name, spec, record_id):
+            return "Registro não encontrado", 404
         logger.error(f"Failed to delete record {record_id} from {form_name}")
+    else:
+        logger.info(f"Deleted record {record_id} from {form_name}")
 
     return redirect(f"/{form_name}")
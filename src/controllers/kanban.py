@@ -4,14 +4,26 @@ Kanban Controller for VibeCForms Visual Kanban System.
 This controller handles all Kanban board routes:
 - GET /kanban/<board_name> - Display a Kanban board
 - GET /api/kanban/boards - List all available Kanban boards
-- GET /api/kanban/<board_name>/cards - Get cards for a board
+- GET /api/kanban/<board_name>/cards - Get cards for a board (paged per column)
+- GET /api/kanban/<board_name>/changes - Get card changes after a cursor
+- GET /api/kanban/<board_name>/stream - Server-Sent Events stream of card changes
 - POST /api/kanban/<board_name>/move - Move a card between columns
+- POST /api/kanban/<board_name>/move/batch - Move many cards in one transaction
 
 Routes are registered with Flask Blueprint pattern for modular organization.
 """
 
+import json
 import logging
-from flask import Blueprint, render_template, request, jsonify
+import time
+from flask import (
+    Blueprint,
+    Response,
+    render_template,
+    request,
+    jsonify,
+    stream_with_context,
+)
 
 from services.kanban_service import get_kanban_service
 from utils.crockford import validate_id
@@ -25,6 +37,21 @@ kanban_bp = Blueprint("kanban", __name__)
 # Initialize Kanban service at module level
 kanban_service = get_kanban_service()
 
+# Largest page of cards per column a client can request
+MAX_PAGE_SIZE = 500
+
+# Most moves accepted by one batch move request
+MAX_BATCH_MOVES = 1000
+
+# Change streams poll the change log every STREAM_POLL_INTERVAL seconds, send
+# a keepalive comment after STREAM_KEEPALIVE idle seconds and end after
+# STREAM_TIMEOUT seconds, well under gunicorn's default 30 s worker timeout
+# (EventSource reconnects after STREAM_RETRY_MS with Last-Event-ID)
+STREAM_POLL_INTERVAL = 1.0
+STREAM_KEEPALIVE = 10.0
+STREAM_TIMEOUT = 20.0
+STREAM_RETRY_MS = 500
+
 
 @kanban_bp.route("/kanban/<board_name>")
 def kanban_board(board_name):
@@ -79,12 +106,21 @@ def api_kanban_boards():
 @kanban_bp.route("/api/kanban/<board_name>/cards")
 def api_kanban_cards(board_name):
     """
-    Get all cards for a Kanban board organized by columns.
+    Get cards for a Kanban board organized by columns.
 
     GET /api/kanban/sales_pipeline/cards
+    GET /api/kanban/sales_pipeline/cards?limit=50
+    GET /api/kanban/sales_pipeline/cards?limit=50&column=lead&after=<cursor>
+
+    Query params:
+        limit: Maximum cards per column (default: all, at most MAX_PAGE_SIZE)
+        column: Only return this column
+        after: The column's "next_cursor" from the previous page
 
     Returns:
-        JSON response with cards organized by column tags
+        JSON response with cards organized by column tags, per column the
+        total number of cards and the cursor of the next page, and the
+        change cursor to follow the board with /changes or /stream
     """
     try:
         # Load board configuration
@@ -96,16 +132,143 @@ def api_kanban_cards(board_name):
                 404,
             )
 
-        # Get all cards organized by column
-        cards = kanban_service.get_all_board_cards(board_name)
+        limit = request.args.get("limit", type=int)
+        if limit is not None and not 0 < limit <= MAX_PAGE_SIZE:
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": f"limit must be between 1 and {MAX_PAGE_SIZE}",
+                    }
+                ),
+                400,
+            )
+        column = request.args.get("column") or None
+        after = request.args.get("after") or None
+        if after and not column:
+            return (
+                jsonify({"success": False, "error": "after requires column"}),
+                400,
+            )
 
-        return jsonify({"success": True, "board": board_name, "cards": cards})
+        # Read before the cards, so changes made meanwhile are replayed
+        cursor = kanban_service.get_change_cursor(board_name)
+        try:
+            page = kanban_service.get_board_page(board_name, limit, column, after)
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+
+        return jsonify(
+            {
+                "success": True,
+                "board": board_name,
+                "cursor": cursor,
+                "cards": {tag: col["cards"] for tag, col in page.items()},
+                "columns": {
+                    tag: {"total": col["total"], "next_cursor": col["next_cursor"]}
+                    for tag, col in page.items()
+                },
+            }
+        )
 
     except Exception as e:
         logger.error(f"Error getting cards for board '{board_name}': {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@kanban_bp.route("/api/kanban/<board_name>/changes")
+def api_kanban_changes(board_name):
+    """
+    Get the card changes of a board after a change cursor.
+
+    GET /api/kanban/sales_pipeline/changes?since=1042
+
+    Query params:
+        since: Change cursor from /cards or from the previous call
+
+    Returns:
+        JSON response with the next cursor, the added, removed, moved and
+        updated cards, and the new column totals. If "reset" is true the
+        client is too far behind and must reload /cards.
+    """
+    try:
+        if not kanban_service.load_board_config(board_name):
+            return (
+                jsonify({"success": False, "error": f"Board '{board_name}' not found"}),
+                404,
+            )
+
+        since = request.args.get("since", type=int)
+        if since is None or since < 0:
+            return jsonify({"success": False, "error": "Missing since cursor"}), 400
+
+        changes = kanban_service.get_board_changes(board_name, since)
+        return jsonify({"success": True, "board": board_name, **changes})
+
+    except Exception as e:
+        logger.error(f"Error getting changes for board '{board_name}': {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@kanban_bp.route("/api/kanban/<board_name>/stream")
+def api_kanban_stream(board_name):
+    """
+    Stream the card changes of a board as Server-Sent Events.
+
+    GET /api/kanban/sales_pipeline/stream?since=1042
+
+    Each "changes" event carries the same JSON as /changes, with the new
+    cursor as event id. Reconnects resume from the Last-Event-ID header.
+    The stream ends after a "reset" event, or after STREAM_TIMEOUT seconds.
+
+    Each open stream holds a worker thread, so the server must run a
+    threaded or async worker class (see wsgi.py).
+
+    Returns:
+        text/event-stream response
+    """
+    if not kanban_service.load_board_config(board_name):
+        return (
+            jsonify({"success": False, "error": f"Board '{board_name}' not found"}),
+            404,
+        )
+
+    since = request.headers.get("Last-Event-ID", type=int)
+    if since is None:
+        since = request.args.get("since", type=int)
+    if since is None or since < 0:
+        return jsonify({"success": False, "error": "Missing since cursor"}), 400
+
+    def events(cursor):
+        deadline = time.monotonic() + STREAM_TIMEOUT
+        last_sent = time.monotonic()
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        while time.monotonic() < deadline:
+            changes = kanban_service.get_board_changes(board_name, cursor)
+            if changes["reset"] or changes["changes"]:
+                yield (
+                    f"id: {changes['cursor']}\n"
+                    f"event: changes\n"
+                    f"data: {json.dumps(changes)}\n\n"
+                )
+                last_sent = time.monotonic()
+                if changes["reset"]:
+                    return
+            elif time.monotonic() - last_sent >= STREAM_KEEPALIVE:
+                yield ": keepalive\n\n"
+                last_sent = time.monotonic()
+
+            cursor = changes["cursor"]
+            if not changes["more"]:
+                time.sleep(STREAM_POLL_INTERVAL)
+
+    return Response(
+        stream_with_context(events(since)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @kanban_bp.route("/api/kanban/<board_name>/move", methods=["POST"])
 def api_kanban_move(board_name):
     """
@@ -203,3 +366,85 @@ def api_kanban_move(board_name):
     except Exception as e:
         logger.error(f"Error moving card on board '{board_name}': {e}")
         return jsonify({"success": False, "error": str(e)}), 500
+
+
+@kanban_bp.route("/api/kanban/<board_name>/move/batch", methods=["POST"])
+def api_kanban_move_batch(board_name):
+    """
+    Move many cards between columns in a single transaction.
+
+    Every move is validated like /move; the valid ones are applied
+    together and the invalid ones are reported without being applied.
+
+    POST /api/kanban/sales_pipeline/move/batch
+    Body: {
+        "moves": [
+            {"record_id": "5FQR8V9JMF8SKT2EGTC90X7G1WW",
+             "from_tag": "lead", "to_tag": "qualified"},
+            ...
+        ],
+        "actor": "ai_agent"
+    }
+
+    Returns:
+        JSON response with one result per move (in request order) with a
+        status of "moved", "unchanged", "invalid" or "failed", and the
+        number of cards moved. success is false if any move was invalid
+        or failed.
+    """
+    try:
+        # Load board configuration
+        board_config = kanban_service.load_board_config(board_name)
+
+        if not board_config:
+            return (
+                jsonify({"success": False, "error": f"Board '{board_name}' not found"}),
+                404,
+            )
+
+        # Get request data
+        data = request.get_json(silent=True) or {}
+        moves = data.get("moves")
+        actor = data.get("actor", "unknown")
+
+        if not isinstance(moves, list) or not moves:
+            return (
+                jsonify({"success": False, "error": "moves must be a non-empty list"}),
+                400,
+            )
+        if len(moves) > MAX_BATCH_MOVES:
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": f"At most {MAX_BATCH_MOVES} moves per request",
+                    }
+                ),
+                400,
+            )
+
+        try:
+            results = kanban_service.move_cards(
+                board_name, moves, actor, metadata={"board": board_name}
+            )
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 500
+
+        moved = sum(1 for result in results if result["status"] == "moved")
+        logger.info(
+            f"Batch move on board '{board_name}': {moved}/{len(moves)} cards by {actor}"
+        )
+        return jsonify(
+            {
+                "success": all(
+                    result["status"] in ("moved", "unchanged") for result in results
+                ),
+                "board": board_name,
+                "moved": moved,
+                "results": results,
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Error moving cards on board '{board_name}': {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
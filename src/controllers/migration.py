@@ -4,11 +4,12 @@ Migration Controller for VibeCForms
 Handles backend and schema migration operations including:
 - Migration confirmation UI
 - Migration execution
-- Data migration between backends
+- Data migration between backends (as background jobs)
+- Migration job progress and cancellation
 """
 
 import logging
-from flask import Blueprint, render_template, request, redirect
+from flask import Blueprint, render_template, request, redirect, jsonify
 
 from persistence.factory import RepositoryFactory
 from persistence.change_manager import (
@@ -16,7 +17,7 @@ from persistence.change_manager import (
     update_form_tracking,
     ChangeManager,
 )
-from persistence.migration_manager import MigrationManager
+from services.migration_job_service import get_migration_job_service
 from persistence.schema_history import get_history
 from persistence.config import get_config
 from utils.spec_loader import load_spec
@@ -39,8 +40,9 @@ def migrate_confirm(form_path):
     current_backend_config = config.get_backend_config(form_path)
     current_backend = current_backend_config.get("type")
 
-    last_backend = history.get_last_backend(form_path)
-    backend_changed = last_backend and last_backend != current_backend
+    backend_changed = history.has_backend_changed(
+        form_path, current_backend, current_backend_config
+    )
 
     # Get repository for current (new) backend
     repo = RepositoryFactory.get_repository(form_path)
@@ -129,8 +131,9 @@ def migrate_execute(form_path):
     current_backend_config = config.get_backend_config(form_path)
     current_backend = current_backend_config.get("type")
 
-    last_backend = history.get_last_backend(form_path)
-    backend_changed = last_backend and last_backend != current_backend
+    backend_changed = history.has_backend_changed(
+        form_path, current_backend, current_backend_config
+    )
 
     # Get repository for current (new) backend
     repo = RepositoryFactory.get_repository(form_path)
@@ -163,26 +166,29 @@ def migrate_execute(form_path):
         form_path=form_path, spec=spec, has_data=has_data, record_count=record_count
     )
 
+    # Backend migrations can take minutes on large forms: run them as a
+    # background job and let the progress page poll its status
+    if backend_change:
+        job = get_migration_job_service().submit(
+            form_path=form_path,
+            spec=spec,
+            old_backend=backend_change.old_backend,
+            new_backend=backend_change.new_backend,
+            record_count=record_count,
+            old_config=backend_change.old_config,
+            new_config=backend_change.new_config,
+        )
+        logger.info(
+            f"Backend migration for '{form_path}' submitted as job {job['job_id']}"
+        )
+        return redirect(f"/migrate/progress/{job['job_id']}")
+
     success = True
     error_message = None
 
     try:
-        # Execute backend migration if needed
-        if backend_change:
-            logger.info(f"Executing backend migration for '{form_path}'...")
-            success = MigrationManager.migrate_backend(
-                form_path=form_path,
-                spec=spec,
-                old_backend=backend_change.old_backend,
-                new_backend=backend_change.new_backend,
-                record_count=record_count,
-            )
-
-            if not success:
-                error_message = f"Falha na migração de backend: {backend_change.old_backend} → {backend_change.new_backend}"
-
         # Execute schema migration if needed
-        if success and schema_change and schema_change.has_changes():
+        if schema_change and schema_change.has_changes():
             logger.info(f"Executing schema migration for '{form_path}'...")
 
             # Get old spec from history to perform migration
@@ -222,3 +228,39 @@ def migrate_execute(form_path):
     else:
         logger.error(f"Migration failed: {error_message}")
         return redirect(f"/{form_path}")
+
+
+@migration_bp.route("/migrate/progress/<job_id>")
+def migrate_progress(job_id):
+    """Display the progress page of a background migration job."""
+    job = get_migration_job_service().get_status(job_id)
+    if not job:
+        return "Migração não encontrada", 404
+
+    spec = load_spec(job["form_path"])
+    return render_template(
+        "migration_progress.html",
+        job=job,
+        form_path=job["form_path"],
+        form_title=spec.get("title", job["form_path"]),
+    )
+
+
+@migration_bp.route("/migrate/status/<job_id>")
+def migrate_status(job_id):
+    """Get the status of a background migration job (polled by the UI)."""
+    job = get_migration_job_service().get_status(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
+@migration_bp.route("/migrate/cancel/<job_id>", methods=["POST"])
+def migrate_cancel(job_id):
+    """Request cancellation of a background migration job."""
+    service = get_migration_job_service()
+    if not service.get_status(job_id):
+        return jsonify({"error": "Job not found"}), 404
+    if not service.cancel(job_id):
+        return jsonify({"error": "Job is not active"}), 409
+    return jsonify({"success": True, "job": service.get_status(job_id)})
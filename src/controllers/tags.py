@@ -9,7 +9,7 @@ Handles all tag-related operations including:
 
 import logging
 from flask import Blueprint, render_template, request, jsonify
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from services.tag_service import TagService
 from persistence.factory import RepositoryFactory
@@ -31,6 +31,11 @@ tag_service = TagService()
 # =============================================================================
 
 
+def _split_tags(value: str) -> List[str]:
+    """Split a comma-separated tags query parameter."""
+    return [tag.strip() for tag in value.split(",") if tag.strip()]
+
+
 @tags_bp.route("/tags/manager")
 def tags_manager():
     """Display the tags management page."""
@@ -81,6 +86,104 @@ def api_add_tag(form_name, record_id):
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@tags_bp.route("/api/<path:form_name>/tags/bulk", methods=["POST"])
+def api_bulk_tags(form_name):
+    """
+    Add, remove or transition a tag on many records at once.
+
+    POST /api/contatos/tags/bulk
+    Body: {
+        "action": "add",  # "add", "remove" or "transition"
+        "record_ids": ["5FQR8V9JMF8SKT2EGTC90X7G1WW", ...],
+        "tag": "importado",  # for "add" and "remove"
+        "from_tag": "lead", "to_tag": "qualified",  # for "transition"
+        "actor": "user123",
+        "metadata": {"source": "import"}
+    }
+
+    Returns:
+        JSON response with the IDs that were changed
+    """
+    try:
+        data = request.get_json() or {}
+        action = data.get("action")
+        record_ids = data.get("record_ids")
+        actor = data.get("actor", "unknown")
+        metadata = data.get("metadata", None)
+
+        if action not in ("add", "remove", "transition"):
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": "Action must be 'add', 'remove' or 'transition'",
+                    }
+                ),
+                400,
+            )
+
+        if not isinstance(record_ids, list) or not record_ids:
+            return (
+                jsonify({"success": False, "error": "record_ids must be a list"}),
+                400,
+            )
+
+        invalid_ids = [rid for rid in record_ids if not validate_id(rid)]
+        if invalid_ids:
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": "Invalid ID format",
+                        "invalid_ids": invalid_ids,
+                    }
+                ),
+                400,
+            )
+
+        if action == "transition":
+            from_tag = data.get("from_tag")
+            to_tag = data.get("to_tag")
+            if not from_tag or not to_tag:
+                return (
+                    jsonify(
+                        {"success": False, "error": "from_tag and to_tag are required"}
+                    ),
+                    400,
+                )
+            changed = tag_service.bulk_transition(
+                form_name, record_ids, from_tag, to_tag, actor, metadata
+            )
+        else:
+            tag = data.get("tag")
+            if not tag:
+                return jsonify({"success": False, "error": "Tag is required"}), 400
+            if action == "add":
+                changed = tag_service.bulk_add_tag(
+                    form_name, record_ids, tag, actor, metadata
+                )
+            else:
+                changed = tag_service.bulk_remove_tag(form_name, record_ids, tag, actor)
+
+        logger.info(
+            f"Bulk tag {action} on {form_name}: {len(changed)}/{len(record_ids)} "
+            f"records changed by {actor}"
+        )
+        return jsonify(
+            {
+                "success": True,
+                "action": action,
+                "requested": len(record_ids),
+                "changed": len(changed),
+                "record_ids": changed,
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Error in bulk tag operation: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @tags_bp.route("/api/<path:form_name>/tags/<record_id>/<tag>", methods=["DELETE"])
 def api_remove_tag(form_name, record_id, tag):
     """
@@ -166,24 +269,43 @@ def api_get_tag_history(form_name, record_id):
 @tags_bp.route("/api/<path:form_name>/search/tags", methods=["GET"])
 def api_search_by_tag(form_name):
     """
-    Search for objects by tag.
+    Search for objects by tag, or by a combination of tags.
 
     GET /api/contatos/search/tags?tag=importante
+    GET /api/deals/search/tags?all=qualified,priority&none=on_hold&limit=50
+
+    Query parameters:
+        tag: Single tag the objects must have
+        all: Comma-separated tags the objects must all have
+        any: Comma-separated tags of which objects must have at least one
+        none: Comma-separated tags the objects must not have
+        limit: Maximum number of objects to return
+        include_data: "true" to return full records instead of IDs
 
     Returns:
-        JSON response with list of object IDs that have the tag
+        JSON response with list of object IDs that match
     """
     try:
         tag = request.args.get("tag", "").strip()
+        all_of = _split_tags(request.args.get("all", ""))
+        any_of = _split_tags(request.args.get("any", ""))
+        none_of = _split_tags(request.args.get("none", ""))
 
-        if not tag:
+        if tag:
+            all_of = [tag] + all_of
+
+        if not (all_of or any_of or none_of):
             return (
                 jsonify({"success": False, "error": "Tag parameter is required"}),
                 400,
             )
 
-        # Get all objects with this tag
-        object_ids = tag_service.get_objects_with_tag(form_name, tag)
+        limit = request.args.get("limit", type=int)
+
+        # One storage query for the whole combination
+        object_ids = tag_service.query_objects(
+            form_name, all_of, any_of, none_of, limit
+        )
 
         # If we need full object data, fetch it from repository
         include_data = request.args.get("include_data", "false").lower() == "true"
@@ -8,19 +8,171 @@ to text files.
 
 import os
 import sqlite3
-import shutil
 import logging
 import json
 import re
-from typing import Dict, Any, List, Optional
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Iterator, Tuple
 from pathlib import Path
 from datetime import datetime
-from persistence.base import BaseRepository
+from persistence.base import CHANGE_LOG_RETENTION, BaseRepository, BulkLoad
+from persistence.backup_store import BackupStore
+from persistence.backups import (
+    backup_sqlite,
+    dump_sqlite_table,
+    load_sqlite_table,
+    restore_sqlite,
+)
 from persistence.schema_detector import SchemaChangeDetector, ChangeType
 from utils.crockford import generate_id
 
 logger = logging.getLogger(__name__)
 
+# Fast-load sessions commit every FAST_LOAD_COMMIT_ROWS rows and use a page
+# cache of FAST_LOAD_CACHE_KIB (negative cache_size = size in KiB)
+FAST_LOAD_COMMIT_ROWS = 100_000
+FAST_LOAD_CACHE_KIB = 262_144
+
+# Indexes dropped and the journal mode replaced by fast-load sessions are
+# recorded in this table of the same database, so a session interrupted by
+# a crash is undone by the next session (e.g. the resumed migration)
+FAST_LOAD_STATE_TABLE = "_fast_load_state"
+
+# Object IDs per "IN (...)" query in bulk tag operations, below SQLite's
+# default limit of 999 bound parameters
+TAG_QUERY_CHUNK = 500
+
+# Active tags and closed history entries as one relation, with the columns of
+# the legacy single tags table
+_ALL_TAGS_SQL = """
+SELECT object_type, object_id, tag, applied_at, applied_by,
+       NULL AS removed_at, NULL AS removed_by, metadata
+FROM tags_active
+UNION ALL
+SELECT object_type, object_id, tag, applied_at, applied_by,
+       removed_at, removed_by, metadata
+FROM tags_history
+"""
+
+
+# SQL function registered by _migrate_table for in-query type conversions
+_CONVERT_FUNCTION = "vibecforms_convert"
+
+
+@dataclass
+class TableMigrationPlan:
+    """Statements that migrate a form table to a new spec in one transaction."""
+
+    table_name: str
+    # (sql, params) in execution order
+    statements: List[Tuple[str, tuple]] = field(default_factory=list)
+    # True: single table rebuild; False: native ALTER TABLE statements
+    rebuild: bool = False
+    renames: List[Tuple[str, str]] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    conversions: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+
+class FastLoadSession(BulkLoad):
+    """
+    Bulk-load session of a SQLiteRepository (see SQLiteRepository.fast_load).
+
+    Holds the dedicated connection used by bulk_create() for the session's
+    table, the number of rows written since the last commit and the
+    secondary indexes dropped for the load. Dropped indexes are recorded in
+    FAST_LOAD_STATE_TABLE in the same transaction as the drops.
+    """
+
+    def __init__(
+        self, conn: sqlite3.Connection, table_name: str, commit_rows: int
+    ) -> None:
+        self.conn = conn
+        self.table_name = table_name
+        self.commit_rows = commit_rows
+        self.thread_id = threading.get_ident()
+        self.pending = 0
+        self.rows_loaded = 0
+        # (name, sql) of indexes to rebuild; None until the first write
+        self.dropped_indexes: Optional[List[tuple]] = None
+
+    def commit_due(self) -> bool:
+        """Return True once commit_rows rows are pending."""
+        return self.pending >= self.commit_rows
+
+    def commit(self) -> None:
+        """Commit all rows written so far."""
+        self.conn.commit()
+        self.pending = 0
+
+    def drop_indexes(self) -> None:
+        """Drop the table's secondary indexes, recording how to rebuild them."""
+        # Automatic indexes (PRIMARY KEY/UNIQUE) have no SQL and cannot be dropped
+        indexes = self.conn.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (self.table_name,),
+        ).fetchall()
+
+        # Tables created by older versions carry a record_id index that
+        # duplicates the PRIMARY KEY index; it is not rebuilt
+        redundant = f"idx_{self.table_name}_record_id"
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO {FAST_LOAD_STATE_TABLE} "
+            f"(table_name, kind, name, value) VALUES (?, 'index', ?, ?)",
+            [
+                (self.table_name, row["name"], row["sql"])
+                for row in indexes
+                if row["name"] != redundant
+            ],
+        )
+        for row in indexes:
+            self.conn.execute(f"DROP INDEX {row['name']}")
+        self.conn.commit()
+
+        # Including indexes an interrupted session left dropped
+        self.dropped_indexes = self._recorded_indexes()
+
+    def rebuild_indexes(self) -> None:
+        """
+        Recreate the recorded dropped indexes of the table.
+
+        Also rebuilds indexes left dropped by an interrupted session. The
+        records are removed in the same transaction; indexes of a table that
+        no longer exists are forgotten.
+        """
+        table_exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (self.table_name,),
+        ).fetchone()
+        for name, sql in self._recorded_indexes() if table_exists else []:
+            exists = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+                (name,),
+            ).fetchone()
+            if not exists:
+                self.conn.execute(sql)
+        self.conn.execute(
+            f"DELETE FROM {FAST_LOAD_STATE_TABLE} "
+            f"WHERE table_name = ? AND kind = 'index'",
+            (self.table_name,),
+        )
+        self.conn.commit()
+
+    def _recorded_indexes(self) -> List[tuple]:
+        """(name, sql) of the table's indexes recorded as dropped."""
+        return [
+            (row["name"], row["value"])
+            for row in self.conn.execute(
+                f"SELECT name, value FROM {FAST_LOAD_STATE_TABLE} "
+                f"WHERE table_name = ? AND kind = 'index' ORDER BY name",
+                (self.table_name,),
+            )
+        ]
+
 
 class SQLiteRepository(BaseRepository):
     """
@@ -67,10 +219,19 @@ class SQLiteRepository(BaseRepository):
                 - database: Path to SQLite database file
                 - timeout: Connection timeout in seconds (default: 10)
                 - check_same_thread: SQLite check_same_thread parameter
+                - backup_scope: What schema migrations back up: "table"
+                  (default, only the migrated table) or "database"
         """
         self.database = config.get("database", "data/sqlite/vibecforms.db")
         self.timeout = config.get("timeout", 10)
         self.check_same_thread = config.get("check_same_thread", False)
+        self.backup_scope = config.get("backup_scope", "table")
+
+        # Open fast-load sessions by table name
+        self._fast_load_sessions: Dict[str, FastLoadSession] = {}
+
+        # Set once the tags table is known to exist
+        self._tags_table_ready = False
 
         # Ensure database directory exists
         db_dir = os.path.dirname(self.database)
@@ -113,39 +274,203 @@ class SQLiteRepository(BaseRepository):
         return bool(re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", field_name))
 
     def _ensure_tags_table(self) -> None:
-        """Ensure the tags table exists in the database."""
-        create_sql = """
-        CREATE TABLE IF NOT EXISTS tags (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            object_type TEXT NOT NULL,
-            object_id TEXT NOT NULL,
-            tag TEXT NOT NULL,
-            applied_at TEXT NOT NULL,
-            applied_by TEXT NOT NULL,
-            removed_at TEXT,
-            removed_by TEXT,
-            metadata TEXT
-        )
         """
-
-        index_sql = """
-        CREATE INDEX IF NOT EXISTS idx_tags_object ON tags(object_type, object_id);
-        CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags(object_type, tag);
-        CREATE INDEX IF NOT EXISTS idx_tags_active ON tags(object_type, object_id, removed_at);
+        Ensure the tag tables exist in the database.
+
+        Active tags live in tags_active, one row per (object_type,
+        object_id, tag). Removed tags are appended to tags_history. A
+        legacy single "tags" table is converted on first use. Its active
+        rows move to tags_active and keep their IDs. Its removed rows move
+        to tags_history. Duplicate active rows are closed in tags_history
+        as removed by 'system'.
+
+        tag_counts holds the number of active tags per (object_type, tag).
+        Triggers on tags_active keep it up to date in the same transaction
+        as every insert and delete. When the table is first created it is
+        filled from tags_active.
+
+        tag_changes logs every insert into and delete from tags_active
+        (plus record updates, see update_by_id) under a growing sequence
+        number; a trigger keeps only the last CHANGE_LOG_RETENTION entries.
         """
+        if self._tags_table_ready:
+            return
+
+        statements = [
+            """
+            CREATE TABLE IF NOT EXISTS tags_active (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                object_type TEXT NOT NULL,
+                object_id TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                applied_at TEXT NOT NULL,
+                applied_by TEXT NOT NULL,
+                metadata TEXT,
+                UNIQUE (object_type, object_id, tag)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_tags_active_tag ON tags_active(object_type, tag)",
+            """
+            CREATE TABLE IF NOT EXISTS tags_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                object_type TEXT NOT NULL,
+                object_id TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                applied_at TEXT NOT NULL,
+                applied_by TEXT NOT NULL,
+                removed_at TEXT NOT NULL,
+                removed_by TEXT,
+                metadata TEXT
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_tags_history_object "
+            "ON tags_history(object_type, object_id)",
+            """
+            CREATE TABLE IF NOT EXISTS tag_counts (
+                object_type TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (object_type, tag)
+            ) WITHOUT ROWID
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_tags_active_insert
+            AFTER INSERT ON tags_active
+            BEGIN
+                INSERT OR IGNORE INTO tag_counts (object_type, tag, count)
+                VALUES (NEW.object_type, NEW.tag, 0);
+                UPDATE tag_counts SET count = count + 1
+                WHERE object_type = NEW.object_type AND tag = NEW.tag;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_tags_active_delete
+            AFTER DELETE ON tags_active
+            BEGIN
+                UPDATE tag_counts SET count = count - 1
+                WHERE object_type = OLD.object_type AND tag = OLD.tag;
+                DELETE FROM tag_counts
+                WHERE object_type = OLD.object_type AND tag = OLD.tag AND count <= 0;
+            END
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS tag_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                object_type TEXT NOT NULL,
+                object_id TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                op TEXT NOT NULL,
+                changed_at TEXT NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_tag_changes_object_type "
+            "ON tag_changes(object_type, seq)",
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_tags_active_insert_change
+            AFTER INSERT ON tags_active
+            BEGIN
+                INSERT INTO tag_changes (object_type, object_id, tag, op, changed_at)
+                VALUES (NEW.object_type, NEW.object_id, NEW.tag, 'add', NEW.applied_at);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_tags_active_delete_change
+            AFTER DELETE ON tags_active
+            BEGIN
+                INSERT INTO tag_changes (object_type, object_id, tag, op, changed_at)
+                VALUES (
+                    OLD.object_type, OLD.object_id, OLD.tag, 'remove',
+                    strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')
+                );
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_tag_changes_trim
+            AFTER INSERT ON tag_changes
+            BEGIN
+                DELETE FROM tag_changes WHERE seq <= NEW.seq - {CHANGE_LOG_RETENTION};
+            END
+            """,
+        ]
 
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(create_sql)
-            cursor.executescript(index_sql)
-            conn.commit()
-            conn.close()
-            logger.debug("Tags table ensured")
+            conn.isolation_level = None
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    new_counts = not conn.execute(
+                        "SELECT 1 FROM sqlite_master "
+                        "WHERE type='table' AND name='tag_counts'"
+                    ).fetchone()
+                    for sql in statements:
+                        conn.execute(sql)
+                    legacy = conn.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='tags'"
+                    ).fetchone()
+                    if legacy:
+                        self._migrate_legacy_tags(conn)
+                    if new_counts:
+                        self._rebuild_tag_counts(conn)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            finally:
+                conn.close()
+            self._tags_table_ready = True
+            logger.debug("Tags tables ensured")
         except Exception as e:
-            logger.error(f"Failed to ensure tags table: {e}")
+            logger.error(f"Failed to ensure tags tables: {e}")
             raise
 
+    def _rebuild_tag_counts(
+        self, conn: sqlite3.Connection, object_type: Optional[str] = None
+    ) -> None:
+        """Recompute tag_counts from tags_active (all object types if None)."""
+        where = "" if object_type is None else "WHERE object_type = ?"
+        params = () if object_type is None else (object_type,)
+        conn.execute(f"DELETE FROM tag_counts {where}", params)
+        conn.execute(
+            f"""
+            INSERT INTO tag_counts (object_type, tag, count)
+            SELECT object_type, tag, COUNT(*) FROM tags_active {where}
+            GROUP BY object_type, tag
+            """,
+            params,
+        )
+
+    def _migrate_legacy_tags(self, conn: sqlite3.Connection) -> None:
+        """Move rows of the legacy "tags" table into the split tag tables."""
+        conn.execute("""
+            INSERT OR IGNORE INTO tags_active
+                (id, object_type, object_id, tag, applied_at, applied_by, metadata)
+            SELECT id, object_type, object_id, tag, applied_at, applied_by, metadata
+            FROM tags WHERE removed_at IS NULL ORDER BY id
+            """)
+        active = conn.execute("SELECT changes()").fetchone()[0]
+        history = conn.execute(
+            """
+            INSERT INTO tags_history
+                (object_type, object_id, tag, applied_at, applied_by,
+                 removed_at, removed_by, metadata)
+            SELECT object_type, object_id, tag, applied_at, applied_by,
+                   COALESCE(removed_at, ?),
+                   CASE WHEN removed_at IS NULL THEN 'system' ELSE removed_by END,
+                   metadata
+            FROM tags
+            WHERE removed_at IS NOT NULL
+               OR id NOT IN (SELECT id FROM tags_active)
+            ORDER BY id
+            """,
+            (datetime.now().isoformat(),),
+        ).rowcount
+        conn.execute("DROP TABLE tags")
+        logger.info(
+            f"Migrated legacy tags table: {active} active tags, "
+            f"{history} history entries"
+        )
+
     def create_storage(self, form_path: str, spec: Dict[str, Any]) -> bool:
         """Create storage (table) for the form."""
         table_name = self._get_table_name(form_path)
@@ -164,20 +489,7 @@ class SQLiteRepository(BaseRepository):
                 )
 
         # Build CREATE TABLE statement
-        columns = [
-            "record_id TEXT PRIMARY KEY",  # UUID Crockford Base32 as PRIMARY KEY
-        ]
-
-        for field in spec["fields"]:
-            field_name = field["name"]
-            field_type = field["type"]
-            sql_type = self.TYPE_MAPPING.get(field_type, "TEXT")
-
-            # Add NOT NULL constraint for required fields (except checkbox)
-            required = field.get("required", False)
-            constraint = " NOT NULL" if required and field_type != "checkbox" else ""
-
-            columns.append(f"{field_name} {sql_type}{constraint}")
+        columns = self._column_definitions(spec)
 
         columns_sql = ",\n    ".join(columns)
         create_sql = f"CREATE TABLE {table_name} (\n    {columns_sql}\n)"
@@ -185,13 +497,8 @@ class SQLiteRepository(BaseRepository):
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
+            # record_id lookups use the PRIMARY KEY's own index
             cursor.execute(create_sql)
-
-            # Create index on record_id for fast lookups
-            cursor.execute(
-                f"CREATE INDEX idx_{table_name}_record_id ON {table_name}(record_id)"
-            )
-
             conn.commit()
             conn.close()
 
@@ -218,29 +525,7 @@ class SQLiteRepository(BaseRepository):
             conn.close()
 
             # Convert rows to dictionaries and apply type conversions
-            forms = []
-            for row in rows:
-                form_data = {}
-                for field in spec["fields"]:
-                    field_name = field["name"]
-                    field_type = field["type"]
-                    value = row[field_name]
-
-                    # Convert based on field type
-                    if field_type == "checkbox":
-                        form_data[field_name] = (
-                            bool(value) if value is not None else False
-                        )
-                    elif field_type == "number" or field_type == "range":
-                        form_data[field_name] = int(value) if value is not None else 0
-                    else:
-                        form_data[field_name] = value if value is not None else ""
-
-                # Add record_id to form_data (not in spec but needed for migrations/references)
-                if "record_id" in row.keys():
-                    form_data["_record_id"] = row["record_id"]
-
-                forms.append(form_data)
+            forms = [self._row_to_record(row, spec) for row in rows]
 
             logger.debug(f"Read {len(forms)} records from {table_name}")
             return forms
@@ -249,6 +534,88 @@ class SQLiteRepository(BaseRepository):
             logger.error(f"Failed to read from {table_name}: {e}")
             return []
 
+    def _row_to_record(self, row: sqlite3.Row, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a table row to a record dictionary as returned by read_all.
+
+        Args:
+            row: Row from a SELECT * on the form table
+            spec: Form specification
+
+        Returns:
+            Dictionary with converted field values and '_record_id'
+        """
+        form_data = {}
+        for field in spec["fields"]:
+            field_name = field["name"]
+            field_type = field["type"]
+            value = row[field_name]
+
+            # Convert based on field type
+            if field_type == "checkbox":
+                form_data[field_name] = bool(value) if value is not None else False
+            elif field_type == "number" or field_type == "range":
+                form_data[field_name] = int(value) if value is not None else 0
+            else:
+                form_data[field_name] = value if value is not None else ""
+
+        # Add record_id to form_data (not in spec but needed for migrations/references)
+        if "record_id" in row.keys():
+            form_data["_record_id"] = row["record_id"]
+
+        return form_data
+
+    def iter_records(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        batch_size: int = 1000,
+        after_id: Optional[str] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream records in record_id order using keyset pagination.
+
+        Each batch is fetched with its own short query
+        (WHERE record_id > last ORDER BY record_id LIMIT n), so no read
+        transaction is held open between batches and writers are not
+        blocked while a long migration is running.
+        """
+        table_name = self._get_table_name(form_path)
+
+        if not self.exists(form_path):
+            logger.debug(f"Table doesn't exist: {table_name}")
+            return
+
+        last_id = after_id
+        while True:
+            conn = self._get_connection()
+            try:
+                cursor = conn.cursor()
+                if last_id is None:
+                    cursor.execute(
+                        f"SELECT * FROM {table_name} ORDER BY record_id LIMIT ?",
+                        (batch_size,),
+                    )
+                else:
+                    cursor.execute(
+                        f"SELECT * FROM {table_name} WHERE record_id > ? "
+                        f"ORDER BY record_id LIMIT ?",
+                        (last_id, batch_size),
+                    )
+                rows = cursor.fetchall()
+            finally:
+                conn.close()
+
+            if not rows:
+                return
+
+            batch = [self._row_to_record(row, spec) for row in rows]
+            last_id = rows[-1]["record_id"]
+            yield batch
+
+            if len(rows) < batch_size:
+                return
+
     def read_one(
         self, form_path: str, spec: Dict[str, Any], idx: int
     ) -> Optional[Dict[str, Any]]:
@@ -272,6 +639,78 @@ class SQLiteRepository(BaseRepository):
         if not self.exists(form_path):
             self.create_storage(form_path, spec)
 
+        record_id, insert_sql, values = self._build_insert(form_path, spec, data)
+
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(insert_sql, values)
+            conn.commit()
+            conn.close()
+
+            logger.debug(f"Inserted record {record_id} into {table_name}")
+            return record_id
+
+        except Exception as e:
+            logger.error(f"Failed to insert into {table_name}: {e}")
+            return None
+
+    def create_with_tags(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        data: Dict[str, Any],
+        tags: List[str],
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """Insert a record and its tags in one transaction."""
+        table_name = self._get_table_name(form_path)
+
+        if not self.exists(form_path):
+            self.create_storage(form_path, spec)
+        self._ensure_tags_table()
+
+        record_id, insert_sql, values = self._build_insert(form_path, spec, data)
+        keys = [(form_path, record_id, tag) for tag in dict.fromkeys(tags)]
+
+        try:
+            conn = self._get_connection()
+            conn.isolation_level = None
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.execute(insert_sql, values)
+                    self._insert_active_tags(
+                        conn, keys, datetime.now().isoformat(), actor, metadata
+                    )
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            finally:
+                conn.close()
+
+            logger.debug(
+                f"Inserted record {record_id} into {table_name} with {len(keys)} tags"
+            )
+            return record_id
+
+        except Exception as e:
+            logger.error(f"Failed to insert into {table_name}: {e}")
+            return None
+
+    def _build_insert(
+        self, form_path: str, spec: Dict[str, Any], data: Dict[str, Any]
+    ) -> Tuple[str, str, List[Any]]:
+        """
+        Build the INSERT statement for a new record.
+
+        Returns:
+            Tuple of (record_id, SQL, parameter values)
+        """
+        table_name = self._get_table_name(form_path)
+
         # Use existing UUID if provided (for migrations), otherwise generate new one
         record_id = data.get("_record_id") or generate_id()
 
@@ -300,19 +739,7 @@ class SQLiteRepository(BaseRepository):
             else:
                 values.append(str(value) if value else "")
 
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(insert_sql, values)
-            conn.commit()
-            conn.close()
-
-            logger.debug(f"Inserted record {record_id} into {table_name}")
-            return record_id
-
-        except Exception as e:
-            logger.error(f"Failed to insert into {table_name}: {e}")
-            return None
+        return record_id, insert_sql, values
 
     def update(
         self, form_path: str, spec: Dict[str, Any], idx: int, data: Dict[str, Any]
@@ -488,13 +915,15 @@ class SQLiteRepository(BaseRepository):
         """
         Migrate schema when form specification changes.
 
-        This method now uses change detection to intelligently handle:
-        - Rename fields: Preserves data while renaming
-        - Change field types: Converts data to new type
-        - Remove fields: Deletes field and data (with backup)
-        - Add fields: Adds new fields with default values
+        All detected changes (renames, type changes, removals, additions) are
+        compiled into one plan and applied in a single transaction:
+        - Renames, additions and a single removal use native ALTER TABLE
+          (RENAME COLUMN / ADD COLUMN / DROP COLUMN) when SQLite supports it
+        - Anything else rebuilds the table once: CREATE new table,
+          INSERT ... SELECT with conversions, DROP old, RENAME new
 
-        A backup is created before migration.
+        A backup is created before destructive migrations (removals and
+        type changes on a table with data).
         """
         table_name = self._get_table_name(form_path)
 
@@ -514,117 +943,18 @@ class SQLiteRepository(BaseRepository):
 
         logger.info(f"Detected changes for {form_path}: {schema_change.get_summary()}")
 
-        # Create backup before any changes
-        backup_path = self._create_backup()
-        if not backup_path:
-            logger.error("Failed to create backup, aborting migration")
-            return False
-
-        try:
-            # Process changes in order: renames, type changes, removes, adds
-            current_spec = old_spec.copy()
-
-            # 1. Process field renames first (preserves data)
-            for change in schema_change.changes:
-                if change.change_type == ChangeType.RENAME_FIELD:
-                    logger.info(
-                        f"Renaming field '{change.old_name}' to '{change.new_name}'"
-                    )
-
-                    # Update current_spec to reflect the rename
-                    for field in current_spec["fields"]:
-                        if field["name"] == change.old_name:
-                            field["name"] = change.new_name
-                            break
-
-                    # Execute rename
-                    if not self.rename_field(
-                        form_path, current_spec, change.old_name, change.new_name
-                    ):
-                        raise Exception(f"Failed to rename field '{change.old_name}'")
-
-            # 2. Process type changes
-            for change in schema_change.changes:
-                if change.change_type == ChangeType.CHANGE_TYPE:
-                    logger.info(
-                        f"Changing type of '{change.field_name}' from {change.old_type} to {change.new_type}"
-                    )
-
-                    # Update current_spec to reflect the type change
-                    for field in current_spec["fields"]:
-                        if field["name"] == change.field_name:
-                            field["type"] = change.new_type
-                            break
-
-                    # Execute type change
-                    if not self.change_field_type(
-                        form_path,
-                        current_spec,
-                        change.field_name,
-                        change.old_type,
-                        change.new_type,
-                    ):
-                        raise Exception(
-                            f"Failed to change type of field '{change.field_name}'"
-                        )
-
-            # 3. Process field removals (destructive)
-            for change in schema_change.changes:
-                if change.change_type == ChangeType.REMOVE_FIELD:
-                    logger.warning(
-                        f"Removing field '{change.field_name}' (data will be lost)"
-                    )
-
-                    # Remove from current_spec
-                    current_spec["fields"] = [
-                        f
-                        for f in current_spec["fields"]
-                        if f["name"] != change.field_name
-                    ]
-
-                    # Execute removal
-                    if not self.remove_field(
-                        form_path, current_spec, change.field_name
-                    ):
-                        raise Exception(f"Failed to remove field '{change.field_name}'")
-
-            # 4. Process field additions (safe)
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            for change in schema_change.changes:
-                if change.change_type == ChangeType.ADD_FIELD:
-                    logger.info(
-                        f"Adding new field '{change.field_name}' with type {change.field_type}"
-                    )
-
-                    field_name = change.field_name
-                    field_type = change.field_type
-                    sql_type = self.TYPE_MAPPING.get(field_type, "TEXT")
-
-                    # Get default value for the field type
-                    default_value = self._get_default_value_sql(field_type)
+        renames = {
+            change.old_value: change.new_value
+            for change in schema_change.changes
+            if change.change_type == ChangeType.RENAME_FIELD
+        }
+        conversions = {
+            change.field_name: (change.old_value, change.new_value)
+            for change in schema_change.changes
+            if change.change_type == ChangeType.CHANGE_TYPE
+        }
 
-                    alter_sql = f"ALTER TABLE {table_name} ADD COLUMN {field_name} {sql_type} DEFAULT {default_value}"
-                    cursor.execute(alter_sql)
-
-                    # Update current_spec
-                    current_spec["fields"].append(
-                        {"name": field_name, "type": field_type}
-                    )
-
-            conn.commit()
-            conn.close()
-
-            logger.info(f"Successfully migrated schema for {form_path}")
-            return True
-
-        except Exception as e:
-            # Restore from backup on error
-            if backup_path:
-                self._restore_backup(backup_path)
-            logger.error(f"Migration error: {e}, restored from backup")
-            return False
+        return self._migrate_table(form_path, new_spec, renames, conversions)
 
     def create_index(self, form_path: str, field_name: str) -> bool:
         """Create an index on a specific field."""
@@ -670,226 +1000,380 @@ class SQLiteRepository(BaseRepository):
         else:
             return "''"
 
-    def rename_field(
-        self, form_path: str, spec: Dict[str, Any], old_name: str, new_name: str
-    ) -> bool:
+    def _column_definitions(self, spec: Dict[str, Any]) -> List[str]:
         """
-        Rename a field in the table, preserving all data.
-
-        For SQLite, we recreate the table since ALTER TABLE RENAME COLUMN
-        is not supported in older versions.
+        Build the column definitions of a form table.
 
         Args:
-            form_path: Path to the form
-            spec: Updated form specification (with new field name)
-            old_name: Current name of the field
-            new_name: New name for the field
+            spec: Form specification
 
         Returns:
-            True if field was renamed successfully
+            List of column definitions, record_id first
         """
-        table_name = self._get_table_name(form_path)
-
-        if not self.exists(form_path):
-            logger.error(f"Cannot rename field: table {table_name} doesn't exist")
-            return False
-
-        # Create backup
-        backup_path = self._create_backup()
-        if not backup_path:
-            logger.error("Failed to create backup, aborting rename")
-            return False
-
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+        columns = [
+            "record_id TEXT PRIMARY KEY",  # UUID Crockford Base32 as PRIMARY KEY
+        ]
 
-            # Create new table with renamed field
-            temp_table = f"{table_name}_temp"
+        for field in spec["fields"]:
+            field_name = field["name"]
+            field_type = field["type"]
+            sql_type = self.TYPE_MAPPING.get(field_type, "TEXT")
 
-            # Build CREATE TABLE for new structure
-            columns = ["record_id TEXT PRIMARY KEY"]
-            for field in spec["fields"]:
-                field_name = field["name"]
-                field_type = field["type"]
-                sql_type = self.TYPE_MAPPING.get(field_type, "TEXT")
+            # Add NOT NULL constraint for required fields (except checkbox)
+            required = field.get("required", False)
+            constraint = " NOT NULL" if required and field_type != "checkbox" else ""
 
-                required = field.get("required", False)
-                constraint = (
-                    " NOT NULL" if required and field_type != "checkbox" else ""
-                )
+            columns.append(f"{field_name} {sql_type}{constraint}")
 
-                columns.append(f"{field_name} {sql_type}{constraint}")
+        return columns
 
-            columns_sql = ",\n    ".join(columns)
-            create_sql = f"CREATE TABLE {temp_table} (\n    {columns_sql}\n)"
+    def _get_table_indexes(
+        self, conn: sqlite3.Connection, table_name: str
+    ) -> List[Dict[str, Any]]:
+        """
+        List the explicitly created indexes of a table.
 
-            cursor.execute(create_sql)
+        Args:
+            conn: Open connection
+            table_name: Table to inspect
 
-            # Copy data from old table to new table
-            # Build field list with old_name -> new_name mapping
-            old_fields = ["record_id"] + [
-                old_name if f["name"] == new_name else f["name"] for f in spec["fields"]
+        Returns:
+            List of {"name", "sql", "unique", "columns"} dictionaries
+        """
+        unique = {
+            row["name"]: bool(row["unique"])
+            for row in conn.execute(f"PRAGMA index_list({table_name})")
+        }
+        indexes = []
+        for row in conn.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (table_name,),
+        ):
+            columns = [
+                info["name"] for info in conn.execute(f"PRAGMA index_info({row[0]})")
             ]
-            new_fields = ["record_id"] + [f["name"] for f in spec["fields"]]
-
-            old_fields_sql = ", ".join(old_fields)
-            new_fields_sql = ", ".join(new_fields)
+            indexes.append(
+                {
+                    "name": row[0],
+                    "sql": row[1],
+                    "unique": unique.get(row[0], False),
+                    "columns": columns,
+                }
+            )
+        return indexes
 
-            copy_sql = f"""
-                INSERT INTO {temp_table} ({new_fields_sql})
-                SELECT {old_fields_sql}
-                FROM {table_name}
-            """
-            cursor.execute(copy_sql)
+    def _plan_table_migration(
+        self,
+        conn: sqlite3.Connection,
+        table_name: str,
+        spec: Dict[str, Any],
+        renames: Dict[str, str],
+        conversions: Dict[str, Tuple[str, str]],
+    ) -> TableMigrationPlan:
+        """
+        Compile the changes from the current table to a spec into one plan.
 
-            # Drop old table and rename new table
-            cursor.execute(f"DROP TABLE {table_name}")
-            cursor.execute(f"ALTER TABLE {temp_table} RENAME TO {table_name}")
+        Removed and added columns are derived from the table's actual
+        columns: every column not in the spec (after renames) is removed,
+        every spec field without a source column is added.
 
-            conn.commit()
-            conn.close()
+        Args:
+            conn: Open connection
+            table_name: Table to migrate
+            spec: Target form specification
+            renames: Column renames (old name -> new name)
+            conversions: Type changes (new field name -> (old type, new type))
 
-            logger.info(f"Renamed field '{old_name}' to '{new_name}' in {table_name}")
-            return True
+        Returns:
+            TableMigrationPlan
+        """
+        plan = TableMigrationPlan(table_name)
+        columns = [
+            row["name"]
+            for row in conn.execute(f"PRAGMA table_info({table_name})")
+            if row["name"] != "record_id"
+        ]
+        fields = {field["name"]: field for field in spec["fields"]}
+
+        # Target field name -> source column
+        sources = {}
+        for column in columns:
+            target = renames.get(column, column)
+            if target in fields:
+                sources[target] = column
+            else:
+                plan.removed.append(column)
+        plan.renames = [
+            (sources[name], name) for name in sources if sources[name] != name
+        ]
+        plan.added = [field for name, field in fields.items() if name not in sources]
+        plan.conversions = {
+            name: types
+            for name, types in conversions.items()
+            if name in sources and types[0] != types[1]
+        }
+
+        if not (plan.renames or plan.removed or plan.added or plan.conversions):
+            return plan
+
+        indexes = self._get_table_indexes(conn, table_name)
+        indexed = {column for index in indexes for column in index["columns"]}
+
+        # Native ALTER TABLE: DROP COLUMN rewrites the table, so it is only
+        # used for a single unindexed column; renames onto existing column
+        # names (swaps) need the rebuild
+        plan.rebuild = bool(
+            plan.conversions
+            or len(plan.removed) > 1
+            or set(plan.removed) & indexed
+            or any(new in columns for _, new in plan.renames)
+            or (plan.renames and sqlite3.sqlite_version_info < (3, 25, 0))
+            or (plan.removed and sqlite3.sqlite_version_info < (3, 35, 0))
+        )
 
-        except Exception as e:
-            # Restore from backup on error
-            if backup_path:
-                self._restore_backup(backup_path)
-            logger.error(f"Failed to rename field: {e}, restored from backup")
-            return False
+        if not plan.rebuild:
+            for old_name, new_name in plan.renames:
+                plan.statements.append(
+                    (
+                        f"ALTER TABLE {table_name} RENAME COLUMN {old_name} TO {new_name}",
+                        (),
+                    )
+                )
+            for column in plan.removed:
+                plan.statements.append(
+                    (f"ALTER TABLE {table_name} DROP COLUMN {column}", ())
+                )
+            for field in plan.added:
+                sql_type = self.TYPE_MAPPING.get(field["type"], "TEXT")
+                default_value = self._get_default_value_sql(field["type"])
+                plan.statements.append(
+                    (
+                        f"ALTER TABLE {table_name} ADD COLUMN {field['name']} "
+                        f"{sql_type} DEFAULT {default_value}",
+                        (),
+                    )
+                )
+            return plan
 
-    def change_field_type(
+        # Single rebuild: new table, one INSERT ... SELECT, swap
+        temp_table = f"{table_name}_migration"
+        columns_sql = ",\n    ".join(self._column_definitions(spec))
+        plan.statements.append(
+            (f"CREATE TABLE {temp_table} (\n    {columns_sql}\n)", ())
+        )
+
+        select_exprs = ["record_id"]
+        params: List[str] = []
+        for name, field in fields.items():
+            source = sources.get(name)
+            default_value = self._get_default_value_sql(field["type"])
+            if source is None:
+                select_exprs.append(default_value)
+            elif name in plan.conversions:
+                select_exprs.append(f"{_CONVERT_FUNCTION}({source}, ?, ?)")
+                params.extend(plan.conversions[name])
+            elif field.get("required", False) and field["type"] != "checkbox":
+                select_exprs.append(f"COALESCE({source}, {default_value})")
+            else:
+                select_exprs.append(source)
+
+        target_columns = ", ".join(["record_id"] + list(fields))
+        plan.statements.append(
+            (
+                f"INSERT INTO {temp_table} ({target_columns}) "
+                f"SELECT {', '.join(select_exprs)} FROM {table_name}",
+                tuple(params),
+            )
+        )
+        plan.statements.append((f"DROP TABLE {table_name}", ()))
+        plan.statements.append((f"ALTER TABLE {temp_table} RENAME TO {table_name}", ()))
+
+        # Recreate indexes whose columns survive (the redundant record_id
+        # index of older tables is left out)
+        renamed = dict(plan.renames)
+        for index in indexes:
+            if index["name"] == f"idx_{table_name}_record_id":
+                continue
+            index_columns = [renamed.get(column, column) for column in index["columns"]]
+            if not all(
+                column == "record_id" or column in fields for column in index_columns
+            ):
+                continue
+            if index_columns == index["columns"]:
+                plan.statements.append((index["sql"], ()))
+                continue
+            index_name = index["name"]
+            if index_name == f"idx_{table_name}_{index['columns'][0]}":
+                index_name = f"idx_{table_name}_{index_columns[0]}"
+            unique = "UNIQUE " if index["unique"] else ""
+            plan.statements.append(
+                (
+                    f"CREATE {unique}INDEX {index_name} ON "
+                    f"{table_name}({', '.join(index_columns)})",
+                    (),
+                )
+            )
+
+        return plan
+
+    def _migrate_table(
         self,
         form_path: str,
         spec: Dict[str, Any],
-        field_name: str,
-        old_type: str,
-        new_type: str,
+        renames: Optional[Dict[str, str]] = None,
+        conversions: Optional[Dict[str, Tuple[str, str]]] = None,
     ) -> bool:
         """
-        Change the type of a field, attempting to convert existing data.
-
-        For SQLite, we recreate the table with the new type and copy/convert data.
+        Bring a form table in line with a spec in a single transaction.
 
         Args:
             form_path: Path to the form
-            spec: Updated form specification (with new field type)
-            field_name: Name of the field to change
-            old_type: Current type of the field
-            new_type: New type for the field
+            spec: Target form specification
+            renames: Column renames (old name -> new name)
+            conversions: Type changes (new field name -> (old type, new type))
 
         Returns:
-            True if type was changed successfully
+            True if the table was migrated (or already matched the spec)
         """
         table_name = self._get_table_name(form_path)
 
         if not self.exists(form_path):
-            logger.error(f"Cannot change field type: table {table_name} doesn't exist")
+            logger.error(f"Cannot migrate: table {table_name} doesn't exist")
             return False
 
-        # Create backup
-        backup_path = self._create_backup()
-        if not backup_path:
-            logger.error("Failed to create backup, aborting type change")
-            return False
+        for field in spec["fields"]:
+            if not self._validate_field_name(field["name"]):
+                logger.error(f"Invalid field name: {field['name']}")
+                return False
+
+        conversion_errors = 0
+
+        def convert(value: Any, old_type: str, new_type: str) -> Any:
+            nonlocal conversion_errors
+            try:
+                value = self._convert_value(value, old_type, new_type)
+            except Exception as e:
+                logger.warning(f"Conversion error: {e}")
+                conversion_errors += 1
+                value = self._get_default_value(new_type)
+
+            # Apply type conversion
+            if new_type == "checkbox":
+                return 1 if value else 0
+            if new_type == "number" or new_type == "range":
+                try:
+                    return int(value) if value else 0
+                except ValueError:
+                    return 0
+            return str(value) if value else ""
 
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-
-            # Read all existing data
-            cursor.execute(f"SELECT * FROM {table_name}")
-            rows = cursor.fetchall()
-
-            # Create new table with updated type
-            temp_table = f"{table_name}_temp"
-
-            # Build CREATE TABLE with new field type
-            columns = ["record_id TEXT PRIMARY KEY"]
-            for field in spec["fields"]:
-                fname = field["name"]
-                ftype = field["type"]
-                sql_type = self.TYPE_MAPPING.get(ftype, "TEXT")
+            # Explicit transaction control: DDL must be part of the transaction
+            conn.isolation_level = None
+            conn.create_function(_CONVERT_FUNCTION, 3, convert)
+            try:
+                plan = self._plan_table_migration(
+                    conn, table_name, spec, renames or {}, conversions or {}
+                )
+                if not plan.statements:
+                    logger.info(f"Table {table_name} already matches the spec")
+                    return True
+
+                if (plan.removed or plan.conversions) and self.has_data(form_path):
+                    # Create backup before losing or converting data
+                    scope = table_name if self.backup_scope == "table" else None
+                    if not self._create_backup(scope):
+                        logger.error("Failed to create backup, aborting migration")
+                        return False
+
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    row_count = 0
+                    for sql, params in plan.statements:
+                        cursor = conn.execute(sql, params)
+                        if sql.startswith("INSERT"):
+                            row_count = cursor.rowcount
+
+                    # Check if too many conversions failed
+                    if row_count > 0 and conversion_errors / row_count > 0.5:
+                        raise Exception(
+                            f"Too many conversion errors: {conversion_errors}/{row_count}"
+                        )
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            finally:
+                conn.close()
 
-                required = field.get("required", False)
-                constraint = " NOT NULL" if required and ftype != "checkbox" else ""
+            logger.info(
+                f"Migrated schema of {table_name} "
+                f"({'single rebuild' if plan.rebuild else 'native ALTER TABLE'}): "
+                f"{len(plan.renames)} renamed, {len(plan.conversions)} converted "
+                f"({conversion_errors} conversion errors), "
+                f"{len(plan.removed)} removed, {len(plan.added)} added"
+            )
+            return True
 
-                columns.append(f"{fname} {sql_type}{constraint}")
+        except Exception as e:
+            logger.error(f"Failed to migrate schema of {table_name}: {e}")
+            return False
 
-            columns_sql = ",\n    ".join(columns)
-            create_sql = f"CREATE TABLE {temp_table} (\n    {columns_sql}\n)"
+    def rename_field(
+        self, form_path: str, spec: Dict[str, Any], old_name: str, new_name: str
+    ) -> bool:
+        """
+        Rename a field in the table, preserving all data.
 
-            cursor.execute(create_sql)
+        Uses ALTER TABLE RENAME COLUMN where supported, otherwise rebuilds
+        the table once (see _migrate_table).
 
-            # Convert and insert data (include record_id)
-            field_names = ["record_id"] + [f["name"] for f in spec["fields"]]
-            placeholders = ", ".join(["?" for _ in field_names])
-            columns_insert = ", ".join(field_names)
+        Args:
+            form_path: Path to the form
+            spec: Updated form specification (with new field name)
+            old_name: Current name of the field
+            new_name: New name for the field
 
-            insert_sql = (
-                f"INSERT INTO {temp_table} ({columns_insert}) VALUES ({placeholders})"
-            )
+        Returns:
+            True if field was renamed successfully
+        """
+        if self._migrate_table(form_path, spec, renames={old_name: new_name}):
+            logger.info(f"Renamed field '{old_name}' to '{new_name}'")
+            return True
+        return False
 
-            conversion_errors = 0
-            for row in rows:
-                # Start with record_id
-                values = [row["record_id"]]
-
-                for field in spec["fields"]:
-                    fname = field["name"]
-                    ftype = field["type"]
-                    value = row[fname]
-
-                    # Convert the changed field
-                    if fname == field_name:
-                        try:
-                            value = self._convert_value(value, old_type, new_type)
-                        except Exception as e:
-                            logger.warning(f"Conversion error for {fname}: {e}")
-                            conversion_errors += 1
-                            value = self._get_default_value(new_type)
-
-                    # Apply type conversion
-                    if ftype == "checkbox":
-                        values.append(1 if value else 0)
-                    elif ftype == "number" or ftype == "range":
-                        try:
-                            values.append(int(value) if value else 0)
-                        except ValueError:
-                            values.append(0)
-                    else:
-                        values.append(str(value) if value else "")
-
-                cursor.execute(insert_sql, values)
-
-            # Check if too many conversions failed
-            total_rows = len(rows)
-            if total_rows > 0 and conversion_errors / total_rows > 0.5:
-                raise Exception(
-                    f"Too many conversion errors: {conversion_errors}/{total_rows}"
-                )
+    def change_field_type(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        field_name: str,
+        old_type: str,
+        new_type: str,
+    ) -> bool:
+        """
+        Change the type of a field, attempting to convert existing data.
 
-            # Drop old table and rename new table
-            cursor.execute(f"DROP TABLE {table_name}")
-            cursor.execute(f"ALTER TABLE {temp_table} RENAME TO {table_name}")
+        The table is rebuilt once with the new type, converting values in
+        the INSERT ... SELECT that copies the data.
 
-            conn.commit()
-            conn.close()
+        Args:
+            form_path: Path to the form
+            spec: Updated form specification (with new field type)
+            field_name: Name of the field to change
+            old_type: Current type of the field
+            new_type: New type for the field
 
-            logger.info(
-                f"Changed field '{field_name}' from {old_type} to {new_type} "
-                f"in {table_name} ({conversion_errors} conversion errors)"
-            )
+        Returns:
+            True if type was changed successfully
+        """
+        if self._migrate_table(
+            form_path, spec, conversions={field_name: (old_type, new_type)}
+        ):
+            logger.info(f"Changed field '{field_name}' from {old_type} to {new_type}")
             return True
-
-        except Exception as e:
-            # Restore from backup on error
-            if backup_path:
-                self._restore_backup(backup_path)
-            logger.error(f"Failed to change field type: {e}, restored from backup")
-            return False
+        return False
 
     def remove_field(
         self, form_path: str, spec: Dict[str, Any], field_name: str
@@ -897,7 +1381,8 @@ class SQLiteRepository(BaseRepository):
         """
         Remove a field from the table (destructive operation).
 
-        For SQLite, we recreate the table without the removed field.
+        Uses ALTER TABLE DROP COLUMN where supported, otherwise rebuilds
+        the table once without the field. A backup is created first.
 
         Args:
             form_path: Path to the form
@@ -907,69 +1392,10 @@ class SQLiteRepository(BaseRepository):
         Returns:
             True if field was removed successfully
         """
-        table_name = self._get_table_name(form_path)
-
-        if not self.exists(form_path):
-            logger.error(f"Cannot remove field: table {table_name} doesn't exist")
-            return False
-
-        # Create backup (critical for destructive operations!)
-        backup_path = self._create_backup()
-        if not backup_path:
-            logger.error("Failed to create backup, aborting field removal")
-            return False
-
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            # Create new table without the removed field
-            temp_table = f"{table_name}_temp"
-
-            # Build CREATE TABLE without removed field
-            columns = ["record_id TEXT PRIMARY KEY"]
-            for field in spec["fields"]:
-                fname = field["name"]
-                ftype = field["type"]
-                sql_type = self.TYPE_MAPPING.get(ftype, "TEXT")
-
-                required = field.get("required", False)
-                constraint = " NOT NULL" if required and ftype != "checkbox" else ""
-
-                columns.append(f"{fname} {sql_type}{constraint}")
-
-            columns_sql = ",\n    ".join(columns)
-            create_sql = f"CREATE TABLE {temp_table} (\n    {columns_sql}\n)"
-
-            cursor.execute(create_sql)
-
-            # Copy data excluding the removed field (include record_id)
-            field_names = ["record_id"] + [f["name"] for f in spec["fields"]]
-            fields_sql = ", ".join(field_names)
-
-            copy_sql = f"""
-                INSERT INTO {temp_table} ({fields_sql})
-                SELECT {fields_sql}
-                FROM {table_name}
-            """
-            cursor.execute(copy_sql)
-
-            # Drop old table and rename new table
-            cursor.execute(f"DROP TABLE {table_name}")
-            cursor.execute(f"ALTER TABLE {temp_table} RENAME TO {table_name}")
-
-            conn.commit()
-            conn.close()
-
-            logger.info(f"Removed field '{field_name}' from {table_name}")
+        if self._migrate_table(form_path, spec):
+            logger.info(f"Removed field '{field_name}'")
             return True
-
-        except Exception as e:
-            # Restore from backup on error
-            if backup_path:
-                self._restore_backup(backup_path)
-            logger.error(f"Failed to remove field: {e}, restored from backup")
-            return False
+        return False
 
     def _convert_value(self, value: Any, old_type: str, new_type: str) -> Any:
         """
@@ -1048,53 +1474,97 @@ class SQLiteRepository(BaseRepository):
         else:
             return ""
 
-    def _create_backup(self) -> Optional[str]:
+    def _get_backup_store(self) -> BackupStore:
+        """Get the backup store next to the database file."""
+        return BackupStore(os.path.join(os.path.dirname(self.database), "backups"))
+
+    def _create_backup(self, table_name: Optional[str] = None) -> Optional[str]:
         """
-        Create a backup of the database.
+        Back up the database, or one table, into the backup store.
+
+        Table backups are streamed as a logical dump read in short keyset
+        batches (see persistence.backups.dump_sqlite_table), so rows that
+        did not change since the previous backup are deduplicated.
+        Whole-database backups take an online paged copy first (see
+        persistence.backups.backup_sqlite) and store it in page-aligned
+        chunks. Old backups of the same series are pruned afterwards
+        according to the retention policy.
+
+        Args:
+            table_name: Only back up this table (None = whole database)
 
         Returns:
-            Path to backup file, or None on failure
+            Backup ID, or None on failure
         """
         if not os.path.exists(self.database):
             return None
 
-        # Create backups directory
-        db_dir = os.path.dirname(self.database)
-        backup_dir = os.path.join(db_dir, "backups")
-        Path(backup_dir).mkdir(parents=True, exist_ok=True)
-
-        # Generate backup filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        db_filename = os.path.basename(self.database)
-        name, ext = os.path.splitext(db_filename)
-        backup_filename = f"{name}_backup_{timestamp}{ext}"
-        backup_path = os.path.join(backup_dir, backup_filename)
+        store = self._get_backup_store()
+        series = os.path.splitext(os.path.basename(self.database))[0]
 
         try:
-            shutil.copy2(self.database, backup_path)
-            logger.info(f"Created backup: {backup_path}")
-            return backup_path
+            if table_name:
+                series = f"{series}_{table_name}"
+                manifest = store.put_lines(
+                    series,
+                    dump_sqlite_table(self.database, table_name, self.timeout),
+                    kind="sqlite-table",
+                    metadata={"database": self.database, "table": table_name},
+                )
+            else:
+                snapshot = os.path.join(str(store.root), f"{series}.snapshot")
+                try:
+                    backup_sqlite(self.database, snapshot, timeout=self.timeout)
+                    manifest = store.put_file(
+                        series,
+                        snapshot,
+                        kind="sqlite-database",
+                        metadata={"database": self.database},
+                        line_chunks=False,
+                    )
+                finally:
+                    if os.path.exists(snapshot):
+                        os.remove(snapshot)
         except Exception as e:
             logger.error(f"Failed to create backup: {e}")
             return None
 
-    def _restore_backup(self, backup_path: str) -> bool:
+        store.prune(series)
+        return manifest["id"]
+
+    def _restore_backup(self, backup_id: str) -> bool:
         """
-        Restore database from backup.
+        Restore the database, or one table, from a backup.
+
+        Both kinds of backup are streamed out of the store: table backups
+        straight into the table, database backups into a temporary file
+        that is then copied into the live database.
 
         Args:
-            backup_path: Path to backup file
+            backup_id: Backup ID returned by _create_backup()
 
         Returns:
             True if restored successfully
         """
-        if not os.path.exists(backup_path):
-            logger.error(f"Backup file doesn't exist: {backup_path}")
-            return False
+        store = self._get_backup_store()
 
         try:
-            shutil.copy2(backup_path, self.database)
-            logger.info(f"Restored from backup: {backup_path}")
+            manifest = store.get_manifest(backup_id)
+            if manifest["kind"] == "sqlite-table":
+                load_sqlite_table(
+                    self.database, store.iter_lines(backup_id), self.timeout
+                )
+            else:
+                snapshot = store.restore_file(
+                    backup_id, os.path.join(str(store.root), "restore.snapshot")
+                )
+                try:
+                    restore_sqlite(snapshot, self.database, timeout=self.timeout)
+                finally:
+                    os.remove(snapshot)
+                # The snapshot may predate the tags table
+                self._tags_table_ready = False
+            logger.info(f"Restored from backup: {backup_id}")
             return True
         except Exception as e:
             logger.error(f"Failed to restore from backup: {e}")
@@ -1152,6 +1622,50 @@ class SQLiteRepository(BaseRepository):
             logger.error(f"Failed to read record {record_id} from {table_name}: {e}")
             return None
 
+    def read_by_ids(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        record_ids: List[str],
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Read several records with chunked IN queries, selecting only `fields`."""
+        table_name = self._get_table_name(form_path)
+        record_ids = list(dict.fromkeys(record_ids))
+
+        if not record_ids or not self.exists(form_path):
+            return {}
+
+        if fields is not None:
+            spec = {
+                **spec,
+                "fields": [f for f in spec["fields"] if f["name"] in fields],
+            }
+        columns = ", ".join(["record_id"] + [f["name"] for f in spec["fields"]])
+
+        records = {}
+        try:
+            conn = self._get_connection()
+            try:
+                for start in range(0, len(record_ids), TAG_QUERY_CHUNK):
+                    chunk = record_ids[start : start + TAG_QUERY_CHUNK]
+                    placeholders = ", ".join("?" * len(chunk))
+                    cursor = conn.execute(
+                        f"SELECT {columns} FROM {table_name} "
+                        f"WHERE record_id IN ({placeholders})",
+                        chunk,
+                    )
+                    for row in cursor:
+                        records[row["record_id"]] = self._row_to_record(row, spec)
+            finally:
+                conn.close()
+
+        except Exception as e:
+            logger.error(f"Failed to read records by ID from {table_name}: {e}")
+            return {}
+
+        return records
+
     def update_by_id(
         self,
         form_path: str,
@@ -1194,11 +1708,21 @@ class SQLiteRepository(BaseRepository):
         set_sql = ", ".join(set_clauses)
         update_sql = f"UPDATE {table_name} SET {set_sql} WHERE record_id = ?"
 
+        self._ensure_tags_table()
+
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
             cursor.execute(update_sql, values)
             rows_affected = cursor.rowcount
+            if rows_affected:
+                # Logged in the same transaction as the update
+                cursor.execute(
+                    "INSERT INTO tag_changes "
+                    "(object_type, object_id, tag, op, changed_at) "
+                    "VALUES (?, ?, '', 'update', ?)",
+                    (form_path, record_id, datetime.now().isoformat()),
+                )
             conn.commit()
             conn.close()
 
@@ -1216,26 +1740,43 @@ class SQLiteRepository(BaseRepository):
     def delete_by_id(
         self, form_path: str, spec: Dict[str, Any], record_id: str
     ) -> bool:
-        """Delete a record by its unique ID."""
+        """Delete a record and all its tags in one transaction."""
         table_name = self._get_table_name(form_path)
 
         if not self.exists(form_path):
             logger.error(f"Cannot delete: table does not exist: {table_name}")
             return False
 
-        delete_sql = f"DELETE FROM {table_name} WHERE record_id = ?"
+        self._ensure_tags_table()
 
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(delete_sql, (record_id,))
-            rows_affected = cursor.rowcount
-            conn.commit()
-            conn.close()
+            conn.isolation_level = None
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    cursor = conn.execute(
+                        f"DELETE FROM {table_name} WHERE record_id = ?", (record_id,)
+                    )
+                    if cursor.rowcount == 0:
+                        conn.execute("ROLLBACK")
+                        logger.warning(
+                            f"No record found with ID {record_id} in {table_name}"
+                        )
+                        return False
 
-            if rows_affected == 0:
-                logger.warning(f"No record found with ID {record_id} in {table_name}")
-                return False
+                    for tags_table in ("tags_active", "tags_history"):
+                        conn.execute(
+                            f"DELETE FROM {tags_table} "
+                            "WHERE object_type = ? AND object_id = ?",
+                            (form_path, record_id),
+                        )
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            finally:
+                conn.close()
 
             logger.debug(f"Deleted record {record_id} from {table_name}")
             return True
@@ -1309,116 +1850,360 @@ class SQLiteRepository(BaseRepository):
     # TAG MANAGEMENT METHODS (Stub implementations for FASE 3)
     # =========================================================================
 
-    def add_tag(
+    def _close_active_tags(
+        self,
+        conn: sqlite3.Connection,
+        keys: List[Tuple[str, str, str]],
+        removed_at: str,
+        removed_by: str,
+    ) -> int:
+        """
+        Move active tags to the history table.
+
+        Args:
+            conn: Connection with an open transaction
+            keys: (object_type, object_id, tag) of the tags to close
+            removed_at: Removal timestamp
+            removed_by: Who removed the tags
+
+        Returns:
+            Number of active tags that were closed
+        """
+        conn.executemany(
+            """
+            INSERT INTO tags_history
+                (object_type, object_id, tag, applied_at, applied_by,
+                 removed_at, removed_by, metadata)
+            SELECT object_type, object_id, tag, applied_at, applied_by, ?, ?, metadata
+            FROM tags_active
+            WHERE object_type = ? AND object_id = ? AND tag = ?
+            """,
+            ((removed_at, removed_by, *key) for key in keys),
+        )
+        cursor = conn.executemany(
+            "DELETE FROM tags_active WHERE object_type = ? AND object_id = ? AND tag = ?",
+            keys,
+        )
+        return cursor.rowcount
+
+    def _insert_active_tags(
         self,
+        conn: sqlite3.Connection,
+        keys: List[Tuple[str, str, str]],
+        applied_at: str,
+        applied_by: str,
+        metadata: Optional[Dict[str, Any]],
+    ) -> int:
+        """
+        Insert active tags, skipping tags that are already active.
+
+        Returns:
+            Number of tags inserted
+        """
+        metadata_json = json.dumps(metadata) if metadata else None
+        cursor = conn.executemany(
+            """
+            INSERT OR IGNORE INTO tags_active
+                (object_type, object_id, tag, applied_at, applied_by, metadata)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            ((*key, applied_at, applied_by, metadata_json) for key in keys),
+        )
+        return cursor.rowcount
+
+    def _active_tag_ids(
+        self,
+        conn: sqlite3.Connection,
         object_type: str,
-        object_id: str,
         tag: str,
-        applied_by: str,
-        metadata: Optional[Dict[str, Any]] = None,
-    ) -> bool:
-        """Add a tag to an object."""
-        self._ensure_tags_table()
+        object_ids: List[str],
+    ) -> set:
+        """Return which of object_ids currently have tag active."""
+        active = set()
+        for start in range(0, len(object_ids), TAG_QUERY_CHUNK):
+            chunk = object_ids[start : start + TAG_QUERY_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor = conn.execute(
+                f"""
+                SELECT object_id FROM tags_active
+                WHERE object_type = ? AND tag = ? AND object_id IN ({placeholders})
+                """,
+                (object_type, tag, *chunk),
+            )
+            active.update(row["object_id"] for row in cursor)
+        return active
 
-        # Check if tag is already active
-        if self.has_tag(object_type, object_id, tag):
-            logger.debug(f"Tag '{tag}' already exists for {object_type}:{object_id}")
-            return False
+    def _run_tag_batch(self, description: str, work) -> List[str]:
+        """
+        Run a tag operation in one BEGIN IMMEDIATE transaction.
 
-        applied_at = datetime.now().isoformat()
-        metadata_json = json.dumps(metadata) if metadata else None
+        Args:
+            description: Operation description for log messages
+            work: Callable receiving the connection and returning the
+                  changed object IDs. If it returns no IDs the transaction
+                  is rolled back, so a partial change (e.g. the removal
+                  half of a refused transition) is never stored.
 
-        insert_sql = """
-        INSERT INTO tags (object_type, object_id, tag, applied_at, applied_by, metadata)
-        VALUES (?, ?, ?, ?, ?, ?)
+        Returns:
+            The changed object IDs, or an empty list if nothing was stored
         """
+        self._ensure_tags_table()
 
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                insert_sql,
-                (object_type, object_id, tag, applied_at, applied_by, metadata_json),
-            )
-            conn.commit()
-            conn.close()
+            conn.isolation_level = None
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    changed = work(conn)
+                    conn.execute("COMMIT" if changed else "ROLLBACK")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            finally:
+                conn.close()
 
-            logger.debug(f"Added tag '{tag}' to {object_type}:{object_id}")
-            return True
+            logger.debug(f"{description}: {len(changed)} objects changed")
+            return changed
 
         except Exception as e:
-            logger.error(f"Failed to add tag '{tag}' to {object_type}:{object_id}: {e}")
-            return False
+            logger.error(f"Failed to {description}: {e}")
+            return []
+
+    def add_tag(
+        self,
+        object_type: str,
+        object_id: str,
+        tag: str,
+        applied_by: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Add a tag to an object (ignored if the tag is already active)."""
+        applied_at = datetime.now().isoformat()
+
+        def work(conn):
+            keys = [(object_type, object_id, tag)]
+            if self._insert_active_tags(conn, keys, applied_at, applied_by, metadata):
+                return [object_id]
+            return []
+
+        return bool(
+            self._run_tag_batch(f"add tag '{tag}' to {object_type}:{object_id}", work)
+        )
 
     def remove_tag(
         self, object_type: str, object_id: str, tag: str, removed_by: str
     ) -> bool:
-        """Remove a tag from an object."""
-        self._ensure_tags_table()
+        """Remove a tag from an object, moving it to the history table."""
+        removed_at = datetime.now().isoformat()
 
-        # Check if tag exists and is active
-        if not self.has_tag(object_type, object_id, tag):
-            logger.debug(f"Tag '{tag}' not found for {object_type}:{object_id}")
-            return False
+        def work(conn):
+            keys = [(object_type, object_id, tag)]
+            if self._close_active_tags(conn, keys, removed_at, removed_by):
+                return [object_id]
+            return []
 
-        removed_at = datetime.now().isoformat()
+        return bool(
+            self._run_tag_batch(
+                f"remove tag '{tag}' from {object_type}:{object_id}", work
+            )
+        )
 
-        update_sql = """
-        UPDATE tags
-        SET removed_at = ?, removed_by = ?
-        WHERE object_type = ? AND object_id = ? AND tag = ? AND removed_at IS NULL
+    def transition_tag(
+        self,
+        object_type: str,
+        object_id: str,
+        from_tag: str,
+        to_tag: str,
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> bool:
         """
+        Move an object from one tag to another in one transaction.
 
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                update_sql, (removed_at, removed_by, object_type, object_id, tag)
+        from_tag is moved to the history table and to_tag inserted; the
+        UNIQUE constraint on tags_active refuses to_tag if it is already
+        active, in which case the transaction is rolled back and from_tag
+        stays in place.
+        """
+        now = datetime.now().isoformat()
+
+        def work(conn):
+            self._close_active_tags(
+                conn, [(object_type, object_id, from_tag)], now, actor
             )
-            conn.commit()
-            conn.close()
+            keys = [(object_type, object_id, to_tag)]
+            if self._insert_active_tags(conn, keys, now, actor, metadata):
+                return [object_id]
+            return []
 
-            logger.debug(f"Removed tag '{tag}' from {object_type}:{object_id}")
-            return True
+        return bool(
+            self._run_tag_batch(
+                f"transition {object_type}:{object_id} "
+                f"from '{from_tag}' to '{to_tag}'",
+                work,
+            )
+        )
 
-        except Exception as e:
-            logger.error(
-                f"Failed to remove tag '{tag}' from {object_type}:{object_id}: {e}"
+    def bulk_add_tag(
+        self,
+        object_type: str,
+        object_ids: List[str],
+        tag: str,
+        applied_by: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """Add a tag to many objects in one transaction."""
+        object_ids = list(dict.fromkeys(object_ids))
+        applied_at = datetime.now().isoformat()
+
+        def work(conn):
+            active = self._active_tag_ids(conn, object_type, tag, object_ids)
+            changed = [oid for oid in object_ids if oid not in active]
+            keys = [(object_type, oid, tag) for oid in changed]
+            self._insert_active_tags(conn, keys, applied_at, applied_by, metadata)
+            return changed
+
+        return self._run_tag_batch(f"add tag '{tag}' to {object_type}", work)
+
+    def bulk_remove_tag(
+        self, object_type: str, object_ids: List[str], tag: str, removed_by: str
+    ) -> List[str]:
+        """Remove a tag from many objects in one transaction."""
+        object_ids = list(dict.fromkeys(object_ids))
+        removed_at = datetime.now().isoformat()
+
+        def work(conn):
+            active = self._active_tag_ids(conn, object_type, tag, object_ids)
+            changed = [oid for oid in object_ids if oid in active]
+            keys = [(object_type, oid, tag) for oid in changed]
+            self._close_active_tags(conn, keys, removed_at, removed_by)
+            return changed
+
+        return self._run_tag_batch(f"remove tag '{tag}' from {object_type}", work)
+
+    def bulk_transition(
+        self,
+        object_type: str,
+        object_ids: List[str],
+        from_tag: str,
+        to_tag: str,
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """Move many objects from one tag to another in one transaction."""
+        object_ids = list(dict.fromkeys(object_ids))
+        now = datetime.now().isoformat()
+
+        def work(conn):
+            return self._transition_ids(
+                conn, object_type, object_ids, from_tag, to_tag, now, actor, metadata
             )
-            return False
+
+        return self._run_tag_batch(
+            f"transition {object_type} from '{from_tag}' to '{to_tag}'", work
+        )
+
+    def apply_transitions(
+        self,
+        object_type: str,
+        moves: List[Tuple[str, str, str]],
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """Apply a batch of transitions with different tag pairs in one transaction."""
+        groups = self._group_moves(moves)
+        now = datetime.now().isoformat()
+
+        def work(conn):
+            moved = set()
+            for (from_tag, to_tag), object_ids in groups.items():
+                moved.update(
+                    self._transition_ids(
+                        conn,
+                        object_type,
+                        object_ids,
+                        from_tag,
+                        to_tag,
+                        now,
+                        actor,
+                        metadata,
+                    )
+                )
+            return [oid for oid in dict.fromkeys(m[0] for m in moves) if oid in moved]
+
+        return self._run_tag_batch(
+            f"apply {len(moves)} transitions to {object_type}", work
+        )
+
+    def _transition_ids(
+        self,
+        conn: sqlite3.Connection,
+        object_type: str,
+        object_ids: List[str],
+        from_tag: str,
+        to_tag: str,
+        now: str,
+        actor: str,
+        metadata: Optional[Dict[str, Any]],
+    ) -> List[str]:
+        """
+        Move objects from one tag to another inside an open transaction.
+
+        Objects that already have to_tag active are skipped.
+
+        Returns:
+            IDs that were moved, in the order given
+        """
+        blocked = set()
+        if to_tag != from_tag:
+            blocked = self._active_tag_ids(conn, object_type, to_tag, object_ids)
+        changed = [oid for oid in object_ids if oid not in blocked]
+        self._close_active_tags(
+            conn, [(object_type, oid, from_tag) for oid in changed], now, actor
+        )
+        self._insert_active_tags(
+            conn,
+            [(object_type, oid, to_tag) for oid in changed],
+            now,
+            actor,
+            metadata,
+        )
+        return changed
+
+    def _query_tags(self, query_sql: str, params: Tuple) -> List[sqlite3.Row]:
+        """Run a read-only query against the tag tables."""
+        self._ensure_tags_table()
+
+        conn = self._get_connection()
+        try:
+            return conn.execute(query_sql, params).fetchall()
+        finally:
+            conn.close()
 
     def get_tags(
         self, object_type: str, object_id: str, active_only: bool = True
     ) -> List[Dict[str, Any]]:
         """Get all tags for an object."""
-        self._ensure_tags_table()
-
         if active_only:
             query_sql = """
             SELECT tag, applied_at, applied_by, metadata
-            FROM tags
-            WHERE object_type = ? AND object_id = ? AND removed_at IS NULL
+            FROM tags_active
+            WHERE object_type = ? AND object_id = ?
             ORDER BY applied_at DESC
             """
             params = (object_type, object_id)
         else:
-            query_sql = """
-            SELECT tag, applied_at, applied_by, removed_at, removed_by, metadata
-            FROM tags
+            query_sql = f"""
+            SELECT * FROM ({_ALL_TAGS_SQL})
             WHERE object_type = ? AND object_id = ?
             ORDER BY applied_at DESC
             """
             params = (object_type, object_id)
 
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query_sql, params)
-            rows = cursor.fetchall()
-            conn.close()
-
             tags = []
-            for row in rows:
+            for row in self._query_tags(query_sql, params):
                 tag_data = {
                     "tag": row["tag"],
                     "applied_at": row["applied_at"],
@@ -1429,8 +2214,8 @@ class SQLiteRepository(BaseRepository):
                 }
 
                 if not active_only:
-                    tag_data["removed_at"] = row.get("removed_at")
-                    tag_data["removed_by"] = row.get("removed_by")
+                    tag_data["removed_at"] = row["removed_at"]
+                    tag_data["removed_by"] = row["removed_by"]
 
                 tags.append(tag_data)
 
@@ -1442,21 +2227,13 @@ class SQLiteRepository(BaseRepository):
 
     def has_tag(self, object_type: str, object_id: str, tag: str) -> bool:
         """Check if an object has a specific tag."""
-        self._ensure_tags_table()
-
         query_sql = """
-        SELECT COUNT(*) FROM tags
-        WHERE object_type = ? AND object_id = ? AND tag = ? AND removed_at IS NULL
+        SELECT 1 FROM tags_active
+        WHERE object_type = ? AND object_id = ? AND tag = ?
         """
 
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query_sql, (object_type, object_id, tag))
-            count = cursor.fetchone()[0]
-            conn.close()
-
-            return count > 0
+            return bool(self._query_tags(query_sql, (object_type, object_id, tag)))
 
         except Exception as e:
             logger.error(
@@ -1468,68 +2245,175 @@ class SQLiteRepository(BaseRepository):
         self, object_type: str, tag: str, active_only: bool = True
     ) -> List[str]:
         """Get all object IDs with a specific tag."""
-        self._ensure_tags_table()
-
         if active_only:
             query_sql = """
-            SELECT DISTINCT object_id
-            FROM tags
-            WHERE object_type = ? AND tag = ? AND removed_at IS NULL
+            SELECT object_id
+            FROM tags_active
+            WHERE object_type = ? AND tag = ?
             ORDER BY applied_at DESC
             """
         else:
-            query_sql = """
-            SELECT DISTINCT object_id
-            FROM tags
+            query_sql = f"""
+            SELECT object_id
+            FROM ({_ALL_TAGS_SQL})
             WHERE object_type = ? AND tag = ?
-            ORDER BY applied_at DESC
+            GROUP BY object_id
+            ORDER BY MAX(applied_at) DESC
             """
 
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query_sql, (object_type, tag))
-            rows = cursor.fetchall()
-            conn.close()
-
+            rows = self._query_tags(query_sql, (object_type, tag))
             return [row["object_id"] for row in rows]
 
         except Exception as e:
             logger.error(f"Failed to get objects by tag '{tag}' for {object_type}: {e}")
             return []
 
+    def query_objects_by_tags(
+        self,
+        object_type: str,
+        all_of: Optional[List[str]] = None,
+        any_of: Optional[List[str]] = None,
+        none_of: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Find objects by a combination of active tags.
+
+        Compiled to one query grouping tags_active by object; the UNIQUE
+        constraint guarantees SUM(tag IN (...)) counts distinct tags.
+        """
+        all_of = list(dict.fromkeys(all_of or []))
+        any_of = list(dict.fromkeys(any_of or []))
+        none_of = list(dict.fromkeys(none_of or []))
+
+        def in_list(tags):
+            return f"tag IN ({', '.join('?' * len(tags))})"
+
+        where = ["object_type = ?"]
+        params: List[Any] = [object_type]
+        if all_of or any_of:
+            # Only rows that can affect the result are grouped
+            relevant = list(dict.fromkeys(all_of + any_of + none_of))
+            where.append(in_list(relevant))
+            params.extend(relevant)
+
+        having = []
+        if all_of:
+            having.append(f"SUM({in_list(all_of)}) = ?")
+            params.extend(all_of + [len(all_of)])
+        if any_of:
+            having.append(f"SUM({in_list(any_of)}) > 0")
+            params.extend(any_of)
+        if none_of:
+            having.append(f"SUM({in_list(none_of)}) = 0")
+            params.extend(none_of)
+
+        query_sql = f"""
+        SELECT object_id
+        FROM tags_active
+        WHERE {' AND '.join(where)}
+        GROUP BY object_id
+        {'HAVING ' + ' AND '.join(having) if having else ''}
+        ORDER BY MAX(applied_at) DESC, object_id
+        """
+        if limit is not None:
+            query_sql += " LIMIT ?"
+            params.append(limit)
+
+        try:
+            rows = self._query_tags(query_sql, tuple(params))
+            return [row["object_id"] for row in rows]
+
+        except Exception as e:
+            logger.error(f"Failed to query objects by tags for {object_type}: {e}")
+            return []
+
+    def page_objects_by_tag(
+        self,
+        object_type: str,
+        tag: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[Tuple[str, str]]:
+        """Get one page of the objects with an active tag using a keyset query."""
+        query_sql = """
+        SELECT applied_at, object_id
+        FROM tags_active
+        WHERE object_type = ? AND tag = ?
+        """
+        params: List[Any] = [object_type, tag]
+        if after is not None:
+            query_sql += " AND (applied_at < ? OR (applied_at = ? AND object_id > ?))"
+            params.extend([after[0], after[0], after[1]])
+        query_sql += " ORDER BY applied_at DESC, object_id"
+        if limit is not None:
+            query_sql += " LIMIT ?"
+            params.append(limit)
+
+        try:
+            rows = self._query_tags(query_sql, tuple(params))
+            return [(row["applied_at"], row["object_id"]) for row in rows]
+
+        except Exception as e:
+            logger.error(
+                f"Failed to page objects by tag '{tag}' for {object_type}: {e}"
+            )
+            return []
+
+    def get_tag_changes(
+        self, object_type: str, since: int = 0, limit: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Get the logged changes of a form after a sequence number."""
+        query_sql = """
+        SELECT seq, object_id, tag, op, changed_at
+        FROM tag_changes
+        WHERE object_type = ? AND seq > ?
+        ORDER BY seq
+        """
+        params: List[Any] = [object_type, since]
+        if limit is not None:
+            query_sql += " LIMIT ?"
+            params.append(limit)
+
+        rows = self._query_tags(query_sql, tuple(params))
+        # Checked after reading: if nothing after `since` was trimmed by
+        # now, nothing was trimmed before the read either
+        oldest = self._query_tags("SELECT MIN(seq) AS seq FROM tag_changes", ())[0]
+        if oldest["seq"] is not None and oldest["seq"] > since + 1:
+            return None
+
+        return [dict(row) for row in rows]
+
+    def get_change_cursor(self) -> int:
+        """Get the latest change sequence number, which survives trimming."""
+        rows = self._query_tags(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'tag_changes'", ()
+        )
+        return rows[0]["seq"] if rows else 0
+
     def get_tag_history(
         self, object_type: str, object_id: str, tag: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Get complete tag history for an object."""
-        self._ensure_tags_table()
-
         if tag:
-            query_sql = """
-            SELECT tag, applied_at, applied_by, removed_at, removed_by, metadata
-            FROM tags
+            query_sql = f"""
+            SELECT * FROM ({_ALL_TAGS_SQL})
             WHERE object_type = ? AND object_id = ? AND tag = ?
             ORDER BY applied_at DESC
             """
             params = (object_type, object_id, tag)
         else:
-            query_sql = """
-            SELECT tag, applied_at, applied_by, removed_at, removed_by, metadata
-            FROM tags
+            query_sql = f"""
+            SELECT * FROM ({_ALL_TAGS_SQL})
             WHERE object_type = ? AND object_id = ?
             ORDER BY applied_at DESC
             """
             params = (object_type, object_id)
 
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query_sql, params)
-            rows = cursor.fetchall()
-            conn.close()
-
             history = []
-            for row in rows:
+            for row in self._query_tags(query_sql, params):
                 history.append(
                     {
                         "tag": row["tag"],
@@ -1553,38 +2437,285 @@ class SQLiteRepository(BaseRepository):
             return []
 
     def get_tag_statistics(self, object_type: str) -> Dict[str, int]:
-        """Get statistics about tag usage."""
-        self._ensure_tags_table()
-
+        """Get statistics about tag usage from the tag_counts counters."""
         query_sql = """
-        SELECT tag, COUNT(DISTINCT object_id) as count
-        FROM tags
-        WHERE object_type = ? AND removed_at IS NULL
-        GROUP BY tag
+        SELECT tag, count
+        FROM tag_counts
+        WHERE object_type = ?
         ORDER BY count DESC, tag ASC
         """
 
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query_sql, (object_type,))
-            rows = cursor.fetchall()
-            conn.close()
-
-            statistics = {}
-            for row in rows:
-                statistics[row["tag"]] = row["count"]
-
-            return statistics
+            rows = self._query_tags(query_sql, (object_type,))
+            return {row["tag"]: row["count"] for row in rows}
 
         except Exception as e:
             logger.error(f"Failed to get tag statistics for {object_type}: {e}")
             return {}
 
+    def rebuild_tag_statistics(self, object_type: str) -> Dict[str, int]:
+        """Recompute the tag_counts counters of a form from tags_active."""
+        self._ensure_tags_table()
+
+        conn = self._get_connection()
+        conn.isolation_level = None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._rebuild_tag_counts(conn, object_type)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+        logger.info(f"Rebuilt tag statistics for {object_type}")
+        return self.get_tag_statistics(object_type)
+
+    def purge_orphan_tags(self, object_type: str) -> int:
+        """Delete the tags of records that no longer exist, one anti-join per table."""
+        if not self.exists(object_type):
+            logger.warning(f"Cannot purge orphan tags: no table for {object_type}")
+            return 0
+
+        self._ensure_tags_table()
+        table_name = self._get_table_name(object_type)
+
+        conn = self._get_connection()
+        conn.isolation_level = None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                purged = 0
+                for tags_table in ("tags_active", "tags_history"):
+                    cursor = conn.execute(
+                        f"""
+                        DELETE FROM {tags_table}
+                        WHERE object_type = ?
+                          AND NOT EXISTS (
+                              SELECT 1 FROM {table_name} r
+                              WHERE r.record_id = {tags_table}.object_id
+                          )
+                        """,
+                        (object_type,),
+                    )
+                    purged += cursor.rowcount
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+        logger.info(f"Purged {purged} orphan tag rows for {object_type}")
+        return purged
+
     # =========================================================================
     # BULK OPERATIONS (Performance Optimization)
     # =========================================================================
 
+    @contextmanager
+    def fast_load(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        commit_rows: Optional[int] = None,
+        journal_mode: str = "WAL",
+    ) -> Iterator[FastLoadSession]:
+        """
+        Open a fast-load session for bulk loading a form's table.
+
+        For the duration of the session, bulk_create() calls for the form
+        from the opening thread share one dedicated connection that:
+        - runs with synchronous=OFF, the given journal_mode and a large
+          page cache
+        - loads into the table without its secondary indexes (dropped on
+          the first write, rebuilt in one pass when the session ends)
+        - records the dropped indexes and the original journal mode in
+          FAST_LOAD_STATE_TABLE, so if the process dies mid-load the next
+          session for the table (e.g. the resumed migration) rebuilds the
+          indexes and restores the journal mode
+        - commits only when the caller calls session.commit() (e.g. when
+          session.commit_due() reports commit_rows pending rows) and when
+          the session ends
+
+        Normal connection settings are restored at the end. The journal
+        mode is persistent, so it is restored once no other fast-load
+        session is open; if another connection prevents leaving WAL, a
+        warning is logged and the next session retries. If the block
+        raises, rows written since the last commit are rolled back.
+
+        WAL (default) keeps the database consistent if the process dies
+        mid-load and lets other connections read during the load; MEMORY is
+        slightly faster but a crash during a transaction can corrupt the
+        database. With synchronous=OFF, committed rows can still be lost
+        (but not corrupted) on power loss until the next checkpoint.
+
+        Args:
+            form_path: Path to the form
+            spec: Form specification
+            commit_rows: Pending rows after which commit_due() is True
+                (default: FAST_LOAD_COMMIT_ROWS)
+            journal_mode: Journal mode for the load ("WAL" or "MEMORY")
+
+        Yields:
+            FastLoadSession
+
+        Example:
+            with repo.fast_load('contatos', spec) as session:
+                for batch in batches:
+                    repo.bulk_create('contatos', spec, batch)
+                    if session.commit_due():
+                        session.commit()
+        """
+        table_name = self._get_table_name(form_path)
+        if table_name in self._fast_load_sessions:
+            raise RuntimeError(f"A fast-load session is already open for {table_name}")
+
+        conn = self._get_connection()
+        original = {
+            pragma: conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+            for pragma in ("journal_mode", "synchronous", "cache_size")
+        }
+        original["journal_mode"] = self._record_journal_mode(
+            conn, table_name, original["journal_mode"]
+        )
+        conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(f"PRAGMA cache_size = -{FAST_LOAD_CACHE_KIB}")
+
+        session = FastLoadSession(
+            conn, table_name, commit_rows or FAST_LOAD_COMMIT_ROWS
+        )
+        self._fast_load_sessions[table_name] = session
+        start_time = time.time()
+        try:
+            yield session
+            session.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            del self._fast_load_sessions[table_name]
+            try:
+                session.rebuild_indexes()
+                conn.execute(f"PRAGMA cache_size = {original['cache_size']}")
+                conn.execute(f"PRAGMA synchronous = {original['synchronous']}")
+                self._restore_journal_mode(conn, table_name, original["journal_mode"])
+            finally:
+                conn.close()
+
+        elapsed = time.time() - start_time
+        logger.info(
+            f"Fast-loaded {session.rows_loaded} rows into {table_name} "
+            f"in {elapsed:.2f}s"
+        )
+
+    @staticmethod
+    def _record_journal_mode(
+        conn: sqlite3.Connection, table_name: str, current: str
+    ) -> str:
+        """
+        Record the journal mode a fast-load session must restore.
+
+        If an earlier session is open or was interrupted, the mode it
+        recorded is the original one, not the current (fast-load) mode.
+
+        Returns:
+            Journal mode to restore when the session ends
+        """
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {FAST_LOAD_STATE_TABLE} ("
+            f"table_name TEXT NOT NULL, kind TEXT NOT NULL, name TEXT NOT NULL, "
+            f"value TEXT NOT NULL, PRIMARY KEY (table_name, kind, name))"
+        )
+        recorded = conn.execute(
+            f"SELECT value FROM {FAST_LOAD_STATE_TABLE} "
+            f"WHERE kind = 'pragma' AND name = 'journal_mode' LIMIT 1"
+        ).fetchone()
+        original = recorded[0] if recorded else current
+        conn.execute(
+            f"INSERT OR REPLACE INTO {FAST_LOAD_STATE_TABLE} "
+            f"(table_name, kind, name, value) "
+            f"VALUES (?, 'pragma', 'journal_mode', ?)",
+            (table_name, original),
+        )
+        conn.commit()
+        return original
+
+    def _restore_journal_mode(
+        self, conn: sqlite3.Connection, table_name: str, original: str
+    ) -> None:
+        """
+        Restore the recorded journal mode once no fast-load session is open.
+
+        On success the records of all sessions, including interrupted ones,
+        are removed; otherwise they are kept for the next session to retry.
+        """
+        if self._fast_load_sessions:
+            # Another session of this repository restores it when it ends
+            conn.execute(
+                f"DELETE FROM {FAST_LOAD_STATE_TABLE} "
+                f"WHERE table_name = ? AND kind = 'pragma'",
+                (table_name,),
+            )
+            conn.commit()
+            return
+
+        mode = conn.execute(f"PRAGMA journal_mode = {original}").fetchone()[0]
+        if mode.lower() != original.lower():
+            # Leaving WAL needs the database to itself
+            logger.warning(
+                f"Could not restore journal_mode={original} after fast load "
+                f"(still {mode}); the next fast-load session retries"
+            )
+            return
+        conn.execute(f"DELETE FROM {FAST_LOAD_STATE_TABLE} WHERE kind = 'pragma'")
+        conn.commit()
+
+    @staticmethod
+    def _bulk_values(
+        spec: Dict[str, Any], records: List[Dict[str, Any]], record_ids: List[str]
+    ) -> List[tuple]:
+        """
+        Convert records to INSERT parameter rows (record_id, then fields).
+
+        Converts one column at a time, so each field's type dispatch happens
+        once per batch instead of once per value.
+
+        Args:
+            spec: Form specification
+            records: Records to insert
+            record_ids: IDs of the records, in the same order
+
+        Returns:
+            List of parameter tuples
+        """
+        columns = [record_ids]
+        for field in spec["fields"]:
+            field_name = field["name"]
+            field_type = field["type"]
+            values = [record.get(field_name, "") for record in records]
+
+            # Convert based on field type
+            if field_type == "checkbox":
+                values = [1 if value else 0 for value in values]
+            elif field_type == "number" or field_type == "range":
+                numbers = []
+                for value in values:
+                    try:
+                        numbers.append(int(value) if value else 0)
+                    except (TypeError, ValueError):
+                        numbers.append(0)
+                values = numbers
+            else:
+                values = [str(value) if value else "" for value in values]
+
+            columns.append(values)
+
+        return list(zip(*columns))
+
     def bulk_create(
         self, form_path: str, spec: Dict[str, Any], records: List[Dict[str, Any]]
     ) -> List[Optional[str]]:
@@ -1611,37 +2742,19 @@ class SQLiteRepository(BaseRepository):
 
         table_name = self._get_table_name(form_path)
 
-        if not self.exists(form_path):
-            self.create_storage(form_path, spec)
-
-        # Prepare all records with UUIDs
-        record_ids = []
-        all_values = []
-
-        for record in records:
-            # Use existing UUID if provided (for migrations), otherwise generate new one
-            record_id = record.get("_record_id") or generate_id()
-            record_ids.append(record_id)
-
-            # Extract values (record_id first, then field values)
-            values = [record_id]
-            for field in spec["fields"]:
-                field_name = field["name"]
-                field_type = field["type"]
-                value = record.get(field_name, "")
+        session = self._fast_load_sessions.get(table_name)
+        if session is not None and session.thread_id != threading.get_ident():
+            session = None
 
-                # Convert based on field type
-                if field_type == "checkbox":
-                    values.append(1 if value else 0)
-                elif field_type == "number" or field_type == "range":
-                    try:
-                        values.append(int(value) if value else 0)
-                    except ValueError:
-                        values.append(0)
-                else:
-                    values.append(str(value) if value else "")
+        if session is None or session.dropped_indexes is None:
+            if not self.exists(form_path):
+                self.create_storage(form_path, spec)
+            if session is not None:
+                session.drop_indexes()
 
-            all_values.append(values)
+        # Use existing UUIDs if provided (for migrations), otherwise generate new ones
+        record_ids = [record.get("_record_id") or generate_id() for record in records]
+        all_values = self._bulk_values(spec, records, record_ids)
 
         # Build INSERT statement
         field_names = ["record_id"] + [field["name"] for field in spec["fields"]]
@@ -1650,10 +2763,15 @@ class SQLiteRepository(BaseRepository):
         insert_sql = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
 
         try:
-            import time
-
             start_time = time.time()
 
+            if session is not None:
+                # Committed by the session owner
+                session.conn.executemany(insert_sql, all_values)
+                session.pending += len(records)
+                session.rows_loaded += len(records)
+                return record_ids
+
             conn = self._get_connection()
             cursor = conn.cursor()
 
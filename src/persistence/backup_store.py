@@ -0,0 +1,496 @@
+"""
+Content-addressed backup store for VibeCForms persistence layer.
+
+Backups are split into chunks; every chunk is stored once, compressed,
+under the SHA-256 of its contents, and each backup is a small JSON
+manifest listing its chunks in order:
+
+    <root>/objects/ab/ab12...ef          zlib-compressed chunk
+    <root>/manifests/<series>/<ts>.json  one manifest per backup
+
+Successive backups of the same data (a TXT file before each schema
+change, a table dump, a manual backup of a form) share every chunk that
+did not change, so backup space and write I/O grow with the amount of
+changed data instead of with the number of backups.
+
+Line-oriented data (TXT files, table dumps, record dumps) is chunked at
+content-defined line boundaries, so inserting or deleting a line only
+changes the chunk around it. Binary files (SQLite databases) are chunked
+at fixed offsets aligned to database pages.
+
+Restores stream chunk by chunk and verify every chunk against its hash.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+from persistence.backups import get_retention_policy, select_expired
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Content-defined line chunking: cut after a line whose CRC matches the
+# boundary mask once the chunk holds at least CHUNK_MIN_SIZE bytes
+CHUNK_MIN_SIZE = 16 * 1024
+CHUNK_MAX_SIZE = 256 * 1024
+CHUNK_BOUNDARY_MASK = 0x1F
+
+# Fixed-size chunks for binary files (a multiple of every SQLite page size)
+FIXED_CHUNK_SIZE = 64 * 1024
+
+COMPRESSION_LEVEL = 6
+
+# Objects touched more recently than this are never garbage collected, so
+# a backup being written concurrently keeps the chunks it deduplicated
+GC_GRACE_SECONDS = 3600
+
+
+def chunk_lines(
+    lines: Iterable[bytes],
+    min_size: int = CHUNK_MIN_SIZE,
+    max_size: int = CHUNK_MAX_SIZE,
+) -> Iterator[bytes]:
+    """
+    Group lines into content-defined chunks.
+
+    A chunk ends after a line whose CRC-32 matches the boundary mask (once
+    the chunk is at least min_size bytes), or at max_size bytes. Since
+    boundaries depend on line contents rather than offsets, an edit only
+    changes the chunks around it; later chunks line up again.
+
+    Args:
+        lines: Lines including their line terminators
+        min_size: Minimum chunk size in bytes
+        max_size: Maximum chunk size in bytes
+
+    Yields:
+        Chunks made of whole lines
+    """
+    buffer: List[bytes] = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= max_size or (
+            size >= min_size and zlib.crc32(line) & CHUNK_BOUNDARY_MASK == 0
+        ):
+            yield b"".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def chunk_file(path: str, chunk_size: int = FIXED_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Read a file in fixed-size chunks.
+
+    Args:
+        path: File to read
+        chunk_size: Chunk size in bytes
+
+    Yields:
+        Chunks of up to chunk_size bytes
+    """
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+class BackupStore:
+    """
+    Deduplicating, compressed backup store rooted at a directory.
+
+    Backups are identified by "<series>/<timestamp>" IDs. A series groups
+    the backups of one thing (e.g. one table or one form); retention is
+    applied per series.
+    """
+
+    def __init__(self, root: str):
+        """
+        Initialize the store.
+
+        Args:
+            root: Store directory (created on first write)
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "manifests"
+
+    # =========================================================================
+    # WRITING
+    # =========================================================================
+
+    def put_file(
+        self,
+        series: str,
+        path: str,
+        kind: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        line_chunks: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Back up a file.
+
+        Args:
+            series: Backup series name
+            path: File to back up
+            kind: Backup kind, recorded in the manifest (e.g. "txt")
+            metadata: Extra manifest metadata
+            line_chunks: Chunk at line boundaries (text files) instead of at
+                fixed offsets (binary files)
+
+        Returns:
+            The backup's manifest
+        """
+        if line_chunks:
+            with open(path, "rb") as f:
+                return self.put_chunks(series, chunk_lines(f), kind, metadata)
+        return self.put_chunks(series, chunk_file(path), kind, metadata)
+
+    def put_lines(
+        self,
+        series: str,
+        lines: Iterable[bytes],
+        kind: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Back up a stream of lines (e.g. a table or record dump).
+
+        Args:
+            series: Backup series name
+            lines: Lines including their line terminators
+            kind: Backup kind, recorded in the manifest
+            metadata: Extra manifest metadata
+
+        Returns:
+            The backup's manifest
+        """
+        return self.put_chunks(series, chunk_lines(lines), kind, metadata)
+
+    def put_chunks(
+        self,
+        series: str,
+        chunks: Iterable[bytes],
+        kind: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Back up a stream of chunks, storing only chunks not already stored.
+
+        The manifest is written last, so an interrupted backup leaves at
+        most unreferenced chunks behind (removed by gc()).
+
+        Args:
+            series: Backup series name
+            chunks: Backup contents, in order
+            kind: Backup kind, recorded in the manifest
+            metadata: Extra manifest metadata
+
+        Returns:
+            The backup's manifest
+        """
+        created = datetime.now()
+        backup_id = f"{series}/{created.strftime('%Y%m%d_%H%M%S_%f')}"
+
+        digest = hashlib.sha256()
+        refs = []
+        size = 0
+        stored_bytes = 0
+        for chunk in chunks:
+            key = hashlib.sha256(chunk).hexdigest()
+            digest.update(chunk)
+            size += len(chunk)
+            stored_bytes += self._put_object(key, chunk)
+            refs.append([key, len(chunk)])
+
+        manifest = {
+            "id": backup_id,
+            "series": series,
+            "kind": kind,
+            "created_at": created.isoformat(),
+            "size": size,
+            "sha256": digest.hexdigest(),
+            "stored_bytes": stored_bytes,
+            "chunks": refs,
+            "metadata": metadata or {},
+        }
+
+        manifest_path = self._manifest_path(backup_id)
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(manifest_path, json.dumps(manifest).encode("utf-8"))
+
+        logger.info(
+            f"Created backup {backup_id}: {size} bytes in {len(refs)} chunks, "
+            f"{stored_bytes} new bytes stored"
+        )
+        return manifest
+
+    def _put_object(self, key: str, chunk: bytes) -> int:
+        """
+        Store a chunk unless it is already stored.
+
+        Returns:
+            Compressed bytes written (0 if the chunk was deduplicated)
+        """
+        path = self._object_path(key)
+        if path.exists():
+            # Refresh mtime so a concurrent gc() keeps the chunk
+            try:
+                os.utime(path)
+                return 0
+            except OSError:
+                pass
+
+        data = zlib.compress(chunk, COMPRESSION_LEVEL)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(path, data)
+        return len(data)
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        """Write a file through a temporary file and an atomic rename."""
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # =========================================================================
+    # READING
+    # =========================================================================
+
+    def get_manifest(self, backup_id: str) -> Dict[str, Any]:
+        """
+        Load a backup's manifest.
+
+        Args:
+            backup_id: Backup ID
+
+        Returns:
+            Manifest dictionary
+
+        Raises:
+            ValueError: If the backup does not exist
+        """
+        path = self._manifest_path(backup_id)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise ValueError(f"Backup '{backup_id}' not found in {self.root}")
+
+    def list_backups(self, series: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List backups, oldest first.
+
+        Args:
+            series: Only list this series (None = all series)
+
+        Returns:
+            Manifests of the matching backups
+        """
+        pattern = f"{series}/*.json" if series else "*/*.json"
+        manifests = []
+        for path in self.manifests_dir.glob(pattern):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    manifests.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable manifest {path}: {e}")
+        return sorted(manifests, key=lambda m: m["created_at"])
+
+    def iter_chunks(self, backup_id: str) -> Iterator[bytes]:
+        """
+        Stream a backup's contents chunk by chunk.
+
+        Args:
+            backup_id: Backup ID
+
+        Yields:
+            Decompressed chunks, in order
+
+        Raises:
+            ValueError: If the backup does not exist or a chunk is missing
+                or corrupt
+        """
+        manifest = self.get_manifest(backup_id)
+        for key, length in manifest["chunks"]:
+            try:
+                with open(self._object_path(key), "rb") as f:
+                    chunk = zlib.decompress(f.read())
+            except (OSError, zlib.error) as e:
+                raise ValueError(f"Backup '{backup_id}': chunk {key} unreadable: {e}")
+            if len(chunk) != length or hashlib.sha256(chunk).hexdigest() != key:
+                raise ValueError(f"Backup '{backup_id}': chunk {key} is corrupt")
+            yield chunk
+
+    def iter_lines(self, backup_id: str) -> Iterator[bytes]:
+        """
+        Stream a line-oriented backup line by line.
+
+        Args:
+            backup_id: Backup ID
+
+        Yields:
+            Lines including their line terminators
+        """
+        pending = b""
+        for chunk in self.iter_chunks(backup_id):
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line + b"\n"
+        if pending:
+            yield pending
+
+    def restore_file(self, backup_id: str, dest_path: str) -> str:
+        """
+        Restore a backup into a file.
+
+        The file is written through a temporary file and only replaces
+        dest_path once the whole backup has been verified.
+
+        Args:
+            backup_id: Backup ID
+            dest_path: File to restore to
+
+        Returns:
+            dest_path
+
+        Raises:
+            ValueError: If the backup is missing or corrupt
+        """
+        manifest = self.get_manifest(backup_id)
+        dest_dir = os.path.dirname(os.path.abspath(dest_path))
+        os.makedirs(dest_dir, exist_ok=True)
+
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=dest_dir, suffix=".restore")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in self.iter_chunks(backup_id):
+                    digest.update(chunk)
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            if digest.hexdigest() != manifest["sha256"]:
+                raise ValueError(f"Backup '{backup_id}' failed verification")
+            os.replace(tmp_path, dest_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        logger.info(f"Restored backup {backup_id} to {dest_path}")
+        return dest_path
+
+    # =========================================================================
+    # RETENTION
+    # =========================================================================
+
+    def delete(self, backup_id: str) -> None:
+        """
+        Delete a backup's manifest (its chunks are removed by gc()).
+
+        Args:
+            backup_id: Backup ID
+        """
+        self._manifest_path(backup_id).unlink()
+
+    def prune(
+        self,
+        series: str,
+        keep_last: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+    ) -> List[str]:
+        """
+        Delete old backups of a series according to the retention policy,
+        then remove chunks no backup references anymore.
+
+        Args:
+            series: Backup series name
+            keep_last: Backups to keep (default: configured policy)
+            max_age_days: Delete backups older than this (default: configured
+                policy); the newest backup is always kept
+
+        Returns:
+            IDs of the deleted backups
+        """
+        if keep_last is None and max_age_days is None:
+            policy = get_retention_policy()
+            keep_last = policy["keep_last"]
+            max_age_days = policy["max_age_days"]
+
+        backups = [
+            (m["id"], datetime.fromisoformat(m["created_at"]).timestamp())
+            for m in self.list_backups(series)
+        ]
+
+        deleted = []
+        for backup_id in select_expired(backups, keep_last, max_age_days):
+            try:
+                self.delete(backup_id)
+                deleted.append(backup_id)
+            except OSError as e:
+                logger.warning(f"Failed to prune backup {backup_id}: {e}")
+
+        if deleted:
+            logger.info(f"Pruned {len(deleted)} old backups of {series}")
+            self.gc()
+        return deleted
+
+    def gc(self, grace_seconds: float = GC_GRACE_SECONDS) -> int:
+        """
+        Remove chunks that no manifest references.
+
+        Args:
+            grace_seconds: Keep unreferenced chunks touched more recently
+                than this (they may belong to a backup still being written)
+
+        Returns:
+            Number of chunks removed
+        """
+        referenced = set()
+        for manifest in self.list_backups():
+            referenced.update(key for key, _ in manifest["chunks"])
+
+        cutoff = time.time() - grace_seconds
+        removed = 0
+        for path in self.objects_dir.glob("*/*"):
+            if path.name in referenced:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError as e:
+                logger.warning(f"Failed to remove backup chunk {path}: {e}")
+
+        if removed:
+            logger.info(f"Removed {removed} unreferenced backup chunks")
+        return removed
+
+    def _object_path(self, key: str) -> Path:
+        """Get the path of a chunk object."""
+        return self.objects_dir / key[:2] / key
+
+    def _manifest_path(self, backup_id: str) -> Path:
+        """Get the path of a backup's manifest."""
+        series, _, timestamp = backup_id.rpartition("/")
+        return self.manifests_dir / series / f"{timestamp}.json"
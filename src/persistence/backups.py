@@ -0,0 +1,393 @@
+"""
+Backup helpers for VibeCForms persistence layer.
+
+This module takes consistent online backups of SQLite databases (whole
+database or a single table) without blocking concurrent writers for the
+duration of the copy, streams logical table dumps for the backup store
+(see persistence.backup_store), and prunes old backups according to the
+configured retention policy.
+
+Retention is read from the "backup_retention" setting of persistence.json:
+
+    "backup_retention": {"keep_last": 10, "max_age_days": 30}
+
+keep_last is applied per backup series (e.g. all backups of one database
+or one form); max_age_days removes older backups, but never the newest
+one of a series.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Pages copied per backup step; locks are released between steps
+BACKUP_PAGES_PER_STEP = 256
+# Pause between backup steps (seconds), giving writers a window
+BACKUP_STEP_SLEEP = 0.005
+# Rows read per transaction by table dumps; locks are released between batches
+DUMP_BATCH_ROWS = 1000
+
+DEFAULT_RETENTION = {"keep_last": 10, "max_age_days": None}
+
+
+def backup_sqlite(
+    source_db: str,
+    dest_path: str,
+    table: Optional[str] = None,
+    pages: int = BACKUP_PAGES_PER_STEP,
+    sleep: float = BACKUP_STEP_SLEEP,
+    timeout: float = 10,
+) -> str:
+    """
+    Take an online backup of a SQLite database or of one of its tables.
+
+    Whole-database backups use the sqlite3 backup API in steps of `pages`
+    pages, so other connections can keep writing between steps (if the
+    source changes mid-backup, SQLite restarts the copy to keep it
+    consistent). Table backups copy the table's schema, its indexes and
+    all rows in a single read transaction, giving a consistent snapshot of
+    that table only.
+
+    Args:
+        source_db: Path to the source database
+        dest_path: Path of the backup file to create
+        table: Only back up this table (None = whole database)
+        pages: Pages copied per step (whole-database backups)
+        sleep: Seconds to sleep between steps
+        timeout: Connection timeout in seconds
+
+    Returns:
+        dest_path
+
+    Raises:
+        sqlite3.Error: If the backup fails (the partial file is removed)
+        ValueError: If the table does not exist
+    """
+    Path(dest_path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{dest_path}.partial"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    try:
+        if table is None:
+            source = sqlite3.connect(source_db, timeout=timeout)
+            dest = sqlite3.connect(tmp_path)
+            try:
+                source.backup(dest, pages=pages, sleep=sleep)
+            finally:
+                dest.close()
+                source.close()
+        else:
+            _backup_table(source_db, tmp_path, table, timeout)
+
+        os.replace(tmp_path, dest_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return dest_path
+
+
+def _backup_table(source_db: str, dest_path: str, table: str, timeout: float) -> None:
+    """Copy one table (schema, indexes and rows) into a new database file."""
+    dest = sqlite3.connect(dest_path, timeout=timeout)
+    try:
+        dest.execute("ATTACH DATABASE ? AS source", (source_db,))
+        schema = dest.execute(
+            "SELECT type, sql FROM source.sqlite_master "
+            "WHERE tbl_name = ? AND sql IS NOT NULL "
+            "ORDER BY type = 'index'",
+            (table,),
+        ).fetchall()
+        if not schema:
+            raise ValueError(f"Table '{table}' not found in {source_db}")
+
+        # One transaction: schema and rows come from the same snapshot
+        dest.execute("BEGIN")
+        for _, sql in schema:
+            dest.execute(sql)
+        dest.execute(f"INSERT INTO main.{table} SELECT * FROM source.{table}")
+        dest.commit()
+    finally:
+        dest.close()
+
+
+def restore_sqlite(
+    backup_path: str,
+    dest_db: str,
+    table: Optional[str] = None,
+    timeout: float = 10,
+) -> None:
+    """
+    Restore a database (or one table) from a backup_sqlite() backup.
+
+    Whole-database restores go through the backup API into the live
+    database, so open connections see the restored content instead of a
+    file replaced under them. Table restores replace the table's schema
+    and rows in one transaction.
+
+    Args:
+        backup_path: Backup file
+        dest_db: Database to restore into
+        table: Restore only this table (None = whole database)
+        timeout: Connection timeout in seconds
+
+    Raises:
+        sqlite3.Error: If the restore fails
+    """
+    if table is None:
+        source = sqlite3.connect(backup_path)
+        dest = sqlite3.connect(dest_db, timeout=timeout)
+        try:
+            source.backup(dest)
+        finally:
+            dest.close()
+            source.close()
+        return
+
+    dest = sqlite3.connect(dest_db, timeout=timeout)
+    dest.isolation_level = None
+    try:
+        dest.execute("ATTACH DATABASE ? AS backup", (backup_path,))
+        schema = dest.execute(
+            "SELECT sql FROM backup.sqlite_master "
+            "WHERE tbl_name = ? AND sql IS NOT NULL "
+            "ORDER BY type = 'index'",
+            (table,),
+        ).fetchall()
+        dest.execute("BEGIN IMMEDIATE")
+        try:
+            dest.execute(f"DROP TABLE IF EXISTS main.{table}")
+            for (sql,) in schema:
+                dest.execute(sql)
+            dest.execute(f"INSERT INTO main.{table} SELECT * FROM backup.{table}")
+            dest.execute("COMMIT")
+        except Exception:
+            dest.execute("ROLLBACK")
+            raise
+    finally:
+        dest.close()
+
+
+def dump_sqlite_table(
+    source_db: str, table: str, timeout: float = 10, batch_rows: int = DUMP_BATCH_ROWS
+) -> Iterator[bytes]:
+    """
+    Stream a logical dump of one table as JSON lines.
+
+    The first line holds the table's schema, its indexes and its column
+    names; every following line is one row as a compact JSON array, in
+    rowid order. Unlike a page copy, unchanged rows produce identical lines
+    from one dump to the next, which is what lets the backup store
+    deduplicate them.
+
+    Rows are read in keyset batches of `batch_rows` (rowid > last rowid),
+    each in its own short read transaction that ends before its lines are
+    yielded. A consumer compressing and writing the lines therefore never
+    holds the database's read lock, which in rollback-journal mode would
+    block every writer's commit. Each batch is consistent, but the dump as
+    a whole is not a point-in-time snapshot: a row changed during the dump
+    appears in its old or its new version.
+
+    Args:
+        source_db: Path to the source database
+        table: Table to dump
+        timeout: Connection timeout in seconds
+        batch_rows: Rows read per transaction
+
+    Yields:
+        UTF-8 encoded lines, each ending in a newline
+
+    Raises:
+        ValueError: If the table does not exist
+    """
+    conn = sqlite3.connect(source_db, timeout=timeout)
+    # Autocommit: every fully fetched SELECT is its own read transaction
+    conn.isolation_level = None
+    try:
+        schema = conn.execute(
+            "SELECT type, sql FROM sqlite_master "
+            "WHERE tbl_name = ? AND sql IS NOT NULL "
+            "ORDER BY type = 'index', name",
+            (table,),
+        ).fetchall()
+        if not schema:
+            raise ValueError(f"Table '{table}' not found in {source_db}")
+
+        cursor = conn.execute(f"SELECT * FROM {table} LIMIT 0")
+        header = {
+            "table": table,
+            "schema": [sql for kind, sql in schema if kind != "index"],
+            "indexes": [sql for kind, sql in schema if kind == "index"],
+            "columns": [column[0] for column in cursor.description],
+        }
+        cursor.fetchall()
+        yield _dump_line(header)
+
+        first_batch = f"SELECT rowid, * FROM {table} ORDER BY rowid LIMIT ?"
+        next_batch = (
+            f"SELECT rowid, * FROM {table} WHERE rowid > ? ORDER BY rowid LIMIT ?"
+        )
+        rows = conn.execute(first_batch, (batch_rows,)).fetchall()
+        while rows:
+            for row in rows:
+                yield _dump_line(row[1:])
+            rows = conn.execute(next_batch, (rows[-1][0], batch_rows)).fetchall()
+    finally:
+        conn.close()
+
+
+def load_sqlite_table(dest_db: str, lines: Iterable[bytes], timeout: float = 10) -> int:
+    """
+    Replace a table with the contents of a dump_sqlite_table() dump.
+
+    Rows are streamed from `lines` into the table in one transaction;
+    indexes are created after the rows are loaded.
+
+    Args:
+        dest_db: Database to restore into
+        lines: Dump lines (header first)
+        timeout: Connection timeout in seconds
+
+    Returns:
+        Number of rows restored
+
+    Raises:
+        ValueError: If the dump has no header
+        sqlite3.Error: If the restore fails (the table is left unchanged)
+    """
+    lines = iter(lines)
+    try:
+        header = json.loads(next(lines))
+    except StopIteration:
+        raise ValueError("Empty table dump")
+
+    table = header["table"]
+    columns = ", ".join(header["columns"])
+    placeholders = ", ".join("?" for _ in header["columns"])
+
+    dest = sqlite3.connect(dest_db, timeout=timeout)
+    dest.isolation_level = None
+    try:
+        dest.execute("BEGIN IMMEDIATE")
+        try:
+            dest.execute(f"DROP TABLE IF EXISTS {table}")
+            for sql in header["schema"]:
+                dest.execute(sql)
+            cursor = dest.executemany(
+                f"INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+                (json.loads(line) for line in lines),
+            )
+            restored = cursor.rowcount
+            for sql in header["indexes"]:
+                dest.execute(sql)
+            dest.execute("COMMIT")
+        except Exception:
+            dest.execute("ROLLBACK")
+            raise
+    finally:
+        dest.close()
+
+    return restored
+
+
+def _dump_line(value: Any) -> bytes:
+    """Encode one dump line as compact JSON."""
+    return (json.dumps(value, ensure_ascii=False, separators=(",", ":")) + "\n").encode(
+        "utf-8"
+    )
+
+
+def get_retention_policy() -> Dict[str, Any]:
+    """
+    Get the backup retention policy from persistence.json.
+
+    Returns:
+        Dictionary with "keep_last" and "max_age_days" (None = no limit)
+    """
+    policy = dict(DEFAULT_RETENTION)
+    try:
+        from persistence.config import get_config
+
+        policy.update(get_config().get_setting("backup_retention", None) or {})
+    except Exception as e:
+        logger.debug(f"Using default backup retention: {e}")
+    return policy
+
+
+def select_expired(
+    backups: List[Tuple[Any, float]],
+    keep_last: Optional[int],
+    max_age_days: Optional[float],
+) -> List[Any]:
+    """
+    Select the backups of one series that the retention policy expires.
+
+    Args:
+        backups: (backup, created timestamp) pairs of one series
+        keep_last: Backups to keep (None = no limit)
+        max_age_days: Expire backups older than this (None = no limit);
+            the newest backup is never expired
+
+    Returns:
+        Expired backups, newest first
+    """
+    ordered = sorted(backups, key=lambda item: item[1], reverse=True)
+    cutoff = time.time() - max_age_days * 86400 if max_age_days else None
+
+    expired = []
+    for position, (backup, created) in enumerate(ordered):
+        if position == 0:
+            continue
+        too_old = cutoff is not None and created < cutoff
+        if too_old or (keep_last is not None and position >= keep_last):
+            expired.append(backup)
+    return expired
+
+
+def prune_backups(
+    directory: str,
+    pattern: str,
+    keep_last: Optional[int] = None,
+    max_age_days: Optional[float] = None,
+) -> List[str]:
+    """
+    Delete old backups of one series according to the retention policy.
+
+    Args:
+        directory: Backup directory
+        pattern: Glob pattern matching the series' backup files
+        keep_last: Backups to keep (default: configured policy)
+        max_age_days: Delete backups older than this (default: configured
+            policy); the newest backup is always kept
+
+    Returns:
+        Paths of the deleted backups
+    """
+    if keep_last is None and max_age_days is None:
+        policy = get_retention_policy()
+        keep_last = policy["keep_last"]
+        max_age_days = policy["max_age_days"]
+
+    backups = [
+        (p, p.stat().st_mtime) for p in Path(directory).glob(pattern) if p.is_file()
+    ]
+
+    deleted = []
+    for backup in select_expired(backups, keep_last, max_age_days):
+        try:
+            backup.unlink()
+            deleted.append(str(backup))
+        except OSError as e:
+            logger.warning(f"Failed to prune backup {backup}: {e}")
+
+    if deleted:
+        logger.info(f"Pruned {len(deleted)} old backups matching {pattern}")
+    return deleted
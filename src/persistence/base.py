@@ -15,9 +15,31 @@ Version 2.0 - UUID-based IDs and Tags as State:
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 import warnings
 
+# Entries kept in the tag change log before the oldest are dropped; readers
+# further behind than this must reload instead of catching up
+CHANGE_LOG_RETENTION = 10_000
+
+
+class BulkLoad:
+    """
+    Bulk-load session returned by BaseRepository.fast_load().
+
+    The default session has nothing to defer: every bulk_create() call is
+    already durable when it returns, so a commit is always due and commit()
+    is a no-op. Backends that batch commits return a subclass.
+    """
+
+    def commit_due(self) -> bool:
+        """Return True if enough writes are pending to warrant a commit."""
+        return True
+
+    def commit(self) -> None:
+        """Make all writes of the session durable."""
+
 
 class BaseRepository(ABC):
     """
@@ -178,6 +200,132 @@ class BaseRepository(ABC):
             result_ids.append(record_id)
         return result_ids
 
+    def create_with_tags(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        data: Dict[str, Any],
+        tags: List[str],
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """
+        Create a record and apply tags to it in a single write.
+
+        Used for form submissions with default_tags, so the record and its
+        initial states are stored together.
+
+        Args:
+            form_path: Path to the form
+            spec: Form specification for validation and type conversion
+            data: Dictionary containing field values (may include _record_id)
+            tags: Tags to apply to the new record
+            actor: Who applied the tags (user_id, 'ai_agent', 'system')
+            metadata: Optional metadata stored with every tag
+
+        Returns:
+            ID of the created record
+            None if creation failed
+
+        Note:
+            Default implementation calls create() and then add_tag() for
+            each tag. Subclasses should override this method to store both
+            at once (SQLite: one transaction; TXT: one append per file).
+
+        Example:
+            record_id = repo.create_with_tags(
+                'deals', spec, data, ['lead'], 'system', {'source': 'default_tags'}
+            )
+        """
+        record_id = self.create(form_path, spec, data)
+        if record_id:
+            for tag in dict.fromkeys(tags):
+                self.add_tag(form_path, record_id, tag, actor, metadata)
+        return record_id
+
+    def iter_records(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        batch_size: int = 1000,
+        after_id: Optional[str] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream all records in batches, in a stable backend-defined order.
+
+        Used by migrations to process large forms without holding the whole
+        dataset in memory. Records have the same shape as read_all() results
+        (including '_record_id').
+
+        Args:
+            form_path: Path to the form
+            spec: Form specification for field type conversion
+            batch_size: Maximum number of records per yielded batch
+            after_id: Resume point - only records that come after the record
+                with this ID (in iteration order) are returned
+
+        Yields:
+            Lists of up to batch_size record dictionaries
+
+        Raises:
+            ValueError: If after_id cannot be located
+
+        Example:
+            for batch in repo.iter_records('contatos', spec, batch_size=500):
+                target.bulk_create('contatos', spec, batch)
+
+        Note:
+            Default implementation slices read_all(), so it only bounds the
+            size of each batch, not peak memory. Subclasses should override
+            this method with a real streaming read.
+        """
+        records = self.read_all(form_path, spec)
+
+        start = 0
+        if after_id is not None:
+            for position, record in enumerate(records):
+                if record.get("_record_id") == after_id:
+                    start = position + 1
+                    break
+            else:
+                raise ValueError(
+                    f"Record '{after_id}' not found in {form_path}, cannot resume"
+                )
+
+        for offset in range(start, len(records), batch_size):
+            yield records[offset : offset + batch_size]
+
+    @contextmanager
+    def fast_load(self, form_path: str, spec: Dict[str, Any]) -> Iterator[BulkLoad]:
+        """
+        Open a bulk-load session for a form (migrations and imports).
+
+        Inside the session, bulk_create() calls for the form from the same
+        thread may trade durability of uncommitted writes for throughput.
+        Writes are only guaranteed to be durable after session.commit() or
+        once the session ends; if the block raises, uncommitted writes may
+        be discarded.
+
+        Args:
+            form_path: Path to the form being loaded
+            spec: Form specification
+
+        Yields:
+            BulkLoad session
+
+        Example:
+            with repo.fast_load('contatos', spec) as session:
+                for batch in batches:
+                    repo.bulk_create('contatos', spec, batch)
+                    if session.commit_due():
+                        session.commit()
+
+        Note:
+            Default implementation yields a session whose writes are
+            committed by each bulk_create() call.
+        """
+        yield BulkLoad()
+
     # =========================================================================
     # ID-BASED CRUD METHODS (NEW in v2.0)
     # =========================================================================
@@ -204,6 +352,54 @@ class BaseRepository(ABC):
         """
         pass
 
+    def read_by_ids(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        record_ids: List[str],
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Read several records by ID, optionally only some of their fields.
+
+        Args:
+            form_path: Path to the form
+            spec: Form specification for field type conversion
+            record_ids: IDs of the records to read
+            fields: Field names to return (None for all); '_record_id' is
+                    always included
+
+        Returns:
+            Dictionary mapping each found ID to its record
+            IDs that don't exist are left out
+
+        Note:
+            Default implementation calls read_by_id() for each ID.
+            Subclasses should override this method to read all records in
+            one pass and only the requested fields.
+
+        Example:
+            cards = repo.read_by_ids('contatos', spec, ids, fields=['nome'])
+            # {'3HNMQR8PJSG0C9VWBYTE12K': {'_record_id': '3HNM...', 'nome': 'João'}}
+        """
+        records = {}
+        for record_id in dict.fromkeys(record_ids):
+            record = self.read_by_id(form_path, spec, record_id)
+            if record:
+                records[record_id] = self._project_record(record, fields)
+        return records
+
+    @staticmethod
+    def _project_record(
+        record: Dict[str, Any], fields: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """Keep only the given fields (and '_record_id') of a record."""
+        if fields is None:
+            return record
+        projected = {name: record[name] for name in fields if name in record}
+        projected["_record_id"] = record["_record_id"]
+        return projected
+
     @abstractmethod
     def update_by_id(
         self,
@@ -625,7 +821,7 @@ class BaseRepository(ABC):
             - Same tag can exist multiple times if removed and re-added (tracked in history)
             - Should validate that object_id exists before adding tag
             - Should store timestamp automatically (ISO 8601 format)
-            - For SQLite: Insert into tags table
+            - For SQLite: Insert into tags_active table
             - For TXT: Append to .tags.txt file
 
         Example:
@@ -660,7 +856,7 @@ class BaseRepository(ABC):
         Implementation notes:
             - Should preserve tag history (mark as removed with timestamp)
             - Should not delete tag records, only mark as inactive
-            - For SQLite: Update removed_at and removed_by columns
+            - For SQLite: Move the row from tags_active to tags_history
             - For TXT: Append removal record to .tags.txt
 
         Example:
@@ -671,6 +867,192 @@ class BaseRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def transition_tag(
+        self,
+        object_type: str,
+        object_id: str,
+        from_tag: str,
+        to_tag: str,
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Move an object from one tag to another in a single atomic operation.
+
+        Removes from_tag (if active) and adds to_tag. Either both changes are
+        stored or neither is, so concurrent readers never see the object
+        with both tags or with neither.
+
+        Args:
+            object_type: Form path
+            object_id: 27-character Crockford Base32 ID of the object
+            from_tag: Current tag to remove (ignored if not active)
+            to_tag: New tag to add
+            actor: Who performed the transition (user_id, 'ai_agent', 'system')
+            metadata: Optional metadata stored with the new tag
+
+        Returns:
+            True if the transition was stored
+            False if to_tag is already active or the operation failed
+            (in which case nothing was changed)
+
+        Implementation notes:
+            - For SQLite: One transaction with a conditional UPDATE + INSERT
+            - For TXT: One locked append to the tags file
+
+        Example:
+            success = repo.transition_tag(
+                'deals', '3HNMQR8PJSG0C9VWBYTE12K',
+                'qualified', 'proposal', 'user123'
+            )
+        """
+        pass
+
+    @abstractmethod
+    def bulk_add_tag(
+        self,
+        object_type: str,
+        object_ids: List[str],
+        tag: str,
+        applied_by: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """
+        Add a tag to many objects in a single batch operation.
+
+        Performance benefits:
+        - SQLite: Single transaction instead of N probes and N commits
+        - TXT: Single append instead of N rewrites of the tags file
+
+        Args:
+            object_type: Form path
+            object_ids: IDs of the objects to tag
+            tag: Tag name to add
+            applied_by: Who applied the tag (user_id, 'ai_agent', 'system')
+            metadata: Optional metadata stored with every new tag
+
+        Returns:
+            IDs the tag was added to, in request order
+            (objects that already had the tag are skipped)
+            Empty list if the operation failed (nothing was changed)
+
+        Example:
+            tagged = repo.bulk_add_tag('contatos', imported_ids, 'imported', 'system')
+        """
+        pass
+
+    @abstractmethod
+    def bulk_remove_tag(
+        self, object_type: str, object_ids: List[str], tag: str, removed_by: str
+    ) -> List[str]:
+        """
+        Remove a tag from many objects in a single batch operation.
+
+        Args:
+            object_type: Form path
+            object_ids: IDs of the objects to untag
+            tag: Tag name to remove
+            removed_by: Who removed the tag (user_id, 'ai_agent', 'system')
+
+        Returns:
+            IDs the tag was removed from, in request order
+            (objects without the active tag are skipped)
+            Empty list if the operation failed (nothing was changed)
+        """
+        pass
+
+    @abstractmethod
+    def bulk_transition(
+        self,
+        object_type: str,
+        object_ids: List[str],
+        from_tag: str,
+        to_tag: str,
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """
+        Move many objects from one tag to another in a single batch operation.
+
+        Each object is handled like transition_tag(): from_tag is removed if
+        active and to_tag is added. Objects that already have to_tag are left
+        untouched.
+
+        Args:
+            object_type: Form path
+            object_ids: IDs of the objects to move
+            from_tag: Current tag to remove (ignored where not active)
+            to_tag: New tag to add
+            actor: Who performed the transition (user_id, 'ai_agent', 'system')
+            metadata: Optional metadata stored with every new tag
+
+        Returns:
+            IDs that were moved, in request order
+            Empty list if the operation failed (nothing was changed)
+        """
+        pass
+
+    def apply_transitions(
+        self,
+        object_type: str,
+        moves: List[Tuple[str, str, str]],
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """
+        Apply a batch of transitions with different tag pairs at once.
+
+        Each (object_id, from_tag, to_tag) move is handled like
+        transition_tag(). An object is moved at most once: later moves for
+        an object already in the batch are ignored.
+
+        Args:
+            object_type: Form path
+            moves: (object_id, from_tag, to_tag) tuples
+            actor: Who performed the transitions (user_id, 'ai_agent', 'system')
+            metadata: Optional metadata stored with every new tag
+
+        Returns:
+            IDs that were moved, in request order
+            Empty list if the operation failed (nothing was changed)
+
+        Note:
+            Default implementation calls bulk_transition() once per tag pair,
+            so a failure can leave the batch partly applied. Subclasses
+            should override this method to apply every move in one write
+            (SQLite: one transaction; TXT: one append).
+
+        Example:
+            moved = repo.apply_transitions(
+                'deals',
+                [(id1, 'lead', 'qualified'), (id2, 'proposal', 'won')],
+                'ai_agent',
+            )
+        """
+        moved = set()
+        for (from_tag, to_tag), object_ids in self._group_moves(moves).items():
+            moved.update(
+                self.bulk_transition(
+                    object_type, object_ids, from_tag, to_tag, actor, metadata
+                )
+            )
+        return [oid for oid in dict.fromkeys(m[0] for m in moves) if oid in moved]
+
+    @staticmethod
+    def _group_moves(
+        moves: List[Tuple[str, str, str]],
+    ) -> Dict[Tuple[str, str], List[str]]:
+        """Group moves by (from_tag, to_tag), keeping the first move per object."""
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        seen = set()
+        for object_id, from_tag, to_tag in moves:
+            if object_id in seen:
+                continue
+            seen.add(object_id)
+            groups.setdefault((from_tag, to_tag), []).append(object_id)
+        return groups
+
     @abstractmethod
     def get_tags(
         self, object_type: str, object_id: str, active_only: bool = True
@@ -758,6 +1140,129 @@ class BaseRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def query_objects_by_tags(
+        self,
+        object_type: str,
+        all_of: Optional[List[str]] = None,
+        any_of: Optional[List[str]] = None,
+        none_of: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Find objects by a combination of active tags in one storage query.
+
+        Candidates are the objects of object_type with at least one active
+        tag. An object matches if it has every tag in all_of, at least one
+        tag in any_of (when given) and none of the tags in none_of.
+
+        Args:
+            object_type: Form path
+            all_of: Tags the object must all have
+            any_of: Tags of which the object must have at least one
+            none_of: Tags the object must not have
+            limit: Maximum number of IDs to return (None for all)
+
+        Returns:
+            Matching IDs, most recently tagged first
+            Empty list if no objects match
+
+        Implementation notes:
+            - For SQLite: A single grouped query over tags_active
+            - For TXT: Set operations on an in-memory index of active tags
+
+        Example:
+            # Qualified priority deals that are not on hold
+            ids = repo.query_objects_by_tags(
+                'deals', all_of=['qualified', 'priority'], none_of=['on_hold']
+            )
+        """
+        pass
+
+    @abstractmethod
+    def page_objects_by_tag(
+        self,
+        object_type: str,
+        tag: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[Tuple[str, str]]:
+        """
+        Get one page of the objects with an active tag.
+
+        Objects are ordered most recently tagged first, ties broken by ID,
+        and paged with a keyset cursor so each page costs the same.
+
+        Args:
+            object_type: Form path
+            tag: Tag name
+            limit: Maximum number of objects to return (None for all)
+            after: (applied_at, object_id) of the last object of the
+                   previous page, None for the first page
+
+        Returns:
+            List of (applied_at, object_id) tuples; the last one is the
+            cursor for the next page
+
+        Implementation notes:
+            - For SQLite: A keyset query on tags_active with LIMIT
+            - For TXT: Sort the tag's entries in the in-memory tag index
+
+        Example:
+            page = repo.page_objects_by_tag('deals', 'lead', limit=50)
+            more = repo.page_objects_by_tag('deals', 'lead', 50, after=page[-1])
+        """
+        pass
+
+    @abstractmethod
+    def get_tag_changes(
+        self, object_type: str, since: int = 0, limit: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the tag and record changes of a form after a change cursor.
+
+        Every tag application or removal, and every update_by_id(), is
+        logged with a sequence number that only grows. Deleting a record
+        logs the removal of its active tags. The log keeps the last
+        CHANGE_LOG_RETENTION entries of all forms.
+
+        Args:
+            object_type: Form path
+            since: Sequence number of the last change already seen
+            limit: Maximum number of changes to return (None for all)
+
+        Returns:
+            Changes oldest first, as dictionaries with 'seq', 'object_id',
+            'tag' ('' for record updates), 'op' ('add', 'remove' or
+            'update') and 'changed_at'
+            None if changes after `since` were already dropped from the log
+
+        Implementation notes:
+            - For SQLite: tag_changes table fed by triggers on tags_active
+            - For TXT: tag_changes.txt appended with every tags file write
+
+        Example:
+            cursor = repo.get_change_cursor()
+            ...
+            changes = repo.get_tag_changes('deals', since=cursor)
+            if changes is None:
+                ...  # Too far behind: reload everything
+        """
+        pass
+
+    @abstractmethod
+    def get_change_cursor(self) -> int:
+        """
+        Get the sequence number of the latest logged change (0 if none).
+
+        Read it before loading state, then pass it to get_tag_changes() to
+        get every change made since.
+
+        Returns:
+            Latest change sequence number of any form
+        """
+        pass
+
     @abstractmethod
     def get_tag_history(
         self, object_type: str, object_id: str, tag: Optional[str] = None
@@ -801,12 +1306,15 @@ class BaseRepository(ABC):
         Get statistics about tag usage for a form type.
 
         This provides insights into workflow states and distribution.
+        Counts are maintained incrementally by every tag write, so reading
+        them costs O(number of distinct tags).
 
         Args:
             object_type: Form path
 
         Returns:
-            Dictionary mapping tag names to counts of objects with that tag
+            Dictionary mapping tag names to counts of objects with that tag,
+            highest count first
             Empty dict if no tags exist
 
         Example:
@@ -820,3 +1328,44 @@ class BaseRepository(ABC):
             # }
         """
         pass
+
+    @abstractmethod
+    def rebuild_tag_statistics(self, object_type: str) -> Dict[str, int]:
+        """
+        Recompute the tag statistics counters of a form from stored tags.
+
+        Counters only drift if tags are changed outside the repository
+        (e.g. edited by hand); this repairs them.
+
+        Args:
+            object_type: Form path
+
+        Returns:
+            The recomputed statistics, as returned by get_tag_statistics()
+
+        Implementation notes:
+            - For SQLite: Recount tag_counts from tags_active
+            - For TXT: Compact the tags file and rebuild the tag index
+        """
+        pass
+
+    @abstractmethod
+    def purge_orphan_tags(self, object_type: str) -> int:
+        """
+        Delete tags (active and history) of records that no longer exist.
+
+        delete_by_id() already removes a record's tags; this cleans up tags
+        left behind by older versions or by records removed outside the
+        repository.
+
+        Args:
+            object_type: Form path
+
+        Returns:
+            Number of tag rows deleted
+
+        Implementation notes:
+            - For SQLite: One NOT EXISTS anti-join delete per tags table
+            - For TXT: Rewrite the tags file without the orphaned lines
+        """
+        pass
@@ -2,7 +2,15 @@
 Change detection and coordination for VibeCForms persistence layer.
 
 This module coordinates schema change detection, backend change detection,
-and migration execution (to be implemented in migration_manager.py).
+and migration execution (see migration_manager.py and online_migration.py).
+
+Backend changes are migrated according to the "migration_mode" setting of
+persistence.json:
+- "offline" (default): the form is blocked behind the migration
+  confirmation page until migrate_backend() finishes
+- "online": the form stays usable; writes go to both backends while the
+  history is backfilled in the background, and reads flip to the new
+  backend once the checksums match
 """
 
 import logging
@@ -10,6 +18,7 @@ from typing import Dict, Any, Optional, Tuple
 from .schema_detector import SchemaChangeDetector, SchemaChange, BackendChange
 from .schema_history import get_history
 from .config import get_config
+from .online_migration import get_dual_write_repository
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -32,6 +41,7 @@ class ChangeManager:
         backend: str,
         has_data: bool = False,
         record_count: int = 0,
+        backend_config: Optional[Dict[str, Any]] = None,
     ) -> Tuple[Optional[SchemaChange], Optional[BackendChange]]:
         """
         Check if a form has schema or backend changes.
@@ -42,6 +52,8 @@ class ChangeManager:
             backend: Current backend type
             has_data: Whether the form has existing data
             record_count: Number of existing records
+            backend_config: Resolved configuration of the current backend,
+                so moves between backends of the same type are detected
 
         Returns:
             Tuple of (SchemaChange, BackendChange) - either can be None if no change
@@ -76,20 +88,25 @@ class ChangeManager:
                 logger.info(f"First time tracking '{form_path}'")
 
         # Check if backend changed
-        last_backend = history.get_last_backend(form_path)
-        if last_backend and last_backend != backend:
+        if history.has_backend_changed(form_path, backend, backend_config):
             backend_change = SchemaChangeDetector.detect_backend_change(
                 form_path=form_path,
-                old_backend=last_backend,
+                old_backend=history.get_last_backend(form_path),
                 new_backend=backend,
                 record_count=record_count,
+                old_config=history.get_last_backend_config(form_path),
+                new_config=backend_config,
             )
 
         return schema_change, backend_change
 
     @staticmethod
     def update_tracking(
-        form_path: str, spec: Dict[str, Any], backend: str, record_count: int = 0
+        form_path: str,
+        spec: Dict[str, Any],
+        backend: str,
+        record_count: int = 0,
+        backend_config: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """
         Update tracking information after successful operations.
@@ -99,6 +116,8 @@ class ChangeManager:
             spec: Current specification
             backend: Current backend
             record_count: Current record count
+            backend_config: Resolved configuration of the current backend
+                (None keeps the recorded one if the backend type is the same)
 
         Returns:
             True if successful
@@ -111,8 +130,71 @@ class ChangeManager:
             spec_hash=spec_hash,
             backend=backend,
             record_count=record_count,
+            backend_config=backend_config,
         )
 
+    @staticmethod
+    def get_migration_mode() -> str:
+        """
+        Get how backend changes are migrated.
+
+        Returns:
+            "offline" or "online"
+        """
+        return get_config().get_setting("migration_mode", "offline")
+
+    @staticmethod
+    def start_online_migration(
+        form_path: str,
+        spec: Dict[str, Any],
+        backend_change: BackendChange,
+        record_count: int = 0,
+    ) -> bool:
+        """
+        Start (or join) an online migration for a backend change.
+
+        Dual writes are enabled before this returns, so the caller can keep
+        using RepositoryFactory.get_repository() for the form right away;
+        the backfill, verification and flip run as a background job.
+
+        Args:
+            form_path: Path to the form
+            spec: Current form specification
+            backend_change: Detected backend change
+            record_count: Number of records in the old backend
+
+        Returns:
+            True if the form is being migrated online, False if online
+            migration is disabled or was cancelled for this form (the change
+            needs an offline migration)
+        """
+        if get_dual_write_repository(form_path) is not None:
+            return True
+        if ChangeManager.get_migration_mode() != "online":
+            return False
+
+        # Services depend on the persistence layer, not the other way round
+        from services.migration_job_service import get_migration_job_service
+
+        service = get_migration_job_service()
+        jobs = service.list_jobs(form_path)
+        if jobs and jobs[-1]["status"] == "cancelled":
+            # Do not restart a migration the user cancelled; the change goes
+            # through the confirmation page instead
+            return False
+
+        service.submit(
+            form_path=form_path,
+            spec=spec,
+            old_backend=backend_change.old_backend,
+            new_backend=backend_change.new_backend,
+            record_count=record_count,
+            mode="online",
+            old_config=backend_change.old_config,
+            new_config=backend_change.new_config,
+        )
+        return True
+
     @staticmethod
     def requires_confirmation(
         schema_change: Optional[SchemaChange], backend_change: Optional[BackendChange]
@@ -192,6 +274,7 @@ def check_form_changes(
         backend=backend,
         has_data=has_data,
         record_count=record_count,
+        backend_config=backend_config,
     )
 
 
@@ -209,10 +292,20 @@ def update_form_tracking(
     Returns:
         True if successful
     """
+    # The form's tracking belongs to its online migration until the flip,
+    # which records the new backend; writing it here could put the old
+    # backend back after another process flipped it
+    if get_dual_write_repository(form_path) is not None:
+        return True
+
     config = get_config()
     backend_config = config.get_backend_config(form_path)
     backend = backend_config.get("type")
 
     return ChangeManager.update_tracking(
-        form_path=form_path, spec=spec, backend=backend, record_count=record_count
+        form_path=form_path,
+        spec=spec,
+        backend=backend,
+        record_count=record_count,
+        backend_config=backend_config,
     )
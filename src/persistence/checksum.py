@@ -0,0 +1,202 @@
+"""
+Dataset checksums for VibeCForms persistence layer.
+
+This module computes order-independent checksums over the records of a
+form, so the contents of two backends can be compared in one streaming
+pass per side (e.g. to verify a migration) without holding either dataset
+in memory.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, List, Tuple
+
+from persistence.base import BaseRepository
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Aggregates are sums of 128-bit digests modulo 2**128
+_DIGEST_SIZE = 16
+_AGGREGATE_MODULUS = 1 << (_DIGEST_SIZE * 8)
+
+# Separates values inside the digested payload (cannot occur in form data
+# read back from either backend)
+_SEPARATOR = "\x1f"
+
+
+@dataclass
+class DatasetChecksum:
+    """Order-independent checksum of all records of a form."""
+
+    record_count: int = 0
+    # Sum of per-record digests over (record_id, values)
+    aggregate: int = 0
+    # Sum of per-record digests over values only
+    values_aggregate: int = 0
+    # Records without a record_id (legacy TXT lines)
+    records_without_id: int = 0
+
+    def matches(self, other: "DatasetChecksum") -> bool:
+        """
+        Check whether two datasets have the same contents.
+
+        Record IDs are part of the comparison unless either side has
+        records without IDs, which get fresh IDs when migrated.
+
+        Args:
+            other: Checksum of the other dataset
+
+        Returns:
+            True if both datasets contain the same records
+        """
+        if self.record_count != other.record_count:
+            return False
+        if self.records_without_id or other.records_without_id:
+            return self.values_aggregate == other.values_aggregate
+        return self.aggregate == other.aggregate
+
+    def __str__(self) -> str:
+        return f"{self.record_count} records, checksum {self.aggregate:032x}"
+
+
+def normalize_value(field_type: str, value: Any) -> str:
+    """
+    Normalize a field value to its canonical storage representation.
+
+    Backends return slightly different Python types for the same stored
+    value (e.g. SQLite returns None for NULL text, TXT returns ''), so
+    values are compared through the same conversions the adapters apply
+    when writing.
+
+    Args:
+        field_type: Field type from the spec
+        value: Value as read from a backend
+
+    Returns:
+        Canonical string representation
+    """
+    if field_type == "checkbox":
+        return "1" if value else "0"
+    if field_type == "number" or field_type == "range":
+        try:
+            return str(int(value)) if value else "0"
+        except (TypeError, ValueError):
+            return "0"
+    return "" if value is None else str(value)
+
+
+def record_digests(record: Dict[str, Any], spec: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    Compute the digests of a single record.
+
+    Args:
+        record: Record as returned by read_all / iter_records
+        spec: Form specification
+
+    Returns:
+        Tuple of (digest over record_id and values, digest over values only)
+    """
+    values = _SEPARATOR.join(
+        normalize_value(field["type"], record.get(field["name"]))
+        for field in spec["fields"]
+    )
+    record_id = record.get("_record_id") or ""
+
+    with_id = hashlib.blake2b(
+        (record_id + _SEPARATOR + values).encode("utf-8"), digest_size=_DIGEST_SIZE
+    ).digest()
+    values_only = hashlib.blake2b(
+        values.encode("utf-8"), digest_size=_DIGEST_SIZE
+    ).digest()
+    return int.from_bytes(with_id, "big"), int.from_bytes(values_only, "big")
+
+
+def compute_checksum(
+    repo: BaseRepository,
+    form_path: str,
+    spec: Dict[str, Any],
+    batch_size: int = 1000,
+) -> DatasetChecksum:
+    """
+    Compute the checksum of a form in one streaming pass.
+
+    Args:
+        repo: Repository holding the form
+        form_path: Path to the form
+        spec: Form specification
+        batch_size: Records per streamed batch
+
+    Returns:
+        DatasetChecksum for the form's records
+    """
+    checksum = DatasetChecksum()
+
+    for batch in repo.iter_records(form_path, spec, batch_size=batch_size):
+        for record in batch:
+            with_id, values_only = record_digests(record, spec)
+            checksum.record_count += 1
+            checksum.aggregate = (checksum.aggregate + with_id) % _AGGREGATE_MODULUS
+            checksum.values_aggregate = (
+                checksum.values_aggregate + values_only
+            ) % _AGGREGATE_MODULUS
+            if not record.get("_record_id"):
+                checksum.records_without_id += 1
+
+    return checksum
+
+
+def find_mismatches(
+    source_repo: BaseRepository,
+    target_repo: BaseRepository,
+    form_path: str,
+    spec: Dict[str, Any],
+    limit: int = 10,
+    batch_size: int = 1000,
+) -> List[Dict[str, str]]:
+    """
+    Locate the first records that differ between two repositories.
+
+    Diagnostic pass used after a checksum mismatch: keeps one digest per
+    source record in memory (not the records themselves) and streams the
+    target against it.
+
+    Args:
+        source_repo: Repository with the expected data
+        target_repo: Repository to check
+        form_path: Path to the form
+        spec: Form specification
+        limit: Maximum number of mismatches to report
+        batch_size: Records per streamed batch
+
+    Returns:
+        List of {"record_id", "problem"} dictionaries, where problem is
+        "missing" (only in source), "unexpected" (only in target) or
+        "different" (same ID, different values)
+    """
+    expected: Dict[str, int] = {}
+    for batch in source_repo.iter_records(form_path, spec, batch_size=batch_size):
+        for record in batch:
+            record_id = record.get("_record_id")
+            if record_id:
+                expected[record_id] = record_digests(record, spec)[0]
+
+    mismatches: List[Dict[str, str]] = []
+    for batch in target_repo.iter_records(form_path, spec, batch_size=batch_size):
+        for record in batch:
+            record_id = record.get("_record_id") or ""
+            digest = expected.pop(record_id, None)
+            if digest is None:
+                mismatches.append({"record_id": record_id, "problem": "unexpected"})
+            elif digest != record_digests(record, spec)[0]:
+                mismatches.append({"record_id": record_id, "problem": "different"})
+            if len(mismatches) >= limit:
+                return mismatches
+
+    for record_id in expected:
+        if len(mismatches) >= limit:
+            break
+        mismatches.append({"record_id": record_id, "problem": "missing"})
+
+    return mismatches
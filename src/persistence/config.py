@@ -10,12 +10,76 @@ import os
 import json
 import logging
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Pattern, Tuple, Callable
 from pathlib import Path
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Keys that typically contain file/directory paths
+_PATH_KEYS = ["path", "database", "backup_path"]
+
+
+def backend_identity(backend_config: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Build a hashable identity for a resolved backend configuration.
+
+    Two forms share a repository instance only if their resolved backend
+    configurations are identical (same type, database file, path, ...).
+
+    Args:
+        backend_config: Backend configuration with env vars and paths resolved
+
+    Returns:
+        Tuple of (backend_type, canonical JSON of the configuration)
+    """
+    return (
+        backend_config["type"],
+        json.dumps(backend_config, sort_keys=True, default=str),
+    )
+
+
+class _RoutingMappings(dict):
+    """
+    form_mappings dict that invalidates the compiled routing table when
+    modified in place (e.g. ``config.form_mappings[path] = 'sqlite'``).
+    """
+
+    def __init__(self, data: Dict[str, str], on_change: Callable[[], None]):
+        super().__init__(data)
+        self._on_change = on_change
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._on_change()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._on_change()
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._on_change()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self._on_change()
+        return result
+
+    def setdefault(self, key, default=None):
+        result = super().setdefault(key, default)
+        self._on_change()
+        return result
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._on_change()
+
+    def clear(self):
+        super().clear()
+        self._on_change()
+
 
 class PersistenceConfig:
     """
@@ -44,6 +108,7 @@ class PersistenceConfig:
         self.business_case_root = self.config_path.parent.parent
         self.config = self._load_config()
         self._validate_config()
+        self._compile_routing()
 
     def _load_config(self) -> Dict[str, Any]:
         """
@@ -122,41 +187,11 @@ class PersistenceConfig:
             >>> config.get_backend_for_form('financeiro/contas')
             'mysql'  # if 'financeiro/*' is mapped to mysql
         """
-        form_mappings = self.config.get("form_mappings", {})
-
-        # First: Try exact match
-        if form_path in form_mappings:
-            backend = form_mappings[form_path]
-            # If backend is "default_backend", use the actual default
-            if backend == "default_backend":
-                backend = self.config["default_backend"]
-            logger.debug(
-                f"Form '{form_path}' mapped to backend '{backend}' (exact match)"
-            )
-            return backend
-
-        # Second: Try wildcard patterns
-        for pattern, backend in form_mappings.items():
-            if "*" in pattern:
-                # Convert glob pattern to regex
-                # 'financeiro/*' becomes '^financeiro/.*$'
-                regex_pattern = (
-                    "^" + pattern.replace("/", r"\/").replace("*", ".*") + "$"
-                )
-                if re.match(regex_pattern, form_path):
-                    # If backend is "default_backend", use the actual default
-                    if backend == "default_backend":
-                        backend = self.config["default_backend"]
-                    logger.debug(
-                        f"Form '{form_path}' matched pattern '{pattern}', "
-                        f"using backend '{backend}'"
-                    )
-                    return backend
-
-        # Third: Use default backend
-        default_backend = self.config["default_backend"]
-        logger.debug(f"Form '{form_path}' using default backend '{default_backend}'")
-        return default_backend
+        backend = self._form_backends.get(form_path)
+        if backend is None:
+            backend = self._route(form_path)
+            self._form_backends[form_path] = backend
+        return backend
 
     def get_backend_config(self, form_path: str) -> Dict[str, Any]:
         """
@@ -177,16 +212,173 @@ class PersistenceConfig:
                 'timeout': 10
             }
         """
-        backend_name = self.get_backend_for_form(form_path)
-        backend_config = self.config["backends"][backend_name].copy()
+        backend_config = self._form_configs.get(form_path)
+        if backend_config is None:
+            backend_name = self.get_backend_for_form(form_path)
+            backend_config = self.resolve_backend_config(
+                self.config["backends"][backend_name], form_path
+            )
+            self._form_configs[form_path] = backend_config
+
+        # Callers may modify the returned dict; keep the memoized one intact
+        return backend_config.copy()
+
+    def resolve_backend_config(
+        self, backend_config: Dict[str, Any], form_path: str
+    ) -> Dict[str, Any]:
+        """
+        Resolve a raw backend definition for a form.
 
+        Substitutes environment variables, resolves relative paths and
+        expands the {form} shard placeholder, exactly like the configuration
+        returned by get_backend_config().
+
+        Args:
+            backend_config: Backend definition as written in the "backends"
+                section
+            form_path: Path to the form
+
+        Returns:
+            Resolved backend configuration
+        """
         # Substitute environment variables
-        backend_config = self._substitute_env_vars(backend_config)
+        resolved = self._substitute_env_vars(backend_config.copy())
 
         # Resolve relative paths to absolute paths
-        backend_config = self._resolve_paths(backend_config)
+        resolved = self._resolve_paths(resolved)
+
+        # Expand per-form shard placeholders
+        return self._resolve_shard(resolved, form_path)
+
+    def find_backend_config(
+        self, backend: str, form_path: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the resolved configuration of a backend for a form.
+
+        Used when the backend is known only by name or type (e.g. from the
+        schema history of forms tracked before backend identities were
+        recorded).
 
-        return backend_config
+        Args:
+            backend: Backend name, or a backend type if no backend has that
+                name (the first backend of that type is used)
+            form_path: Path to the form
+
+        Returns:
+            Resolved backend configuration, or None if no backend matches
+        """
+        backends = self.config.get("backends", {})
+        backend_config = backends.get(backend)
+        if backend_config is None:
+            backend_config = next(
+                (b for b in backends.values() if b.get("type") == backend), None
+            )
+        if backend_config is None:
+            return None
+        return self.resolve_backend_config(backend_config, form_path)
+
+    def get_backend_identity(self, form_path: str) -> Tuple[str, str]:
+        """
+        Get the identity of the resolved backend configuration for a form.
+
+        Used by RepositoryFactory as its cache key; memoized like the
+        backend configuration itself.
+
+        Args:
+            form_path: Path to the form
+
+        Returns:
+            Tuple of (backend_type, canonical JSON of the configuration)
+        """
+        identity = self._form_identities.get(form_path)
+        if identity is None:
+            identity = backend_identity(self.get_backend_config(form_path))
+            self._form_identities[form_path] = identity
+        return identity
+
+    def _compile_routing(self) -> None:
+        """
+        Build the routing table from the current form_mappings.
+
+        Exact mappings are stored in a dict, wildcard patterns are compiled
+        once (keeping their declaration order), and "default_backend"
+        aliases are resolved up front. Per-form lookups and resolved backend
+        configs are memoized on top of this table and discarded whenever it
+        is rebuilt.
+        """
+        default_backend = self.config["default_backend"]
+
+        mappings = self.config.get("form_mappings")
+        if not isinstance(mappings, _RoutingMappings):
+            mappings = _RoutingMappings(mappings or {}, self.invalidate_routing)
+            if "form_mappings" in self.config:
+                self.config["form_mappings"] = mappings
+
+        def resolve(backend: str) -> str:
+            return default_backend if backend == "default_backend" else backend
+
+        self._exact_routes: Dict[str, str] = {}
+        self._wildcard_routes: List[Tuple[Pattern, str, str]] = []
+        for pattern, backend in mappings.items():
+            self._exact_routes[pattern] = resolve(backend)
+            if "*" in pattern:
+                # Convert glob pattern to regex
+                # 'financeiro/*' becomes '^financeiro/.*$'
+                regex_pattern = (
+                    "^" + pattern.replace("/", r"\/").replace("*", ".*") + "$"
+                )
+                self._wildcard_routes.append(
+                    (re.compile(regex_pattern), pattern, resolve(backend))
+                )
+
+        self._form_backends: Dict[str, str] = {}
+        self._form_configs: Dict[str, Dict[str, Any]] = {}
+        self._form_identities: Dict[str, Tuple[str, str]] = {}
+
+    def invalidate_routing(self) -> None:
+        """
+        Discard the compiled routing table and rebuild it from the config.
+
+        Called automatically by reload(), save() and in-place changes to
+        form_mappings. Call it explicitly after replacing ``config`` entries
+        directly or after changing environment variables referenced by a
+        backend, since resolved backend configs are memoized.
+        """
+        self._compile_routing()
+        logger.debug("Persistence routing table rebuilt")
+
+    def _route(self, form_path: str) -> str:
+        """
+        Resolve a form path against the compiled routing table.
+
+        Args:
+            form_path: Path to the form
+
+        Returns:
+            Backend name
+        """
+        # First: Try exact match
+        backend = self._exact_routes.get(form_path)
+        if backend is not None:
+            logger.debug(
+                f"Form '{form_path}' mapped to backend '{backend}' (exact match)"
+            )
+            return backend
+
+        # Second: Try wildcard patterns
+        for regex, pattern, backend in self._wildcard_routes:
+            if regex.match(form_path):
+                logger.debug(
+                    f"Form '{form_path}' matched pattern '{pattern}', "
+                    f"using backend '{backend}'"
+                )
+                return backend
+
+        # Third: Use default backend
+        default_backend = self.config["default_backend"]
+        logger.debug(f"Form '{form_path}' using default backend '{default_backend}'")
+        return default_backend
 
     def _substitute_env_vars(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -261,18 +453,46 @@ class PersistenceConfig:
             {"path": "data/"} -> {"path": "/absolute/path/to/business/case/data/"}
             {"database": "data/db.sqlite"} -> {"database": "/absolute/path/to/business/case/data/db.sqlite"}
         """
-        # Keys that typically contain file/directory paths
-        path_keys = ["path", "database", "backup_path"]
-
         result = {}
         for key, value in config.items():
-            if key in path_keys and isinstance(value, str):
+            if key in _PATH_KEYS and isinstance(value, str):
                 # Convert relative paths to absolute
                 if not os.path.isabs(value):
                     value = str(self.business_case_root / value)
             result[key] = value
         return result
 
+    def _resolve_shard(self, config: Dict[str, Any], form_path: str) -> Dict[str, Any]:
+        """
+        Expand the {form} placeholder in path settings.
+
+        Lets a single backend definition give every form its own storage,
+        e.g. one SQLite file per form so that writes to different forms do
+        not contend for the same database lock. Forms can also be grouped
+        into shards simply by mapping them to different backends in
+        form_mappings.
+
+        Args:
+            config: Configuration dictionary with paths already resolved
+            form_path: Path to the form
+
+        Returns:
+            Configuration with {form} replaced by the form path, with
+            slashes converted to underscores
+
+        Example:
+            {"database": "data/shards/{form}.db"} for 'financeiro/contas'
+            -> {"database": ".../data/shards/financeiro_contas.db"}
+        """
+        shard_name = form_path.replace("/", "_")
+
+        result = {}
+        for key, value in config.items():
+            if key in _PATH_KEYS and isinstance(value, str) and "{form}" in value:
+                value = value.replace("{form}", shard_name)
+            result[key] = value
+        return result
+
     def get_setting(self, key: str, default: Any = None) -> Any:
         """
         Get a top-level configuration setting.
@@ -326,6 +546,7 @@ class PersistenceConfig:
         """
         with open(self.config_path, "w", encoding="utf-8") as f:
             json.dump(self.config, f, indent=2, ensure_ascii=False)
+        self.invalidate_routing()
         logger.info(f"Persistence configuration saved to {self.config_path}")
 
     def reload(self) -> None:
@@ -336,6 +557,7 @@ class PersistenceConfig:
         """
         self.config = self._load_config()
         self._validate_config()
+        self._compile_routing()
         logger.info("Persistence configuration reloaded")
 
     def __repr__(self) -> str:
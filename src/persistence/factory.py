@@ -6,15 +6,18 @@ repository adapter based on configuration and form path.
 """
 
 import logging
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from persistence.base import BaseRepository
-from persistence.config import get_config
+from persistence.config import get_config, backend_identity
+from persistence.online_migration import get_dual_write_repository
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Cache of repository instances (singleton per backend type)
-_repository_cache: Dict[str, BaseRepository] = {}
+# Cache of repository instances, one per resolved backend configuration.
+# Keyed by (backend_type, canonical config) so that two backends of the same
+# type pointing at different databases/paths get separate instances.
+_repository_cache: Dict[Tuple[str, str], BaseRepository] = {}
 
 
 class RepositoryFactory:
@@ -33,7 +36,8 @@ class RepositoryFactory:
 
         Determines which backend to use based on configuration,
         creates the adapter instance (or returns cached instance),
-        and returns it.
+        and returns it. Forms in an online migration get the migration's
+        DualWriteRepository instead (see persistence.online_migration).
 
         Args:
             form_path: Path to the form (e.g., 'contatos', 'financeiro/contas')
@@ -49,21 +53,27 @@ class RepositoryFactory:
             >>> repo = RepositoryFactory.get_repository('contatos')
             >>> forms = repo.read_all('contatos', spec)
         """
+        # Forms being migrated online write to both backends
+        dual_write = get_dual_write_repository(form_path)
+        if dual_write is not None:
+            return dual_write
+
         # Get configuration
         config = get_config()
-        backend_config = config.get_backend_config(form_path)
-        backend_type = backend_config["type"]
+        cache_key = config.get_backend_identity(form_path)
 
         # Check cache first
-        if backend_type in _repository_cache:
-            logger.debug(f"Using cached repository for backend '{backend_type}'")
-            return _repository_cache[backend_type]
+        repository = _repository_cache.get(cache_key)
+        if repository is not None:
+            return repository
 
         # Create new repository instance
+        backend_config = config.get_backend_config(form_path)
+        backend_type = backend_config["type"]
         repository = RepositoryFactory._create_repository(backend_type, backend_config)
 
         # Cache it
-        _repository_cache[backend_type] = repository
+        _repository_cache[cache_key] = repository
 
         logger.info(
             f"Created and cached repository for backend '{backend_type}' "
@@ -143,7 +153,8 @@ class RepositoryFactory:
         and uses default configuration for the backend.
 
         Args:
-            backend_type: Type of backend ('txt', 'sqlite', etc.)
+            backend_type: Backend name as defined in the configuration
+                ('txt', 'sqlite', etc.)
 
         Returns:
             BaseRepository instance
@@ -152,10 +163,6 @@ class RepositoryFactory:
             >>> txt_repo = RepositoryFactory.get_repository_by_type('txt')
             >>> sqlite_repo = RepositoryFactory.get_repository_by_type('sqlite')
         """
-        # Check cache first
-        if backend_type in _repository_cache:
-            return _repository_cache[backend_type]
-
         # Get backend configuration
         config = get_config()
         backends = config.config.get("backends", {})
@@ -170,10 +177,48 @@ class RepositoryFactory:
         # Substitute environment variables
         backend_config = config._substitute_env_vars(backend_config)
 
+        # Check cache first
+        cache_key = backend_identity(backend_config)
+        repository = _repository_cache.get(cache_key)
+        if repository is not None:
+            return repository
+
         # Create and cache repository
-        repository = RepositoryFactory._create_repository(backend_type, backend_config)
-        _repository_cache[backend_type] = repository
+        repository = RepositoryFactory._create_repository(
+            backend_config["type"], backend_config
+        )
+        _repository_cache[cache_key] = repository
+
+        return repository
+
+    @staticmethod
+    def get_repository_for_config(backend_config: Dict) -> BaseRepository:
+        """
+        Get a repository instance for a resolved backend configuration.
+
+        Instances are shared with get_repository(): a form whose current
+        backend resolves to the same configuration gets the same instance.
+        Used by migrations, whose source may be a backend the form is no
+        longer mapped to.
+
+        Args:
+            backend_config: Backend configuration with env vars, paths and
+                shard placeholders resolved (see
+                PersistenceConfig.resolve_backend_config)
 
+        Returns:
+            BaseRepository instance
+
+        Raises:
+            ValueError: If backend type is not supported
+        """
+        cache_key = backend_identity(backend_config)
+        repository = _repository_cache.get(cache_key)
+        if repository is None:
+            repository = RepositoryFactory._create_repository(
+                backend_config["type"], backend_config
+            )
+            _repository_cache[cache_key] = repository
         return repository
 
     @staticmethod
@@ -194,10 +239,12 @@ class RepositoryFactory:
         Get list of currently cached backend types.
 
         Returns:
-            List of backend type names currently in cache
+            List of backend type names, one entry per cached instance
+            (a type appears more than once when forms are sharded across
+            several databases)
 
         Example:
             >>> RepositoryFactory.get_cached_backends()
-            ['txt', 'sqlite']
+            ['txt', 'sqlite', 'sqlite']
         """
-        return list(_repository_cache.keys())
+        return [backend_type for backend_type, _ in _repository_cache.keys()]
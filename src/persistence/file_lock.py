@@ -0,0 +1,104 @@
+"""
+Inter-process file locks for VibeCForms persistence layer.
+
+Files shared by several processes (e.g. the workers started by
+``gunicorn -w 4``) are protected by an exclusive ``flock`` on a sidecar
+``<file>.lock`` file. The lock file is never replaced, so the lock stays
+valid while the protected file itself is rewritten through a temporary file
+and an atomic rename.
+
+Locks are reentrant within a thread and shared by all users of the same
+path in a process: only the outermost acquisition takes the ``flock``.
+On platforms without ``fcntl`` only the in-process lock is taken.
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+# Locks by absolute path of the protected file
+_file_locks: Dict[str, "FileLock"] = {}
+_file_locks_guard = threading.Lock()
+
+
+class FileLock:
+    """
+    Reentrant lock serializing changes to a file across threads and processes.
+
+    Example:
+        with get_file_lock(tags_file):
+            ...  # read, check and append
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the lock.
+
+        Args:
+            path: Path of the protected file; the lock is taken on
+                  ``path + '.lock'``
+        """
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        """Acquire the lock, blocking until it is free."""
+        self._lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                os.makedirs(os.path.dirname(self.lock_path) or ".", exist_ok=True)
+                fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                except BaseException:
+                    os.close(fd)
+                    raise
+                self._fd = fd
+            except BaseException:
+                self._lock.release()
+                raise
+        self._depth += 1
+
+    def release(self) -> None:
+        """Release one acquisition of the lock."""
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fd, self._fd = self._fd, None
+            try:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            finally:
+                os.close(fd)
+        self._lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+def get_file_lock(path: str) -> FileLock:
+    """
+    Get the lock of a file, shared by all users of the path in this process.
+
+    Args:
+        path: Path of the protected file
+
+    Returns:
+        FileLock for the file
+    """
+    path = os.path.abspath(path)
+    with _file_locks_guard:
+        lock = _file_locks.get(path)
+        if lock is None:
+            lock = _file_locks[path] = FileLock(path)
+        return lock
@@ -5,19 +5,178 @@ This module handles data migration between different storage backends,
 allowing seamless transitions from TXT to SQLite, SQLite to TXT, etc.
 """
 
+import hashlib
+import json
 import logging
-import shutil
 import os
-from typing import Dict, Any, Optional, List
+import multiprocessing
+import queue
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, Any, Optional, List, Callable, Iterator
 from datetime import datetime
 from pathlib import Path
-from persistence.base import BaseRepository
+from persistence.base import BaseRepository, BulkLoad
 from persistence.factory import RepositoryFactory
-from persistence.config import get_config
+from persistence.config import get_config, backend_identity
+from persistence.schema_detector import SchemaChangeDetector
+from persistence.checksum import compute_checksum, find_mismatches
+from persistence.backup_store import BackupStore
+from persistence.backups import backup_sqlite, dump_sqlite_table
 
 logger = logging.getLogger(__name__)
 
 
+class MigrationCancelled(Exception):
+    """Raised inside migrate_backend() when its cancel_event is set."""
+
+
+class _ProducerError:
+    """Wraps an exception raised by the reader thread of a pipeline."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_PIPELINE_DONE = object()
+
+
+def pipeline_batches(
+    batches: Iterator[List[Dict[str, Any]]], queue_depth: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Read batches ahead in a background thread.
+
+    A reader thread pulls batches from the source iterator (parsing the
+    source file or querying the source database) into a bounded queue while
+    the caller writes the previous batches to the target, so reading and
+    writing overlap. At most queue_depth batches are buffered.
+
+    Exceptions raised while reading are re-raised in the caller. If the
+    caller stops early, the reader thread is stopped as well.
+
+    Args:
+        batches: Source batch iterator (e.g. repo.iter_records(...))
+        queue_depth: Maximum number of buffered batches; 0 disables the
+            reader thread and iterates serially
+
+    Yields:
+        The source batches, in order
+    """
+    if queue_depth <= 0:
+        yield from batches
+        return
+
+    buffer: "queue.Queue[Any]" = queue.Queue(maxsize=queue_depth)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for batch in batches:
+                if not put(batch):
+                    return
+            put(_PIPELINE_DONE)
+        except BaseException as e:
+            put(_ProducerError(e))
+
+    reader = threading.Thread(target=produce, name="migration-reader", daemon=True)
+    reader.start()
+
+    try:
+        while True:
+            item = buffer.get()
+            if item is _PIPELINE_DONE:
+                return
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        reader.join()
+
+
+def _read_in_process(
+    repo: BaseRepository,
+    form_path: str,
+    spec: Dict[str, Any],
+    batch_size: int,
+    after_id: Optional[str],
+    out_queue: Any,
+) -> None:
+    """Reader process body: stream source batches into out_queue."""
+    try:
+        for batch in repo.iter_records(
+            form_path, spec, batch_size=batch_size, after_id=after_id
+        ):
+            out_queue.put(batch)
+        out_queue.put(None)
+    except BaseException as e:
+        out_queue.put(_ProducerError(e))
+
+
+def process_batches(
+    repo: BaseRepository,
+    form_path: str,
+    spec: Dict[str, Any],
+    batch_size: int,
+    after_id: Optional[str],
+    queue_depth: int,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Read source batches in a separate process.
+
+    Like pipeline_batches(), but parsing runs in a child process, so it does
+    not compete with the writer for the GIL. Batches are pickled across a
+    bounded multiprocessing queue, which is much cheaper than parsing them.
+
+    Args:
+        repo: Source repository (must be picklable)
+        form_path: Path to the form
+        spec: Form specification
+        batch_size: Records per batch
+        after_id: Resume point, as in iter_records()
+        queue_depth: Maximum number of buffered batches
+
+    Yields:
+        The source batches, in order
+    """
+    context = multiprocessing.get_context(
+        "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+    buffer = context.Queue(maxsize=max(queue_depth, 1))
+    reader = context.Process(
+        target=_read_in_process,
+        args=(repo, form_path, spec, batch_size, after_id, buffer),
+        name="migration-reader",
+        daemon=True,
+    )
+    reader.start()
+
+    try:
+        while True:
+            item = buffer.get()
+            if item is None:
+                return
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+    finally:
+        if reader.is_alive():
+            reader.terminate()
+        reader.join()
+        buffer.close()
+
+
 class MigrationManager:
     """
     Manages data migration between different persistence backends.
@@ -32,6 +191,12 @@ class MigrationManager:
     - Support for all backend types
     """
 
+    # Records read, written and checkpointed together
+    BATCH_SIZE = 1000
+
+    # Batches read ahead of the writer (0 = serial read/write)
+    QUEUE_DEPTH = 4
+
     @staticmethod
     def migrate_backend(
         form_path: str,
@@ -39,24 +204,63 @@ class MigrationManager:
         old_backend: str,
         new_backend: str,
         record_count: int = 0,
+        batch_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int, float], None]] = None,
+        verify: str = "checksum",
+        queue_depth: Optional[int] = None,
+        reader: str = "thread",
+        fast_load: bool = True,
+        cancel_event: Optional[threading.Event] = None,
+        old_config: Optional[Dict[str, Any]] = None,
+        new_config: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """
         Migrate data from one backend to another.
 
         This method:
         1. Creates backup of old backend data
-        2. Reads all data from old backend
+        2. Streams data from the old backend in batches, reading ahead in a
+           background thread while the previous batches are being written
         3. Creates storage in new backend
-        4. Writes all data to new backend
+        4. Writes the batches to the new backend in a fast-load session,
+           recording a durable checkpoint whenever the session commits
         5. Verifies migration success
         6. Rollback on failure
 
+        If a migration is interrupted after some batches were written, the
+        partial data and the checkpoint are kept, and the next call with the
+        same form, backends and spec resumes after the last migrated record
+        instead of starting over.
+
         Args:
             form_path: Path to the form
             spec: Form specification
             old_backend: Source backend type (e.g., 'txt')
             new_backend: Target backend type (e.g., 'sqlite')
-            record_count: Number of records to migrate (for logging)
+            record_count: Number of records to migrate (for logging/progress)
+            batch_size: Records per batch (default: MigrationManager.BATCH_SIZE)
+            progress_callback: Called after each batch with
+                (records_migrated, record_count, records_per_second)
+            verify: Verification mode - "checksum" compares order-independent
+                checksums of all field values (default), "count" only
+                compares record counts
+            queue_depth: Batches buffered between the reader thread and the
+                writer (default: MigrationManager.QUEUE_DEPTH, 0 = serial)
+            reader: "thread" reads ahead in a background thread; "process"
+                parses the source in a child process, so parsing also runs
+                in parallel with the writer instead of sharing the GIL
+            fast_load: Write through the new backend's fast-load session
+                (see BaseRepository.fast_load); the checkpoint then advances
+                each time the session commits instead of after every batch
+            cancel_event: When set, the migration stops after the current
+                batch and is rolled back (the old backend is untouched)
+            old_config: Resolved configuration of the source backend, as
+                recorded in the schema history. Required to migrate between
+                two backends of the same type (e.g. from one SQLite shard to
+                another); see _resolve_backend_config() for the default.
+            new_config: Resolved configuration of the target backend
+                (default: the form's current backend if it has type
+                new_backend)
 
         Returns:
             True if migration successful, False otherwise
@@ -70,19 +274,36 @@ class MigrationManager:
                 record_count=150
             )
         """
+        batch_size = batch_size or MigrationManager.BATCH_SIZE
+        if queue_depth is None:
+            queue_depth = MigrationManager.QUEUE_DEPTH
+
         logger.info(
             f"Starting backend migration for '{form_path}': "
             f"{old_backend} -> {new_backend} ({record_count} records)"
         )
 
         # Get repositories for old and new backends
-        old_repo = MigrationManager._get_repository(old_backend)
-        new_repo = MigrationManager._get_repository(new_backend)
+        old_config = MigrationManager._resolve_backend_config(
+            old_backend, form_path, old_config
+        )
+        new_config = MigrationManager._resolve_backend_config(
+            new_backend, form_path, new_config
+        )
+        old_repo = MigrationManager._get_repository(old_backend, form_path, old_config)
+        new_repo = MigrationManager._get_repository(new_backend, form_path, new_config)
 
         if not old_repo or not new_repo:
             logger.error("Failed to create repositories for migration")
             return False
 
+        if backend_identity(old_config) == backend_identity(new_config):
+            logger.error(
+                f"Source and target of the migration of '{form_path}' are the "
+                f"same storage; the source configuration is unknown"
+            )
+            return False
+
         # Check if old backend has storage
         if not old_repo.exists(form_path):
             logger.info(
@@ -90,91 +311,177 @@ class MigrationManager:
             )
             return True
 
-        # Create backup of old backend
-        backup_info = MigrationManager._create_cross_backend_backup(
-            form_path=form_path, old_backend=old_backend, old_repo=old_repo
+        checkpoint_file = MigrationManager._get_checkpoint_path(
+            form_path, old_backend, new_backend, old_config, new_config
+        )
+        checkpoint = MigrationManager._load_checkpoint(
+            checkpoint_file, new_repo, form_path, spec
         )
 
-        if not backup_info:
-            logger.error("Failed to create backup, aborting migration")
-            return False
+        if checkpoint:
+            backup_info = checkpoint["backup_info"]
+            logger.info(
+                f"Resuming migration of '{form_path}' after "
+                f"{checkpoint['records_read']} records "
+                f"(last record: {checkpoint['last_record_id']})"
+            )
+        else:
+            # Create backup of old backend
+            backup_info = MigrationManager._create_cross_backend_backup(
+                form_path=form_path, old_backend=old_backend, old_repo=old_repo
+            )
 
+            if not backup_info:
+                logger.error("Failed to create backup, aborting migration")
+                return False
+
+            checkpoint = {
+                "form_path": form_path,
+                "old_backend": old_backend,
+                "new_backend": new_backend,
+                "spec_hash": SchemaChangeDetector.compute_spec_hash(spec),
+                "backup_info": backup_info,
+                "created_storage": False,
+                "last_record_id": None,
+                "records_read": 0,
+                "records_written": 0,
+                "started_at": datetime.now().isoformat(),
+            }
+
+        # Last checkpoint state whose writes are committed
+        committed = dict(checkpoint)
+        copying = True
         try:
-            import time
-
             migration_start = time.time()
 
-            # Step 1: Read all data from old backend
-            logger.info(f"⏱️  Reading data from {old_backend} backend...")
-            step_start = time.time()
-            old_data = old_repo.read_all(form_path, spec)
-            read_time = time.time() - step_start
-
-            if not old_data:
-                logger.info("No data to migrate")
-                # Still successful - just no data
-                return True
-
+            # Step 1: Stream batches from old backend into new backend
             logger.info(
-                f"✅ Read {len(old_data)} records from {old_backend} in {read_time:.2f}s"
+                f"⏱️  Migrating records from {old_backend} to {new_backend} "
+                f"in batches of {batch_size}..."
             )
+            resuming = checkpoint["last_record_id"] is not None
+            written_this_run = 0
+
+            if reader == "process" and queue_depth > 0:
+                source_batches = process_batches(
+                    old_repo,
+                    form_path,
+                    spec,
+                    batch_size,
+                    checkpoint["last_record_id"],
+                    queue_depth,
+                )
+            else:
+                source_batches = pipeline_batches(
+                    old_repo.iter_records(
+                        form_path,
+                        spec,
+                        batch_size=batch_size,
+                        after_id=checkpoint["last_record_id"],
+                    ),
+                    queue_depth,
+                )
 
-            # Step 2: Create storage in new backend if needed
-            if not new_repo.exists(form_path):
-                logger.info(f"⏱️  Creating storage in {new_backend} backend...")
-                step_start = time.time()
-                if not new_repo.create_storage(form_path, spec):
-                    raise Exception(
-                        f"Failed to create storage in {new_backend} backend"
+            # Load into the new backend in a fast-load session: writes are
+            # committed in large groups, and the checkpoint only advances
+            # when a group is committed
+            loader = (
+                new_repo.fast_load(form_path, spec)
+                if fast_load
+                else nullcontext(BulkLoad())
+            )
+            with loader as session:
+                for batch in source_batches:
+                    last_record_id = batch[-1].get("_record_id")
+                    read_count = len(batch)
+
+                    # Step 2: Create storage in new backend if needed
+                    if not new_repo.exists(form_path):
+                        logger.info(f"⏱️  Creating storage in {new_backend} backend...")
+                        if not new_repo.create_storage(form_path, spec):
+                            raise Exception(
+                                f"Failed to create storage in {new_backend} backend"
+                            )
+                        checkpoint["created_storage"] = True
+                        committed["created_storage"] = True
+
+                    if resuming:
+                        # The batch after the checkpoint may have been written just
+                        # before the interruption; skip records already present
+                        batch = MigrationManager._skip_migrated(
+                            new_repo, form_path, spec, batch
+                        )
+                        resuming = False
+
+                    if batch:
+                        migrated_ids = new_repo.bulk_create(form_path, spec, batch)
+                        failed = sum(1 for id in migrated_ids if id is None)
+                        if failed:
+                            raise Exception(
+                                f"Failed to write {failed}/{len(batch)} records "
+                                f"to {new_backend}"
+                            )
+
+                    checkpoint["records_read"] += read_count
+                    checkpoint["records_written"] += len(batch)
+                    written_this_run += len(batch)
+
+                    # Records without an ID (legacy TXT lines) cannot be used as
+                    # resume points; keep the previous checkpoint position
+                    if last_record_id:
+                        checkpoint["last_record_id"] = last_record_id
+                    if session.commit_due():
+                        session.commit()
+                        MigrationManager._save_checkpoint(checkpoint_file, checkpoint)
+                        committed = dict(checkpoint)
+
+                    elapsed = time.time() - migration_start
+                    rate = written_this_run / elapsed if elapsed > 0 else 0.0
+                    logger.info(
+                        f"   {checkpoint['records_written']}/{record_count or '?'} "
+                        f"records migrated ({rate:.0f} rec/s)"
                     )
-                create_time = time.time() - step_start
-                logger.info(f"✅ Created storage in {create_time:.2f}s")
+                    if progress_callback:
+                        progress_callback(
+                            checkpoint["records_written"], record_count, rate
+                        )
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise MigrationCancelled(
+                            f"Migration cancelled after "
+                            f"{checkpoint['records_written']} records"
+                        )
+
+            # The session committed the remaining writes when it ended
+            MigrationManager._save_checkpoint(checkpoint_file, checkpoint)
+            copying = False
+            migrate_time = time.time() - migration_start
+
+            if checkpoint["records_written"] == 0 and not checkpoint["created_storage"]:
+                logger.info("No data to migrate")
+                MigrationManager._clear_checkpoint(checkpoint_file)
+                # Still successful - just no data
+                return True
 
-            # Step 3: Migrate records to new backend using bulk operation
             logger.info(
-                f"⏱️  Migrating {len(old_data)} records to {new_backend} backend..."
+                f"✅ Migrated {written_this_run} records in {migrate_time:.2f}s"
             )
-            step_start = time.time()
-
-            # Use bulk_create for significantly better performance
-            migrated_ids = new_repo.bulk_create(form_path, spec, old_data)
-            migrate_time = time.time() - step_start
-
-            # Count errors (None values in result)
-            migration_errors = sum(1 for id in migrated_ids if id is None)
-
-            # Check if too many errors occurred
-            total_records = len(old_data)
-            if migration_errors > 0:
-                error_rate = migration_errors / total_records
-                if error_rate > 0.1:  # More than 10% failed
-                    raise Exception(
-                        f"Too many migration errors: {migration_errors}/{total_records} "
-                        f"({error_rate*100:.1f}%)"
-                    )
-                logger.warning(f"⚠️  {migration_errors} records failed to migrate")
-
-            logger.info(f"✅ Migrated in {migrate_time:.2f}s")
 
-            # Step 4: Verify migration
-            logger.info(f"⏱️  Verifying migration...")
+            # Step 3: Verify migration
+            logger.info(f"⏱️  Verifying migration ({verify})...")
             step_start = time.time()
-            new_data = new_repo.read_all(form_path, spec)
+            source_count = MigrationManager.verify_migration(
+                old_repo, new_repo, form_path, spec, mode=verify, batch_size=batch_size
+            )
             verify_time = time.time() - step_start
 
-            if len(new_data) != len(old_data):
-                raise Exception(
-                    f"Verification failed: expected {len(old_data)} records, "
-                    f"got {len(new_data)}"
-                )
-
             total_time = time.time() - migration_start
             logger.info(f"✅ Verified in {verify_time:.2f}s")
 
             # Migration successful
+            MigrationManager._clear_checkpoint(checkpoint_file)
             logger.info(
-                f"✅ Successfully migrated {len(old_data)} records from {old_backend} to {new_backend} "
-                f"in {total_time:.2f}s total ({migration_errors} warnings)"
+                f"✅ Successfully migrated {source_count} records from {old_backend} to {new_backend} "
+                f"in {total_time:.2f}s total"
             )
 
             # Optional: Drop old storage (commented out for safety)
@@ -183,8 +490,25 @@ class MigrationManager:
             return True
 
         except Exception as e:
-            # Rollback: restore old backend and clean up new backend
             logger.error(f"Migration failed: {e}")
+
+            # ValueError: unreadable source data or a resume point that no
+            # longer exists - retrying from the checkpoint cannot succeed.
+            # A cancelled migration is rolled back, not resumed.
+            resumable = copying and not isinstance(e, (ValueError, MigrationCancelled))
+            if copying:
+                # Writes after the last commit were rolled back
+                checkpoint = committed
+            if resumable and checkpoint["last_record_id"] is not None:
+                # Keep partial data so the next attempt resumes from here
+                MigrationManager._save_checkpoint(checkpoint_file, checkpoint)
+                logger.info(
+                    f"Migration interrupted after {checkpoint['records_written']} "
+                    f"records; it will resume from the checkpoint on retry"
+                )
+                return False
+
+            # Rollback: restore old backend and clean up new backend
             logger.info("Rolling back migration...")
 
             MigrationManager._rollback_migration(
@@ -193,42 +517,315 @@ class MigrationManager:
                 new_repo=new_repo,
                 backup_info=backup_info,
             )
+            MigrationManager._clear_checkpoint(checkpoint_file)
 
             return False
 
     @staticmethod
-    def _get_repository(backend_type: str) -> Optional[BaseRepository]:
+    def verify_migration(
+        old_repo: BaseRepository,
+        new_repo: BaseRepository,
+        form_path: str,
+        spec: Dict[str, Any],
+        mode: str = "checksum",
+        batch_size: Optional[int] = None,
+    ) -> int:
         """
-        Get a repository instance for a specific backend type.
+        Verify that the new backend holds the same records as the old one.
+
+        In "checksum" mode each side is streamed once and reduced to an
+        order-independent checksum over the normalized field values, keyed
+        by record_id. On mismatch, a diagnostic pass reports the first
+        differing records.
+
+        Args:
+            old_repo: Source repository
+            new_repo: Target repository
+            form_path: Path to the form
+            spec: Form specification
+            mode: "checksum" or "count"
+            batch_size: Records per streamed batch
+
+        Returns:
+            Number of verified records
+
+        Raises:
+            Exception: If verification fails
+            ValueError: If mode is unknown
+        """
+        batch_size = batch_size or MigrationManager.BATCH_SIZE
+
+        if mode == "count":
+            source_count = sum(
+                len(batch)
+                for batch in old_repo.iter_records(form_path, spec, batch_size)
+            )
+            target_count = sum(
+                len(batch)
+                for batch in new_repo.iter_records(form_path, spec, batch_size)
+            )
+            if target_count != source_count:
+                raise Exception(
+                    f"Verification failed: expected {source_count} records, "
+                    f"got {target_count}"
+                )
+            return source_count
+
+        if mode != "checksum":
+            raise ValueError(f"Unknown verification mode: '{mode}'")
+
+        source = compute_checksum(old_repo, form_path, spec, batch_size)
+        target = compute_checksum(new_repo, form_path, spec, batch_size)
+
+        if not source.matches(target):
+            mismatches = find_mismatches(
+                old_repo, new_repo, form_path, spec, batch_size=batch_size
+            )
+            details = ", ".join(
+                f"{m['record_id']} ({m['problem']})" for m in mismatches
+            )
+            raise Exception(
+                f"Verification failed: source has {source}, target has {target}"
+                + (f"; first mismatches: {details}" if details else "")
+            )
+
+        if source.records_without_id:
+            logger.warning(
+                f"{source.records_without_id} source records have no record_id; "
+                f"verified their values only"
+            )
+        return source.record_count
+
+    @staticmethod
+    def _skip_migrated(
+        repo: BaseRepository,
+        form_path: str,
+        spec: Dict[str, Any],
+        batch: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Remove records that already exist in the target repository.
+
+        Args:
+            repo: Target repository
+            form_path: Path to the form
+            spec: Form specification
+            batch: Records about to be written
+
+        Returns:
+            Records whose IDs are not present in the target yet
+        """
+        pending = {r["_record_id"] for r in batch if r.get("_record_id")}
+        if not pending:
+            return batch
+
+        present = set()
+        for existing in repo.iter_records(form_path, spec):
+            for record in existing:
+                if record.get("_record_id") in pending:
+                    present.add(record["_record_id"])
+
+        if present:
+            logger.info(f"Skipping {len(present)} records already migrated")
+        return [r for r in batch if r.get("_record_id") not in present]
+
+    @staticmethod
+    def _get_backup_dir() -> Path:
+        """
+        Get the migration backup directory, creating it if needed.
+
+        Returns:
+            Path to the backup directory
+        """
+        config = get_config()
+        backup_path = config.get_setting("backup_path", "backups/migrations")
+
+        # Resolve relative paths against business case root
+        if not os.path.isabs(backup_path):
+            backup_path = str(config.business_case_root / backup_path)
+
+        backup_dir = Path(backup_path)
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        return backup_dir
+
+    @staticmethod
+    def _get_checkpoint_path(
+        form_path: str,
+        old_backend: str,
+        new_backend: str,
+        old_config: Optional[Dict[str, Any]] = None,
+        new_config: Optional[Dict[str, Any]] = None,
+    ) -> Path:
+        """
+        Get the checkpoint file for a form migration.
+
+        Args:
+            form_path: Path to the form
+            old_backend: Source backend type
+            new_backend: Target backend type
+            old_config: Resolved source backend configuration
+            new_config: Resolved target backend configuration
+
+        Returns:
+            Path to the checkpoint JSON file. Migrations between backends of
+            the same type get a suffix derived from both configurations, so
+            moves between different shards never share a checkpoint.
+        """
+        name = f"{form_path.replace('/', '_')}_{old_backend}_to_{new_backend}"
+        if old_backend == new_backend and old_config and new_config:
+            digest = hashlib.sha1(
+                (
+                    backend_identity(old_config)[1] + backend_identity(new_config)[1]
+                ).encode("utf-8")
+            ).hexdigest()
+            name += f"_{digest[:8]}"
+        return MigrationManager._get_backup_dir() / f"{name}.checkpoint.json"
+
+    @staticmethod
+    def _load_checkpoint(
+        checkpoint_file: Path,
+        new_repo: BaseRepository,
+        form_path: str,
+        spec: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load a resumable checkpoint, discarding it if it no longer applies.
+
+        A checkpoint is only valid for the spec version it was written for
+        and only if it recorded a resume position. Stale checkpoints are
+        removed, together with the target storage they created.
+
+        Args:
+            checkpoint_file: Checkpoint file path
+            new_repo: Target repository
+            form_path: Path to the form
+            spec: Current form specification
+
+        Returns:
+            Checkpoint dictionary or None
+        """
+        if not checkpoint_file.exists():
+            return None
+
+        try:
+            with open(checkpoint_file, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {checkpoint_file}: {e}")
+            MigrationManager._clear_checkpoint(checkpoint_file)
+            return None
+
+        spec_hash = SchemaChangeDetector.compute_spec_hash(spec)
+        if (
+            checkpoint.get("spec_hash") == spec_hash
+            and checkpoint.get("last_record_id") is not None
+        ):
+            return checkpoint
+
+        logger.warning(
+            f"Discarding migration checkpoint for '{form_path}' "
+            f"(spec changed or no resume position)"
+        )
+        if checkpoint.get("created_storage") and new_repo.exists(form_path):
+            new_repo.drop_storage(form_path, force=True)
+        MigrationManager._clear_checkpoint(checkpoint_file)
+        return None
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_file: Path, checkpoint: Dict[str, Any]) -> None:
+        """
+        Durably write a checkpoint (temporary file + fsync + atomic rename).
+
+        Args:
+            checkpoint_file: Checkpoint file path
+            checkpoint: Checkpoint data
+        """
+        tmp_file = checkpoint_file.with_name(checkpoint_file.name + ".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, checkpoint_file)
+
+    @staticmethod
+    def _clear_checkpoint(checkpoint_file: Path) -> None:
+        """Remove a checkpoint file if it exists."""
+        try:
+            checkpoint_file.unlink()
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _resolve_backend_config(
+        backend_type: str,
+        form_path: Optional[str] = None,
+        backend_config: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the resolved configuration of a migration's backend.
 
         Args:
             backend_type: Type of backend (e.g., 'txt', 'sqlite')
+            form_path: Form being migrated
+            backend_config: Resolved configuration recorded for the backend
+                (e.g. the schema history's last_backend_config); used as is
 
         Returns:
-            Repository instance or None
+            backend_config if given; otherwise the form's current backend
+            configuration if it has this type, so migrations land in the
+            right shard; otherwise the backend of that name (or the first
+            backend of that type) resolved for the form. None if no backend
+            matches.
         """
+        if backend_config is not None:
+            return backend_config
+
         config = get_config()
+        if form_path is None:
+            form_path = ""
+        else:
+            try:
+                current = config.get_backend_config(form_path)
+                if current.get("type") == backend_type:
+                    return current
+            except Exception as e:
+                logger.warning(f"Could not resolve backend for '{form_path}': {e}")
+
+        return config.find_backend_config(backend_type, form_path)
+
+    @staticmethod
+    def _get_repository(
+        backend_type: str,
+        form_path: Optional[str] = None,
+        backend_config: Optional[Dict[str, Any]] = None,
+    ) -> Optional[BaseRepository]:
+        """
+        Get a repository instance for a specific backend type.
 
-        # Get backend configuration
-        backend_config = config.config.get("backends", {}).get(backend_type)
+        Args:
+            backend_type: Type of backend (e.g., 'txt', 'sqlite')
+            form_path: Form being migrated, used to resolve paths and shard
+                placeholders (see _resolve_backend_config)
+            backend_config: Resolved configuration of the backend, if known
+
+        Returns:
+            Repository instance or None
+        """
+        backend_config = MigrationManager._resolve_backend_config(
+            backend_type, form_path, backend_config
+        )
         if not backend_config:
             logger.error(f"No configuration found for backend type: {backend_type}")
             return None
+        if backend_config.get("type") != backend_type:
+            logger.error(
+                f"Backend configuration has type '{backend_config.get('type')}', "
+                f"expected '{backend_type}'"
+            )
+            return None
 
-        # Create repository using factory (simulate form_path)
-        # We need to temporarily modify config to use specific backend
         try:
-            if backend_type == "txt":
-                from persistence.adapters.txt_adapter import TxtRepository
-
-                return TxtRepository(backend_config)
-            elif backend_type == "sqlite":
-                from persistence.adapters.sqlite_adapter import SQLiteRepository
-
-                return SQLiteRepository(backend_config)
-            else:
-                logger.error(f"Unsupported backend type: {backend_type}")
-                return None
+            return RepositoryFactory.get_repository_for_config(backend_config)
         except Exception as e:
             logger.error(f"Failed to create repository for {backend_type}: {e}")
             return None
@@ -248,57 +845,74 @@ class MigrationManager:
         Returns:
             Backup info dictionary with paths and metadata
         """
-        # Get backup path from config
-        config = get_config()
-        backup_path = config.get_setting("backup_path", "backups/migrations")
-
-        # Resolve relative paths against business case root
-        if not os.path.isabs(backup_path):
-            backup_path = str(config.business_case_root / backup_path)
-
         # Create migration backups directory
-        backup_dir = Path(backup_path)
-        backup_dir.mkdir(parents=True, exist_ok=True)
+        backup_dir = MigrationManager._get_backup_dir()
+        store = BackupStore(str(backup_dir))
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = (
-            f"{form_path.replace('/', '_')}_{old_backend}_to_migration_{timestamp}"
-        )
+        series = f"{form_path.replace('/', '_')}_{old_backend}_to_migration"
 
         backup_info = {
             "form_path": form_path,
             "old_backend": old_backend,
             "timestamp": timestamp,
             "backup_dir": str(backup_dir),
-            "backup_name": backup_name,
+            "backup_name": f"{series}_{timestamp}",
         }
 
         try:
+            manifest = None
+
             # Backend-specific backup
             if old_backend == "txt":
-                # Copy .txt file
+                # Store the .txt file
                 from persistence.adapters.txt_adapter import TxtRepository
 
                 if isinstance(old_repo, TxtRepository):
                     source_file = old_repo._get_file_path(form_path)
                     if os.path.exists(source_file):
-                        dest_file = backup_dir / f"{backup_name}.txt"
-                        shutil.copy2(source_file, dest_file)
-                        backup_info["backup_file"] = str(dest_file)
-                        logger.info(f"Created backup: {dest_file}")
+                        manifest = store.put_file(
+                            series,
+                            source_file,
+                            kind="txt",
+                            metadata={"form_path": form_path, "file": source_file},
+                        )
 
             elif old_backend == "sqlite":
-                # Copy entire database
+                # Online backup of the form's table (or the whole database)
                 from persistence.adapters.sqlite_adapter import SQLiteRepository
 
                 if isinstance(old_repo, SQLiteRepository):
                     source_db = old_repo.database
-                    if os.path.exists(source_db):
-                        dest_db = backup_dir / f"{backup_name}.db"
-                        shutil.copy2(source_db, dest_db)
-                        backup_info["backup_file"] = str(dest_db)
-                        logger.info(f"Created backup: {dest_db}")
-
+                    table = old_repo._get_table_name(form_path)
+                    if old_repo.exists(form_path) and old_repo.backup_scope == "table":
+                        manifest = store.put_lines(
+                            series,
+                            dump_sqlite_table(source_db, table, old_repo.timeout),
+                            kind="sqlite-table",
+                            metadata={"database": source_db, "table": table},
+                        )
+                        backup_info["backup_table"] = table
+                    elif os.path.exists(source_db):
+                        snapshot = str(backup_dir / f"{series}.snapshot")
+                        try:
+                            backup_sqlite(source_db, snapshot)
+                            manifest = store.put_file(
+                                series,
+                                snapshot,
+                                kind="sqlite-database",
+                                metadata={"database": source_db},
+                                line_chunks=False,
+                            )
+                        finally:
+                            if os.path.exists(snapshot):
+                                os.remove(snapshot)
+
+            if manifest:
+                backup_info["backup_id"] = manifest["id"]
+                logger.info(f"Created backup: {manifest['id']}")
+
+            store.prune(series)
             return backup_info
 
         except Exception as e:
@@ -0,0 +1,1051 @@
+"""
+Online (zero-downtime) backend migration for VibeCForms persistence layer.
+
+Instead of blocking a form until migrate_backend() has copied it, an online
+migration moves it in stages while the form stays usable:
+
+1. Dual write: the form's repository is replaced by a DualWriteRepository
+   that reads from the old backend and writes to both backends.
+2. Backfill: a background task copies the historical records into the new
+   backend, skipping records the dual writes already put there.
+3. Verify and flip: once the checksums of both backends match (the final
+   check runs with writes paused), the form's tags are copied, its tracking
+   is switched to the new backend and dual writes end, so reads move to it.
+
+The forms being migrated are persisted in a state file next to the migration
+backups, so every process (e.g. each gunicorn worker) dual-writes them, not
+only the one running the migration. RepositoryFactory.get_repository()
+returns a DualWriteRepository for those forms, so every caller writes
+through it, and drops it as soon as the migration ends in any process.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, Any, List, Optional, Callable, Set, Tuple
+
+from persistence.base import BaseRepository
+from persistence.checksum import compute_checksum, find_mismatches
+from persistence.config import get_config
+from persistence.file_lock import FileLock, get_file_lock
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Mismatches repaired per verification round
+REPAIR_LIMIT = 1000
+
+# Verification rounds (each repairing mismatches) before giving up
+VERIFY_ROUNDS = 3
+
+# Persisted online migrations: form path -> old/new backend names and
+# configurations. Lives in the migration backup directory.
+STATE_FILE_NAME = "online_migrations.json"
+
+# Actor recorded for tag changes made by the migration itself
+MIGRATION_ACTOR = "online_migration"
+
+# Dual-write repositories of this process, by form path, with the persisted
+# migration entry each was built for
+_dual_write_repositories: Dict[str, Tuple[Dict[str, Any], "DualWriteRepository"]] = {}
+_registry_lock = threading.Lock()
+
+# Last read state file: (path, (mtime_ns, size), entries)
+_state_cache: Optional[Tuple[str, Tuple[int, int], Dict[str, Any]]] = None
+
+
+class DualWriteRepository(BaseRepository):
+    """
+    Repository wrapper used while a form migrates between backends.
+
+    Reads are served by the source (old) backend, which stays authoritative
+    until the flip. Writes go to the source first and are then mirrored to
+    the target (new) backend with the same record IDs; a failed mirror
+    write is logged and left to the migration's verification to repair,
+    it never fails the caller's write.
+
+    Writes hold `write_lock`, a lock shared by all processes, so the
+    migration can pause them while it backfills a batch or runs the final
+    verification.
+    """
+
+    def __init__(
+        self,
+        form_path: str,
+        source: BaseRepository,
+        target: BaseRepository,
+        old_backend: str,
+        new_backend: str,
+    ):
+        """
+        Initialize the wrapper.
+
+        Args:
+            form_path: Path to the migrating form
+            source: Repository of the old backend
+            target: Repository of the new backend
+            old_backend: Old backend name
+            new_backend: New backend name
+        """
+        self.form_path = form_path
+        self.source = source
+        self.target = target
+        self.old_backend = old_backend
+        self.new_backend = new_backend
+
+        self.write_lock = _write_lock(form_path)
+        self.mirror_errors = 0
+
+    def __getattr__(self, name: str) -> Any:
+        # Backend-specific helpers are served by the source
+        return getattr(self.source, name)
+
+    def _mirror(self, operation: str, write: Callable[[], Any]) -> Any:
+        """Run a write against the target, logging instead of raising."""
+        try:
+            return write()
+        except Exception as e:
+            self.mirror_errors += 1
+            logger.warning(
+                f"Dual write to {self.new_backend} failed for "
+                f"'{self.form_path}' ({operation}): {e}"
+            )
+            return None
+
+    # =========================================================================
+    # WRITES (source, then mirrored to target)
+    # =========================================================================
+
+    def create_storage(self, form_path: str, spec: Dict[str, Any]) -> bool:
+        with self.write_lock:
+            created = self.source.create_storage(form_path, spec)
+            if not self.target.exists(form_path):
+                self._mirror(
+                    "create_storage",
+                    lambda: self.target.create_storage(form_path, spec),
+                )
+            return created
+
+    def create(
+        self, form_path: str, spec: Dict[str, Any], data: Dict[str, Any]
+    ) -> Optional[str]:
+        with self.write_lock:
+            record_id = self.source.create(form_path, spec, data)
+            if record_id:
+                self._mirror(
+                    "create",
+                    lambda: self.target.create(
+                        form_path, spec, {**data, "_record_id": record_id}
+                    ),
+                )
+            return record_id
+
+    def create_with_tags(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        data: Dict[str, Any],
+        tags: List[str],
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        with self.write_lock:
+            record_id = self.source.create_with_tags(
+                form_path, spec, data, tags, actor, metadata
+            )
+            if record_id:
+                self._mirror(
+                    "create_with_tags",
+                    lambda: self.target.create_with_tags(
+                        form_path,
+                        spec,
+                        {**data, "_record_id": record_id},
+                        tags,
+                        actor,
+                        metadata,
+                    ),
+                )
+            return record_id
+
+    def bulk_create(
+        self, form_path: str, spec: Dict[str, Any], records: List[Dict[str, Any]]
+    ) -> List[Optional[str]]:
+        with self.write_lock:
+            record_ids = self.source.bulk_create(form_path, spec, records)
+            created = [
+                {**record, "_record_id": record_id}
+                for record, record_id in zip(records, record_ids)
+                if record_id
+            ]
+            self._mirror(
+                "bulk_create", lambda: self.target.bulk_create(form_path, spec, created)
+            )
+            return record_ids
+
+    def update_by_id(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        record_id: str,
+        data: Dict[str, Any],
+    ) -> bool:
+        with self.write_lock:
+            updated = self.source.update_by_id(form_path, spec, record_id, data)
+            if updated:
+                # Not in the target yet: the backfill copies the new version
+                self._mirror(
+                    "update",
+                    lambda: self.target.update_by_id(form_path, spec, record_id, data),
+                )
+            return updated
+
+    def delete_by_id(
+        self, form_path: str, spec: Dict[str, Any], record_id: str
+    ) -> bool:
+        with self.write_lock:
+            deleted = self.source.delete_by_id(form_path, spec, record_id)
+            if deleted:
+                self._mirror(
+                    "delete",
+                    lambda: self.target.delete_by_id(form_path, spec, record_id),
+                )
+            return deleted
+
+    def update(
+        self, form_path: str, spec: Dict[str, Any], idx: int, data: Dict[str, Any]
+    ) -> bool:
+        with self.write_lock:
+            record = self.source.read_one(form_path, spec, idx)
+            if not record or not record.get("_record_id"):
+                return self.source.update(form_path, spec, idx, data)
+            return self.update_by_id(form_path, spec, record["_record_id"], data)
+
+    def delete(self, form_path: str, spec: Dict[str, Any], idx: int) -> bool:
+        with self.write_lock:
+            record = self.source.read_one(form_path, spec, idx)
+            if not record or not record.get("_record_id"):
+                return self.source.delete(form_path, spec, idx)
+            return self.delete_by_id(form_path, spec, record["_record_id"])
+
+    def drop_storage(self, form_path: str, force: bool = False) -> bool:
+        with self.write_lock:
+            dropped = self.source.drop_storage(form_path, force)
+            self._mirror(
+                "drop_storage", lambda: self.target.drop_storage(form_path, force)
+            )
+            return dropped
+
+    def migrate_schema(
+        self, form_path: str, old_spec: Dict[str, Any], new_spec: Dict[str, Any]
+    ) -> bool:
+        with self.write_lock:
+            migrated = self.source.migrate_schema(form_path, old_spec, new_spec)
+            self._mirror(
+                "migrate_schema",
+                lambda: self.target.migrate_schema(form_path, old_spec, new_spec),
+            )
+            return migrated
+
+    def create_index(self, form_path: str, field_name: str) -> bool:
+        created = self.source.create_index(form_path, field_name)
+        self._mirror(
+            "create_index", lambda: self.target.create_index(form_path, field_name)
+        )
+        return created
+
+    def rename_field(
+        self, form_path: str, spec: Dict[str, Any], old_name: str, new_name: str
+    ) -> bool:
+        with self.write_lock:
+            renamed = self.source.rename_field(form_path, spec, old_name, new_name)
+            self._mirror(
+                "rename_field",
+                lambda: self.target.rename_field(form_path, spec, old_name, new_name),
+            )
+            return renamed
+
+    def change_field_type(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        field_name: str,
+        old_type: str,
+        new_type: str,
+    ) -> bool:
+        with self.write_lock:
+            changed = self.source.change_field_type(
+                form_path, spec, field_name, old_type, new_type
+            )
+            self._mirror(
+                "change_field_type",
+                lambda: self.target.change_field_type(
+                    form_path, spec, field_name, old_type, new_type
+                ),
+            )
+            return changed
+
+    def remove_field(
+        self, form_path: str, spec: Dict[str, Any], field_name: str
+    ) -> bool:
+        with self.write_lock:
+            removed = self.source.remove_field(form_path, spec, field_name)
+            self._mirror(
+                "remove_field",
+                lambda: self.target.remove_field(form_path, spec, field_name),
+            )
+            return removed
+
+    def add_tag(
+        self,
+        object_type: str,
+        object_id: str,
+        tag: str,
+        applied_by: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        with self.write_lock:
+            added = self.source.add_tag(
+                object_type, object_id, tag, applied_by, metadata
+            )
+            if added:
+                self._mirror(
+                    "add_tag",
+                    lambda: self.target.add_tag(
+                        object_type, object_id, tag, applied_by, metadata
+                    ),
+                )
+            return added
+
+    def remove_tag(
+        self, object_type: str, object_id: str, tag: str, removed_by: str
+    ) -> bool:
+        with self.write_lock:
+            removed = self.source.remove_tag(object_type, object_id, tag, removed_by)
+            if removed:
+                self._mirror(
+                    "remove_tag",
+                    lambda: self.target.remove_tag(
+                        object_type, object_id, tag, removed_by
+                    ),
+                )
+            return removed
+
+    def transition_tag(
+        self,
+        object_type: str,
+        object_id: str,
+        from_tag: str,
+        to_tag: str,
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        with self.write_lock:
+            moved = self.source.transition_tag(
+                object_type, object_id, from_tag, to_tag, actor, metadata
+            )
+            if moved:
+                self._mirror(
+                    "transition_tag",
+                    lambda: self.target.transition_tag(
+                        object_type, object_id, from_tag, to_tag, actor, metadata
+                    ),
+                )
+            return moved
+
+    def bulk_add_tag(
+        self,
+        object_type: str,
+        object_ids: List[str],
+        tag: str,
+        applied_by: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        with self.write_lock:
+            added = self.source.bulk_add_tag(
+                object_type, object_ids, tag, applied_by, metadata
+            )
+            if added:
+                self._mirror(
+                    "bulk_add_tag",
+                    lambda: self.target.bulk_add_tag(
+                        object_type, added, tag, applied_by, metadata
+                    ),
+                )
+            return added
+
+    def bulk_remove_tag(
+        self, object_type: str, object_ids: List[str], tag: str, removed_by: str
+    ) -> List[str]:
+        with self.write_lock:
+            removed = self.source.bulk_remove_tag(
+                object_type, object_ids, tag, removed_by
+            )
+            if removed:
+                self._mirror(
+                    "bulk_remove_tag",
+                    lambda: self.target.bulk_remove_tag(
+                        object_type, removed, tag, removed_by
+                    ),
+                )
+            return removed
+
+    def bulk_transition(
+        self,
+        object_type: str,
+        object_ids: List[str],
+        from_tag: str,
+        to_tag: str,
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        with self.write_lock:
+            moved = self.source.bulk_transition(
+                object_type, object_ids, from_tag, to_tag, actor, metadata
+            )
+            if moved:
+                self._mirror(
+                    "bulk_transition",
+                    lambda: self.target.bulk_transition(
+                        object_type, moved, from_tag, to_tag, actor, metadata
+                    ),
+                )
+            return moved
+
+    def apply_transitions(
+        self,
+        object_type: str,
+        moves: List[Tuple[str, str, str]],
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        with self.write_lock:
+            moved = self.source.apply_transitions(object_type, moves, actor, metadata)
+            if moved:
+                applied = set(moved)
+                mirrored = [move for move in moves if move[0] in applied]
+                self._mirror(
+                    "apply_transitions",
+                    lambda: self.target.apply_transitions(
+                        object_type, mirrored, actor, metadata
+                    ),
+                )
+            return moved
+
+    def rebuild_tag_statistics(self, object_type: str) -> Dict[str, int]:
+        with self.write_lock:
+            stats = self.source.rebuild_tag_statistics(object_type)
+            self._mirror(
+                "rebuild_tag_statistics",
+                lambda: self.target.rebuild_tag_statistics(object_type),
+            )
+            return stats
+
+    def purge_orphan_tags(self, object_type: str) -> int:
+        # Not mirrored: records not backfilled yet would look orphaned in
+        # the target
+        with self.write_lock:
+            return self.source.purge_orphan_tags(object_type)
+
+    # =========================================================================
+    # READS (source)
+    # =========================================================================
+
+    def read_all(self, form_path: str, spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return self.source.read_all(form_path, spec)
+
+    def read_one(
+        self, form_path: str, spec: Dict[str, Any], idx: int
+    ) -> Optional[Dict[str, Any]]:
+        return self.source.read_one(form_path, spec, idx)
+
+    def read_by_id(
+        self, form_path: str, spec: Dict[str, Any], record_id: str
+    ) -> Optional[Dict[str, Any]]:
+        return self.source.read_by_id(form_path, spec, record_id)
+
+    def read_by_ids(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        record_ids: List[str],
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        return self.source.read_by_ids(form_path, spec, record_ids, fields)
+
+    def iter_records(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        batch_size: int = 1000,
+        after_id: Optional[str] = None,
+    ):
+        return self.source.iter_records(form_path, spec, batch_size, after_id)
+
+    def search(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        field_name: str,
+        query: str,
+        limit: int = 5,
+    ) -> List[str]:
+        return self.source.search(form_path, spec, field_name, query, limit)
+
+    def exists(self, form_path: str) -> bool:
+        return self.source.exists(form_path)
+
+    def has_data(self, form_path: str) -> bool:
+        return self.source.has_data(form_path)
+
+    def get_tags(
+        self, object_type: str, object_id: str, active_only: bool = True
+    ) -> List[Dict[str, Any]]:
+        return self.source.get_tags(object_type, object_id, active_only)
+
+    def has_tag(self, object_type: str, object_id: str, tag: str) -> bool:
+        return self.source.has_tag(object_type, object_id, tag)
+
+    def page_objects_by_tag(
+        self,
+        object_type: str,
+        tag: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[Tuple[str, str]]:
+        return self.source.page_objects_by_tag(object_type, tag, limit, after)
+
+    def query_objects_by_tags(
+        self,
+        object_type: str,
+        all_of: Optional[List[str]] = None,
+        any_of: Optional[List[str]] = None,
+        none_of: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        return self.source.query_objects_by_tags(
+            object_type, all_of, any_of, none_of, limit
+        )
+
+    def get_objects_by_tag(
+        self, object_type: str, tag: str, active_only: bool = True
+    ) -> List[str]:
+        return self.source.get_objects_by_tag(object_type, tag, active_only)
+
+    def get_tag_changes(
+        self, object_type: str, since: int = 0, limit: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        return self.source.get_tag_changes(object_type, since, limit)
+
+    def get_change_cursor(self) -> int:
+        return self.source.get_change_cursor()
+
+    def get_tag_history(
+        self, object_type: str, object_id: str, tag: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return self.source.get_tag_history(object_type, object_id, tag)
+
+    def get_tag_statistics(self, object_type: str) -> Dict[str, int]:
+        return self.source.get_tag_statistics(object_type)
+
+
+def _state_file() -> str:
+    """Get the path of the persisted online migration state."""
+    config = get_config()
+    backup_path = config.get_setting("backup_path", "backups/migrations")
+    if not os.path.isabs(backup_path):
+        backup_path = str(config.business_case_root / backup_path)
+    return os.path.join(backup_path, STATE_FILE_NAME)
+
+
+def _write_lock(form_path: str) -> FileLock:
+    """Get the lock pausing a migrating form's writes in every process."""
+    safe_name = form_path.replace("/", "_")
+    state_dir = os.path.dirname(_state_file())
+    return get_file_lock(os.path.join(state_dir, f"online_{safe_name}"))
+
+
+def _load_state() -> Dict[str, Any]:
+    """
+    Read the online migrations in progress, by form path.
+
+    Cached by the state file's modification time and size, so the file is
+    only re-read after a migration started or ended.
+    """
+    global _state_cache
+
+    path = _state_file()
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _state_cache is not None and _state_cache[:2] == (path, key):
+        return _state_cache[2]
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Unreadable online migration state {path}: {e}")
+        return {}
+    _state_cache = (path, key, state)
+    return state
+
+
+def _save_state(form_path: str, entry: Optional[Dict[str, Any]]) -> None:
+    """
+    Record that a form is being migrated online (None: no longer).
+
+    The file is re-read and replaced atomically under an inter-process
+    lock, so migrations of other forms are kept.
+    """
+    path = _state_file()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with get_file_lock(path):
+        state = dict(_load_state())
+        if entry is None:
+            if state.pop(form_path, None) is None:
+                return
+        else:
+            state[form_path] = entry
+
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{STATE_FILE_NAME}.", suffix=".tmp", dir=os.path.dirname(path)
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def get_dual_write_repository(form_path: str) -> Optional[DualWriteRepository]:
+    """
+    Get the dual-write repository of a form being migrated online.
+
+    The persisted state decides whether the form is migrating, so a
+    migration started or ended by another process is followed here. The
+    wrapper of a process that did not start the migration is built from
+    the backend configurations recorded by OnlineMigration.begin().
+
+    Args:
+        form_path: Path to the form
+
+    Returns:
+        DualWriteRepository, or None if the form is not migrating
+    """
+    entry = _load_state().get(form_path)
+    registered = _dual_write_repositories.get(form_path)
+    if entry is None:
+        if registered is not None:
+            with _registry_lock:
+                _dual_write_repositories.pop(form_path, None)
+            logger.info(f"Dual writes ended for '{form_path}'")
+        return None
+    if registered is not None and registered[0] == entry:
+        return registered[1]
+
+    # Repositories are created by the factory, which imports this module
+    from persistence.factory import RepositoryFactory
+
+    with _registry_lock:
+        registered = _dual_write_repositories.get(form_path)
+        if registered is None or registered[0] != entry:
+            config = get_config()
+            configs = []
+            for backend in ("old", "new"):
+                backend_config = entry.get(f"{backend}_config")
+                if backend_config is None:
+                    backend_config = config.find_backend_config(
+                        entry[f"{backend}_backend"], form_path
+                    )
+                if backend_config is None:
+                    raise ValueError(
+                        f"Backend '{entry[f'{backend}_backend']}' of the online "
+                        f"migration of '{form_path}' is not configured"
+                    )
+                configs.append(backend_config)
+            wrapper = DualWriteRepository(
+                form_path,
+                RepositoryFactory.get_repository_for_config(configs[0]),
+                RepositoryFactory.get_repository_for_config(configs[1]),
+                entry["old_backend"],
+                entry["new_backend"],
+            )
+            registered = _dual_write_repositories[form_path] = (entry, wrapper)
+            logger.info(
+                f"Dual writes joined for '{form_path}': "
+                f"{entry['old_backend']} + {entry['new_backend']}"
+            )
+    return registered[1]
+
+
+class OnlineMigration:
+    """
+    Zero-downtime migration of one form between backends.
+
+    Example usage:
+        migration = OnlineMigration('contatos', spec, 'txt', 'sqlite', source, target)
+        migration.begin()    # from now on writes go to both backends
+        migration.run()      # backfill, verify and flip
+    """
+
+    def __init__(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        old_backend: str,
+        new_backend: str,
+        source: BaseRepository,
+        target: BaseRepository,
+        batch_size: int = 1000,
+        old_config: Optional[Dict[str, Any]] = None,
+        new_config: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize the migration.
+
+        Args:
+            form_path: Path to the form
+            spec: Form specification
+            old_backend: Old backend name
+            new_backend: New backend name
+            source: Repository of the old backend
+            target: Repository of the new backend
+            batch_size: Records per backfill batch
+            old_config: Resolved configuration of the old backend, used by
+                other processes to build their dual-write repository (if
+                None, they look the backend up by name)
+            new_config: Resolved configuration of the new backend
+        """
+        self.form_path = form_path
+        self.spec = spec
+        self.old_backend = old_backend
+        self.new_backend = new_backend
+        self.source = source
+        self.target = target
+        self.batch_size = batch_size
+        self.old_config = old_config
+        self.new_config = new_config
+
+    def begin(self) -> DualWriteRepository:
+        """
+        Start dual writes for the form.
+
+        Creates the form's storage in the new backend and persists the
+        migration, so RepositoryFactory returns a DualWriteRepository for
+        the form in every process from now on. If the form is already
+        migrating, this process's wrapper is reused.
+
+        Returns:
+            The form's DualWriteRepository
+        """
+        entry = {
+            "old_backend": self.old_backend,
+            "new_backend": self.new_backend,
+            "old_config": self.old_config,
+            "new_config": self.new_config,
+        }
+        with _registry_lock:
+            registered = _dual_write_repositories.get(self.form_path)
+            if registered is None:
+                if not self.target.exists(self.form_path):
+                    self.target.create_storage(self.form_path, self.spec)
+                wrapper = DualWriteRepository(
+                    self.form_path,
+                    self.source,
+                    self.target,
+                    self.old_backend,
+                    self.new_backend,
+                )
+                logger.info(
+                    f"Dual writes enabled for '{self.form_path}': "
+                    f"{self.old_backend} + {self.new_backend}"
+                )
+            else:
+                wrapper = registered[1]
+            _save_state(self.form_path, entry)
+            _dual_write_repositories[self.form_path] = (entry, wrapper)
+        return wrapper
+
+    def end(self, drop_target: bool = False) -> None:
+        """
+        Stop dual writes without flipping (cancelled or failed migration).
+
+        Safe to call when dual writes already ended.
+
+        Args:
+            drop_target: Also drop the partially migrated new storage (tags
+                copied to the new backend are reconciled by the next
+                migration)
+        """
+        with _write_lock(self.form_path):
+            with _registry_lock:
+                _save_state(self.form_path, None)
+                _dual_write_repositories.pop(self.form_path, None)
+            if drop_target and self.target.exists(self.form_path):
+                self.target.drop_storage(self.form_path, force=True)
+        logger.info(f"Dual writes disabled for '{self.form_path}'")
+
+    def run(
+        self,
+        record_count: int = 0,
+        progress_callback: Optional[Callable[[int, int, float], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        on_flip: Optional[Callable[[int], Any]] = None,
+    ) -> bool:
+        """
+        Backfill, verify and flip the form to the new backend.
+
+        Safe to re-run after an interruption: records already in the new
+        backend are skipped.
+
+        Args:
+            record_count: Records to migrate (for progress)
+            progress_callback: Called after each backfill batch with
+                (records_copied, record_count, records_per_second)
+            cancel_event: When set, the migration stops, dual writes end
+                and the new storage is dropped
+            on_flip: Called with the verified record count while writes are
+                paused, to switch the form's tracking to the new backend
+
+        Returns:
+            True if the form was flipped to the new backend
+        """
+        wrapper = self.begin()
+        try:
+            self._backfill(wrapper, record_count, progress_callback, cancel_event)
+            self._sync_tags()
+            verified = self._verify_and_flip(wrapper, cancel_event, on_flip)
+        except _Cancelled:
+            logger.info(f"Online migration of '{self.form_path}' cancelled")
+            self.end(drop_target=True)
+            return False
+        except Exception as e:
+            # The copied records are kept; a new run skips them
+            logger.error(f"Online migration of '{self.form_path}' failed: {e}")
+            self.end()
+            return False
+
+        if verified is None:
+            self.end()
+            return False
+
+        self.end()
+        logger.info(
+            f"✅ '{self.form_path}' flipped to {self.new_backend} "
+            f"({verified} records verified)"
+        )
+        return True
+
+    def _backfill(
+        self,
+        wrapper: DualWriteRepository,
+        record_count: int,
+        progress_callback: Optional[Callable[[int, int, float], None]],
+        cancel_event: Optional[threading.Event],
+    ) -> None:
+        """Copy the records the new backend does not have yet."""
+        existing: Set[str] = set()
+        for batch in self.target.iter_records(self.form_path, self.spec):
+            existing.update(r["_record_id"] for r in batch if r.get("_record_id"))
+
+        copied = 0
+        started = time.time()
+        for batch in self.source.iter_records(
+            self.form_path, self.spec, batch_size=self.batch_size
+        ):
+            if cancel_event is not None and cancel_event.is_set():
+                raise _Cancelled()
+
+            # Writes of every process are paused while the batch is filtered
+            # and written. Records dual writes already put in the target are
+            # skipped, and the others are re-read, so a concurrent update
+            # cannot be overwritten by an older copy
+            with wrapper.write_lock:
+                record_ids = [
+                    r["_record_id"]
+                    for r in batch
+                    if r.get("_record_id") and r["_record_id"] not in existing
+                ]
+                if record_ids:
+                    mirrored = self.target.read_by_ids(
+                        self.form_path, self.spec, record_ids, fields=[]
+                    )
+                    existing.update(mirrored)
+                    current = self.source.read_by_ids(
+                        self.form_path,
+                        self.spec,
+                        [i for i in record_ids if i not in mirrored],
+                    )
+                    pending = [current[i] for i in record_ids if i in current]
+                else:
+                    pending = []
+
+                if pending:
+                    written = self.target.bulk_create(
+                        self.form_path, self.spec, pending
+                    )
+                    failed = sum(1 for record_id in written if record_id is None)
+                    if failed:
+                        raise Exception(
+                            f"Failed to write {failed}/{len(pending)} records "
+                            f"to {self.new_backend}"
+                        )
+                    existing.update(record_id for record_id in written if record_id)
+
+            copied += len(batch)
+            if progress_callback:
+                elapsed = time.time() - started
+                progress_callback(
+                    copied, record_count, copied / elapsed if elapsed > 0 else 0.0
+                )
+
+    def _verify_and_flip(
+        self,
+        wrapper: DualWriteRepository,
+        cancel_event: Optional[threading.Event],
+        on_flip: Optional[Callable[[int], Any]],
+    ) -> Optional[int]:
+        """
+        Compare checksums, repairing mismatches, then flip with writes paused.
+
+        Returns:
+            Verified record count, or None if the backends never matched
+        """
+        for round_number in range(VERIFY_ROUNDS):
+            if cancel_event is not None and cancel_event.is_set():
+                raise _Cancelled()
+
+            # The last round runs with writes paused, so nothing can change
+            # between the final check and the flip
+            final = round_number == VERIFY_ROUNDS - 1
+            lock = wrapper.write_lock if final else nullcontext()
+            with lock:
+                source = compute_checksum(self.source, self.form_path, self.spec)
+                target = compute_checksum(self.target, self.form_path, self.spec)
+                if source.matches(target):
+                    with wrapper.write_lock:
+                        self._sync_tags()
+                        if on_flip:
+                            on_flip(source.record_count)
+                        # Every process reads the new backend from now on
+                        self.end()
+                    return source.record_count
+
+                repaired = self._repair(wrapper)
+                logger.info(
+                    f"Checksum mismatch for '{self.form_path}' "
+                    f"(source {source}, target {target}); repaired {repaired} records"
+                )
+
+        logger.error(
+            f"'{self.form_path}' still differs between {self.old_backend} and "
+            f"{self.new_backend} after {VERIFY_ROUNDS} rounds, not flipping"
+        )
+        return None
+
+    def _sync_tags(self) -> int:
+        """
+        Make the form's active tags in the target match the source.
+
+        Dual writes only mirror tag changes made after they started, so the
+        tags applied before are copied here, keeping who applied them and
+        their metadata (the application time becomes the copy's). Runs
+        after the backfill and again, with writes paused, before the flip.
+
+        Returns:
+            Number of tag applications added to or removed from the target
+        """
+        object_type = self.form_path
+        source_stats = self.source.get_tag_statistics(object_type)
+        target_stats = self.target.get_tag_statistics(object_type)
+
+        changed = 0
+        for tag in sorted(set(source_stats) | set(target_stats)):
+            source_ids = set(
+                self.source.get_objects_by_tag(object_type, tag)
+                if source_stats.get(tag)
+                else []
+            )
+            target_ids = set(
+                self.target.get_objects_by_tag(object_type, tag)
+                if target_stats.get(tag)
+                else []
+            )
+
+            stale = sorted(target_ids - source_ids)
+            if stale:
+                changed += len(
+                    self.target.bulk_remove_tag(
+                        object_type, stale, tag, MIGRATION_ACTOR
+                    )
+                )
+
+            # Missing applications, grouped by (applied_by, metadata) so each
+            # group is copied with one bulk write
+            groups: Dict[str, Tuple[str, Any, List[str]]] = {}
+            for object_id in sorted(source_ids - target_ids):
+                applied = next(
+                    (
+                        t
+                        for t in self.source.get_tags(object_type, object_id)
+                        if t["tag"] == tag
+                    ),
+                    None,
+                )
+                if applied is None:
+                    continue
+                key = json.dumps(
+                    [applied["applied_by"], applied.get("metadata")], sort_keys=True
+                )
+                group = groups.setdefault(
+                    key, (applied["applied_by"], applied.get("metadata"), [])
+                )
+                group[2].append(object_id)
+            for applied_by, metadata, object_ids in groups.values():
+                changed += len(
+                    self.target.bulk_add_tag(
+                        object_type, object_ids, tag, applied_by, metadata
+                    )
+                )
+
+        if changed:
+            logger.info(
+                f"Synchronized {changed} tag applications of '{self.form_path}' "
+                f"to {self.new_backend}"
+            )
+        return changed
+
+    def _repair(self, wrapper: DualWriteRepository) -> int:
+        """Make the target match the source for the mismatched records."""
+        mismatches = find_mismatches(
+            self.source, self.target, self.form_path, self.spec, limit=REPAIR_LIMIT
+        )
+        with wrapper.write_lock:
+            for mismatch in mismatches:
+                record_id = mismatch["record_id"]
+                if mismatch["problem"] == "unexpected":
+                    self.target.delete_by_id(self.form_path, self.spec, record_id)
+                    continue
+                record = self.source.read_by_id(self.form_path, self.spec, record_id)
+                if record is None:
+                    self.target.delete_by_id(self.form_path, self.spec, record_id)
+                elif mismatch["problem"] == "different":
+                    self.target.update_by_id(
+                        self.form_path, self.spec, record_id, record
+                    )
+                else:
+                    self.target.create(self.form_path, self.spec, record)
+        return len(mismatches)
+
+
+class _Cancelled(Exception):
+    """Raised inside OnlineMigration.run() when its cancel_event is set."""
@@ -8,13 +8,22 @@ enabling automatic migrations with user confirmation when needed.
 import hashlib
 import json
 import logging
+import threading
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .config import backend_identity
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Spec hashes memoized by spec object identity: id(spec) -> (spec, fields, hash).
+# Holding the spec keeps its id from being reused while the entry is cached.
+_spec_hash_cache: Dict[int, Tuple[Dict[str, Any], Any, str]] = {}
+_spec_hash_lock = threading.Lock()
+_SPEC_HASH_CACHE_SIZE = 256
+
 
 class ChangeType(Enum):
     """Types of schema changes."""
@@ -78,10 +87,29 @@ class BackendChange:
     has_data: bool = False
     record_count: int = 0
     requires_confirmation: bool = True
+    # Resolved backend configurations (None if unknown); they tell apart
+    # backends of the same type, e.g. two SQLite shards
+    old_config: Optional[Dict[str, Any]] = None
+    new_config: Optional[Dict[str, Any]] = None
+
+    @property
+    def old_location(self) -> str:
+        """Old backend, with its database or directory if known."""
+        return self._location(self.old_backend, self.old_config)
+
+    @property
+    def new_location(self) -> str:
+        """New backend, with its database or directory if known."""
+        return self._location(self.new_backend, self.new_config)
+
+    @staticmethod
+    def _location(backend: str, config: Optional[Dict[str, Any]]) -> str:
+        target = (config or {}).get("database") or (config or {}).get("path")
+        return f"{backend} ({target})" if target else backend
 
     def get_description(self) -> str:
         """Get human-readable description of the backend change."""
-        desc = f"Backend mudou de '{self.old_backend}' para '{self.new_backend}'"
+        desc = f"Backend mudou de '{self.old_location}' para '{self.new_location}'"
         if self.has_data:
             desc += f" ({self.record_count} registros existentes)"
         return desc
@@ -105,15 +133,34 @@ class SchemaChangeDetector:
         """
         Compute MD5 hash of a spec for quick comparison.
 
+        The hash is memoized per spec object: specs returned by load_spec()
+        are cached and shared, so each loaded spec version is serialized and
+        hashed only once. Replacing the spec's "fields" list invalidates the
+        memoized value; specs must not be mutated in place otherwise.
+
         Args:
             spec: Form specification dictionary
 
         Returns:
             MD5 hash of the spec's fields
         """
+        fields = spec.get("fields", [])
+
+        cached = _spec_hash_cache.get(id(spec))
+        if cached is not None and cached[0] is spec and cached[1] is fields:
+            return cached[2]
+
         # Only hash the fields, not title or other metadata
-        fields_json = json.dumps(spec.get("fields", []), sort_keys=True)
-        return hashlib.md5(fields_json.encode()).hexdigest()
+        fields_json = json.dumps(fields, sort_keys=True)
+        spec_hash = hashlib.md5(fields_json.encode()).hexdigest()
+
+        with _spec_hash_lock:
+            if len(_spec_hash_cache) >= _SPEC_HASH_CACHE_SIZE:
+                # Evict the oldest entry
+                del _spec_hash_cache[next(iter(_spec_hash_cache))]
+            _spec_hash_cache[id(spec)] = (spec, fields, spec_hash)
+
+        return spec_hash
 
     @staticmethod
     def detect_changes(
@@ -335,7 +382,12 @@ class SchemaChangeDetector:
 
     @staticmethod
     def detect_backend_change(
-        form_path: str, old_backend: str, new_backend: str, record_count: int = 0
+        form_path: str,
+        old_backend: str,
+        new_backend: str,
+        record_count: int = 0,
+        old_config: Optional[Dict[str, Any]] = None,
+        new_config: Optional[Dict[str, Any]] = None,
     ) -> Optional[BackendChange]:
         """
         Detect a change in persistence backend.
@@ -345,11 +397,19 @@ class SchemaChangeDetector:
             old_backend: Previous backend type
             new_backend: Current backend type
             record_count: Number of existing records
+            old_config: Previous resolved backend configuration, if known
+            new_config: Current resolved backend configuration, if known
 
         Returns:
-            BackendChange object if backend changed, None otherwise
+            BackendChange object if the backend type changed, or if both
+            configurations are known and differ (same type, other storage);
+            None otherwise
         """
-        if old_backend == new_backend:
+        if old_backend == new_backend and (
+            old_config is None
+            or new_config is None
+            or backend_identity(old_config) == backend_identity(new_config)
+        ):
             return None
 
         has_data = record_count > 0
@@ -361,10 +421,13 @@ class SchemaChangeDetector:
             has_data=has_data,
             record_count=record_count,
             requires_confirmation=has_data,
+            old_config=old_config,
+            new_config=new_config,
         )
 
         logger.info(
-            f"Backend change detected for '{form_path}': {old_backend} -> {new_backend}"
+            f"Backend change detected for '{form_path}': "
+            f"{backend_change.old_location} -> {backend_change.new_location}"
         )
         if has_data:
             logger.warning(
@@ -427,8 +490,8 @@ class SchemaChangeDetector:
         """
         lines = [
             f"Mudança de backend detectada no formulário '{backend_change.form_path}':",
-            f"  • Origem: {backend_change.old_backend}",
-            f"  • Destino: {backend_change.new_backend}",
+            f"  • Origem: {backend_change.old_location}",
+            f"  • Destino: {backend_change.new_location}",
         ]
 
         if backend_change.has_data:
@@ -3,18 +3,50 @@ Schema history tracking for VibeCForms persistence layer.
 
 This module maintains a history of form specifications and backend configurations
 to detect changes and trigger migrations when needed.
+
+Updates are applied in memory and written back through a coalescing
+write-behind buffer: bursts of updates produce a single atomic rewrite of
+the history file shortly afterwards, off the request path.
+
+Several processes (e.g. gunicorn workers) may share the history file. Each
+flush re-reads the file under an inter-process lock and writes back only
+the forms this process changed, so updates of different forms never
+overwrite each other; reads pick up other processes' writes as soon as the
+file changes.
 """
 
 import os
 import json
+import atexit
 import logging
+import tempfile
+import threading
+import weakref
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
+from .config import backend_identity
+from .file_lock import get_file_lock
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Seconds to wait before writing pending updates, so bursts are coalesced
+_FLUSH_DELAY = 0.5
+
+# Instances with possibly pending writes, flushed at interpreter exit
+_live_histories: "weakref.WeakSet[SchemaHistory]" = weakref.WeakSet()
+
+
+def _flush_all_histories() -> None:
+    """Flush pending updates of every live history instance."""
+    for history in list(_live_histories):
+        history.flush()
+
+
+atexit.register(_flush_all_histories)
+
 
 class SchemaHistory:
     """
@@ -22,18 +54,24 @@ class SchemaHistory:
 
     Stores the last known state of each form to enable change detection:
     - Last spec hash
-    - Last backend type
+    - Last backend type and resolved backend configuration (so moving a
+      form between two backends of the same type, e.g. SQLite shards, is
+      detected and the old storage can still be found)
     - Last update timestamp
     - Record count at last check
     """
 
-    def __init__(self, history_file: Optional[str] = None):
+    def __init__(
+        self, history_file: Optional[str] = None, flush_delay: float = _FLUSH_DELAY
+    ):
         """
         Initialize schema history manager.
 
         Args:
             history_file: Path to history JSON file.
                          If None, uses default: src/config/schema_history.json
+            flush_delay: Seconds to buffer updates before writing them.
+                         0 writes synchronously on every update.
         """
         if history_file is None:
             # Default path relative to project root
@@ -41,8 +79,22 @@ class SchemaHistory:
             history_file = project_root / "src" / "config" / "schema_history.json"
 
         self.history_file = Path(history_file)
+        self.flush_delay = flush_delay
+        self._file_key = self._stat_key()
         self.history = self._load_history()
 
+        # Guards self.history and the write-behind state
+        self._lock = threading.Lock()
+        # Serializes flushes of this process with other processes' flushes
+        self._write_lock = get_file_lock(str(self.history_file))
+        # Forms changed by this process and not written yet, with their new
+        # entry (None = deleted); _cleared means the whole history was cleared
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._cleared = False
+        self._flush_timer: Optional[threading.Timer] = None
+
+        _live_histories.add(self)
+
     def _load_history(self) -> Dict[str, Any]:
         """
         Load history from JSON file.
@@ -66,36 +118,145 @@ class SchemaHistory:
             logger.error(f"Error loading history: {e}")
             return {}
 
-    def _save_history(self) -> bool:
+    def _stat_key(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the history file, None if missing."""
+        try:
+            stat = os.stat(self.history_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self) -> None:
+        """
+        Reload the history if another process has written the file.
+
+        Changes of this process that are not written yet are kept on top of
+        the reloaded entries.
+        """
+        key = self._stat_key()
+        if key == self._file_key:
+            return
+
+        history = self._load_history()
+        with self._lock:
+            self._file_key = key
+            if self._cleared:
+                history = {}
+            self.history = self._apply_pending(history, self._pending)
+
+    @staticmethod
+    def _apply_pending(
+        history: Dict[str, Any], pending: Dict[str, Optional[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Apply pending per-form changes to a history dictionary."""
+        for form_path, entry in pending.items():
+            if entry is None:
+                history.pop(form_path, None)
+            else:
+                history[form_path] = entry
+        return history
+
+    def _schedule_flush(self) -> bool:
+        """
+        Schedule a write-behind flush of the pending changes.
+
+        Must be called with ``self._lock`` held.
+
+        Returns:
+            True if a flush was scheduled, False if the caller must flush now
+        """
+        if self.flush_delay <= 0:
+            return False  # Caller flushes synchronously
+
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+        return True
+
+    def _commit(self) -> bool:
+        """
+        Persist a change made under ``self._lock``.
+
+        Returns:
+            True if successful
+        """
+        with self._lock:
+            scheduled = self._schedule_flush()
+        return scheduled or self.flush()
+
+    def flush(self) -> bool:
         """
-        Save history to JSON file.
+        Write pending updates to the history file.
+
+        Under an inter-process lock, the file is re-read and only the forms
+        changed by this process are replaced, so concurrent updates of other
+        forms by other processes are kept. The file is replaced atomically
+        (temporary file + rename), so readers never see a partially written
+        history.
+
+        Returns:
+            True if there was nothing to write or the write succeeded
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._pending and not self._cleared:
+                    return True
+                pending, self._pending = self._pending, {}
+                cleared, self._cleared = self._cleared, False
+
+            history = {} if cleared else self._load_history()
+            history = self._apply_pending(history, pending)
+            content = json.dumps(history, indent=2, ensure_ascii=False)
+
+            if self._write_file(content):
+                with self._lock:
+                    self._file_key = self._stat_key()
+                    # Changes made while writing stay on top
+                    self.history = self._apply_pending(history, self._pending)
+                logger.debug(f"Saved schema history to {self.history_file}")
+                return True
+
+            with self._lock:
+                # Keep the updates pending so the next flush retries them
+                self._pending = {**pending, **self._pending}
+                self._cleared = self._cleared or cleared
+            return False
+
+    def _write_file(self, content: str) -> bool:
+        """
+        Atomically replace the history file with the given content.
+
+        Args:
+            content: Serialized history
 
         Returns:
             True if successful, False otherwise
         """
+        tmp_path = None
         try:
             # Ensure directory exists
             self.history_file.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(self.history_file, "w", encoding="utf-8") as f:
-                json.dump(self.history, f, indent=2, ensure_ascii=False)
-                f.flush()  # Ensure data is written to disk
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=f".{self.history_file.name}.",
+                suffix=".tmp",
+                dir=str(self.history_file.parent),
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+                f.flush()
                 os.fsync(f.fileno())  # Force OS to write to disk
 
-            logger.info(f"✅ Saved schema history to {self.history_file}")
-
-            # Verify the save by reading back
-            try:
-                with open(self.history_file, "r", encoding="utf-8") as f:
-                    verification = json.load(f)
-                logger.info(f"✅ Verified schema history file is readable and valid")
-            except Exception as verify_error:
-                logger.error(f"❌ Failed to verify schema history save: {verify_error}")
-                return False
-
+            os.replace(tmp_path, self.history_file)
             return True
         except Exception as e:
             logger.error(f"❌ Error saving history: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
             return False
 
     def get_form_history(self, form_path: str) -> Optional[Dict[str, Any]]:
@@ -108,10 +269,16 @@ class SchemaHistory:
         Returns:
             Dictionary with form history or None if no history exists
         """
+        self._refresh()
         return self.history.get(form_path)
 
     def update_form_history(
-        self, form_path: str, spec_hash: str, backend: str, record_count: int = 0
+        self,
+        form_path: str,
+        spec_hash: str,
+        backend: str,
+        record_count: int = 0,
+        backend_config: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """
         Update history for a form.
@@ -121,18 +288,30 @@ class SchemaHistory:
             spec_hash: MD5 hash of the current spec
             backend: Current backend type (e.g., 'txt', 'sqlite')
             record_count: Number of records in the form
+            backend_config: Resolved configuration of the current backend.
+                If None, the recorded configuration is kept as long as the
+                backend type is unchanged.
 
         Returns:
-            True if successful
+            True if the update was written or scheduled for writing
         """
-        self.history[form_path] = {
+        entry = {
             "last_spec_hash": spec_hash,
             "last_backend": backend,
             "last_updated": datetime.now().isoformat(),
             "record_count": record_count,
         }
 
-        return self._save_history()
+        self._refresh()
+        with self._lock:
+            previous = self.history.get(form_path) or {}
+            if backend_config is None and previous.get("last_backend") == backend:
+                backend_config = previous.get("last_backend_config")
+            if backend_config is not None:
+                entry["last_backend_config"] = backend_config
+            self.history[form_path] = entry
+            self._pending[form_path] = entry
+        return self._commit()
 
     def has_spec_changed(self, form_path: str, current_spec_hash: str) -> bool:
         """
@@ -152,23 +331,42 @@ class SchemaHistory:
         last_hash = history.get("last_spec_hash", "")
         return last_hash != current_spec_hash
 
-    def has_backend_changed(self, form_path: str, current_backend: str) -> bool:
+    def has_backend_changed(
+        self,
+        form_path: str,
+        current_backend: str,
+        current_config: Optional[Dict[str, Any]] = None,
+    ) -> bool:
         """
         Check if a form's backend has changed since last check.
 
         Args:
             form_path: Path to the form
             current_backend: Current backend type
+            current_config: Resolved configuration of the current backend.
+                If given, a different configuration of the same backend type
+                (another database file, directory or shard) also counts as
+                a change.
 
         Returns:
-            True if backend has changed or no history exists
+            True if backend has changed, False if not or no history exists
         """
         history = self.get_form_history(form_path)
         if not history:
             return False  # No history = first time, not a "change"
 
         last_backend = history.get("last_backend", "")
-        return last_backend != current_backend and last_backend != ""
+        if last_backend == "":
+            return False
+        if last_backend != current_backend:
+            return True
+
+        # Entries recorded before backend identities were tracked only
+        # know the backend type
+        last_config = history.get("last_backend_config")
+        if current_config is None or last_config is None:
+            return False
+        return backend_identity(last_config) != backend_identity(current_config)
 
     def get_last_backend(self, form_path: str) -> Optional[str]:
         """
@@ -186,6 +384,23 @@ class SchemaHistory:
 
         return history.get("last_backend")
 
+    def get_last_backend_config(self, form_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the last known resolved backend configuration for a form.
+
+        Args:
+            form_path: Path to the form
+
+        Returns:
+            Backend configuration, or None if no history or the entry was
+            recorded before backend configurations were tracked
+        """
+        history = self.get_form_history(form_path)
+        if not history:
+            return None
+
+        return history.get("last_backend_config")
+
     def get_last_record_count(self, form_path: str) -> int:
         """
         Get the last known record count for a form.
@@ -212,11 +427,13 @@ class SchemaHistory:
         Returns:
             True if successful
         """
-        if form_path in self.history:
+        self._refresh()
+        with self._lock:
+            if form_path not in self.history:
+                return True  # Already doesn't exist
             del self.history[form_path]
-            return self._save_history()
-
-        return True  # Already doesn't exist
+            self._pending[form_path] = None
+        return self._commit()
 
     def get_all_forms(self) -> list:
         """
@@ -225,6 +442,7 @@ class SchemaHistory:
         Returns:
             List of form paths
         """
+        self._refresh()
         return list(self.history.keys())
 
     def clear_history(self) -> bool:
@@ -234,8 +452,11 @@ class SchemaHistory:
         Returns:
             True if successful
         """
-        self.history = {}
-        return self._save_history()
+        with self._lock:
+            self.history = {}
+            self._pending = {}
+            self._cleared = True
+        return self._commit()
 
     def __repr__(self) -> str:
         """String representation of schema history."""
@@ -271,7 +492,10 @@ def reset_history() -> None:
     """
     Reset the global history instance.
 
+    Pending updates of the current instance are written first.
     Useful for testing to force history reload.
     """
     global _history_instance
+    if _history_instance is not None:
+        _history_instance.flush()
     _history_instance = None
@@ -14,15 +14,19 @@ Kanban boards allow:
 import os
 import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from persistence.factory import RepositoryFactory
 from services.tag_service import get_tag_service
+from utils.crockford import validate_id
 from utils.spec_loader import load_spec
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Logged changes folded per get_board_changes() call by default
+CHANGES_LIMIT = 1000
+
 
 class KanbanService:
     """
@@ -161,7 +165,8 @@ class KanbanService:
             spec: Optional form spec (will be loaded if not provided)
 
         Returns:
-            List of object dictionaries with full data
+            List of object dictionaries with full data, most recently
+            moved into the column first
 
         Example:
             cards = kanban_service.get_cards_for_column('contatos', 'qualified')
@@ -175,20 +180,8 @@ class KanbanService:
             if spec is None:
                 spec = load_spec(form_path)
 
-            # Get all object IDs with this tag
-            object_ids = self.tag_service.get_objects_with_tag(form_path, tag)
-
-            if not object_ids:
-                return []
-
-            # Get repository to read full object data
-            repo = RepositoryFactory.get_repository(form_path)
-
-            # Read all objects and filter by IDs
-            all_objects = repo.read_all(form_path, spec)
-
-            # Filter objects that have the tag
-            cards = [obj for obj in all_objects if obj.get("_record_id") in object_ids]
+            pages = {tag: self.tag_service.get_objects_page(form_path, tag)}
+            cards = self._read_cards(form_path, spec, pages)[tag]
 
             self.logger.info(f"Found {len(cards)} cards for {form_path}:{tag}")
             return cards
@@ -197,6 +190,266 @@ class KanbanService:
             self.logger.error(f"Error getting cards for {form_path}:{tag}: {e}")
             return []
 
+    def get_board_page(
+        self,
+        board_name: str,
+        limit: Optional[int] = None,
+        column: Optional[str] = None,
+        after: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get one page of cards per column, with the column totals.
+
+        Only the fields listed in the board's optional "card_fields" are
+        read and returned. Totals come from the tag counters, so they don't
+        depend on the page size.
+
+        Args:
+            board_name: Name of the board
+            limit: Maximum number of cards per column (None for all)
+            column: Only return this column (used to load more cards)
+            after: Cursor of the column's previous page ("next_cursor")
+
+        Returns:
+            Dictionary mapping column tags to
+            {"cards": [...], "total": int, "next_cursor": str or None}
+            Empty dict if the board or its form is unknown
+
+        Raises:
+            ValueError: If column is not on the board or after is malformed
+
+        Example:
+            page = kanban_service.get_board_page('sales_pipeline', limit=50)
+            more = kanban_service.get_board_page(
+                'sales_pipeline', 50, 'lead', page['lead']['next_cursor']
+            )
+        """
+        board_config = self.load_board_config(board_name)
+
+        if not board_config or not board_config.get("form"):
+            self.logger.error(f"Cannot get cards for unknown board: {board_name}")
+            return {}
+
+        form_path = board_config["form"]
+        tags = [
+            col.get("tag") for col in board_config.get("columns", []) if col.get("tag")
+        ]
+        if column is not None:
+            if column not in tags:
+                raise ValueError(f"Column '{column}' is not on board {board_name}")
+            tags = [column]
+
+        after_key = self._parse_cursor(after) if after else None
+        spec = load_spec(form_path)
+
+        # One extra object per column tells whether there is a next page
+        fetch = limit + 1 if limit is not None else None
+        pages = {
+            tag: self.tag_service.get_objects_page(form_path, tag, fetch, after_key)
+            for tag in tags
+        }
+        next_cursors = {}
+        for tag, page in pages.items():
+            if limit is not None and len(page) > limit:
+                pages[tag] = page[:limit]
+                next_cursors[tag] = self._format_cursor(page[limit - 1])
+
+        cards = self._read_cards(
+            form_path, spec, pages, board_config.get("card_fields")
+        )
+        counts = self.tag_service.get_tag_counts(form_path)
+
+        return {
+            tag: {
+                "cards": cards[tag],
+                "total": counts.get(tag, 0),
+                "next_cursor": next_cursors.get(tag),
+            }
+            for tag in tags
+        }
+
+    def get_change_cursor(self, board_name: str) -> int:
+        """
+        Get the change cursor of a board's form.
+
+        Read it before loading the board, then pass it to
+        get_board_changes() to catch up with everything changed since.
+
+        Args:
+            board_name: Name of the board
+
+        Returns:
+            Change cursor (0 for unknown boards or if nothing changed yet)
+        """
+        board_config = self.load_board_config(board_name)
+        if not board_config or not board_config.get("form"):
+            return 0
+        return self.tag_service.get_change_cursor(board_config["form"])
+
+    def get_board_changes(
+        self, board_name: str, since: int, limit: Optional[int] = CHANGES_LIMIT
+    ) -> Dict[str, Any]:
+        """
+        Get the card changes of a board after a change cursor.
+
+        Tag changes on the board's columns are folded per card into
+        "added", "removed" and "moved" events; record updates of cards
+        become "updated" events. Added, moved and updated events carry the
+        card, projected to the board's "card_fields".
+
+        Args:
+            board_name: Name of the board
+            since: Change cursor already applied by the client
+            limit: Maximum number of logged changes to fold in one call
+
+        Returns:
+            {
+                "cursor": next change cursor,
+                "reset": True if the client is too far behind and must
+                         reload the board (no events are returned),
+                "more": True if more changes are waiting (call again),
+                "changes": [events],
+                "totals": {column tag: card count}
+            }
+            Empty dict if the board or its form is unknown
+
+        Example:
+            batch = kanban_service.get_board_changes('sales_pipeline', cursor)
+            # {"cursor": 1042, "reset": False, "more": False,
+            #  "changes": [{"type": "moved", "record_id": "ABC...",
+            #               "from": "lead", "to": "qualified", "card": {...}}],
+            #  "totals": {"lead": 11, "qualified": 5, ...}}
+        """
+        board_config = self.load_board_config(board_name)
+        if not board_config or not board_config.get("form"):
+            return {}
+
+        form_path = board_config["form"]
+        columns = {
+            col.get("tag") for col in board_config.get("columns", []) if col.get("tag")
+        }
+
+        # Read first: every change up to this cursor is already logged
+        latest = self.tag_service.get_change_cursor(form_path)
+        changes = self.tag_service.get_changes(form_path, since, limit)
+        if changes is None:
+            return {
+                "cursor": latest,
+                "reset": True,
+                "more": False,
+                "changes": [],
+                "totals": {},
+            }
+
+        more = limit is not None and len(changes) == limit
+        if more:
+            cursor = changes[-1]["seq"]
+        else:
+            cursor = max([latest, since] + [change["seq"] for change in changes[-1:]])
+
+        # Net column changes per card, in order of first change
+        folded: Dict[str, Dict[str, Any]] = {}
+        for change in changes:
+            if change["op"] != "update" and change["tag"] not in columns:
+                continue
+            card = folded.setdefault(
+                change["object_id"], {"added": [], "removed": [], "updated": False}
+            )
+            if change["op"] == "update":
+                card["updated"] = True
+            elif change["op"] == "add":
+                if change["tag"] in card["removed"]:
+                    card["removed"].remove(change["tag"])
+                else:
+                    card["added"].append(change["tag"])
+            elif change["tag"] in card["added"]:
+                card["added"].remove(change["tag"])
+            else:
+                card["removed"].append(change["tag"])
+
+        spec = load_spec(form_path)
+        needs_card = [
+            record_id
+            for record_id, card in folded.items()
+            if card["added"] or card["updated"]
+        ]
+        records = RepositoryFactory.get_repository(form_path).read_by_ids(
+            form_path, spec, needs_card, board_config.get("card_fields")
+        )
+
+        events = []
+        for record_id, card in folded.items():
+            record = records.get(record_id)
+            if len(card["added"]) == 1 and len(card["removed"]) == 1 and record:
+                events.append(
+                    {
+                        "type": "moved",
+                        "record_id": record_id,
+                        "from": card["removed"][0],
+                        "to": card["added"][0],
+                        "card": record,
+                    }
+                )
+                continue
+
+            for tag in card["removed"]:
+                events.append(
+                    {"type": "removed", "record_id": record_id, "column": tag}
+                )
+            if record:
+                for tag in card["added"]:
+                    events.append(
+                        {
+                            "type": "added",
+                            "record_id": record_id,
+                            "column": tag,
+                            "card": record,
+                        }
+                    )
+                if card["updated"] and not card["added"]:
+                    events.append(
+                        {"type": "updated", "record_id": record_id, "card": record}
+                    )
+
+        counts = self.tag_service.get_tag_counts(form_path) if events else {}
+        return {
+            "cursor": cursor,
+            "reset": False,
+            "more": more,
+            "changes": events,
+            "totals": {tag: counts.get(tag, 0) for tag in columns} if events else {},
+        }
+
+    def _read_cards(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        pages: Dict[str, List[Tuple[str, str]]],
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Read the records of all column pages at once, keeping page order."""
+        repo = RepositoryFactory.get_repository(form_path)
+        record_ids = [object_id for page in pages.values() for _, object_id in page]
+        records = repo.read_by_ids(form_path, spec, record_ids, fields)
+
+        return {
+            tag: [records[object_id] for _, object_id in page if object_id in records]
+            for tag, page in pages.items()
+        }
+
+    @staticmethod
+    def _format_cursor(key: Tuple[str, str]) -> str:
+        """Encode an (applied_at, object_id) page key as a cursor string."""
+        return f"{key[0]}|{key[1]}"
+
+    @staticmethod
+    def _parse_cursor(cursor: str) -> Tuple[str, str]:
+        """Decode a cursor string made by _format_cursor()."""
+        applied_at, sep, object_id = cursor.partition("|")
+        if not sep or not applied_at or not object_id:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        return applied_at, object_id
+
     def get_all_board_cards(self, board_name: str) -> Dict[str, List[Dict[str, Any]]]:
         """
         Get all cards organized by column for a board.
@@ -301,6 +554,103 @@ class KanbanService:
             )
             return False
 
+    def move_cards(
+        self,
+        board_name: str,
+        moves: List[Dict[str, Any]],
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Move many cards between columns of a board at once.
+
+        Every move is checked with validate_move(); the valid ones are stored
+        together in one transaction (see TagService.apply_transitions), the
+        invalid ones are reported and left alone.
+
+        Args:
+            board_name: Name of the board
+            moves: Dicts with record_id, from_tag and to_tag
+            actor: Who is moving the cards (user_id, 'ai_agent', 'system')
+            metadata: Optional metadata stored with every new tag
+
+        Returns:
+            One result per move, in request order, with the move's fields and
+            a status: 'moved', 'unchanged' (the card already was in to_tag),
+            'invalid' or 'failed' (the latter two with an 'error')
+
+        Raises:
+            ValueError: If the board doesn't exist or has no form
+
+        Example:
+            results = kanban_service.move_cards(
+                'sales_pipeline',
+                [{'record_id': id1, 'from_tag': 'lead', 'to_tag': 'qualified'}],
+                'ai_agent',
+            )
+        """
+        board_config = self.load_board_config(board_name)
+        if not board_config:
+            raise ValueError(f"Board '{board_name}' not found")
+        form_path = board_config.get("form")
+        if not form_path:
+            raise ValueError("Board has no form configured")
+
+        results = []
+        valid = []
+        seen = set()
+        for move in moves:
+            if not isinstance(move, dict):
+                move = {}
+            record_id = move.get("record_id")
+            from_tag = move.get("from_tag")
+            to_tag = move.get("to_tag")
+            result = {"record_id": record_id, "from_tag": from_tag, "to_tag": to_tag}
+            results.append(result)
+
+            if not record_id or not from_tag or not to_tag:
+                error = "Missing required fields: record_id, from_tag, to_tag"
+            elif not isinstance(record_id, str) or not validate_id(record_id):
+                error = "Invalid ID format"
+            elif record_id in seen:
+                error = "Card already moved in this batch"
+            elif not self.validate_move(board_name, from_tag, to_tag):
+                error = (
+                    f"Invalid move: {from_tag} -> {to_tag} not allowed on this board"
+                )
+            else:
+                seen.add(record_id)
+                valid.append(result)
+                continue
+            result.update({"status": "invalid", "error": error})
+
+        if not valid:
+            return results
+
+        moved = set(
+            self.tag_service.apply_transitions(
+                form_path,
+                [(r["record_id"], r["from_tag"], r["to_tag"]) for r in valid],
+                actor,
+                metadata,
+            )
+        )
+        for result in valid:
+            if result["record_id"] in moved:
+                result["status"] = "moved"
+            elif self.tag_service.has_tag(
+                form_path, result["record_id"], result["to_tag"]
+            ):
+                result["status"] = "unchanged"
+            else:
+                result.update({"status": "failed", "error": "Failed to move card"})
+
+        self.logger.info(
+            f"Batch move on board {board_name}: {len(moved)}/{len(moves)} cards "
+            f"moved by {actor}"
+        )
+        return results
+
     def validate_move(self, board_name: str, from_tag: str, to_tag: str) -> bool:
         """
         Validate if a move between columns is allowed on a board.
@@ -0,0 +1,590 @@
+"""
+Migration Job Service for VibeCForms.
+
+Runs backend migrations in background threads instead of inside the HTTP
+request, so large forms do not hit the web server's worker timeout. Jobs
+run either an offline migration (MigrationManager.migrate_backend) or an
+online one (persistence.online_migration), where the form stays usable.
+
+Each job's state is persisted as a JSON file, so any web worker process
+can report its progress and request its cancellation, and jobs that were
+running when the process died are resumed on the next start (backend
+migrations are checkpointed, see MigrationManager.migrate_backend).
+
+Job states:
+- queued: Submitted, waiting for a free worker
+- running: Migrating
+- completed: Migrated and form tracking updated
+- failed: Migration failed (see "error")
+- cancelled: Cancelled by the user and rolled back
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable
+
+from persistence.change_manager import ChangeManager, update_form_tracking
+from persistence.migration_manager import MigrationManager
+from persistence.online_migration import OnlineMigration, get_dual_write_repository
+from persistence.schema_history import get_history
+from utils.crockford import generate_id
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATES = ("queued", "running")
+
+# Minimum seconds between persisted progress updates of a running job
+PROGRESS_INTERVAL = 1.0
+
+# Recovered jobs are given up after this many attempts
+MAX_ATTEMPTS = 3
+
+
+class MigrationJobService:
+    """
+    In-process runner for background migration jobs.
+
+    Example usage:
+        service = get_migration_job_service()
+        job = service.submit('contatos', spec, 'txt', 'sqlite', record_count=5000)
+
+        # Later, from any request
+        status = service.get_status(job['job_id'])
+        # {'status': 'running', 'percent': 42.0, 'rate': 8100.0, 'eta_seconds': 0.4, ...}
+
+        service.cancel(job['job_id'])
+    """
+
+    def __init__(
+        self,
+        jobs_dir: Optional[str] = None,
+        max_workers: int = 1,
+        recover: bool = True,
+    ):
+        """
+        Initialize the MigrationJobService.
+
+        Args:
+            jobs_dir: Directory for job state files (default: "jobs" in the
+                migration backup directory)
+            max_workers: Migrations run concurrently
+            recover: Resume jobs left unfinished by a previous process
+        """
+        self.jobs_dir = Path(jobs_dir or MigrationManager._get_backup_dir() / "jobs")
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="migration-job"
+        )
+        self._lock = threading.RLock()
+        # Cancel events of the jobs run by this process
+        self._cancel_events: Dict[str, threading.Event] = {}
+
+        if recover:
+            self.recover()
+
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
+
+    def submit(
+        self,
+        form_path: str,
+        spec: Dict[str, Any],
+        old_backend: str,
+        new_backend: str,
+        record_count: int = 0,
+        mode: str = "offline",
+        old_config: Optional[Dict[str, Any]] = None,
+        new_config: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Submit a backend migration to run in the background.
+
+        Only one migration per form runs at a time: if the form already has
+        an active job, that job is returned instead.
+
+        Args:
+            form_path: Path to the form
+            spec: Form specification
+            old_backend: Source backend type
+            new_backend: Target backend type
+            record_count: Number of records to migrate (for progress)
+            mode: "offline" (MigrationManager.migrate_backend) or "online"
+                (dual writes, backfill and flip, see
+                persistence.online_migration); dual writes of an online job
+                are enabled before this returns
+            old_config: Resolved source backend configuration, if known
+                (see MigrationManager.migrate_backend)
+            new_config: Resolved target backend configuration, if known
+
+        Returns:
+            The job's status dictionary
+        """
+        with self._lock:
+            for job in self.list_jobs(form_path):
+                if job["status"] in ACTIVE_STATES:
+                    logger.info(
+                        f"Form '{form_path}' already has active migration job "
+                        f"{job['job_id']}"
+                    )
+                    # Dual writes of an online job are persisted, so this
+                    # process already follows them (see online_migration)
+                    return job
+
+            # Record where the data lives now: the job may run after the
+            # configuration or the schema history has changed again
+            job = {
+                "job_id": generate_id(),
+                "form_path": form_path,
+                "spec": spec,
+                "old_backend": old_backend,
+                "new_backend": new_backend,
+                "old_config": MigrationManager._resolve_backend_config(
+                    old_backend, form_path, old_config
+                ),
+                "new_config": MigrationManager._resolve_backend_config(
+                    new_backend, form_path, new_config
+                ),
+                "mode": mode,
+                "status": "queued",
+                "record_count": record_count,
+                "records_done": 0,
+                "rate": 0.0,
+                "attempts": 0,
+                "cancel_requested": False,
+                "error": None,
+                "created_at": datetime.now().isoformat(),
+                "started_at": None,
+                "finished_at": None,
+                "updated_at": datetime.now().isoformat(),
+            }
+            self._save_job(job)
+            self._claim(job["job_id"])
+            self._start(job)
+
+        logger.info(
+            f"Submitted migration job {job['job_id']} for '{form_path}': "
+            f"{old_backend} -> {new_backend}"
+        )
+        return self._with_progress(job)
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's status, with percentage and ETA.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Status dictionary (without the spec), or None if the job does
+            not exist
+        """
+        job = self._load_job(job_id)
+        return self._with_progress(job) if job else None
+
+    def list_jobs(self, form_path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List jobs, oldest first.
+
+        Args:
+            form_path: Only list jobs of this form
+
+        Returns:
+            Status dictionaries of the matching jobs
+        """
+        jobs = []
+        for path in self.jobs_dir.glob("*.json"):
+            job = self._load_job(path.stem)
+            if job and (form_path is None or job["form_path"] == form_path):
+                jobs.append(self._with_progress(job))
+        return sorted(jobs, key=lambda job: job["created_at"])
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Request cancellation of an active job.
+
+        The job stops after the batch being written and is rolled back. The
+        request is persisted, so it reaches the job even when it runs in
+        another process.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            True if the job was active and cancellation was requested
+        """
+        with self._lock:
+            job = self._load_job(job_id)
+            if not job or job["status"] not in ACTIVE_STATES:
+                return False
+            job["cancel_requested"] = True
+            self._save_job(job)
+
+            event = self._cancel_events.get(job_id)
+            if event:
+                event.set()
+
+        logger.info(f"Cancellation requested for migration job {job_id}")
+        return True
+
+    def recover(self) -> List[str]:
+        """
+        Resume jobs left active by a process that is no longer running.
+
+        Backend migrations are checkpointed, so a recovered job continues
+        after the last committed batch instead of starting over.
+
+        Returns:
+            IDs of the resumed jobs
+        """
+        resumed = []
+        with self._lock:
+            for path in self.jobs_dir.glob("*.json"):
+                job = self._load_job(path.stem)
+                if not job or job["status"] not in ACTIVE_STATES:
+                    continue
+                # Jobs still owned by a live process are not ours to resume
+                if not self._claim(job["job_id"]):
+                    continue
+
+                if job["cancel_requested"]:
+                    self._finish(job, "cancelled")
+                    self._release(job["job_id"])
+                elif job["attempts"] >= MAX_ATTEMPTS:
+                    self._finish(
+                        job,
+                        "failed",
+                        f"Migração interrompida {job['attempts']} vezes, abandonada",
+                    )
+                    self._release(job["job_id"])
+                else:
+                    logger.info(
+                        f"Recovering migration job {job['job_id']} "
+                        f"for '{job['form_path']}'"
+                    )
+                    job["status"] = "queued"
+                    self._save_job(job)
+                    self._start(job)
+                    resumed.append(job["job_id"])
+        return resumed
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker threads.
+
+        Args:
+            wait: Wait for running jobs to finish
+        """
+        self._executor.shutdown(wait=wait)
+
+    # =========================================================================
+    # JOB EXECUTION
+    # =========================================================================
+
+    def _start(self, job: Dict[str, Any]) -> None:
+        """Queue a claimed job on the worker pool (caller holds the lock)."""
+        if job.get("mode") == "online":
+            self._online_migration(job, job["spec"]).begin()
+        self._cancel_events[job["job_id"]] = threading.Event()
+        self._executor.submit(self._run, job["job_id"])
+
+    def _run(self, job_id: str) -> None:
+        """Run a job to completion in a worker thread."""
+        job = self._load_job(job_id)
+        cancel_event = self._cancel_events[job_id]
+        if job["cancel_requested"]:
+            # Cancelled while queued
+            self._finish(job, "cancelled")
+            self._cancel_events.pop(job_id, None)
+            self._release(job_id)
+            return
+
+        job["status"] = "running"
+        job["attempts"] += 1
+        job["started_at"] = job["started_at"] or datetime.now().isoformat()
+        self._save_job(job)
+
+        last_saved = time.time()
+
+        def on_progress(records_done: int, record_count: int, rate: float) -> None:
+            nonlocal last_saved
+            job["records_done"] = records_done
+            job["rate"] = rate
+            if time.time() - last_saved >= PROGRESS_INTERVAL:
+                last_saved = time.time()
+                with self._lock:
+                    # Pick up cancellation requested from another process
+                    stored = self._load_job(job_id)
+                    if stored and stored["cancel_requested"]:
+                        job["cancel_requested"] = True
+                        cancel_event.set()
+                    self._save_job(job)
+
+        try:
+            if job.get("mode") == "online":
+                success = self._run_online(job, on_progress, cancel_event)
+            else:
+                success = MigrationManager.migrate_backend(
+                    form_path=job["form_path"],
+                    spec=job["spec"],
+                    old_backend=job["old_backend"],
+                    new_backend=job["new_backend"],
+                    record_count=job["record_count"],
+                    progress_callback=on_progress,
+                    cancel_event=cancel_event,
+                    old_config=job.get("old_config"),
+                    new_config=job.get("new_config"),
+                )
+            if cancel_event.is_set() and not success:
+                self._finish(job, "cancelled")
+            elif not success:
+                self._finish(
+                    job,
+                    "failed",
+                    f"Falha na migração de backend: "
+                    f"{job['old_backend']} → {job['new_backend']}",
+                )
+            elif not update_form_tracking(
+                job["form_path"], job["spec"], job["record_count"]
+            ):
+                self._finish(
+                    job, "failed", "Falha ao atualizar o rastreamento do formulário"
+                )
+            else:
+                self._finish(job, "completed")
+        except Exception as e:
+            logger.error(f"Migration job {job_id} crashed: {e}")
+            self._finish(job, "failed", f"Erro durante migração: {e}")
+        finally:
+            self._cancel_events.pop(job_id, None)
+            self._release(job_id)
+
+    @staticmethod
+    def _online_migration(job: Dict[str, Any], spec: Dict[str, Any]) -> OnlineMigration:
+        """Build the OnlineMigration of an online job."""
+        wrapper = get_dual_write_repository(job["form_path"])
+        if wrapper is not None:
+            source, target = wrapper.source, wrapper.target
+        else:
+            source = MigrationManager._get_repository(
+                job["old_backend"], job["form_path"], job.get("old_config")
+            )
+            target = MigrationManager._get_repository(
+                job["new_backend"], job["form_path"], job.get("new_config")
+            )
+        return OnlineMigration(
+            job["form_path"],
+            spec,
+            job["old_backend"],
+            job["new_backend"],
+            source,
+            target,
+            batch_size=MigrationManager.BATCH_SIZE,
+            old_config=job.get("old_config"),
+            new_config=job.get("new_config"),
+        )
+
+    def _run_online(
+        self,
+        job: Dict[str, Any],
+        on_progress: Callable[[int, int, float], None],
+        cancel_event: threading.Event,
+    ) -> bool:
+        """Backfill, verify and flip an online job."""
+        migration = self._online_migration(job, job["spec"])
+
+        if job["attempts"] == 1 and migration.source.exists(job["form_path"]):
+            backup_info = MigrationManager._create_cross_backend_backup(
+                job["form_path"], job["old_backend"], migration.source
+            )
+            if not backup_info:
+                migration.end()
+                return False
+
+        def flip(record_count: int) -> None:
+            # Runs with writes paused: from here on the new backend is the form's
+            job["record_count"] = job["records_done"] = record_count
+            ChangeManager.update_tracking(
+                job["form_path"],
+                job["spec"],
+                job["new_backend"],
+                record_count,
+                backend_config=job.get("new_config"),
+            )
+            # Other processes read the new backend as soon as dual writes
+            # end, so they must find the flipped tracking on disk
+            get_history().flush()
+
+        return migration.run(
+            record_count=job["record_count"],
+            progress_callback=on_progress,
+            cancel_event=cancel_event,
+            on_flip=flip,
+        )
+
+    def _finish(
+        self, job: Dict[str, Any], status: str, error: Optional[str] = None
+    ) -> None:
+        """Record a job's final state."""
+        if job.get("mode") == "online" and status != "completed":
+            # Covers jobs that never ran or crashed: no process may keep
+            # dual-writing (completed jobs ended dual writes at the flip)
+            self._online_migration(job, job["spec"]).end(
+                drop_target=status == "cancelled"
+            )
+        job["status"] = status
+        job["error"] = error
+        job["finished_at"] = datetime.now().isoformat()
+        with self._lock:
+            self._save_job(job)
+        logger.info(
+            f"Migration job {job['job_id']} {status}" + (f": {error}" if error else "")
+        )
+
+    # =========================================================================
+    # STATE FILES
+    # =========================================================================
+
+    def _job_path(self, job_id: str) -> Path:
+        """Get the state file of a job."""
+        return self.jobs_dir / f"{job_id}.json"
+
+    def _load_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Load a job's state file (None if missing or unreadable)."""
+        try:
+            with open(self._job_path(job_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable migration job {job_id}: {e}")
+            return None
+
+    def _save_job(self, job: Dict[str, Any]) -> None:
+        """Write a job's state file atomically."""
+        job["updated_at"] = datetime.now().isoformat()
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.jobs_dir), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(job, f, ensure_ascii=False)
+            os.replace(tmp_path, self._job_path(job["job_id"]))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _claim(self, job_id: str) -> bool:
+        """
+        Take ownership of a job through an exclusive lock file.
+
+        The lock file holds the owner's PID; a lock left behind by a dead
+        process is taken over.
+
+        Returns:
+            True if this process now owns the job
+        """
+        lock_path = self.jobs_dir / f"{job_id}.lock"
+        for _ in range(2):
+            try:
+                fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    pid = int(lock_path.read_text() or 0)
+                except (OSError, ValueError):
+                    pid = 0
+                if pid == os.getpid() or _process_alive(pid):
+                    return False
+                logger.info(f"Taking over migration job {job_id} from dead process")
+                try:
+                    lock_path.unlink()
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return True
+        return False
+
+    def _release(self, job_id: str) -> None:
+        """Give up ownership of a job."""
+        try:
+            (self.jobs_dir / f"{job_id}.lock").unlink()
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _with_progress(job: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a status dictionary with percentage and ETA."""
+        status = {key: value for key, value in job.items() if key != "spec"}
+        total = job["record_count"]
+        done = job["records_done"]
+        rate = job["rate"]
+
+        if job["status"] == "completed":
+            status["percent"] = 100.0
+        elif total:
+            status["percent"] = round(min(done / total, 1.0) * 100, 1)
+        else:
+            status["percent"] = None
+
+        if job["status"] == "running" and total and rate > 0:
+            status["eta_seconds"] = round(max(total - done, 0) / rate, 1)
+        else:
+            status["eta_seconds"] = None
+        return status
+
+
+def _process_alive(pid: int) -> bool:
+    """Check whether a process with this PID is running."""
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Global instance (singleton pattern)
+_migration_job_service_instance: Optional[MigrationJobService] = None
+
+
+def get_migration_job_service() -> MigrationJobService:
+    """
+    Get the global MigrationJobService instance.
+
+    The first call resumes jobs left unfinished by a previous process.
+
+    Returns:
+        MigrationJobService instance
+    """
+    global _migration_job_service_instance
+
+    if _migration_job_service_instance is None:
+        _migration_job_service_instance = MigrationJobService()
+
+    return _migration_job_service_instance
+
+
+def reset_migration_job_service() -> None:
+    """
+    Reset the global MigrationJobService instance (waits for running jobs).
+
+    Used by tests and when the business case changes.
+    """
+    global _migration_job_service_instance
+
+    if _migration_job_service_instance is not None:
+        _migration_job_service_instance.shutdown(wait=True)
+    _migration_job_service_instance = None
@@ -15,7 +15,7 @@ and convenience methods for common tag operations.
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from persistence.factory import RepositoryFactory
@@ -276,6 +276,148 @@ class TagService:
             )
             return []
 
+    def query_objects(
+        self,
+        object_type: str,
+        all_of: Optional[List[str]] = None,
+        any_of: Optional[List[str]] = None,
+        none_of: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Find objects by a combination of tags in a single storage query.
+
+        Args:
+            object_type: Form path
+            all_of: Tags the object must all have
+            any_of: Tags of which the object must have at least one
+            none_of: Tags the object must not have
+            limit: Maximum number of IDs to return (None for all)
+
+        Returns:
+            List of object IDs, most recently tagged first
+            Empty list if no objects match
+
+        Example:
+            # Qualified deals that are priority or hot, but not on hold
+            deals = tag_service.query_objects(
+                'deals',
+                all_of=['qualified'],
+                any_of=['priority', 'hot'],
+                none_of=['on_hold'],
+            )
+        """
+        try:
+            repo = self._get_repository(object_type)
+            return repo.query_objects_by_tags(
+                object_type, all_of, any_of, none_of, limit
+            )
+        except Exception as e:
+            self.logger.error(f"Error querying objects by tags for {object_type}: {e}")
+            return []
+
+    def get_objects_page(
+        self,
+        object_type: str,
+        tag: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[Tuple[str, str]]:
+        """
+        Get one page of the objects with an active tag.
+
+        Args:
+            object_type: Form path
+            tag: Tag name
+            limit: Maximum number of objects to return (None for all)
+            after: Last (applied_at, object_id) of the previous page
+
+        Returns:
+            List of (applied_at, object_id) tuples, most recently tagged first
+            Empty list if no objects have the tag
+
+        Example:
+            page = tag_service.get_objects_page('deals', 'lead', limit=50)
+            next_page = tag_service.get_objects_page('deals', 'lead', 50, page[-1])
+        """
+        try:
+            repo = self._get_repository(object_type)
+            return repo.page_objects_by_tag(object_type, tag, limit, after)
+        except Exception as e:
+            self.logger.error(
+                f"Error paging objects with tag '{tag}' for {object_type}: {e}"
+            )
+            return []
+
+    def get_tag_counts(self, object_type: str) -> Dict[str, int]:
+        """
+        Get the number of objects with each active tag.
+
+        Backed by the repository's tag statistics counters, so it does not
+        scan the tags.
+
+        Args:
+            object_type: Form path
+
+        Returns:
+            Dictionary mapping tag names to object counts
+
+        Example:
+            counts = tag_service.get_tag_counts('deals')
+            # {'lead': 120, 'qualified': 45}
+        """
+        try:
+            repo = self._get_repository(object_type)
+            return repo.get_tag_statistics(object_type)
+        except Exception as e:
+            self.logger.error(f"Error getting tag counts for {object_type}: {e}")
+            return {}
+
+    def get_changes(
+        self, object_type: str, since: int = 0, limit: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the tag and record changes of a form after a change cursor.
+
+        Args:
+            object_type: Form path
+            since: Change cursor already seen (see get_change_cursor)
+            limit: Maximum number of changes to return (None for all)
+
+        Returns:
+            Changes oldest first ('seq', 'object_id', 'tag', 'op',
+            'changed_at'), or None if `since` is too old to catch up from
+
+        Example:
+            changes = tag_service.get_changes('deals', since=cursor)
+            if changes is None:
+                # Reload the full state
+                ...
+        """
+        try:
+            repo = self._get_repository(object_type)
+            return repo.get_tag_changes(object_type, since, limit)
+        except Exception as e:
+            self.logger.error(f"Error getting tag changes for {object_type}: {e}")
+            return None
+
+    def get_change_cursor(self, object_type: str) -> int:
+        """
+        Get the latest change cursor of the storage holding a form.
+
+        Args:
+            object_type: Form path
+
+        Returns:
+            Change cursor to pass to get_changes() later (0 if no changes)
+        """
+        try:
+            repo = self._get_repository(object_type)
+            return repo.get_change_cursor()
+        except Exception as e:
+            self.logger.error(f"Error getting change cursor for {object_type}: {e}")
+            return 0
+
     def transition(
         self,
         object_type: str,
@@ -289,7 +431,8 @@ class TagService:
         Perform a state transition (remove old tag, add new tag).
 
         This is a convenience method for the common pattern of moving an object
-        from one state to another.
+        from one state to another. The repository applies both changes in a
+        single atomic operation (see BaseRepository.transition_tag).
 
         Args:
             object_type: Form path
@@ -301,7 +444,8 @@ class TagService:
 
         Returns:
             True if transition was successful (both operations completed)
-            False if either operation failed
+            False if to_tag is already active or the operation failed
+            (in which case from_tag is left in place)
 
         Note:
             If from_tag doesn't exist, the method will still add to_tag.
@@ -328,33 +472,21 @@ class TagService:
         """
         try:
             repo = self._get_repository(object_type)
+            success = repo.transition_tag(
+                object_type, object_id, from_tag, to_tag, actor, metadata
+            )
 
-            # Remove old tag if it exists
-            # Don't fail the transition if the tag doesn't exist
-            if self.has_tag(object_type, object_id, from_tag):
-                remove_success = repo.remove_tag(
-                    object_type, object_id, from_tag, actor
-                )
-                if not remove_success:
-                    self.logger.warning(
-                        f"Failed to remove '{from_tag}' during transition for "
-                        f"{object_type}/{object_id}"
-                    )
-
-            # Add new tag
-            add_success = repo.add_tag(object_type, object_id, to_tag, actor, metadata)
-
-            if add_success:
+            if success:
                 self.logger.info(
                     f"Transition {object_type}/{object_id}: {from_tag} → {to_tag} by {actor}"
                 )
-                return True
             else:
                 self.logger.error(
-                    f"Failed to add '{to_tag}' during transition for "
+                    f"Failed transition {from_tag} → {to_tag} for "
                     f"{object_type}/{object_id}"
                 )
-                return False
+
+            return success
 
         except Exception as e:
             self.logger.error(
@@ -363,6 +495,194 @@ class TagService:
             )
             return False
 
+    def bulk_add_tag(
+        self,
+        object_type: str,
+        object_ids: List[str],
+        tag: str,
+        applied_by: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """
+        Add a tag to many objects at once.
+
+        The repository applies the whole batch in one transaction (SQLite)
+        or one append (TXT), e.g. to tag every record of an import.
+
+        Args:
+            object_type: Form path
+            object_ids: IDs of the objects to tag
+            tag: Tag name (should be lowercase, alphanumeric, underscores)
+            applied_by: Who is adding the tag (user_id, 'ai_agent', 'system')
+            metadata: Optional metadata stored with every new tag
+
+        Returns:
+            IDs the tag was added to (objects that already had it are skipped)
+            Empty list if the tag name is invalid or the operation failed
+
+        Example:
+            tagged = tag_service.bulk_add_tag('contatos', ids, 'imported', 'system')
+        """
+        if not self._validate_tag_name(tag):
+            self.logger.warning(
+                f"Invalid tag name '{tag}'. Tags should be lowercase, "
+                f"alphanumeric with underscores only."
+            )
+            return []
+
+        try:
+            repo = self._get_repository(object_type)
+            added = repo.bulk_add_tag(
+                object_type, object_ids, tag, applied_by, metadata
+            )
+            self.logger.info(
+                f"Tag '{tag}' added to {len(added)}/{len(object_ids)} "
+                f"{object_type} objects by {applied_by}"
+            )
+            return added
+
+        except Exception as e:
+            self.logger.error(f"Error bulk adding tag '{tag}' to {object_type}: {e}")
+            return []
+
+    def bulk_remove_tag(
+        self, object_type: str, object_ids: List[str], tag: str, removed_by: str
+    ) -> List[str]:
+        """
+        Remove a tag from many objects at once.
+
+        Args:
+            object_type: Form path
+            object_ids: IDs of the objects to untag
+            tag: Tag name to remove
+            removed_by: Who is removing the tag (user_id, 'ai_agent', 'system')
+
+        Returns:
+            IDs the tag was removed from (objects without it are skipped)
+            Empty list if the operation failed
+        """
+        try:
+            repo = self._get_repository(object_type)
+            removed = repo.bulk_remove_tag(object_type, object_ids, tag, removed_by)
+            self.logger.info(
+                f"Tag '{tag}' removed from {len(removed)}/{len(object_ids)} "
+                f"{object_type} objects by {removed_by}"
+            )
+            return removed
+
+        except Exception as e:
+            self.logger.error(
+                f"Error bulk removing tag '{tag}' from {object_type}: {e}"
+            )
+            return []
+
+    def bulk_transition(
+        self,
+        object_type: str,
+        object_ids: List[str],
+        from_tag: str,
+        to_tag: str,
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """
+        Perform the same state transition on many objects at once.
+
+        Args:
+            object_type: Form path
+            object_ids: IDs of the objects to move
+            from_tag: Current tag to remove (ignored where not active)
+            to_tag: New tag to add
+            actor: Who is performing the transition (user_id, 'ai_agent', 'system')
+            metadata: Optional metadata about the transition
+
+        Returns:
+            IDs that were moved (objects that already had to_tag are skipped)
+            Empty list if the tag name is invalid or the operation failed
+
+        Example:
+            # Close every won proposal in one go
+            tag_service.bulk_transition('deals', ids, 'proposal', 'won', 'user123')
+        """
+        if not self._validate_tag_name(to_tag):
+            self.logger.warning(
+                f"Invalid tag name '{to_tag}'. Tags should be lowercase, "
+                f"alphanumeric with underscores only."
+            )
+            return []
+
+        try:
+            repo = self._get_repository(object_type)
+            moved = repo.bulk_transition(
+                object_type, object_ids, from_tag, to_tag, actor, metadata
+            )
+            self.logger.info(
+                f"Transition {from_tag} → {to_tag} applied to "
+                f"{len(moved)}/{len(object_ids)} {object_type} objects by {actor}"
+            )
+            return moved
+
+        except Exception as e:
+            self.logger.error(
+                f"Error during bulk transition {from_tag}→{to_tag} for "
+                f"{object_type}: {e}"
+            )
+            return []
+
+    def apply_transitions(
+        self,
+        object_type: str,
+        moves: List[Tuple[str, str, str]],
+        actor: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """
+        Perform many state transitions with different tag pairs at once.
+
+        All moves are stored together (see BaseRepository.apply_transitions).
+
+        Args:
+            object_type: Form path
+            moves: (object_id, from_tag, to_tag) tuples
+            actor: Who is performing the transitions (user_id, 'ai_agent', 'system')
+            metadata: Optional metadata about the transitions
+
+        Returns:
+            IDs that were moved (objects that already had their to_tag are
+            skipped)
+            Empty list if a tag name is invalid or the operation failed
+
+        Example:
+            # AI agent re-triages leads in one request
+            tag_service.apply_transitions(
+                'deals',
+                [(id1, 'lead', 'qualified'), (id2, 'lead', 'lost')],
+                'ai_agent',
+            )
+        """
+        invalid = [
+            to_tag for _, _, to_tag in moves if not self._validate_tag_name(to_tag)
+        ]
+        if invalid:
+            self.logger.warning(
+                f"Invalid tag name '{invalid[0]}'. Tags should be lowercase, "
+                f"alphanumeric with underscores only."
+            )
+            return []
+
+        try:
+            repo = self._get_repository(object_type)
+            moved = repo.apply_transitions(object_type, moves, actor, metadata)
+            self.logger.info(
+                f"Applied {len(moved)}/{len(moves)} transitions to "
+                f"{object_type} objects by {actor}"
+            )
+            return moved
+
+        except Exception as e:
+            self.logger.error(f"Error applying transitions to {object_type}: {e}")
+            return []
+
     def has_any_tag(self, object_type: str, object_id: str, tags: List[str]) -> bool:
         """
         Check if an object has any of the specified tags.
@@ -383,10 +703,8 @@ class TagService:
                 # Deal is in active pipeline
                 pass
         """
-        for tag in tags:
-            if self.has_tag(object_type, object_id, tag):
-                return True
-        return False
+        active = set(self.get_tag_names(object_type, object_id))
+        return any(tag in active for tag in tags)
 
     def has_all_tags(self, object_type: str, object_id: str, tags: List[str]) -> bool:
         """
@@ -407,10 +725,8 @@ class TagService:
                 # High-priority qualified deal
                 notify_sales_manager(deal_id)
         """
-        for tag in tags:
-            if not self.has_tag(object_type, object_id, tag):
-                return False
-        return True
+        active = set(self.get_tag_names(object_type, object_id))
+        return all(tag in active for tag in tags)
 
     def get_tag_names(
         self, object_type: str, object_id: str, active_only: bool = True
@@ -8,9 +8,14 @@ import os
 import json
 from flask import abort
 
+from persistence.schema_detector import SchemaChangeDetector
+
 # Global variable for specs directory (set during app initialization)
 _SPECS_DIR = None
 
+# Loaded specs keyed by file path: spec_path -> ((mtime_ns, size), spec)
+_spec_cache = {}
+
 
 def set_specs_dir(specs_dir):
     """Set the global specs directory path.
@@ -20,6 +25,7 @@ def set_specs_dir(specs_dir):
     """
     global _SPECS_DIR
     _SPECS_DIR = specs_dir
+    _spec_cache.clear()
 
 
 def get_specs_dir():
@@ -34,6 +40,10 @@ def get_specs_dir():
 def load_spec(form_path):
     """Load and validate a form specification file.
 
+    Parsed specs are cached until the file's modification time or size
+    changes, and their spec hash is computed once per loaded version. The
+    returned dictionary is shared between callers and must not be modified.
+
     Args:
         form_path: Path to form (can include subdirectories, e.g., 'financeiro/contas')
 
@@ -44,9 +54,16 @@ def load_spec(form_path):
         raise RuntimeError("Specs directory not set. Call set_specs_dir() first.")
 
     spec_path = os.path.join(_SPECS_DIR, f"{form_path}.json")
-    if not os.path.exists(spec_path):
+    try:
+        stat = os.stat(spec_path)
+    except OSError:
         abort(404, description=f"Form specification '{form_path}' not found")
 
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _spec_cache.get(spec_path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
     with open(spec_path, "r", encoding="utf-8") as f:
         spec = json.load(f)
 
@@ -71,4 +88,8 @@ def load_spec(form_path):
                     description=f"Invalid tag name '{tag}': use lowercase, numbers, underscores only",
                 )
 
+    # Hash once per loaded version; later calls hit the memoized value
+    SchemaChangeDetector.compute_spec_hash(spec)
+    _spec_cache[spec_path] = (version, spec)
+
     return spec
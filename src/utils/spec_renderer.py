@@ -7,9 +7,11 @@ Internal implementation details are private (prefixed with _).
 
 import os
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable, Iterable, Iterator, Tuple
 from flask import render_template_string, current_app
 
+from persistence.schema_detector import SchemaChangeDetector
+
 logger = logging.getLogger(__name__)
 
 # Table column widths (percentage)
@@ -17,6 +19,9 @@ _TABLE_FIELDS_TOTAL_WIDTH = 60
 _TABLE_TAGS_WIDTH = 15
 _TABLE_ACTIONS_WIDTH = 25
 
+# Rows joined into each chunk when streaming a table
+_STREAM_BATCH_ROWS = 100
+
 
 def _get_template_path(template_name: str) -> str:
     """Get template path with fallback support.
@@ -242,6 +247,8 @@ def _render_table_row(
 ) -> str:
     """Generate a table row from form data.
 
+    Kept for backwards compatibility; delegates to the compiled renderer.
+
     Args:
         form_data: Dictionary with form field values (must include '_record_id')
         spec: Form specification
@@ -250,64 +257,175 @@ def _render_table_row(
     Returns:
         HTML string for table row
     """
-    cells = ""
+    return get_table_renderer(spec, form_name).render_row(form_data)
+
+
+def _compile_cell_formatter(field: Dict[str, Any]) -> Callable[[Any], Any]:
+    """Build the display formatter for a single table column.
+
+    Everything that depends only on the spec (option labels, fixed markup)
+    is resolved here, once, instead of on every cell.
+
+    Args:
+        field: Field definition from spec
+
+    Returns:
+        Function mapping a raw record value to its display value
+    """
+    field_type = field["type"]
+
+    if field_type == "checkbox":
+        return lambda value: "Sim" if value else "Não"
+
+    if field_type == "select" or field_type == "radio":
+        # First option wins, same as the original linear scan
+        labels = {}
+        for option in field.get("options", []):
+            option_value = option.get("value")
+            if option_value not in labels:
+                labels[option_value] = option.get("label", option_value)
+
+        def format_option(value):
+            try:
+                return labels.get(value, value)
+            except TypeError:
+                # Unhashable value can never match an option
+                return value
+
+        return format_option
+
+    if field_type == "color":
+        # Display color swatch alongside hex value
+        return lambda value: (
+            f'<span style="display:inline-block;width:20px;height:20px;'
+            f"background-color:{value};border:1px solid #ccc;"
+            f'vertical-align:middle;margin-right:5px;"></span>{value}'
+        )
+
+    if field_type == "password":
+        # Don't display password values
+        return lambda value: "••••••••"
+
+    if field_type == "hidden":
+        # Don't display hidden values
+        return lambda value: ""
+
+    return lambda value: value
+
+
+class TableRenderer:
+    """Table renderer compiled once per spec version.
+
+    Headers, per-column formatters and option-label lookups are built in the
+    constructor; rendering a row is then a single pass over the columns with
+    no spec inspection. Use :func:`get_table_renderer` to obtain a cached
+    instance instead of constructing one directly.
+    """
+
+    def __init__(self, spec: Dict[str, Any], form_name: str):
+        self.form_name = form_name
+        self.headers = _render_table_headers(spec)
+        self._columns = [
+            (field["name"], _compile_cell_formatter(field)) for field in spec["fields"]
+        ]
+
+    def render_row(self, form_data: Dict[str, Any]) -> str:
+        """Render a single record as a table row.
+
+        Args:
+            form_data: Dictionary with form field values (must include '_record_id')
 
-    # Extract record_id from form data (used for edit/delete/tags links)
-    record_id = form_data.get("_record_id", "")
+        Returns:
+            HTML string for table row
+        """
+        form_name = self.form_name
 
-    # Tags column first (read-only display)
-    tags_html = f"""<td class="tags-cell" data-record-id="{record_id}" data-form-name="{form_name}">
+        # Extract record_id from form data (used for edit/delete/tags links)
+        record_id = form_data.get("_record_id", "")
+
+        # Tags column first (read-only display)
+        parts = [
+            f"""<tr><td class="tags-cell" data-record-id="{record_id}" data-form-name="{form_name}">
         <div class="tags-container" id="tags-{record_id}">
             <!-- Tags will be loaded here -->
         </div>
     </td>"""
-    cells += tags_html
+        ]
 
-    # Generate cells for each field
-    for field in spec["fields"]:
-        field_name = field["name"]
-        field_type = field["type"]
-        value = form_data.get(field_name, "")
+        for field_name, formatter in self._columns:
+            parts.append(f"<td>{formatter(form_data.get(field_name, ''))}</td>\n")
 
-        if field_type == "checkbox":
-            display_value = "Sim" if value else "Não"
-        elif field_type == "select" or field_type == "radio":
-            # Find label for the selected value
-            options = field.get("options", [])
-            display_value = value
-            for option in options:
-                if option.get("value") == value:
-                    display_value = option.get("label", value)
-                    break
-        elif field_type == "color":
-            # Display color swatch alongside hex value
-            display_value = f'<span style="display:inline-block;width:20px;height:20px;background-color:{value};border:1px solid #ccc;vertical-align:middle;margin-right:5px;"></span>{value}'
-        elif field_type == "password":
-            # Don't display password values
-            display_value = "••••••••"
-        elif field_type == "hidden":
-            # Don't display hidden values
-            display_value = ""
-        else:
-            display_value = value
-
-        cells += f"<td>{display_value}</td>\n"
-
-    # Use record_id instead of index for edit/delete links
-    cells += f"""<td>
+        # Use record_id instead of index for edit/delete links
+        parts.append(f"""<td>
         <form action="/{form_name}/edit/{record_id}" method="get" style="display:inline;">
             <button class="icon-btn edit" title="Editar"><i class="fa fa-pencil-alt"></i></button>
         </form>
         <form action="/{form_name}/delete/{record_id}" method="get" style="display:inline;" onsubmit="return confirm('Confirma exclusão?');">
             <button class="icon-btn delete" title="Excluir"><i class="fa fa-trash"></i></button>
         </form>
-    </td>"""
+    </td></tr>""")
+
+        return "".join(parts)
+
+    def render_rows(self, records: Iterable[Dict[str, Any]]) -> str:
+        """Render all records as a single HTML string."""
+        return "".join([self.render_row(record) for record in records])
+
+    def iter_rows(
+        self, records: Iterable[Dict[str, Any]], batch_size: int = _STREAM_BATCH_ROWS
+    ) -> Iterator[str]:
+        """Lazily render records in batches of rows.
+
+        Only one batch is held in memory at a time, so a template rendered
+        with ``stream_template`` starts sending rows as soon as the first
+        batch is ready.
+
+        Args:
+            records: Iterable of record dictionaries
+            batch_size: Number of rows joined into each yielded chunk
+
+        Yields:
+            HTML strings containing up to ``batch_size`` rows
+        """
+        batch = []
+        for record in records:
+            batch.append(self.render_row(record))
+            if len(batch) >= batch_size:
+                yield "".join(batch)
+                batch = []
+        if batch:
+            yield "".join(batch)
+
 
-    return f"<tr>{cells}</tr>"
+# Compiled renderers, one per form, replaced when the form's spec changes
+_table_renderers: Dict[str, Tuple[str, TableRenderer]] = {}
+
+
+def get_table_renderer(spec: Dict[str, Any], form_name: str) -> TableRenderer:
+    """Get the compiled table renderer for a form, building it if needed.
+
+    Renderers are keyed on the spec hash, so editing a spec transparently
+    recompiles its renderer on the next request.
+
+    Args:
+        spec: Form specification
+        form_name: Form path for action URLs
+
+    Returns:
+        TableRenderer for the current version of the spec
+    """
+    spec_hash = SchemaChangeDetector.compute_spec_hash(spec)
+    cached = _table_renderers.get(form_name)
+    if cached is not None and cached[0] == spec_hash:
+        return cached[1]
+
+    renderer = TableRenderer(spec, form_name)
+    _table_renderers[form_name] = (spec_hash, renderer)
+    return renderer
 
 
 # =============================================================================
-# PUBLIC API (only 3 functions)
+# PUBLIC API
 # =============================================================================
 
 
@@ -377,10 +495,8 @@ def render_table(
         >>> table = render_table(spec, records, "contatos")
         >>> # Returns {"headers": "<th>...</th>", "rows": "<tr>...</tr>..."}
     """
-    headers = _render_table_headers(spec)
-    rows = "".join([_render_table_row(record, spec, form_name) for record in records])
-
-    return {"headers": headers, "rows": rows}
+    renderer = get_table_renderer(spec, form_name)
+    return {"headers": renderer.headers, "rows": renderer.render_rows(records)}
 
 
 def validate_form(spec: Dict[str, Any], form_data: Dict[str, Any]) -> str:
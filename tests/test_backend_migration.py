@@ -4,6 +4,7 @@ Tests for backend migration (TXT → SQLite, etc).
 
 import pytest
 import os
+import json
 import sys
 from pathlib import Path
 
@@ -13,6 +14,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 from persistence.migration_manager import MigrationManager
 from persistence.adapters.txt_adapter import TxtRepository
 from persistence.adapters.sqlite_adapter import SQLiteRepository
+from persistence.backup_store import BackupStore
 
 
 @pytest.fixture
@@ -150,9 +152,9 @@ def test_migration_creates_backup(tmp_path, txt_config, sqlite_config, sample_sp
     backup_dir = Path("src/backups/migrations")
     assert backup_dir.exists()
 
-    # Find backup file
-    backup_files = list(backup_dir.glob("test_form_txt_to_migration_*.txt"))
-    assert len(backup_files) > 0
+    # Find backup
+    backups = BackupStore(str(backup_dir)).list_backups("test_form_txt_to_migration")
+    assert len(backups) > 0
 
 
 @pytest.mark.skip(
@@ -263,3 +265,342 @@ def test_migration_rollback_on_failure(tmp_path, txt_config, sample_spec):
     txt_data = txt_repo.read_all("test_form", sample_spec)
     assert len(txt_data) == 1
     assert txt_data[0]["nome"] == "João"
+
+
+@pytest.fixture
+def isolated_config(tmp_path, monkeypatch):
+    """Global persistence config pointing at temporary TXT/SQLite storage."""
+    import json
+    import persistence.config as persistence_config
+    from persistence.config import PersistenceConfig
+    from persistence.factory import RepositoryFactory
+
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    config_file = config_dir / "persistence.json"
+    config_file.write_text(
+        json.dumps(
+            {
+                "version": "1.0",
+                "default_backend": "sqlite",
+                "backends": {
+                    "txt": {"type": "txt", "path": str(tmp_path / "txt")},
+                    "sqlite": {"type": "sqlite", "database": str(tmp_path / "app.db")},
+                },
+                "form_mappings": {"*": "default_backend"},
+                "backup_path": str(tmp_path / "backups"),
+            }
+        )
+    )
+
+    monkeypatch.setattr(
+        persistence_config, "_config_instance", PersistenceConfig(str(config_file))
+    )
+    RepositoryFactory.clear_cache()
+    yield {
+        "txt": {"type": "txt", "path": str(tmp_path / "txt")},
+        "sqlite": {"type": "sqlite", "database": str(tmp_path / "app.db")},
+        "backups": tmp_path / "backups",
+    }
+    RepositoryFactory.clear_cache()
+
+
+def _create_txt_records(txt_config, spec, count):
+    txt_repo = TxtRepository(txt_config)
+    txt_repo.create_storage("test_form", spec)
+    txt_repo.bulk_create(
+        "test_form",
+        spec,
+        [
+            {"nome": f"Pessoa {i}", "telefone": f"11-{i:04d}", "ativo": i % 2 == 0}
+            for i in range(count)
+        ],
+    )
+    return txt_repo.read_all("test_form", spec)
+
+
+def test_iter_records_batches_and_resume(txt_config, sqlite_config, sample_spec):
+    """Both adapters stream records in batches and resume after an ID."""
+    records = _create_txt_records(txt_config, sample_spec, 5)
+    txt_repo = TxtRepository(txt_config)
+    sqlite_repo = SQLiteRepository(sqlite_config)
+    sqlite_repo.bulk_create("test_form", sample_spec, records)
+
+    for repo in (txt_repo, sqlite_repo):
+        batches = list(repo.iter_records("test_form", sample_spec, batch_size=2))
+        assert [len(b) for b in batches] == [2, 2, 1]
+        streamed = [r for b in batches for r in b]
+        assert streamed == repo.read_all("test_form", sample_spec)
+
+        after = streamed[1]["_record_id"]
+        resumed = [
+            r
+            for b in repo.iter_records("test_form", sample_spec, 2, after_id=after)
+            for r in b
+        ]
+        assert resumed == streamed[2:]
+
+
+def test_chunked_migration_with_progress(isolated_config, sample_spec):
+    """Migration streams batches and reports progress per batch."""
+    records = _create_txt_records(isolated_config["txt"], sample_spec, 5)
+    progress = []
+
+    success = MigrationManager.migrate_backend(
+        form_path="test_form",
+        spec=sample_spec,
+        old_backend="txt",
+        new_backend="sqlite",
+        record_count=5,
+        batch_size=2,
+        progress_callback=lambda done, total, rate: progress.append(done),
+    )
+
+    assert success
+    assert progress == [2, 4, 5]
+    migrated = SQLiteRepository(isolated_config["sqlite"]).read_all(
+        "test_form", sample_spec
+    )
+    assert sorted(migrated, key=lambda r: r["_record_id"]) == sorted(
+        records, key=lambda r: r["_record_id"]
+    )
+    assert not list(isolated_config["backups"].glob("*.checkpoint.json"))
+
+
+def test_interrupted_migration_resumes(isolated_config, sample_spec, monkeypatch):
+    """An interrupted migration resumes from its checkpoint without duplicates."""
+    import persistence.adapters.sqlite_adapter as sqlite_adapter
+
+    # Commit the fast-load session after every batch
+    monkeypatch.setattr(sqlite_adapter, "FAST_LOAD_COMMIT_ROWS", 2)
+    records = _create_txt_records(isolated_config["txt"], sample_spec, 5)
+
+    def interrupt(done, total, rate):
+        if done >= 4:
+            raise RuntimeError("simulated crash")
+
+    success = MigrationManager.migrate_backend(
+        "test_form", sample_spec, "txt", "sqlite", 5, 2, interrupt
+    )
+    assert not success
+    assert list(isolated_config["backups"].glob("*.checkpoint.json"))
+
+    sqlite_repo = SQLiteRepository(isolated_config["sqlite"])
+    assert len(sqlite_repo.read_all("test_form", sample_spec)) == 4
+
+    progress = []
+    success = MigrationManager.migrate_backend(
+        "test_form",
+        sample_spec,
+        "txt",
+        "sqlite",
+        5,
+        2,
+        lambda done, total, rate: progress.append(done),
+    )
+
+    assert success
+    assert progress == [5]
+    migrated_ids = [
+        r["_record_id"] for r in sqlite_repo.read_all("test_form", sample_spec)
+    ]
+    assert sorted(migrated_ids) == sorted(r["_record_id"] for r in records)
+    assert not list(isolated_config["backups"].glob("*.checkpoint.json"))
+
+
+def test_interrupted_migration_keeps_committed_checkpoint(
+    isolated_config, sample_spec, monkeypatch
+):
+    """Uncommitted fast-load writes are rolled back and not checkpointed."""
+    import persistence.adapters.sqlite_adapter as sqlite_adapter
+
+    monkeypatch.setattr(sqlite_adapter, "FAST_LOAD_COMMIT_ROWS", 4)
+    records = _create_txt_records(isolated_config["txt"], sample_spec, 7)
+
+    def interrupt(done, total, rate):
+        if done >= 6:
+            raise RuntimeError("simulated crash")
+
+    success = MigrationManager.migrate_backend(
+        "test_form", sample_spec, "txt", "sqlite", 7, 2, interrupt
+    )
+    assert not success
+
+    # Batches 1-2 were committed, batch 3 was rolled back
+    sqlite_repo = SQLiteRepository(isolated_config["sqlite"])
+    assert len(sqlite_repo.read_all("test_form", sample_spec)) == 4
+    checkpoint_file = next(isolated_config["backups"].glob("*.checkpoint.json"))
+    checkpoint = json.loads(checkpoint_file.read_text())
+    assert checkpoint["records_written"] == 4
+    assert checkpoint["last_record_id"] == records[3]["_record_id"]
+
+    assert MigrationManager.migrate_backend(
+        "test_form", sample_spec, "txt", "sqlite", 7, 2
+    )
+    migrated_ids = [
+        r["_record_id"] for r in sqlite_repo.read_all("test_form", sample_spec)
+    ]
+    assert sorted(migrated_ids) == sorted(r["_record_id"] for r in records)
+
+
+def test_checksum_matches_across_backends(txt_config, sqlite_config, sample_spec):
+    """Same records in TXT and SQLite produce the same checksum."""
+    from persistence.checksum import compute_checksum, find_mismatches
+
+    records = _create_txt_records(txt_config, sample_spec, 5)
+    txt_repo = TxtRepository(txt_config)
+    sqlite_repo = SQLiteRepository(sqlite_config)
+    # Insert in reverse order: checksums are order-independent
+    sqlite_repo.bulk_create("test_form", sample_spec, list(reversed(records)))
+
+    source = compute_checksum(txt_repo, "test_form", sample_spec, batch_size=2)
+    target = compute_checksum(sqlite_repo, "test_form", sample_spec)
+
+    assert source.record_count == 5
+    assert source.matches(target)
+    assert find_mismatches(txt_repo, sqlite_repo, "test_form", sample_spec) == []
+
+
+def test_checksum_reports_mismatched_records(txt_config, sqlite_config, sample_spec):
+    """Corrupted, missing and extra records are detected and reported."""
+    from persistence.checksum import compute_checksum, find_mismatches
+
+    records = _create_txt_records(txt_config, sample_spec, 4)
+    txt_repo = TxtRepository(txt_config)
+    sqlite_repo = SQLiteRepository(sqlite_config)
+
+    corrupted = {**records[0], "nome": "Outro Nome"}
+    extra = {"_record_id": "EXTRA", "nome": "Extra", "telefone": "", "ativo": False}
+    sqlite_repo.bulk_create(
+        "test_form", sample_spec, [corrupted, records[1], records[2], extra]
+    )
+
+    source = compute_checksum(txt_repo, "test_form", sample_spec)
+    target = compute_checksum(sqlite_repo, "test_form", sample_spec)
+    assert source.record_count == target.record_count
+    assert not source.matches(target)
+
+    mismatches = find_mismatches(txt_repo, sqlite_repo, "test_form", sample_spec)
+    problems = {m["record_id"]: m["problem"] for m in mismatches}
+    assert problems == {
+        records[0]["_record_id"]: "different",
+        "EXTRA": "unexpected",
+        records[3]["_record_id"]: "missing",
+    }
+
+
+def test_pipeline_batches_order_and_errors():
+    """Read-ahead pipeline preserves order and re-raises reader errors."""
+    from persistence.migration_manager import pipeline_batches
+
+    batches = [[{"n": i}] for i in range(20)]
+    assert list(pipeline_batches(iter(batches), queue_depth=2)) == batches
+    assert list(pipeline_batches(iter(batches), queue_depth=0)) == batches
+
+    def failing():
+        yield [{"n": 0}]
+        raise ValueError("bad line")
+
+    received = []
+    with pytest.raises(ValueError, match="bad line"):
+        for batch in pipeline_batches(failing(), queue_depth=2):
+            received.append(batch)
+    assert received == [[{"n": 0}]]
+
+    # Stopping early shuts the reader thread down
+    pipeline = pipeline_batches(iter(batches), queue_depth=1)
+    assert next(pipeline) == batches[0]
+    pipeline.close()
+
+
+def test_serial_and_pipelined_migration_match(isolated_config, sample_spec):
+    """Serial, thread-pipelined and process-pipelined migrations match."""
+    records = _create_txt_records(isolated_config["txt"], sample_spec, 7)
+    sqlite_repo = SQLiteRepository(isolated_config["sqlite"])
+
+    for queue_depth, reader in ((0, "thread"), (2, "thread"), (2, "process")):
+        if sqlite_repo.exists("test_form"):
+            sqlite_repo.drop_storage("test_form", force=True)
+
+        assert MigrationManager.migrate_backend(
+            "test_form",
+            sample_spec,
+            "txt",
+            "sqlite",
+            record_count=7,
+            batch_size=3,
+            queue_depth=queue_depth,
+            reader=reader,
+        )
+        migrated = sqlite_repo.read_all("test_form", sample_spec)
+        assert sorted(r["_record_id"] for r in migrated) == sorted(
+            r["_record_id"] for r in records
+        )
+
+
+def test_shard_move_is_detected_and_migrated(tmp_path, monkeypatch, sample_spec):
+    """Moving a form between two SQLite shards is a backend change."""
+    import persistence.config as persistence_config
+    import persistence.schema_history as schema_history
+    from persistence.config import PersistenceConfig
+    from persistence.factory import RepositoryFactory
+    from persistence.schema_history import SchemaHistory
+    from persistence.change_manager import check_form_changes, update_form_tracking
+
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    config_file = config_dir / "persistence.json"
+    config_file.write_text(
+        json.dumps(
+            {
+                "version": "1.0",
+                "default_backend": "shard_a",
+                "backends": {
+                    "shard_a": {"type": "sqlite", "database": "a/{form}.db"},
+                    "shard_b": {"type": "sqlite", "database": "b/{form}.db"},
+                },
+                "form_mappings": {"*": "default_backend"},
+                "backup_path": str(tmp_path / "backups"),
+            }
+        )
+    )
+    config = PersistenceConfig(str(config_file))
+    monkeypatch.setattr(persistence_config, "_config_instance", config)
+    history = SchemaHistory(str(config_dir / "schema_history.json"), flush_delay=0)
+    monkeypatch.setattr(schema_history, "_history_instance", history)
+    RepositoryFactory.clear_cache()
+
+    repo = RepositoryFactory.get_repository("test_form")
+    repo.create_storage("test_form", sample_spec)
+    ids = repo.bulk_create(
+        "test_form", sample_spec, [{"nome": f"P{i}"} for i in range(5)]
+    )
+    update_form_tracking("test_form", sample_spec, 5)
+
+    config.config["form_mappings"]["test_form"] = "shard_b"
+    _, change = check_form_changes("test_form", sample_spec, True, 5)
+    assert (change.old_backend, change.new_backend) == ("sqlite", "sqlite")
+    assert change.old_config["database"] == str(tmp_path / "a" / "test_form.db")
+    assert change.new_config["database"] == str(tmp_path / "b" / "test_form.db")
+
+    # Without the recorded source both sides resolve to the new shard
+    assert not MigrationManager.migrate_backend(
+        "test_form", sample_spec, "sqlite", "sqlite", 5
+    )
+    assert MigrationManager.migrate_backend(
+        "test_form",
+        sample_spec,
+        "sqlite",
+        "sqlite",
+        5,
+        old_config=change.old_config,
+        new_config=change.new_config,
+    )
+    migrated = RepositoryFactory.get_repository("test_form").read_all(
+        "test_form", sample_spec
+    )
+    assert sorted(r["_record_id"] for r in migrated) == sorted(ids)
+
+    update_form_tracking("test_form", sample_spec, 5)
+    assert check_form_changes("test_form", sample_spec, True, 5) == (None, None)
+    RepositoryFactory.clear_cache()
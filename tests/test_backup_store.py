@@ -0,0 +1,87 @@
+"""
+Tests for the content-addressed backup store.
+"""
+
+import pytest
+import os
+import sys
+import zlib
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from persistence.backup_store import BackupStore, chunk_lines
+
+
+def _lines(count, start=0):
+    return [
+        f"{i};Pessoa {i};pessoa{i}@example.com\n".encode() for i in range(start, count)
+    ]
+
+
+def test_chunk_boundaries_resync_after_insert():
+    """Inserting a line only changes the chunks around it."""
+    lines = _lines(20000)
+    edited = lines[:100] + [b"inserted;line\n"] + lines[100:]
+
+    before = list(chunk_lines(lines))
+    after = list(chunk_lines(edited))
+
+    assert b"".join(before) == b"".join(lines)
+    assert len(before) > 10
+    assert len(set(before) & set(after)) >= len(before) - 2
+
+
+def test_backups_deduplicate_unchanged_chunks(tmp_path):
+    """A second backup of a slightly edited file stores only the changes."""
+    data_file = tmp_path / "pessoas.txt"
+    data_file.write_bytes(b"".join(_lines(20000)))
+    store = BackupStore(str(tmp_path / "store"))
+
+    first = store.put_file("pessoas", str(data_file), kind="txt")
+    assert 0 < first["stored_bytes"] < first["size"]
+
+    data_file.write_bytes(b"".join(_lines(20000) + _lines(20010, 20000)))
+    second = store.put_file("pessoas", str(data_file), kind="txt")
+    assert second["stored_bytes"] < first["stored_bytes"] / 10
+
+    restored = tmp_path / "restored.txt"
+    store.restore_file(second["id"], str(restored))
+    assert restored.read_bytes() == data_file.read_bytes()
+    assert list(store.iter_lines(first["id"])) == _lines(20000)
+
+
+def test_restore_detects_corrupt_chunk(tmp_path):
+    """Corrupt chunks fail the restore and leave the destination untouched."""
+    store = BackupStore(str(tmp_path / "store"))
+    manifest = store.put_lines("series", _lines(100), kind="records")
+    key = manifest["chunks"][0][0]
+    with open(store._object_path(key), "wb") as f:
+        f.write(zlib.compress(b"tampered"))
+
+    dest = tmp_path / "dest.txt"
+    dest.write_text("original")
+    with pytest.raises(ValueError, match="corrupt"):
+        store.restore_file(manifest["id"], str(dest))
+    assert dest.read_text() == "original"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["dest.txt", "store"]
+
+
+def test_prune_removes_unreferenced_chunks(tmp_path):
+    """Pruning deletes old manifests and the chunks only they referenced."""
+    store = BackupStore(str(tmp_path / "store"))
+    old = store.put_lines("series", _lines(100), kind="records")
+    store.put_lines("series", _lines(100, 50), kind="records")
+    store.put_lines("other", _lines(100), kind="records")
+
+    deleted = store.prune("series", keep_last=1)
+    assert deleted == [old["id"]]
+    # Chunks are still within the grace period
+    assert store.gc() == 0
+    # The old chunk is shared with "other" and must survive
+    assert store.gc(grace_seconds=-1) == 0
+    assert list(store.iter_lines(store.list_backups("other")[0]["id"])) == _lines(100)
+
+    store.delete(store.list_backups("other")[0]["id"])
+    assert store.gc(grace_seconds=-1) == 1
+    assert [m["series"] for m in store.list_backups()] == ["series"]
@@ -0,0 +1,168 @@
+"""
+Tests for online SQLite backups and backup retention.
+"""
+
+import pytest
+import json
+import os
+import sys
+import sqlite3
+import threading
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from persistence.adapters.sqlite_adapter import SQLiteRepository
+from persistence.backup_store import BackupStore
+from persistence.backups import (
+    backup_sqlite,
+    dump_sqlite_table,
+    prune_backups,
+    restore_sqlite,
+)
+
+
+@pytest.fixture
+def sample_spec():
+    """Sample form specification."""
+    return {
+        "title": "Test Form",
+        "fields": [
+            {"name": "nome", "label": "Nome", "type": "text", "required": True},
+            {"name": "email", "label": "Email", "type": "email", "required": False},
+        ],
+    }
+
+
+@pytest.fixture
+def repo(tmp_path, sample_spec):
+    """SQLite repository with two populated tables."""
+    repo = SQLiteRepository({"database": str(tmp_path / "app.db")})
+    for form in ("contatos", "produtos"):
+        repo.create_storage(form, sample_spec)
+        repo.create_index(form, "email")
+        repo.bulk_create(
+            form, sample_spec, [{"nome": f"{form} {i}"} for i in range(50)]
+        )
+    return repo
+
+
+def _tables(db_path):
+    conn = sqlite3.connect(str(db_path))
+    names = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    conn.close()
+    return names
+
+
+def test_table_backup_and_restore(repo, tmp_path, sample_spec):
+    """Table backups hold only that table and restore it in place."""
+    backup_id = repo._create_backup("contatos")
+
+    store = BackupStore(str(tmp_path / "backups"))
+    manifest = store.get_manifest(backup_id)
+    assert backup_id.startswith("app_contatos/")
+    assert manifest["kind"] == "sqlite-table"
+    header = json.loads(next(store.iter_lines(backup_id)))
+    assert header["table"] == "contatos"
+    assert len(header["indexes"]) == 1 and "idx_contatos_email" in header["indexes"][0]
+    assert len(list(store.iter_lines(backup_id))) == 51
+
+    repo.drop_storage("contatos", force=True)
+    assert repo._restore_backup(backup_id)
+    assert len(repo.read_all("contatos", sample_spec)) == 50
+    assert len(repo.read_all("produtos", sample_spec)) == 50
+    assert "idx_contatos_email" in {
+        row[0]
+        for row in sqlite3.connect(repo.database).execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )
+    }
+
+
+def test_database_backup_and_restore(repo, tmp_path, sample_spec):
+    """Whole-database backups go through the store and restore every table."""
+    repo.backup_scope = "database"
+    backup_id = repo._create_backup()
+    assert backup_id.startswith("app/")
+    assert not list((tmp_path / "backups").glob("*.snapshot"))
+
+    repo.drop_storage("contatos", force=True)
+    repo.drop_storage("produtos", force=True)
+    assert repo._restore_backup(backup_id)
+    assert _tables(repo.database) >= {"contatos", "produtos"}
+    assert len(repo.read_all("produtos", sample_spec)) == 50
+
+
+def test_table_dump_does_not_block_writers(repo, sample_spec):
+    """Writers commit while a dump is being consumed between batches."""
+    dump = dump_sqlite_table(repo.database, "contatos", batch_rows=10)
+    header = json.loads(next(dump))
+    rows = [next(dump) for _ in range(15)]
+
+    # Rollback-journal mode: an open read transaction would block this commit
+    conn = sqlite3.connect(repo.database, timeout=0.1)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    conn.execute("UPDATE contatos SET nome = 'alterado'")
+    conn.commit()
+    conn.close()
+
+    rows += list(dump)
+    assert header["columns"][0] == "record_id"
+    assert len(rows) == 50
+    names = [json.loads(row)[header["columns"].index("nome")] for row in rows]
+    assert names[:10] == [f"contatos {i}" for i in range(10)]
+    assert names[20:] == ["alterado"] * 30
+
+
+def test_full_backup_during_concurrent_writes(repo, tmp_path, sample_spec):
+    """A paged online backup completes while another connection writes."""
+    stop = threading.Event()
+
+    def writer():
+        while not stop.is_set():
+            repo.create("produtos", sample_spec, {"nome": "novo"})
+            time.sleep(0.001)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        backup_path = backup_sqlite(
+            repo.database, str(tmp_path / "full.db"), pages=1, sleep=0.001
+        )
+    finally:
+        stop.set()
+        thread.join()
+
+    conn = sqlite3.connect(backup_path)
+    assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    assert conn.execute("SELECT COUNT(*) FROM contatos").fetchone()[0] == 50
+    assert conn.execute("SELECT COUNT(*) FROM produtos").fetchone()[0] >= 50
+    conn.close()
+
+    restore_sqlite(backup_path, repo.database)
+    assert len(repo.read_all("contatos", sample_spec)) == 50
+
+
+def test_prune_backups_retention(tmp_path):
+    """keep_last and max_age_days prune per series, never the newest backup."""
+    now = time.time()
+    for i in range(5):
+        for series in ("a", "b"):
+            path = tmp_path / f"{series}_backup_{i}.db"
+            path.write_text("x")
+            # Backup i is (5 - i) days old
+            os.utime(path, (now - (5 - i) * 86400, now - (5 - i) * 86400))
+
+    deleted = prune_backups(str(tmp_path), "a_backup_*.db", keep_last=3)
+    assert sorted(os.path.basename(p) for p in deleted) == [
+        "a_backup_0.db",
+        "a_backup_1.db",
+    ]
+    assert len(list(tmp_path.glob("b_backup_*"))) == 5
+
+    prune_backups(str(tmp_path), "b_backup_*.db", max_age_days=0.5)
+    assert [p.name for p in tmp_path.glob("b_backup_*")] == ["b_backup_4.db"]
@@ -77,6 +77,19 @@ def test_compute_spec_hash(sample_spec_v1):
     assert len(hash1) == 32  # MD5 hash is 32 characters
 
 
+def test_spec_hash_memoized_per_spec(sample_spec_v1, sample_spec_v2_add_field):
+    """Hash is memoized per spec object and refreshed when fields are replaced."""
+    spec = dict(sample_spec_v1)
+    first = SchemaChangeDetector.compute_spec_hash(spec)
+    assert SchemaChangeDetector.compute_spec_hash(spec) == first
+
+    spec["fields"] = sample_spec_v2_add_field["fields"]
+    assert SchemaChangeDetector.compute_spec_hash(
+        spec
+    ) == SchemaChangeDetector.compute_spec_hash(sample_spec_v2_add_field)
+    assert SchemaChangeDetector.compute_spec_hash(spec) != first
+
+
 def test_different_specs_different_hashes(sample_spec_v1, sample_spec_v2_add_field):
     """Test that different specs have different hashes."""
     hash1 = SchemaChangeDetector.compute_spec_hash(sample_spec_v1)
@@ -244,3 +257,68 @@ def test_type_compatibility_check():
 
     # Number to text is NOT safe (data loss)
     assert not SchemaChangeDetector._is_type_compatible("number", "text")
+
+
+def test_schema_history_write_behind(tmp_path):
+    """History updates are buffered and written atomically on flush."""
+    import json
+    from persistence.schema_history import SchemaHistory
+
+    history_file = tmp_path / "config" / "schema_history.json"
+    history = SchemaHistory(str(history_file), flush_delay=60)
+
+    assert history.update_form_history("contatos", "abc", "txt", 3)
+    assert history.update_form_history("produtos", "def", "sqlite", 1)
+    assert history.get_last_backend("produtos") == "sqlite"
+    assert not history_file.exists()  # Still buffered
+
+    assert history.flush()
+    saved = json.loads(history_file.read_text())
+    assert saved["contatos"]["record_count"] == 3
+    assert saved["produtos"]["last_backend"] == "sqlite"
+    # No temporary files are left behind (the .lock file serializes writers)
+    assert sorted(p.name for p in history_file.parent.iterdir()) == [
+        history_file.name,
+        f"{history_file.name}.lock",
+    ]
+
+    history.delete_form_history("contatos")
+    history.flush()
+    reloaded = SchemaHistory(str(history_file))
+    assert reloaded.get_all_forms() == ["produtos"]
+
+
+def test_schema_history_concurrent_writers_merge(tmp_path):
+    """Writers sharing the file keep each other's updates of other forms."""
+    import json
+    from persistence.schema_history import SchemaHistory
+
+    history_file = tmp_path / "schema_history.json"
+    first = SchemaHistory(str(history_file), flush_delay=60)
+    second = SchemaHistory(str(history_file), flush_delay=60)
+
+    first.update_form_history("contatos", "abc", "txt", 3)
+    second.update_form_history("produtos", "def", "sqlite", 1)
+    assert first.flush()
+    assert second.flush()
+
+    saved = json.loads(history_file.read_text())
+    assert sorted(saved) == ["contatos", "produtos"]
+
+    # Reads pick up the other writer's changes
+    assert first.get_last_backend("produtos") == "sqlite"
+
+    second.delete_form_history("contatos")
+    assert second.flush()
+    assert first.get_all_forms() == ["produtos"]
+
+
+def test_schema_history_synchronous_mode(tmp_path):
+    """flush_delay=0 writes every update immediately."""
+    from persistence.schema_history import SchemaHistory
+
+    history_file = tmp_path / "schema_history.json"
+    history = SchemaHistory(str(history_file), flush_delay=0)
+
+    assert history.update_form_history("contatos", "abc", "txt", 3)
+    assert SchemaHistory(str(history_file)).get_last_record_count("contatos") == 3
@@ -157,6 +157,45 @@ def test_load_spec():
     assert spec["fields"][2]["name"] == "whatsapp"
 
 
+def test_load_spec_cached_until_file_changes(tmp_path):
+    """Specs are cached per file version and hashed once per version."""
+    from utils.spec_loader import get_specs_dir, set_specs_dir
+    from persistence.schema_detector import SchemaChangeDetector
+
+    spec_file = tmp_path / "cached.json"
+    spec_file.write_text(
+        json.dumps(
+            {"title": "Cached", "fields": [{"name": "a", "label": "A", "type": "text"}]}
+        )
+    )
+
+    original_dir = get_specs_dir()
+    set_specs_dir(str(tmp_path))
+    try:
+        spec = load_spec("cached")
+        assert load_spec("cached") is spec
+        spec_hash = SchemaChangeDetector.compute_spec_hash(spec)
+        assert SchemaChangeDetector.compute_spec_hash(spec) == spec_hash
+
+        spec_file.write_text(
+            json.dumps(
+                {
+                    "title": "Cached",
+                    "fields": [{"name": "b", "label": "B", "type": "text"}],
+                }
+            )
+        )
+        stat = spec_file.stat()
+        os.utime(spec_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        reloaded = load_spec("cached")
+        assert reloaded is not spec
+        assert reloaded["fields"][0]["name"] == "b"
+        assert SchemaChangeDetector.compute_spec_hash(reloaded) != spec_hash
+    finally:
+        set_specs_dir(original_dir)
+
+
 def test_scan_specs_directory():
     """Test scanning specs directory for menu structure."""
     menu_items = scan_specs_directory()
@@ -407,3 +446,82 @@ def test_menu_items_sorted_by_order():
         orders = [item["order"] for item in items_with_order]
         # Check if sorted (ascending)
         assert orders == sorted(orders), "Items should be sorted by order field"
+
+
+def test_table_renderer_matches_legacy_row():
+    """Compiled renderer produces the same rows as the legacy helper."""
+    from src.VibeCForms import generate_table_row
+    from utils.spec_renderer import get_table_renderer
+
+    spec = {
+        "title": "Test Form",
+        "fields": [
+            {"name": "nome", "label": "Nome", "type": "text"},
+            {
+                "name": "status",
+                "label": "Status",
+                "type": "select",
+                "options": [
+                    {"value": "a", "label": "Ativo"},
+                    {"value": "a", "label": "Duplicado"},
+                    {"value": "i", "label": "Inativo"},
+                ],
+            },
+            {"name": "ativo", "label": "Ativo", "type": "checkbox"},
+            {"name": "senha", "label": "Senha", "type": "password"},
+        ],
+    }
+    record = {
+        "_record_id": "ABC",
+        "nome": "Ana",
+        "status": "a",
+        "ativo": True,
+        "senha": "x",
+    }
+
+    renderer = get_table_renderer(spec, "test_renderer")
+    row = renderer.render_row(record)
+
+    assert row == generate_table_row(record, spec, "test_renderer")
+    assert row.startswith("<tr>") and row.endswith("</tr>")
+    assert "<td>Ativo</td>" in row  # first matching option wins
+    assert "Duplicado" not in row
+    assert "<td>Sim</td>" in row
+    assert "<td>x</td>" not in row
+    assert renderer.render_row({"status": "zzz"}).count("<td>zzz</td>") == 1
+
+
+def test_table_renderer_cache_and_streaming():
+    """Renderer is reused per spec version and streams rows in batches."""
+    from utils.spec_renderer import get_table_renderer
+
+    spec = {
+        "title": "Test Form",
+        "fields": [{"name": "nome", "label": "Nome", "type": "text"}],
+    }
+    renderer = get_table_renderer(spec, "test_stream")
+    assert get_table_renderer(spec, "test_stream") is renderer
+
+    changed = {
+        "title": "Test Form",
+        "fields": [{"name": "nome", "label": "Nome Completo", "type": "text"}],
+    }
+    assert get_table_renderer(changed, "test_stream") is not renderer
+
+    records = [{"_record_id": str(i), "nome": f"n{i}"} for i in range(5)]
+    chunks = list(renderer.iter_rows(records, batch_size=2))
+
+    assert len(chunks) == 3
+    assert "".join(chunks) == renderer.render_rows(records)
+    assert list(renderer.iter_rows([])) == []
+
+
+def test_form_page_streams_table():
+    """GET on a form page returns a streamed response with the table rows."""
+    from src.VibeCForms import app
+
+    with app.test_client() as client:
+        response = client.get("/contatos")
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert "<table" in response.get_data(as_text=True)
@@ -333,4 +333,262 @@ class TestErrorHandling:
         assert cards == []
 
 
+@pytest.fixture
+def paged_board(tmp_path):
+    """Board over a fresh form with 120 leads and 3 won deals."""
+    from utils.spec_loader import get_specs_dir, set_specs_dir
+
+    # The test business case is shared by the session: use a unique form
+    form = f"deals_{tmp_path.name}"
+    spec = {
+        "title": "Deals",
+        "fields": [
+            {"name": "nome", "label": "Nome", "type": "text"},
+            {"name": "notas", "label": "Notas", "type": "textarea"},
+        ],
+    }
+    (tmp_path / f"{form}.json").write_text(json.dumps(spec))
+    board_config = {
+        "boards": {
+            "deals": {
+                "form": form,
+                "card_fields": ["nome"],
+                "columns": [{"tag": "lead"}, {"tag": "won"}],
+            }
+        }
+    }
+    config_file = tmp_path / "kanban_boards.json"
+    config_file.write_text(json.dumps(board_config))
+
+    original_specs_dir = get_specs_dir()
+    set_specs_dir(str(tmp_path))
+
+    repo = RepositoryFactory.get_repository(form)
+    records = [{"nome": f"Deal {i}", "notas": "x" * 200} for i in range(123)]
+    ids = repo.bulk_create(form, spec, records)
+    repo.bulk_add_tag(form, ids[:120], "lead", "test")
+    repo.bulk_add_tag(form, ids[120:], "won", "test")
+
+    yield KanbanService(config_path=str(config_file))
+
+    set_specs_dir(original_specs_dir)
+
+
+class TestBoardPagination:
+    """Test per-column pages, totals and card field projection."""
+
+    def test_pages_cover_column_once(self, paged_board):
+        """Following next_cursor returns every card of a column exactly once."""
+        page = paged_board.get_board_page("deals", limit=50)
+        assert page["lead"]["total"] == 120
+        assert len(page["lead"]["cards"]) == 50
+        assert page["won"] == {
+            "cards": page["won"]["cards"],
+            "total": 3,
+            "next_cursor": None,
+        }
+        assert set(page["lead"]["cards"][0]) == {"_record_id", "nome"}
+
+        seen = [card["_record_id"] for card in page["lead"]["cards"]]
+        cursor = page["lead"]["next_cursor"]
+        while cursor:
+            more = paged_board.get_board_page("deals", 50, "lead", cursor)
+            assert list(more) == ["lead"]
+            seen += [card["_record_id"] for card in more["lead"]["cards"]]
+            cursor = more["lead"]["next_cursor"]
+
+        assert len(seen) == len(set(seen)) == 120
+
+    def test_invalid_page_requests(self, paged_board):
+        """Unknown columns and malformed cursors are rejected."""
+        with pytest.raises(ValueError):
+            paged_board.get_board_page("deals", 50, "missing")
+        with pytest.raises(ValueError):
+            paged_board.get_board_page("deals", 50, "lead", "not-a-cursor")
+
+    def test_cards_api_pages(self, paged_board, monkeypatch):
+        """The cards API returns per-column pages and totals."""
+        from VibeCForms import app
+        import controllers.kanban
+
+        monkeypatch.setattr(controllers.kanban, "kanban_service", paged_board)
+        client = app.test_client()
+
+        data = client.get("/api/kanban/deals/cards?limit=100").get_json()
+        assert data["columns"]["lead"]["total"] == 120
+        assert len(data["cards"]["lead"]) == 100
+        cursor = data["columns"]["lead"]["next_cursor"]
+
+        data = client.get(
+            "/api/kanban/deals/cards",
+            query_string={"limit": 100, "column": "lead", "after": cursor},
+        ).get_json()
+        assert len(data["cards"]["lead"]) == 20
+        assert data["columns"]["lead"]["next_cursor"] is None
+
+        assert client.get("/api/kanban/deals/cards?limit=0").status_code == 400
+        assert client.get(f"/api/kanban/deals/cards?after={cursor}").status_code == 400
+
+
+class TestBoardChanges:
+    """Test the board change cursor, /changes and the change stream."""
+
+    def test_changes_fold_per_card(self, paged_board):
+        """Logged tag changes become one event per card and column."""
+        form = paged_board.load_board_config("deals")["form"]
+        repo = RepositoryFactory.get_repository(form)
+        leads = [
+            card["_record_id"]
+            for card in paged_board.get_board_page("deals")["lead"]["cards"]
+        ]
+        cursor = paged_board.get_change_cursor("deals")
+
+        repo.transition_tag(form, leads[0], "lead", "won", "u1")
+        repo.remove_tag(form, leads[1], "lead", "u1")
+        repo.add_tag(form, leads[2], "won", "u1")
+        repo.update_by_id(form, load_spec(form), leads[3], {"nome": "Renamed"})
+        repo.add_tag(form, leads[4], "hot", "u1")  # Not a column
+        repo.remove_tag(form, leads[5], "lead", "u1")
+        repo.add_tag(form, leads[5], "lead", "u1")  # Net no change
+
+        batch = paged_board.get_board_changes("deals", cursor)
+        assert [(e["type"], e["record_id"]) for e in batch["changes"]] == [
+            ("moved", leads[0]),
+            ("removed", leads[1]),
+            ("added", leads[2]),
+            ("updated", leads[3]),
+        ]
+        moved = batch["changes"][0]
+        assert (moved["from"], moved["to"]) == ("lead", "won")
+        assert batch["changes"][3]["card"] == {
+            "_record_id": leads[3],
+            "nome": "Renamed",
+        }
+        assert batch["totals"] == {"lead": 118, "won": 5}
+        assert not batch["reset"] and not batch["more"]
+
+        assert paged_board.get_board_changes("deals", batch["cursor"])["changes"] == []
+
+    def test_changes_api_and_stream(self, paged_board, monkeypatch):
+        """Changes are served by /changes and pushed by the event stream."""
+        from VibeCForms import app
+        import controllers.kanban
+
+        monkeypatch.setattr(controllers.kanban, "kanban_service", paged_board)
+        monkeypatch.setattr(controllers.kanban, "STREAM_POLL_INTERVAL", 0.01)
+        monkeypatch.setattr(controllers.kanban, "STREAM_TIMEOUT", 0.2)
+        client = app.test_client()
+
+        data = client.get("/api/kanban/deals/cards?limit=1").get_json()
+        cursor = data["cursor"]
+        record_id = data["cards"]["lead"][0]["_record_id"]
+        form = paged_board.load_board_config("deals")["form"]
+        RepositoryFactory.get_repository(form).transition_tag(
+            form, record_id, "lead", "won", "u1"
+        )
+
+        data = client.get(f"/api/kanban/deals/changes?since={cursor}").get_json()
+        assert [e["type"] for e in data["changes"]] == ["moved"]
+        assert client.get("/api/kanban/deals/changes").status_code == 400
+
+        response = client.get(f"/api/kanban/deals/stream?since={cursor}")
+        assert response.mimetype == "text/event-stream"
+        body = response.get_data(as_text=True)
+        assert body.startswith("retry: ")
+        assert f"id: {data['cursor']}\nevent: changes\n" in body
+        assert body.count("event: changes") == 1
+
+        # Reconnects resume from the last event id
+        response = client.get(
+            f"/api/kanban/deals/stream?since={cursor}",
+            headers={"Last-Event-ID": str(data["cursor"])},
+        )
+        assert "event: changes" not in response.get_data(as_text=True)
+
+
+class TestBatchMove:
+    """Test moving many cards with one request."""
+
+    def test_move_cards_results(self, paged_board):
+        """Valid moves are applied together and every move gets a result."""
+        page = paged_board.get_board_page("deals")
+        leads = [card["_record_id"] for card in page["lead"]["cards"]]
+        won = [card["_record_id"] for card in page["won"]["cards"]]
+
+        moves = [
+            {"record_id": leads[0], "from_tag": "lead", "to_tag": "won"},
+            {"record_id": won[0], "from_tag": "won", "to_tag": "lead"},
+            {"record_id": won[1], "from_tag": "lead", "to_tag": "won"},
+            {"record_id": leads[1], "from_tag": "lead", "to_tag": "proposal"},
+            {"record_id": leads[0], "from_tag": "won", "to_tag": "lead"},
+            {"record_id": "not-an-id", "from_tag": "lead", "to_tag": "won"},
+            {"record_id": leads[2], "from_tag": "lead"},
+        ]
+        results = paged_board.move_cards("deals", moves, "ai_agent")
+        assert [r["status"] for r in results] == [
+            "moved",
+            "moved",
+            "unchanged",
+            "invalid",
+            "invalid",
+            "invalid",
+            "invalid",
+        ]
+        assert results[0] == {
+            "record_id": leads[0],
+            "from_tag": "lead",
+            "to_tag": "won",
+            "status": "moved",
+        }
+        assert "not allowed" in results[3]["error"]
+
+        page = paged_board.get_board_page("deals", limit=1)
+        assert (page["lead"]["total"], page["won"]["total"]) == (120, 3)
+
+        with pytest.raises(ValueError):
+            paged_board.move_cards("missing", moves, "u1")
+
+    def test_move_batch_api(self, paged_board, monkeypatch):
+        """The batch endpoint returns per-move results."""
+        from VibeCForms import app
+        import controllers.kanban
+
+        monkeypatch.setattr(controllers.kanban, "kanban_service", paged_board)
+        client = app.test_client()
+
+        data = client.get("/api/kanban/deals/cards?limit=5").get_json()
+        moves = [
+            {"record_id": card["_record_id"], "from_tag": "lead", "to_tag": "won"}
+            for card in data["cards"]["lead"]
+        ]
+        response = client.post(
+            "/api/kanban/deals/move/batch", json={"moves": moves, "actor": "ai_agent"}
+        )
+        data = response.get_json()
+        assert data["success"] and data["moved"] == 5
+        assert all(result["status"] == "moved" for result in data["results"])
+
+        data = client.post(
+            "/api/kanban/deals/move/batch",
+            json={"moves": moves + [{"record_id": "x"}]},
+        ).get_json()
+        assert not data["success"] and data["moved"] == 0
+        assert [r["status"] for r in data["results"]] == ["unchanged"] * 5 + ["invalid"]
+
+        assert client.post("/api/kanban/deals/move/batch", json={}).status_code == 400
+        monkeypatch.setattr(controllers.kanban, "MAX_BATCH_MOVES", 2)
+        assert (
+            client.post(
+                "/api/kanban/deals/move/batch", json={"moves": moves}
+            ).status_code
+            == 400
+        )
+        assert (
+            client.post(
+                "/api/kanban/missing/move/batch", json={"moves": moves}
+            ).status_code
+            == 404
+        )
+
+
 # Run tests with: uv run pytest tests/test_kanban.py -v
@@ -0,0 +1,200 @@
+"""
+Tests for background migration jobs.
+"""
+
+import pytest
+import os
+import sys
+import json
+import threading
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from persistence.adapters.txt_adapter import TxtRepository
+from persistence.adapters.sqlite_adapter import SQLiteRepository
+from persistence.migration_manager import MigrationManager
+from services.migration_job_service import MigrationJobService
+
+
+@pytest.fixture
+def sample_spec():
+    """Sample form specification."""
+    return {
+        "title": "Test Form",
+        "fields": [
+            {"name": "nome", "label": "Nome", "type": "text", "required": True},
+            {"name": "ativo", "label": "Ativo", "type": "checkbox"},
+        ],
+    }
+
+
+@pytest.fixture
+def isolated_config(tmp_path, monkeypatch, sample_spec):
+    """Global persistence config with a populated TXT form."""
+    import persistence.config as persistence_config
+    from persistence.config import PersistenceConfig
+    from persistence.factory import RepositoryFactory
+
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    config_file = config_dir / "persistence.json"
+    config_file.write_text(
+        json.dumps(
+            {
+                "version": "1.0",
+                "default_backend": "sqlite",
+                "backends": {
+                    "txt": {"type": "txt", "path": str(tmp_path / "txt")},
+                    "sqlite": {"type": "sqlite", "database": str(tmp_path / "app.db")},
+                },
+                "form_mappings": {"*": "default_backend"},
+                "backup_path": str(tmp_path / "backups"),
+            }
+        )
+    )
+    monkeypatch.setattr(
+        persistence_config, "_config_instance", PersistenceConfig(str(config_file))
+    )
+    RepositoryFactory.clear_cache()
+
+    txt_repo = TxtRepository({"path": str(tmp_path / "txt")})
+    txt_repo.create_storage("test_form", sample_spec)
+    txt_repo.bulk_create(
+        "test_form", sample_spec, [{"nome": f"Pessoa {i}"} for i in range(50)]
+    )
+
+    yield {
+        "sqlite": SQLiteRepository({"database": str(tmp_path / "app.db")}),
+        "jobs": tmp_path / "jobs",
+    }
+    RepositoryFactory.clear_cache()
+
+
+def _wait(service, job_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = service.get_status(job_id)
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_job_runs_in_background(isolated_config, sample_spec):
+    """A submitted job migrates the form and reports completion."""
+    service = MigrationJobService(str(isolated_config["jobs"]))
+    release = threading.Event()
+    service._executor.submit(release.wait)
+    try:
+        job = service.submit("test_form", sample_spec, "txt", "sqlite", 50)
+        assert job["status"] == "queued"
+        assert job["percent"] == 0.0
+        # A second submission for the same form returns the active job
+        again = service.submit("test_form", sample_spec, "txt", "sqlite", 50)
+        assert again["job_id"] == job["job_id"]
+
+        release.set()
+        job = _wait(service, job["job_id"])
+    finally:
+        release.set()
+        service.shutdown()
+
+    assert job["status"] == "completed"
+    assert job["percent"] == 100.0
+    assert job["records_done"] == 50
+    assert "spec" not in job
+    assert len(isolated_config["sqlite"].read_all("test_form", sample_spec)) == 50
+    assert not list(isolated_config["jobs"].glob("*.lock"))
+
+
+def test_cancel_rolls_back(isolated_config, sample_spec):
+    """Cancelling stops the migration and leaves no partial data behind."""
+    service = MigrationJobService(str(isolated_config["jobs"]))
+    release = threading.Event()
+    # Keep the single worker busy so the job is still queued
+    service._executor.submit(release.wait)
+    try:
+        job = service.submit("test_form", sample_spec, "txt", "sqlite", 50)
+        assert service.cancel(job["job_id"])
+        release.set()
+        job = _wait(service, job["job_id"])
+    finally:
+        release.set()
+        service.shutdown()
+
+    assert job["status"] == "cancelled"
+    assert not service.cancel(job["job_id"])
+    assert not isolated_config["sqlite"].exists("test_form")
+
+    # A migration cancelled while copying is rolled back
+    cancel_event = threading.Event()
+    cancel_event.set()
+    assert not MigrationManager.migrate_backend(
+        "test_form",
+        sample_spec,
+        "txt",
+        "sqlite",
+        batch_size=10,
+        cancel_event=cancel_event,
+    )
+    assert not isolated_config["sqlite"].exists("test_form")
+
+
+def test_recover_resumes_interrupted_job(isolated_config, sample_spec):
+    """Jobs left running by a dead process are resumed on startup."""
+    jobs_dir = isolated_config["jobs"]
+    jobs_dir.mkdir()
+    job = {
+        "job_id": "interrupted",
+        "form_path": "test_form",
+        "spec": sample_spec,
+        "old_backend": "txt",
+        "new_backend": "sqlite",
+        "status": "running",
+        "record_count": 50,
+        "records_done": 20,
+        "rate": 100.0,
+        "attempts": 1,
+        "cancel_requested": False,
+        "error": None,
+        "created_at": "2026-01-01T00:00:00",
+        "started_at": "2026-01-01T00:00:00",
+        "finished_at": None,
+        "updated_at": "2026-01-01T00:00:01",
+    }
+    (jobs_dir / "interrupted.json").write_text(json.dumps(job))
+    # Lock held by a process that no longer exists
+    (jobs_dir / "interrupted.lock").write_text("999999999")
+
+    service = MigrationJobService(str(jobs_dir))
+    try:
+        job = _wait(service, "interrupted")
+    finally:
+        service.shutdown()
+
+    assert job["status"] == "completed"
+    assert job["attempts"] == 2
+    assert len(isolated_config["sqlite"].read_all("test_form", sample_spec)) == 50
+
+
+def test_status_endpoint(isolated_config, sample_spec, monkeypatch):
+    """The status API returns progress JSON and 404 for unknown jobs."""
+    import services.migration_job_service as job_module
+    from src.VibeCForms import app
+
+    service = MigrationJobService(str(isolated_config["jobs"]))
+    monkeypatch.setattr(job_module, "_migration_job_service_instance", service)
+    try:
+        job = service.submit("test_form", sample_spec, "txt", "sqlite", 50)
+        _wait(service, job["job_id"])
+
+        client = app.test_client()
+        response = client.get(f"/migrate/status/{job['job_id']}")
+        assert response.status_code == 200
+        assert response.get_json()["status"] == "completed"
+        assert client.get("/migrate/status/unknown").status_code == 404
+        assert client.post(f"/migrate/cancel/{job['job_id']}").status_code == 409
+    finally:
+        service.shutdown()
@@ -0,0 +1,245 @@
+"""
+Tests for online (dual-write) backend migration.
+"""
+
+import pytest
+import os
+import sys
+import json
+import threading
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from persistence.adapters.txt_adapter import TxtRepository
+from persistence.adapters.sqlite_adapter import SQLiteRepository
+from persistence.checksum import compute_checksum
+from persistence.factory import RepositoryFactory
+from persistence.online_migration import (
+    DualWriteRepository,
+    OnlineMigration,
+    get_dual_write_repository,
+)
+from persistence.schema_detector import BackendChange
+
+
+@pytest.fixture
+def sample_spec():
+    """Sample form specification."""
+    return {
+        "title": "Test Form",
+        "fields": [
+            {"name": "nome", "label": "Nome", "type": "text", "required": True},
+            {"name": "idade", "label": "Idade", "type": "number"},
+        ],
+    }
+
+
+@pytest.fixture
+def repos(tmp_path, sample_spec):
+    """TXT source with 100 records and an empty SQLite target."""
+    source = TxtRepository({"path": str(tmp_path / "txt")})
+    source.create_storage("pessoas", sample_spec)
+    ids = source.bulk_create(
+        "pessoas", sample_spec, [{"nome": f"P{i}", "idade": i} for i in range(100)]
+    )
+    target = SQLiteRepository({"database": str(tmp_path / "app.db")})
+    return source, target, ids
+
+
+def _migration(repos, spec):
+    source, target, _ = repos
+    return OnlineMigration(
+        "pessoas", spec, "txt", "sqlite", source, target, batch_size=10
+    )
+
+
+def test_backfill_with_concurrent_writes(repos, sample_spec):
+    """Writes made during the backfill end up in both backends before the flip."""
+    source, target, ids = repos
+    migration = _migration(repos, sample_spec)
+    wrapper = migration.begin()
+    assert get_dual_write_repository("pessoas") is wrapper
+
+    def write_during_backfill(copied, total, rate):
+        if copied != 20:
+            return
+        # Already copied, not yet copied, deleted, and brand new records
+        wrapper.update_by_id("pessoas", sample_spec, ids[5], {"nome": "X", "idade": 1})
+        wrapper.update_by_id("pessoas", sample_spec, ids[80], {"nome": "Y", "idade": 2})
+        wrapper.delete_by_id("pessoas", sample_spec, ids[90])
+        wrapper.create("pessoas", sample_spec, {"nome": "Nova", "idade": 3})
+
+    flipped = []
+    assert migration.run(
+        record_count=100,
+        progress_callback=write_during_backfill,
+        on_flip=flipped.append,
+    )
+
+    assert flipped == [100]
+    assert get_dual_write_repository("pessoas") is None
+    assert compute_checksum(target, "pessoas", sample_spec).matches(
+        compute_checksum(source, "pessoas", sample_spec)
+    )
+    assert target.read_by_id("pessoas", sample_spec, ids[80])["nome"] == "Y"
+    assert target.read_by_id("pessoas", sample_spec, ids[90]) is None
+
+
+def test_verification_repairs_target(repos, sample_spec):
+    """Stale and unexpected records in the target are repaired before flipping."""
+    source, target, ids = repos
+    target.create_storage("pessoas", sample_spec)
+    target.create(
+        "pessoas", sample_spec, {"nome": "Velho", "idade": 0, "_record_id": ids[0]}
+    )
+    target.create("pessoas", sample_spec, {"nome": "Intruso", "idade": 0})
+
+    assert _migration(repos, sample_spec).run()
+    assert compute_checksum(target, "pessoas", sample_spec).matches(
+        compute_checksum(source, "pessoas", sample_spec)
+    )
+    assert target.read_by_id("pessoas", sample_spec, ids[0])["nome"] == "P0"
+
+
+def test_cancel_drops_target(repos, sample_spec):
+    """A cancelled online migration ends dual writes and drops the new storage."""
+    source, target, _ = repos
+    cancel_event = threading.Event()
+    cancel_event.set()
+
+    assert not _migration(repos, sample_spec).run(cancel_event=cancel_event)
+    assert get_dual_write_repository("pessoas") is None
+    assert not target.exists("pessoas")
+    assert len(source.read_all("pessoas", sample_spec)) == 100
+
+
+@pytest.fixture
+def online_config(tmp_path, monkeypatch, sample_spec):
+    """Global config in online mode with 'pessoas' moved from TXT to SQLite."""
+    import persistence.config as persistence_config
+    import persistence.schema_history as schema_history
+    import services.migration_job_service as job_module
+    from persistence.config import PersistenceConfig
+    from persistence.schema_history import SchemaHistory
+    from services.migration_job_service import MigrationJobService
+
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    config_file = config_dir / "persistence.json"
+    config_file.write_text(
+        json.dumps(
+            {
+                "version": "1.0",
+                "default_backend": "sqlite",
+                "backends": {
+                    "txt": {"type": "txt", "path": str(tmp_path / "txt")},
+                    "sqlite": {"type": "sqlite", "database": str(tmp_path / "app.db")},
+                },
+                "form_mappings": {"*": "default_backend"},
+                "backup_path": str(tmp_path / "backups"),
+                "migration_mode": "online",
+            }
+        )
+    )
+    monkeypatch.setattr(
+        persistence_config, "_config_instance", PersistenceConfig(str(config_file))
+    )
+    history = SchemaHistory(str(config_dir / "schema_history.json"))
+    history.update_form_history("pessoas", "hash", "txt", 100)
+    monkeypatch.setattr(schema_history, "_history_instance", history)
+
+    service = MigrationJobService(str(tmp_path / "jobs"))
+    monkeypatch.setattr(job_module, "_migration_job_service_instance", service)
+    RepositoryFactory.clear_cache()
+    yield {"history": history, "service": service}
+    service.shutdown()
+    RepositoryFactory.clear_cache()
+
+
+def test_change_manager_migrates_online(repos, online_config, sample_spec):
+    """ChangeManager starts dual writes at once and flips in the background."""
+    from persistence.change_manager import ChangeManager, update_form_tracking
+
+    change = BackendChange("pessoas", "txt", "sqlite", True, 100)
+    release = threading.Event()
+    online_config["service"]._executor.submit(release.wait)
+    try:
+        assert ChangeManager.start_online_migration("pessoas", sample_spec, change, 100)
+
+        # The form keeps working while the job is queued
+        repo = RepositoryFactory.get_repository("pessoas")
+        assert isinstance(repo, DualWriteRepository)
+        assert len(repo.read_all("pessoas", sample_spec)) == 100
+        repo.create("pessoas", sample_spec, {"nome": "Durante", "idade": 1})
+        update_form_tracking("pessoas", sample_spec, 101)
+        assert online_config["history"].get_last_backend("pessoas") == "txt"
+    finally:
+        release.set()
+
+    (job,) = online_config["service"].list_jobs("pessoas")
+    deadline = time.time() + 10
+    while job["status"] in ("queued", "running") and time.time() < deadline:
+        time.sleep(0.01)
+        job = online_config["service"].get_status(job["job_id"])
+
+    assert job["status"] == "completed"
+    assert online_config["history"].get_last_backend("pessoas") == "sqlite"
+    repo = RepositoryFactory.get_repository("pessoas")
+    assert isinstance(repo, SQLiteRepository)
+    assert len(repo.read_all("pessoas", sample_spec)) == 101
+
+
+def test_historical_tags_are_copied(repos, sample_spec):
+    """Tags applied before dual writes started reach the target before the flip."""
+    source, target, ids = repos
+    source.add_tag("pessoas", ids[0], "lead", "u1", {"origem": "site"})
+    source.add_tag("pessoas", ids[1], "lead", "u2")
+    # Left behind in the target by an earlier, cancelled migration
+    target.create_storage("pessoas", sample_spec)
+    target.add_tag("pessoas", ids[2], "won", "u1")
+
+    migration = _migration(repos, sample_spec)
+    wrapper = migration.begin()
+    wrapper.transition_tag("pessoas", ids[1], "lead", "won", "u3")
+    assert migration.run(record_count=100)
+
+    assert target.get_objects_by_tag("pessoas", "lead") == [ids[0]]
+    assert target.get_objects_by_tag("pessoas", "won") == [ids[1]]
+    (tag,) = target.get_tags("pessoas", ids[0])
+    assert (tag["applied_by"], tag["metadata"]) == ("u1", {"origem": "site"})
+
+
+def test_other_processes_follow_persisted_state(repos, online_config, sample_spec):
+    """Dual writes are joined and dropped from the persisted migration state."""
+    import persistence.online_migration as online_migration
+    from persistence.change_manager import ChangeManager
+
+    change = BackendChange("pessoas", "txt", "sqlite", True, 100)
+    release = threading.Event()
+    online_config["service"]._executor.submit(release.wait)
+    try:
+        assert ChangeManager.start_online_migration("pessoas", sample_spec, change, 100)
+
+        # A worker that never saw the migration start builds its own wrapper
+        online_migration._dual_write_repositories.clear()
+        repo = RepositoryFactory.get_repository("pessoas")
+        assert isinstance(repo, DualWriteRepository)
+        assert isinstance(repo.source, TxtRepository)
+        assert isinstance(repo.target, SQLiteRepository)
+        stale = online_migration._dual_write_repositories["pessoas"]
+    finally:
+        release.set()
+
+    (job,) = online_config["service"].list_jobs("pessoas")
+    deadline = time.time() + 10
+    while job["status"] in ("queued", "running") and time.time() < deadline:
+        time.sleep(0.01)
+        job = online_config["service"].get_status(job["job_id"])
+    assert job["status"] == "completed"
+
+    # The worker still holding the wrapper drops it once the job flipped
+    online_migration._dual_write_repositories["pessoas"] = stale
+    assert isinstance(RepositoryFactory.get_repository("pessoas"), SQLiteRepository)
+    assert "pessoas" not in online_migration._dual_write_repositories
@@ -0,0 +1,131 @@
+"""
+Tests for persistence configuration routing.
+"""
+
+import pytest
+import os
+import sys
+import json
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import persistence.config as persistence_config
+from persistence.config import PersistenceConfig
+from persistence.factory import RepositoryFactory
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    """persistence.json with exact, wildcard and default mappings."""
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    config_path = config_dir / "persistence.json"
+    config_path.write_text(
+        json.dumps(
+            {
+                "version": "1.0",
+                "default_backend": "txt",
+                "backends": {
+                    "txt": {"type": "txt", "path": "data/"},
+                    "sqlite": {"type": "sqlite", "database": "data/app.db"},
+                },
+                "form_mappings": {
+                    "produtos": "sqlite",
+                    "financeiro/*": "sqlite",
+                    "financeiro/caixa": "default_backend",
+                },
+            }
+        )
+    )
+    return config_path
+
+
+def test_routing_matches_mappings(config_file):
+    """Exact matches win over wildcards; unmapped forms use the default."""
+    config = PersistenceConfig(str(config_file))
+
+    assert config.get_backend_for_form("produtos") == "sqlite"
+    assert config.get_backend_for_form("financeiro/contas") == "sqlite"
+    assert config.get_backend_for_form("financeiro/caixa") == "txt"
+    assert config.get_backend_for_form("contatos") == "txt"
+
+    backend_config = config.get_backend_config("produtos")
+    assert backend_config["database"] == str(config_file.parent.parent / "data/app.db")
+
+    # Returned configs are copies of the memoized entry
+    backend_config["database"] = "changed"
+    assert config.get_backend_config("produtos")["database"] != "changed"
+
+
+def test_routing_invalidated_on_change(config_file):
+    """In-place mapping changes, save() and reload() rebuild routing."""
+    config = PersistenceConfig(str(config_file))
+    assert config.get_backend_for_form("contatos") == "txt"
+
+    config.form_mappings["contatos"] = "sqlite"
+    assert config.get_backend_for_form("contatos") == "sqlite"
+    assert config.get_backend_config("contatos")["type"] == "sqlite"
+
+    del config.form_mappings["contatos"]
+    assert config.get_backend_for_form("contatos") == "txt"
+
+    config.form_mappings["contatos"] = "sqlite"
+    config.save()
+    assert json.loads(config_file.read_text())["form_mappings"]["contatos"] == "sqlite"
+
+    data = json.loads(config_file.read_text())
+    data["form_mappings"]["contatos"] = "txt"
+    config_file.write_text(json.dumps(data))
+    config.reload()
+    assert config.get_backend_for_form("contatos") == "txt"
+
+    config.form_mappings["outro"] = "sqlite"
+    assert config.get_backend_for_form("outro") == "sqlite"
+
+
+@pytest.fixture
+def sharded_config(config_file, monkeypatch):
+    """Install a config with two SQLite backends and a per-form shard backend."""
+    data = json.loads(config_file.read_text())
+    data["backends"]["sqlite_vendas"] = {
+        "type": "sqlite",
+        "database": "data/vendas.db",
+    }
+    data["backends"]["sqlite_shard"] = {
+        "type": "sqlite",
+        "database": "data/shards/{form}.db",
+    }
+    data["form_mappings"].update(
+        {"vendas/*": "sqlite_vendas", "pedidos/*": "sqlite_shard"}
+    )
+    config_file.write_text(json.dumps(data))
+
+    config = PersistenceConfig(str(config_file))
+    monkeypatch.setattr(persistence_config, "_config_instance", config)
+    RepositoryFactory.clear_cache()
+    yield config
+    RepositoryFactory.clear_cache()
+
+
+def test_factory_caches_by_backend_identity(sharded_config):
+    """Backends of the same type with different databases are not shared."""
+    produtos = RepositoryFactory.get_repository("produtos")
+    contas = RepositoryFactory.get_repository("financeiro/contas")
+    vendas = RepositoryFactory.get_repository("vendas/itens")
+
+    assert produtos is contas
+    assert vendas is not produtos
+    assert vendas.database.endswith("vendas.db")
+    assert RepositoryFactory.get_repository("vendas/notas") is vendas
+
+
+def test_factory_shards_per_form(sharded_config):
+    """{form} placeholder gives each form its own database file."""
+    a = RepositoryFactory.get_repository("pedidos/a")
+    b = RepositoryFactory.get_repository("pedidos/b")
+
+    assert a is not b
+    assert a.database.endswith(os.path.join("shards", "pedidos_a.db"))
+    assert b.database.endswith(os.path.join("shards", "pedidos_b.db"))
+    assert RepositoryFactory.get_cached_backends() == ["sqlite", "sqlite"]
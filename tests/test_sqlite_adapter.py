@@ -12,6 +12,7 @@ from pathlib import Path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from persistence.adapters.sqlite_adapter import SQLiteRepository
+from persistence.backup_store import BackupStore
 
 
 @pytest.fixture
@@ -269,3 +270,514 @@ def test_boolean_field_conversion(temp_db):
     repo.create("test", spec, {"ativo": False})
     records = repo.read_all("test", spec)
     assert records[0]["ativo"] is False
+
+
+def _index_names(db_path, table):
+    conn = sqlite3.connect(str(db_path))
+    names = {
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (table,),
+        )
+    }
+    conn.close()
+    return names
+
+
+def test_fast_load_session(temp_db, sample_spec):
+    """Fast-load drops secondary indexes, commits in groups and restores settings."""
+    config, db_path = temp_db
+    repo = SQLiteRepository(config)
+    repo.create_storage("test_form", sample_spec)
+    assert repo.create_index("test_form", "email")
+    indexes = _index_names(db_path, "test_form")
+    assert indexes
+
+    records = [{"nome": f"Pessoa {i}", "ativo": i % 2 == 0} for i in range(5)]
+    with repo.fast_load("test_form", sample_spec, commit_rows=4) as session:
+        repo.bulk_create("test_form", sample_spec, records[:2])
+        assert not session.commit_due()
+        assert _index_names(db_path, "test_form") == set()
+        repo.bulk_create("test_form", sample_spec, records[2:])
+        assert session.commit_due()
+        session.commit()
+        assert len(repo.read_all("test_form", sample_spec)) == 5
+
+    assert _index_names(db_path, "test_form") == indexes
+    conn = sqlite3.connect(str(db_path))
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    conn.close()
+
+    # Outside the session, bulk_create commits on its own again
+    repo.bulk_create("test_form", sample_spec, records[:1])
+    assert len(repo.read_all("test_form", sample_spec)) == 6
+
+
+def test_fast_load_rolls_back_uncommitted(temp_db, sample_spec):
+    """An error inside the session discards rows written since the last commit."""
+    config, db_path = temp_db
+    repo = SQLiteRepository(config)
+    records = [{"nome": f"Pessoa {i}"} for i in range(3)]
+    repo.create_storage("test_form", sample_spec)
+    assert repo.create_index("test_form", "email")
+
+    with pytest.raises(RuntimeError):
+        with repo.fast_load("test_form", sample_spec) as session:
+            repo.bulk_create("test_form", sample_spec, records[:2])
+            session.commit()
+            repo.bulk_create("test_form", sample_spec, records[2:])
+            raise RuntimeError("load failed")
+
+    assert len(repo.read_all("test_form", sample_spec)) == 2
+    assert _index_names(db_path, "test_form")
+
+
+def _crash_during_fast_load(config, spec):
+    """Child process dying inside a fast-load session after a commit."""
+    repo = SQLiteRepository(config)
+    with repo.fast_load("test_form", spec) as session:
+        repo.bulk_create("test_form", spec, [{"nome": "Pessoa"}])
+        session.commit()
+        os._exit(1)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_fast_load_recovers_after_crash(temp_db, sample_spec):
+    """Indexes and journal mode left by a crashed session are restored on resume."""
+    import multiprocessing
+
+    config, db_path = temp_db
+    repo = SQLiteRepository(config)
+    repo.create_storage("test_form", sample_spec)
+    assert repo.create_index("test_form", "email")
+    indexes = _index_names(db_path, "test_form")
+
+    child = multiprocessing.get_context("fork").Process(
+        target=_crash_during_fast_load, args=(config, sample_spec)
+    )
+    child.start()
+    child.join(timeout=30)
+    assert child.exitcode == 1
+    assert _index_names(db_path, "test_form") == set()
+
+    # The resumed load rebuilds the recorded indexes and restores the mode
+    with repo.fast_load("test_form", sample_spec) as session:
+        repo.bulk_create("test_form", sample_spec, [{"nome": "Outra"}])
+        assert _index_names(db_path, "test_form") == set()
+
+    assert _index_names(db_path, "test_form") == indexes
+    assert len(repo.read_all("test_form", sample_spec)) == 2
+    conn = sqlite3.connect(str(db_path))
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert conn.execute("SELECT COUNT(*) FROM _fast_load_state").fetchone()[0] == 0
+    conn.close()
+
+
+@pytest.fixture
+def schema_specs():
+    """Old and new spec with a rename, a type change, a removal and an addition."""
+    old_spec = {
+        "title": "Test",
+        "fields": [
+            {"name": "nome", "label": "Nome", "type": "text", "required": True},
+            {"name": "email", "label": "Email", "type": "email"},
+            {"name": "idade", "label": "Idade", "type": "text"},
+            {"name": "fax", "label": "Fax", "type": "text"},
+        ],
+    }
+    new_spec = {
+        "title": "Test",
+        "fields": [
+            {
+                "name": "nome_completo",
+                "label": "Nome",
+                "type": "text",
+                "required": True,
+            },
+            {"name": "email", "label": "Email", "type": "email"},
+            {"name": "idade", "label": "Idade", "type": "number"},
+            {"name": "ativo", "label": "Ativo", "type": "checkbox"},
+        ],
+    }
+    return old_spec, new_spec
+
+
+def test_migrate_schema_single_rebuild(temp_db, schema_specs):
+    """All changes are applied in one rebuild, keeping data and indexes."""
+    config, db_path = temp_db
+    old_spec, new_spec = schema_specs
+    repo = SQLiteRepository(config)
+    repo.create_storage("pessoas", old_spec)
+    repo.create_index("pessoas", "nome")
+    repo.create_index("pessoas", "email")
+    ids = repo.bulk_create(
+        "pessoas",
+        old_spec,
+        [
+            {"nome": "Ana", "email": "ana@x.com", "idade": "31", "fax": "1"},
+            {"nome": "Rui", "email": "rui@x.com", "idade": "42", "fax": "2"},
+        ],
+    )
+
+    assert repo.migrate_schema("pessoas", old_spec, new_spec)
+
+    records = {r["_record_id"]: r for r in repo.read_all("pessoas", new_spec)}
+    assert records[ids[0]] == {
+        "nome_completo": "Ana",
+        "email": "ana@x.com",
+        "idade": 31,
+        "ativo": False,
+        "_record_id": ids[0],
+    }
+    assert records[ids[1]]["idade"] == 42
+    assert _index_names(db_path, "pessoas") == {
+        "idx_pessoas_nome_completo",
+        "idx_pessoas_email",
+    }
+    # One backup for the whole migration, no leftover rebuild table
+    assert len(BackupStore(str(db_path.parent / "backups")).list_backups()) == 1
+    assert not repo.exists("pessoas_migration")
+
+
+def test_migrate_schema_native_alter(temp_db, sample_spec):
+    """Renames, additions and a single removal use ALTER TABLE without a rebuild."""
+    config, db_path = temp_db
+    repo = SQLiteRepository(config)
+    repo.create_storage("test_form", sample_spec)
+    record_id = repo.create("test_form", sample_spec, {"nome": "Ana", "ativo": True})
+
+    new_spec = {
+        "fields": [
+            {"name": "nome_completo", "type": "text", "required": True},
+            {"name": "ativo", "type": "checkbox"},
+            {"name": "cidade", "type": "select"},
+        ]
+    }
+    conn = repo._get_connection()
+    plan = repo._plan_table_migration(
+        conn, "test_form", new_spec, {"nome": "nome_completo"}, {}
+    )
+    conn.close()
+    assert not plan.rebuild
+    assert plan.removed == ["email"]
+    assert [sql.split()[3] for sql, _ in plan.statements] == [
+        "RENAME",
+        "DROP",
+        "ADD",
+    ]
+
+    assert repo.rename_field("test_form", new_spec, "nome", "nome_completo")
+    assert repo.read_by_id("test_form", new_spec, record_id) == {
+        "nome_completo": "Ana",
+        "ativo": True,
+        "cidade": "",
+        "_record_id": record_id,
+    }
+
+
+def test_migrate_schema_rolls_back_on_conversion_errors(temp_db, sample_spec):
+    """Too many failed conversions abort the migration without changing the table."""
+    config, db_path = temp_db
+    repo = SQLiteRepository(config)
+    repo.create_storage("test_form", sample_spec)
+    repo.create("test_form", sample_spec, {"nome": "Ana", "email": "ana@x.com"})
+
+    new_spec = {
+        "fields": [
+            {"name": "nome", "type": "number", "required": True},
+            {"name": "email", "type": "email"},
+            {"name": "ativo", "type": "checkbox"},
+        ]
+    }
+    assert not repo.change_field_type("test_form", new_spec, "nome", "text", "number")
+    assert repo.read_all("test_form", sample_spec)[0]["nome"] == "Ana"
+    assert not repo.exists("test_form_migration")
+
+
+def test_transition_tag_is_atomic(temp_db):
+    """transition_tag swaps tags in one transaction and changes nothing on conflict."""
+    config, _ = temp_db
+    repo = SQLiteRepository(config)
+    repo.add_tag("deals", "A", "lead", "system")
+    repo.add_tag("deals", "B", "lead", "system")
+    repo.add_tag("deals", "B", "won", "system")
+
+    assert repo.transition_tag("deals", "A", "lead", "qualified", "u1", {"score": 9})
+    assert [t["tag"] for t in repo.get_tags("deals", "A")] == ["qualified"]
+    history = repo.get_tag_history("deals", "A", "lead")
+    assert history[0]["removed_by"] == "u1"
+
+    # to_tag already active: rolled back, from_tag kept
+    assert not repo.transition_tag("deals", "B", "lead", "won", "u1")
+    assert sorted(t["tag"] for t in repo.get_tags("deals", "B")) == ["lead", "won"]
+
+    # from_tag not active: to_tag is still added
+    assert repo.transition_tag("deals", "A", "lead", "proposal", "u1")
+    assert sorted(t["tag"] for t in repo.get_tags("deals", "A")) == [
+        "proposal",
+        "qualified",
+    ]
+
+
+def test_bulk_tag_operations(temp_db):
+    """Bulk tag operations skip no-op objects and apply the rest at once."""
+    config, _ = temp_db
+    repo = SQLiteRepository(config)
+    ids = [f"ID{i:05d}" for i in range(2000)]
+    repo.add_tag("deals", ids[0], "lead", "system")
+
+    assert repo.bulk_add_tag("deals", ids + ids[:10], "lead", "import") == ids[1:]
+    assert len(repo.get_objects_by_tag("deals", "lead")) == 2000
+
+    repo.add_tag("deals", ids[1], "won", "system")
+    moved = repo.bulk_transition("deals", ids[:1000], "lead", "won", "u1")
+    assert moved == [ids[0]] + ids[2:1000]
+    assert repo.get_tag_statistics("deals") == {"lead": 1001, "won": 1000}
+
+    assert repo.bulk_remove_tag("deals", ids, "lead", "u1") == ids[1:2] + ids[1000:]
+    assert repo.get_tag_statistics("deals") == {"won": 1000}
+
+
+def test_apply_transitions(temp_db):
+    """Moves with different tag pairs are stored in one transaction."""
+    config, _ = temp_db
+    repo = SQLiteRepository(config)
+    repo.bulk_add_tag("deals", ["A", "B", "C"], "lead", "system")
+    repo.add_tag("deals", "D", "proposal", "system")
+    repo.add_tag("deals", "C", "won", "system")
+    cursor = repo.get_change_cursor()
+
+    moves = [
+        ("A", "lead", "qualified"),
+        ("D", "proposal", "won"),
+        ("C", "lead", "won"),  # Already won: skipped
+        ("B", "lead", "lost"),
+        ("A", "qualified", "won"),  # Second move of A: ignored
+    ]
+    assert repo.apply_transitions("deals", moves, "ai_agent") == ["A", "D", "B"]
+    assert repo.get_tag_statistics("deals") == {
+        "lead": 1,
+        "lost": 1,
+        "qualified": 1,
+        "won": 2,
+    }
+    assert repo.get_tag_history("deals", "D", "proposal")[0]["removed_by"] == (
+        "ai_agent"
+    )
+    changes = repo.get_tag_changes("deals", cursor)
+    assert len(changes) == 6
+    assert len({c["changed_at"] for c in changes if c["op"] == "add"}) == 1
+
+    # Nothing to move: nothing is stored
+    assert repo.apply_transitions("deals", [("C", "lead", "won")], "u1") == []
+    assert repo.get_change_cursor() == cursor + 6
+
+
+def test_legacy_tags_table_is_migrated(temp_db):
+    """A legacy single tags table is split into active tags and history."""
+    config, db_path = temp_db
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE tags (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            object_type TEXT NOT NULL, object_id TEXT NOT NULL, tag TEXT NOT NULL,
+            applied_at TEXT NOT NULL, applied_by TEXT NOT NULL,
+            removed_at TEXT, removed_by TEXT, metadata TEXT
+        )
+        """)
+    conn.executemany(
+        "INSERT INTO tags (object_type, object_id, tag, applied_at, applied_by, "
+        "removed_at, removed_by, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("deals", "A", "lead", "2025-01-01", "u1", "2025-01-02", "u2", None),
+            ("deals", "A", "won", "2025-01-02", "u2", None, None, '{"v": 1}'),
+            ("deals", "B", "lead", "2025-01-03", "u1", None, None, None),
+            ("deals", "B", "lead", "2025-01-04", "u1", None, None, None),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    repo = SQLiteRepository(config)
+    assert repo.get_tags("deals", "A") == [
+        {
+            "tag": "won",
+            "applied_at": "2025-01-02",
+            "applied_by": "u2",
+            "metadata": {"v": 1},
+        }
+    ]
+    assert [(h["tag"], h["is_active"]) for h in repo.get_tag_history("deals", "A")] == [
+        ("won", True),
+        ("lead", False),
+    ]
+    # The duplicate active row is kept as closed history
+    assert repo.get_tag_statistics("deals") == {"lead": 1, "won": 1}
+    assert len(repo.get_tag_history("deals", "B")) == 2
+    assert repo.get_objects_by_tag("deals", "lead", active_only=False) == ["B", "A"]
+
+    conn = sqlite3.connect(db_path)
+    tables = {
+        r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    }
+    conn.close()
+    assert "tags" not in tables and {"tags_active", "tags_history"} <= tables
+
+    # Re-adding a removed tag starts a new history entry
+    assert repo.remove_tag("deals", "A", "won", "u3")
+    assert repo.add_tag("deals", "A", "won", "u3")
+    assert [h["is_active"] for h in repo.get_tag_history("deals", "A", "won")] == [
+        True,
+        False,
+    ]
+
+
+def test_query_objects_by_tags(temp_db):
+    """Tag combinations are answered by one grouped query."""
+    config, _ = temp_db
+    repo = SQLiteRepository(config)
+    repo.bulk_add_tag("deals", ["A", "B", "C", "D"], "qualified", "u1")
+    repo.bulk_add_tag("deals", ["A", "B"], "priority", "u1")
+    repo.bulk_add_tag("deals", ["C"], "hot", "u1")
+    repo.bulk_add_tag("deals", ["B"], "on_hold", "u1")
+    repo.add_tag("leads", "A", "priority", "u1")
+
+    query = repo.query_objects_by_tags
+    assert query("deals", all_of=["qualified", "priority"]) == ["A", "B"]
+    assert query("deals", all_of=["qualified"], none_of=["on_hold"]) == [
+        "A",
+        "C",
+        "D",
+    ]
+    # Most recently tagged first
+    assert query("deals", any_of=["priority", "hot"], none_of=["on_hold"]) == [
+        "C",
+        "A",
+    ]
+    assert query("deals", none_of=["qualified"]) == []
+    assert query("deals", all_of=["qualified"], limit=2) == ["A", "B"]
+    assert query("deals", all_of=["priority", "missing"]) == []
+
+
+def test_tag_statistics_counters(temp_db):
+    """Tag counters follow every tag write and can be rebuilt."""
+    config, db_path = temp_db
+    repo = SQLiteRepository(config)
+    repo.bulk_add_tag("deals", ["A", "B", "C"], "lead", "u1")
+    repo.add_tag("deals", "A", "lead", "u1")  # Ignored duplicate
+    repo.transition_tag("deals", "A", "lead", "won", "u1")
+    repo.bulk_transition("deals", ["B", "C"], "lead", "won", "u1")
+    repo.remove_tag("deals", "C", "won", "u1")
+    repo.add_tag("leads", "A", "lead", "u1")
+
+    assert repo.get_tag_statistics("deals") == {"won": 2}
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE tag_counts SET count = 99")
+    conn.commit()
+    conn.close()
+    assert repo.rebuild_tag_statistics("deals") == {"won": 2}
+    assert repo.get_tag_statistics("leads") == {"lead": 99}
+
+
+def test_create_with_tags_is_atomic(temp_db, sample_spec):
+    """A record and its tags are committed together or not at all."""
+    config, _ = temp_db
+    repo = SQLiteRepository(config)
+    data = {"nome": "Ana", "email": "ana@x.com", "_record_id": "R1"}
+
+    assert (
+        repo.create_with_tags(
+            "deals", sample_spec, data, ["lead", "lead", "new"], "system"
+        )
+        == "R1"
+    )
+    assert repo.read_by_id("deals", sample_spec, "R1")["nome"] == "Ana"
+    assert sorted(t["tag"] for t in repo.get_tags("deals", "R1")) == ["lead", "new"]
+
+    # Duplicate record_id: neither the record nor its tags are written
+    data = {"nome": "Bia", "email": "bia@x.com", "_record_id": "R1"}
+    assert repo.create_with_tags("deals", sample_spec, data, ["hot"], "system") is None
+    assert len(repo.read_all("deals", sample_spec)) == 1
+    assert repo.get_tag_statistics("deals") == {"lead": 1, "new": 1}
+
+
+def test_delete_by_id_removes_tags(temp_db, sample_spec):
+    """Deleting a record removes its tags; orphans left behind can be purged."""
+    config, db_path = temp_db
+    repo = SQLiteRepository(config)
+    keep = repo.create_with_tags("deals", sample_spec, {"nome": "Ana"}, ["lead"], "u1")
+    gone = repo.create_with_tags("deals", sample_spec, {"nome": "Bia"}, ["lead"], "u1")
+    repo.transition_tag("deals", gone, "lead", "won", "u1")
+
+    assert repo.delete_by_id("deals", sample_spec, gone)
+    assert repo.get_tags("deals", gone, active_only=False) == []
+    assert repo.get_tag_statistics("deals") == {"lead": 1}
+    assert not repo.delete_by_id("deals", sample_spec, gone)
+
+    # Record removed outside the repository
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM deals WHERE record_id = ?", (keep,))
+    conn.commit()
+    conn.close()
+    repo.add_tag("deals", "not-a-record", "lead", "u1")
+    assert repo.purge_orphan_tags("deals") == 2
+    assert repo.get_tag_statistics("deals") == {}
+
+
+def test_read_by_ids_and_tag_pages(temp_db, sample_spec):
+    """Records are read by ID with a field projection; tag pages use a cursor."""
+    config, _ = temp_db
+    repo = SQLiteRepository(config)
+    ids = repo.bulk_create(
+        "deals", sample_spec, [{"nome": f"D{i}", "email": "d@x"} for i in range(1200)]
+    )
+    records = repo.read_by_ids("deals", sample_spec, ids + ["missing"], ["nome"])
+    assert len(records) == 1200
+    assert records[ids[7]] == {"nome": "D7", "_record_id": ids[7]}
+
+    repo.bulk_add_tag("deals", ids[:100], "lead", "u1")
+    repo.add_tag("deals", ids[500], "lead", "u1")  # Tagged last: first in order
+    first = repo.page_objects_by_tag("deals", "lead", limit=40)
+    assert first[0][1] == ids[500]
+    seen = [object_id for _, object_id in first]
+    while len(first) == 40:
+        first = repo.page_objects_by_tag("deals", "lead", 40, after=first[-1])
+        seen += [object_id for _, object_id in first]
+    assert sorted(seen) == sorted(ids[:100] + [ids[500]])
+
+
+def test_tag_change_log(temp_db, sample_spec, monkeypatch):
+    """Tag and record writes are logged in order; trimmed cursors need a reload."""
+    import persistence.adapters.sqlite_adapter as sqlite_adapter
+
+    monkeypatch.setattr(sqlite_adapter, "CHANGE_LOG_RETENTION", 5)
+    config, _ = temp_db
+    repo = SQLiteRepository(config)
+    assert repo.get_change_cursor() == 0
+
+    record_id = repo.create_with_tags(
+        "deals", sample_spec, {"nome": "A"}, ["lead"], "u1"
+    )
+    start = repo.get_change_cursor()
+    repo.transition_tag("deals", record_id, "lead", "won", "u1")
+    repo.update_by_id("deals", sample_spec, record_id, {"nome": "B"})
+    repo.add_tag("leads", "X", "lead", "u1")
+
+    changes = repo.get_tag_changes("deals", since=start)
+    assert [(c["op"], c["tag"]) for c in changes] == [
+        ("remove", "lead"),
+        ("add", "won"),
+        ("update", ""),
+    ]
+    assert changes[-1]["object_id"] == record_id
+    assert repo.get_change_cursor() == start + 4
+    assert repo.get_tag_changes("deals", since=repo.get_change_cursor()) == []
+
+    repo.delete_by_id("deals", sample_spec, record_id)
+    repo.add_tag("leads", "Y", "lead", "u1")  # Trims changes 1 and 2
+    assert repo.get_tag_changes("deals", since=start) is None
+    changes = repo.get_tag_changes("deals", since=start + 4)
+    assert [(c["op"], c["tag"]) for c in changes] == [("remove", "won")]
@@ -3,6 +3,7 @@ Tests for Tag Management API Endpoints (FASE 9).
 
 Tests the REST API endpoints for tag management:
 - POST /api/<form>/tags/<id> - Add tag
+- POST /api/<form>/tags/bulk - Bulk add/remove/transition
 - DELETE /api/<form>/tags/<id>/<tag> - Remove tag
 - GET /api/<form>/tags/<id> - Get tags
 - GET /api/<form>/tags/<id>/history - Get tag history
@@ -466,3 +467,75 @@ def test_tag_workflow(client, test_record):
     response = client.get("/api/test_form/search/tags?tag=draft")
     data = json.loads(response.data)
     assert test_record not in data["object_ids"]  # Removed tag shouldn't match
+
+
+def test_bulk_tags(client, test_record):
+    """Test bulk add, transition and remove on many records."""
+    record_ids = [test_record] + [generate_id() for _ in range(4)]
+
+    response = client.post(
+        "/api/test_form/tags/bulk",
+        json={"action": "add", "record_ids": record_ids[:3], "tag": "lead"},
+    )
+    assert response.status_code == 200
+    assert json.loads(response.data)["changed"] == 3
+
+    response = client.post(
+        "/api/test_form/tags/bulk",
+        json={
+            "action": "transition",
+            "record_ids": record_ids,
+            "from_tag": "lead",
+            "to_tag": "qualified",
+            "actor": "test_user",
+        },
+    )
+    data = json.loads(response.data)
+    assert data["success"] is True
+    assert data["record_ids"] == record_ids
+
+    response = client.post(
+        "/api/test_form/tags/bulk",
+        json={"action": "remove", "record_ids": record_ids, "tag": "lead"},
+    )
+    assert json.loads(response.data)["changed"] == 0
+
+    tags = json.loads(client.get(f"/api/test_form/tags/{test_record}").data)["tags"]
+    assert [t["tag"] for t in tags] == ["qualified"]
+
+
+def test_bulk_tags_invalid_request(client):
+    """Test bulk endpoint validation."""
+    response = client.post(
+        "/api/test_form/tags/bulk",
+        json={"action": "add", "record_ids": ["bad-id"], "tag": "lead"},
+    )
+    assert response.status_code == 400
+    assert json.loads(response.data)["invalid_ids"] == ["bad-id"]
+
+    response = client.post(
+        "/api/test_form/tags/bulk",
+        json={"action": "archive", "record_ids": [generate_id()]},
+    )
+    assert response.status_code == 400
+
+
+def test_search_by_tag_combination(client, test_record):
+    """Test searching with all/any/none tag combinations."""
+    other = generate_id()
+    client.post(
+        "/api/test_form/tags/bulk",
+        json={"action": "add", "record_ids": [test_record, other], "tag": "lead"},
+    )
+    client.post(
+        "/api/test_form/tags/bulk",
+        json={"action": "add", "record_ids": [other], "tag": "archived"},
+    )
+
+    response = client.get("/api/test_form/search/tags?tag=lead&none=archived")
+    data = json.loads(response.data)
+    assert test_record in data["object_ids"]
+    assert other not in data["object_ids"]
+
+    response = client.get("/api/test_form/search/tags?all=lead,archived")
+    assert other in json.loads(response.data)["object_ids"]
@@ -0,0 +1,379 @@
+"""
+Tests for TXT adapter schema migrations.
+"""
+
+import pytest
+import os
+import sys
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from persistence.adapters.txt_adapter import TxtRepository
+from persistence.backup_store import BackupStore
+
+
+@pytest.fixture
+def txt_repo(tmp_path):
+    """TXT repository writing under a temporary directory."""
+    return TxtRepository({"type": "txt", "path": str(tmp_path)})
+
+
+@pytest.fixture
+def old_spec():
+    """Specification the data file is written with."""
+    return {
+        "title": "Test",
+        "fields": [
+            {"name": "nome", "label": "Nome", "type": "text", "required": True},
+            {"name": "email", "label": "Email", "type": "email"},
+            {"name": "idade", "label": "Idade", "type": "text"},
+            {"name": "fax", "label": "Fax", "type": "text"},
+        ],
+    }
+
+
+def test_migrate_schema_single_pass(txt_repo, tmp_path, old_spec):
+    """Rename, type change, removal and addition are applied in one rewrite."""
+    new_spec = {
+        "title": "Test",
+        "fields": [
+            {"name": "nome_completo", "label": "Nome", "type": "text"},
+            {"name": "email", "label": "Email", "type": "email"},
+            {"name": "idade", "label": "Idade", "type": "number"},
+            {"name": "ativo", "label": "Ativo", "type": "checkbox"},
+        ],
+    }
+    txt_repo.create_storage("pessoas", old_spec)
+    ids = txt_repo.bulk_create(
+        "pessoas",
+        old_spec,
+        [
+            {"nome": "Ana", "email": "ana@x.com", "idade": "31", "fax": "1"},
+            {"nome": "Rui", "email": "rui@x.com", "idade": "", "fax": "2"},
+        ],
+    )
+    # Legacy line without record_id
+    with open(tmp_path / "pessoas.txt", "a", encoding="utf-8") as f:
+        f.write("Eva;eva@x.com;27;3\n")
+
+    assert txt_repo.migrate_schema("pessoas", old_spec, new_spec)
+
+    records = txt_repo.read_all("pessoas", new_spec)
+    assert records == [
+        {
+            "nome_completo": "Ana",
+            "email": "ana@x.com",
+            "idade": 31,
+            "ativo": False,
+            "_record_id": ids[0],
+        },
+        {
+            "nome_completo": "Rui",
+            "email": "rui@x.com",
+            "idade": 0,
+            "ativo": False,
+            "_record_id": ids[1],
+        },
+        {"nome_completo": "Eva", "email": "eva@x.com", "idade": 27, "ativo": False},
+    ]
+    # One backup, no temporary files left behind
+    assert len(BackupStore(str(tmp_path / "backups")).list_backups()) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["backups", "pessoas.txt"]
+
+
+def test_migrate_schema_failure_leaves_file_unchanged(txt_repo, tmp_path, old_spec):
+    """Too many conversion errors abort without touching the data file."""
+    txt_repo.create_storage("pessoas", old_spec)
+    txt_repo.bulk_create(
+        "pessoas", old_spec, [{"nome": "Ana", "idade": "trinta", "fax": "1"}]
+    )
+    before = (tmp_path / "pessoas.txt").read_text()
+
+    new_spec = {
+        "fields": [
+            dict(field, type="number") if field["name"] == "idade" else field
+            for field in old_spec["fields"]
+        ]
+    }
+    assert not txt_repo.change_field_type(
+        "pessoas", new_spec, "idade", "text", "number"
+    )
+    assert (tmp_path / "pessoas.txt").read_text() == before
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
+
+
+def test_rename_field_keeps_data(txt_repo, old_spec):
+    """rename_field rewrites the file once under the new field name."""
+    txt_repo.create_storage("pessoas", old_spec)
+    txt_repo.create("pessoas", old_spec, {"nome": "Ana", "email": "a@x.com"})
+
+    new_spec = {
+        "fields": [
+            dict(field, name="correio") if field["name"] == "email" else field
+            for field in old_spec["fields"]
+        ]
+    }
+    assert txt_repo.rename_field("pessoas", new_spec, "email", "correio")
+    assert txt_repo.read_all("pessoas", new_spec)[0]["correio"] == "a@x.com"
+
+
+def test_transition_tag_appends(txt_repo, tmp_path):
+    """transition_tag appends the removal and the new tag without rewriting."""
+    txt_repo.add_tag("deals", "A", "lead", "system")
+    txt_repo.add_tag("deals", "B", "won", "system")
+    before = (tmp_path / "tags.txt").read_text()
+
+    assert txt_repo.transition_tag("deals", "A", "lead", "qualified", "u1")
+    assert not txt_repo.transition_tag("deals", "B", "lead", "won", "u1")
+
+    content = (tmp_path / "tags.txt").read_text()
+    assert content.startswith(before)
+    assert len(content.splitlines()) == 4
+    assert [t["tag"] for t in txt_repo.get_tags("deals", "A")] == ["qualified"]
+    assert txt_repo.get_tag_history("deals", "A", "lead")[0]["removed_by"] == "u1"
+    assert [t["tag"] for t in txt_repo.get_tags("deals", "B")] == ["won"]
+
+    # Rebuilding the statistics compacts the appended removal record
+    assert txt_repo.rebuild_tag_statistics("deals") == {"qualified": 1, "won": 1}
+    assert len((tmp_path / "tags.txt").read_text().splitlines()) == 3
+
+
+def test_bulk_tag_operations_append(txt_repo, tmp_path):
+    """Bulk tag operations append to the tags file once per call."""
+    ids = [f"ID{i:03d}" for i in range(100)]
+    txt_repo.add_tag("deals", ids[0], "won", "system")
+
+    assert txt_repo.bulk_add_tag("deals", ids, "lead", "import") == ids
+    assert txt_repo.bulk_transition("deals", ids[:50], "lead", "won", "u1") == ids[1:50]
+    assert txt_repo.bulk_remove_tag("deals", ids, "lead", "u1") == [ids[0]] + ids[50:]
+
+    assert len((tmp_path / "tags.txt").read_text().splitlines()) == 1 + 100 + 98 + 51
+    assert txt_repo.get_tag_statistics("deals") == {"won": 50}
+    assert txt_repo.get_objects_by_tag("deals", "lead") == []
+
+
+def test_apply_transitions_append(txt_repo, tmp_path):
+    """Moves with different tag pairs are appended in one write."""
+    txt_repo.bulk_add_tag("deals", ["A", "B", "C"], "lead", "system")
+    txt_repo.add_tag("deals", "D", "proposal", "system")
+    txt_repo.add_tag("deals", "C", "won", "system")
+    before = (tmp_path / "tags.txt").read_text()
+
+    moves = [
+        ("A", "lead", "qualified"),
+        ("D", "proposal", "won"),
+        ("C", "lead", "won"),
+        ("B", "lead", "lost"),
+        ("A", "qualified", "won"),
+    ]
+    assert txt_repo.apply_transitions("deals", moves, "ai_agent") == ["A", "D", "B"]
+
+    content = (tmp_path / "tags.txt").read_text()
+    assert content.startswith(before)
+    assert len(content.splitlines()) == len(before.splitlines()) + 6
+    assert txt_repo.get_tag_statistics("deals") == {
+        "lead": 1,
+        "lost": 1,
+        "qualified": 1,
+        "won": 2,
+    }
+
+
+def test_query_objects_by_tags(txt_repo):
+    """Tag combinations are answered from the in-memory tag index."""
+    txt_repo.bulk_add_tag("deals", ["A", "B", "C", "D"], "qualified", "u1")
+    txt_repo.bulk_add_tag("deals", ["A", "B"], "priority", "u1")
+    txt_repo.bulk_add_tag("deals", ["C"], "hot", "u1")
+    txt_repo.bulk_add_tag("deals", ["B"], "on_hold", "u1")
+
+    query = txt_repo.query_objects_by_tags
+    assert query("deals", all_of=["qualified", "priority"]) == ["A", "B"]
+    # Most recently tagged first
+    assert query("deals", any_of=["priority", "hot"], none_of=["on_hold"]) == [
+        "C",
+        "A",
+    ]
+
+    # The index follows later writes to the tags file
+    txt_repo.remove_tag("deals", "B", "on_hold", "u1")
+    assert query("deals", all_of=["qualified"], none_of=["on_hold"], limit=3) == [
+        "A",
+        "B",
+        "C",
+    ]
+
+
+def test_tag_statistics_follow_other_writers(txt_repo, tmp_path):
+    """Statistics come from the tag index, which notices foreign writes."""
+    txt_repo.bulk_add_tag("deals", ["A", "B"], "lead", "u1")
+    assert txt_repo.get_tag_statistics("deals") == {"lead": 2}
+
+    other = TxtRepository({"type": "txt", "path": str(tmp_path)})
+    other.transition_tag("deals", "A", "lead", "won", "u2")
+
+    assert txt_repo.get_tag_statistics("deals") == {"lead": 1, "won": 1}
+    assert txt_repo.has_tag("deals", "A", "won")
+
+
+def _add_lead_tags(path, object_ids, results):
+    """Worker process adding the same tag to all objects."""
+    repo = TxtRepository({"type": "txt", "path": path})
+    results.put(sum(repo.add_tag("deals", oid, "lead", "u1") for oid in object_ids))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_tag_checks_and_appends_are_atomic_across_processes(tmp_path):
+    """Concurrent workers never apply the same tag twice."""
+    import multiprocessing
+
+    ctx = multiprocessing.get_context("fork")
+    object_ids = [f"D{i}" for i in range(200)]
+    results = ctx.Queue()
+    workers = [
+        ctx.Process(target=_add_lead_tags, args=(str(tmp_path), object_ids, results))
+        for _ in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    added = sum(results.get(timeout=60) for _ in workers)
+    for worker in workers:
+        worker.join(timeout=60)
+
+    repo = TxtRepository({"type": "txt", "path": str(tmp_path)})
+    assert added == len(object_ids)
+    assert len(repo._read_all_tags()) == len(object_ids)
+    assert repo.get_tag_statistics("deals") == {"lead": len(object_ids)}
+    seqs = [c["seq"] for c in repo._read_changes()]
+    assert seqs == list(range(1, len(object_ids) + 1))
+
+
+def test_tag_pages_are_consistent_during_writes(txt_repo):
+    """Readers iterate the tag index while another thread writes tags."""
+    import threading
+
+    object_ids = [f"D{i}" for i in range(1000)]
+    errors = []
+    done = threading.Event()
+
+    def write():
+        try:
+            for oid in object_ids:
+                txt_repo.add_tag("deals", oid, "lead", "u1")
+                if oid.endswith("0"):
+                    txt_repo.remove_tag("deals", oid, "lead", "u1")
+        except Exception as e:
+            errors.append(e)
+        finally:
+            done.set()
+
+    def read():
+        try:
+            while not done.is_set():
+                page = txt_repo.page_objects_by_tag("deals", "lead")
+                assert len(page) == len(set(page))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write), threading.Thread(target=read)]
+    # Switch threads often so reads overlap index updates
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    assert len(txt_repo.page_objects_by_tag("deals", "lead")) == 900
+
+
+def test_create_with_tags_appends(txt_repo, old_spec, tmp_path):
+    """create_with_tags appends the record and all its tags in one write each."""
+    txt_repo.create("pessoas", old_spec, {"nome": "Ana"})
+    record_id = txt_repo.create_with_tags(
+        "pessoas", old_spec, {"nome": "Bia"}, ["lead", "new", "lead"], "system"
+    )
+
+    assert txt_repo.read_by_id("pessoas", old_spec, record_id)["nome"] == "Bia"
+    assert len(txt_repo.read_all("pessoas", old_spec)) == 2
+    assert sorted(t["tag"] for t in txt_repo.get_tags("pessoas", record_id)) == [
+        "lead",
+        "new",
+    ]
+    assert len((tmp_path / "tags.txt").read_text().splitlines()) == 2
+
+
+def test_delete_by_id_removes_tags(txt_repo, old_spec):
+    """Deleting a record removes its tags; orphans left behind can be purged."""
+    keep = txt_repo.create_with_tags("pessoas", old_spec, {"nome": "Ana"}, ["a"], "u1")
+    gone = txt_repo.create_with_tags("pessoas", old_spec, {"nome": "Bia"}, ["a"], "u1")
+    txt_repo.add_tag("deals", gone, "a", "u1")
+
+    assert txt_repo.delete_by_id("pessoas", old_spec, gone)
+    # The tags file was replaced atomically and the index follows it
+    assert not [name for name in os.listdir(txt_repo.path) if name.endswith(".tmp")]
+    assert txt_repo._tag_index[0] == txt_repo._tags_file_key()
+    assert txt_repo.get_tags("pessoas", gone, active_only=False) == []
+    assert txt_repo.get_objects_by_tag("pessoas", "a") == [keep]
+    # Other object types are left alone
+    assert txt_repo.get_objects_by_tag("deals", "a") == [gone]
+
+    txt_repo.add_tag("pessoas", "not-a-record", "a", "u1")
+    txt_repo.remove_tag("pessoas", "not-a-record", "a", "u1")
+    assert txt_repo.purge_orphan_tags("pessoas") == 1
+    assert txt_repo.get_tag_history("pessoas", "not-a-record", "a") == []
+    assert txt_repo.purge_orphan_tags("pessoas") == 0
+
+
+def test_read_by_ids_and_tag_pages(txt_repo, old_spec):
+    """Records are read by ID with a field projection; tag pages use a cursor."""
+    ids = txt_repo.bulk_create(
+        "pessoas", old_spec, [{"nome": f"P{i}", "email": f"p{i}@x"} for i in range(5)]
+    )
+    records = txt_repo.read_by_ids("pessoas", old_spec, ids[3:] + ["missing"], ["nome"])
+    assert records == {
+        ids[3]: {"nome": "P3", "_record_id": ids[3]},
+        ids[4]: {"nome": "P4", "_record_id": ids[4]},
+    }
+
+    txt_repo.bulk_add_tag("pessoas", ids, "lead", "u1")
+    first = txt_repo.page_objects_by_tag("pessoas", "lead", limit=3)
+    rest = txt_repo.page_objects_by_tag("pessoas", "lead", after=first[-1])
+    assert sorted(object_id for _, object_id in first + rest) == sorted(ids)
+
+
+def test_tag_change_log(txt_repo, old_spec, monkeypatch):
+    """Tag and record writes are logged in order; trimmed cursors need a reload."""
+    import persistence.adapters.txt_adapter as txt_adapter
+
+    monkeypatch.setattr(txt_adapter, "CHANGE_LOG_RETENTION", 3)
+    record_id = txt_repo.create_with_tags(
+        "pessoas", old_spec, {"nome": "A"}, ["lead"], "u1"
+    )
+    assert txt_repo.get_change_cursor() == 1
+
+    txt_repo.transition_tag("pessoas", record_id, "lead", "won", "u1")
+    txt_repo.update_by_id("pessoas", old_spec, record_id, {"nome": "B"})
+    txt_repo.add_tag("deals", "X", "lead", "u1")
+    changes = txt_repo.get_tag_changes("pessoas", since=1)
+    assert [(c["seq"], c["op"], c["tag"]) for c in changes] == [
+        (2, "remove", "lead"),
+        (3, "add", "won"),
+        (4, "update", ""),
+    ]
+
+    # A second repository reads the log appended by the first
+    other = txt_adapter.TxtRepository({"type": "txt", "path": txt_repo.path})
+    assert other.get_change_cursor() == 5
+    assert other.get_tag_changes("pessoas", since=5) == []
+
+    # Deleting the record logs the removal of its tags; the next change
+    # trims the log to its last 3 entries
+    txt_repo.delete_by_id("pessoas", old_spec, record_id)
+    txt_repo.add_tag("deals", "Y", "lead", "u1")
+    assert txt_repo.get_tag_changes("pessoas", since=1) is None
+    assert [c["op"] for c in txt_repo.get_tag_changes("pessoas", since=5)] == ["remove"]
@@ -5,7 +5,11 @@ This module serves as the entry point for WSGI servers like Gunicorn.
 It imports the Flask application instance from the main application module.
 
 Usage:
-    BUSINESS_CASE_PATH=examples/ponto-de-vendas gunicorn -w 4 -b 0.0.0.0:5000 wsgi:app
+    BUSINESS_CASE_PATH=examples/ponto-de-vendas gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5000 wsgi:app
+
+Use a threaded (gthread) or async worker class: Kanban change streams
+(/api/kanban/<board>/stream) keep their request open, which would tie up a
+whole sync worker per open board.
 
 Environment Variables:
     BUSINESS_CASE_PATH: Path to the business case directory (required)
@@ -26,7 +30,7 @@ if not business_case_path:
     print("Error: BUSINESS_CASE_PATH environment variable not set")
     print("\nUsage:")
     print(
-        "  BUSINESS_CASE_PATH=examples/ponto-de-vendas gunicorn -w 4 -b 0.0.0.0:5000 wsgi:app"
+        "  BUSINESS_CASE_PATH=examples/ponto-de-vendas gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5000 wsgi:app"
     )
     sys.exit(1)
 